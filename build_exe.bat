@@ -40,6 +40,40 @@ if %ERRORLEVEL% NEQ 0 (
     echo [OK] PyInstaller already installed.
 )
 
+REM ── Check / Install cryptography (encrypts the remembered login) ─────────────
+echo.
+echo Checking for cryptography...
+"%PY%" -c "import cryptography.fernet" >nul 2>&1
+if %ERRORLEVEL% NEQ 0 (
+    echo cryptography not found. Installing...
+    "%PY%" -m pip install cryptography
+    if %ERRORLEVEL% NEQ 0 (
+        echo [ERROR] Failed to install cryptography.
+        pause
+        exit /b 1
+    )
+    echo [OK] cryptography installed.
+) else (
+    echo [OK] cryptography already installed.
+)
+
+REM ── Check / Install psutil (editor memory/CPU, admission limits) ─────────────
+echo.
+echo Checking for psutil...
+"%PY%" -c "import psutil" >nul 2>&1
+if %ERRORLEVEL% NEQ 0 (
+    echo psutil not found. Installing...
+    "%PY%" -m pip install psutil
+    if %ERRORLEVEL% NEQ 0 (
+        echo [ERROR] Failed to install psutil.
+        pause
+        exit /b 1
+    )
+    echo [OK] psutil installed.
+) else (
+    echo [OK] psutil already installed.
+)
+
 REM ── Build from spec file ──────────────────────────────────────────────────────
 echo.
 echo Building EXE from spec file, please wait...
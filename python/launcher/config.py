@@ -39,5 +39,98 @@ KC_ISSUER    = os.getenv("KC_BASE",     f"http://{DOMAIN}:8080")
 KC_REALM     = os.getenv("KC_REALM",    "MIHIRA-REALM")
 KC_CLIENT_ID = os.getenv("KC_CLIENT_ID","mihira-cli")
 
+# Keep the login (encrypted refresh token + profile, see services/session_store.py) across restarts
+AUTH_REMEMBER_SESSION = _cfg.getboolean("Auth", "remember_session", fallback=True)
+# Check access token signatures against Keycloak's published keys (cached in CACHE_DIR/auth)
+AUTH_VERIFY_TOKENS    = _cfg.getboolean("Auth", "verify_tokens", fallback=True)
+
 FASTAPI_BASE_URL    = f"http://{DOMAIN}:4007/api/v1"
-FASTAPI_AUTH_PREFIX = ""
\ No newline at end of file
+FASTAPI_AUTH_PREFIX = ""
+
+# JSON codec for API payloads and local files (util/json_codec.py): auto | orjson | msgspec | stdlib
+JSON_CODEC = os.getenv("MVL_JSON_CODEC") or _cfg.get("Json", "codec", fallback="auto")
+
+# HTTP pipeline (services/http_pipeline.py): default (connect, read) timeouts, attempts for
+# idempotent calls, and the circuit breaker: consecutive failed sends before a host is paused, and for
+# how long. While a backend is down it is probed every probe_interval_s (services/backend_health.py)
+HTTP_CONNECT_TIMEOUT   = _cfg.getfloat("Http", "connect_timeout_s", fallback=5.0)
+HTTP_READ_TIMEOUT      = _cfg.getfloat("Http", "read_timeout_s", fallback=30.0)
+HTTP_RETRY_ATTEMPTS    = max(1, _cfg.getint("Http", "retry_attempts", fallback=3))
+HTTP_BREAKER_THRESHOLD = _cfg.getint("Http", "breaker_failures", fallback=3)
+HTTP_BREAKER_COOLDOWN  = _cfg.getfloat("Http", "breaker_cooldown_s", fallback=30.0)
+HTTP_PROBE_INTERVAL    = _cfg.getfloat("Http", "probe_interval_s", fallback=10.0)
+# Compression: ask for gzip/br/zstd responses; JSON request bodies of at least compress_min_bytes to
+# the listed endpoints ("<METHOD> <path prefix>", comma-separated) are sent with request_encoding
+HTTP_COMPRESS_RESPONSES  = _cfg.getboolean("Http", "compress_responses", fallback=True)
+HTTP_COMPRESS_REQUESTS   = tuple(e.strip() for e in _cfg.get(
+    "Http", "compress_requests", fallback="POST projects").split(",") if e.strip())
+HTTP_REQUEST_ENCODING    = _cfg.get("Http", "request_encoding", fallback="gzip")
+HTTP_COMPRESS_MIN_BYTES  = _cfg.getint("Http", "compress_min_bytes", fallback=4096)
+# What sends the requests (services/http_recording.py): live, record (live, and every exchange appended
+# to recording) or replay (answers from recording, no network). replay_speed scales the time the server
+# originally took: 1 waits as long, 0 answers at once. recording defaults to CACHE_DIR/recordings
+HTTP_TRANSPORT    = (os.getenv("MVL_HTTP_TRANSPORT") or _cfg.get("Http", "transport", fallback="live")).strip().lower()
+HTTP_RECORDING    = os.getenv("MVL_HTTP_RECORDING") or _cfg.get("Http", "recording", fallback="")
+HTTP_REPLAY_SPEED = _cfg.getfloat("Http", "replay_speed", fallback=1.0)
+
+# Bulk project actions (services/bulk_operations.py): project ids per batched request, and calls in
+# flight at once when the server has no batch endpoint
+BULK_BATCH_SIZE  = max(1, _cfg.getint("Bulk", "batch_size", fallback=100))
+BULK_CONCURRENCY = max(1, _cfg.getint("Bulk", "concurrency", fallback=4))
+
+# Unreal project provisioning: per-project copies of the template live next to it
+UPROJECT_TEMPLATE   = os.getenv("THEATER_UPROJECT_TEMPLATE") or _cfg.get("Paths", "uproject_template", fallback="")
+UNREAL_PROJECTS_DIR = os.getenv("MVL_UNREAL_PROJECTS_DIR") or _cfg.get(
+    "Paths", "unreal_projects_dir",
+    fallback=str(Path(UPROJECT_TEMPLATE).parent.parent) if UPROJECT_TEMPLATE else r"C:\dev\Unreal Projects",
+)
+# copy | reflink | hardlink | auto (reflink where the filesystem supports it, else copy)
+PROVISION_LINK_MODE = os.getenv("MVL_PROVISION_LINK_MODE") or _cfg.get("Paths", "provision_link_mode", fallback="auto")
+
+# Editor launch. THEATER_HOME is what the .bat files have always pointed at the editor binary
+EDITOR_EXECUTABLE = os.getenv("THEATER_HOME") or os.getenv("THEATER_EXECUTABLE") \
+    or _cfg.get("Paths", "theater_executable", fallback="")
+# Root of the shared project tree the editor resolves MVL_* paths against
+PROJECTS_ROOT_DIR = os.getenv("PROJECTS_ROOT_DIR") or _cfg.get("Paths", "projects_root_dir", fallback="J:")
+# Launch context the editor opens in (the MVL_SCOPE sequence comes from what was clicked)
+LAUNCH_MVL_TYPE      = _cfg.get("Launch", "mvl_type", fallback="sequences")
+LAUNCH_MVL_CONTAINER = _cfg.get("Launch", "mvl_container", fallback="master")
+LAUNCH_MVL_TASK      = _cfg.get("Launch", "mvl_task", fallback="layout")
+LAUNCH_MVL_STEP      = _cfg.get("Launch", "mvl_step", fallback="lay")
+# Seconds existence checks of editor / template / project-root paths are trusted
+PATH_PROBE_TTL = _cfg.getfloat("Launch", "path_probe_ttl", fallback=60.0)
+LAUNCH_WARM_ON_BROWSE = _cfg.getboolean("Launch", "warm_on_browse", fallback=True)
+LAUNCH_PREFETCH_MB    = _cfg.getint("Launch", "prefetch_mb", fallback=1024)
+MAX_EDITORS           = _cfg.getint("Launch", "max_editors", fallback=3)
+
+# Admission control: launches wait (queue) or go ahead with a warning when the machine is busy
+LAUNCH_QUEUE_WHEN_BUSY  = _cfg.getboolean("Launch", "queue_when_busy", fallback=True)
+ADMIT_MIN_FREE_MEM_MB   = _cfg.getint("Launch", "min_free_mem_mb", fallback=6144)
+ADMIT_WARN_FREE_MEM_MB  = _cfg.getint("Launch", "warn_free_mem_mb", fallback=12288)
+ADMIT_MAX_LOAD_PER_CPU  = _cfg.getfloat("Launch", "max_load_per_cpu", fallback=1.5)
+ADMIT_WARN_LOAD_PER_CPU = _cfg.getfloat("Launch", "warn_load_per_cpu", fallback=0.9)
+ADMIT_EDITOR_MEM_MB     = _cfg.getint("Launch", "editor_mem_mb", fallback=4096)
+
+# Compressed editor session logs (CACHE_DIR/logs/archive); oldest sessions go first past this size
+LOG_ARCHIVE_MAX_MB = _cfg.getint("Logs", "archive_max_mb", fallback=2048)
+
+# Editor hang / crash watchdog; action is report, kill or relaunch
+WATCHDOG_STARTUP_SILENCE = _cfg.getfloat("Watchdog", "startup_silence_s", fallback=180.0)
+WATCHDOG_STARTUP_TIMEOUT = _cfg.getfloat("Watchdog", "startup_timeout_s", fallback=1800.0)
+WATCHDOG_PING_FAILURES   = _cfg.getint("Watchdog", "ping_failures", fallback=3)
+WATCHDOG_ACTION          = _cfg.get("Watchdog", "action", fallback="report").strip().lower()
+WATCHDOG_MAX_RELAUNCHES  = _cfg.getint("Watchdog", "max_relaunches", fallback=1)
+
+
+def _get_cache_dir() -> Path:
+    # Per-machine cache for local mirrors, manifests and logs
+    override = os.getenv("MVL_CACHE_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        base = Path(os.getenv("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+        return base / "MVLTheater"
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "mvl_theater"
+
+
+CACHE_DIR = _get_cache_dir()
@@ -1,10 +1,27 @@
 # domain/project.py
 from dataclasses import dataclass
 
-@dataclass
+# Values the backend accepts for a project's status, and for a user's role on it
+PROJECT_STATUSES = ("Active", "On Hold", "Completed")
+ACCESS_ROLES = ("viewer", "editor", "admin")
+
+
+@dataclass(slots=True)
 class Project:
     id: str
     name: str
     code: str
     sequence_count: int
     shot_count: int
+    updated_at: str | None = None  # server ISO-8601 timestamp, used for incremental caching
+
+    @classmethod
+    def from_dict(cls, p: dict, sequence_count: int = 0, shot_count: int = 0) -> "Project":
+        return cls(
+            p["id"],
+            p["name"],
+            p["code"],
+            int(sequence_count),
+            int(shot_count),
+            p.get("updated_at"),
+        )
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Dict, List
 
-@dataclass
+@dataclass(slots=True)
 class ScriptBreakdown:
     total_pages: int = 0
     total_scenes: int = 0
@@ -9,4 +9,4 @@ class ScriptBreakdown:
     scenes: List[str] = field(default_factory=list)
     characters: List[str] = field(default_factory=list)
     character_appearances: Dict[str, int] = field(default_factory=dict)
-    character_scenes: Dict[str, List[str]] = field(default_factory=dict)
\ No newline at end of file
+    character_scenes: Dict[str, List[str]] = field(default_factory=dict)
@@ -1,12 +1,42 @@
-# domain/project.py
-from dataclasses import dataclass
+# domain/sequence.py
+import sys
+from dataclasses import dataclass, field
 
+from launcher.util import json_codec
 
-@dataclass
+
+@dataclass(slots=True)
 class Sequence:
     id: str
     project_id: str
-    name: str
+    name: str | None
     code: str
     status: str
-    meta: dict
\ No newline at end of file
+    # dict, or undecoded JSON (str/bytes) that is parsed on first access to .meta
+    raw_meta: dict | str | bytes | None = field(default=None, repr=False)
+    updated_at: str | None = None  # server ISO-8601 timestamp, used for incremental caching
+
+    @property
+    def meta(self) -> dict:
+        raw = self.raw_meta
+        if raw is None:
+            raw = self.raw_meta = {}
+        elif not isinstance(raw, dict):
+            raw = self.raw_meta = json_codec.loads(raw)
+        return raw
+
+    @classmethod
+    def from_dict(cls, s: dict) -> "Sequence":
+        return cls(
+            s["id"],
+            sys.intern(s["project_id"]),
+            s.get("name"),
+            s["code"],
+            sys.intern(s.get("status") or "new"),
+            s.get("meta"),
+            s.get("updated_at"),
+        )
+
+    @classmethod
+    def list_from_json(cls, data: bytes | str) -> list["Sequence"]:
+        return json_codec.decode_list(data, cls.from_dict)
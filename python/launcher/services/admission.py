@@ -0,0 +1,123 @@
+# services/admission.py
+"""
+Admission control for editor launches.
+
+Before an editor starts, the workstation's available memory, load average
+and the number of editors already running are compared against two sets
+of thresholds:
+
+    warn    the launch goes ahead, the user is told the machine is busy
+    queue   the launch waits until resources free up (TheaterService
+            re-checks on its sampling timer and whenever an editor exits)
+
+An editor takes a while to grow to its working set, so editors admitted
+in the last SETTLE_SECONDS still count `editor_mem_mb` against available
+memory. Otherwise draining a queue would start every waiting editor at
+once on the strength of a single sample.
+
+Metrics come from a callable (`sample_system` by default) so tests can
+inject their own.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from launcher import config
+from launcher.util.proc_stats import SystemSample, sample_system
+
+SETTLE_SECONDS = 60.0
+
+ADMIT = "admit"
+WARN = "warn"
+QUEUE = "queue"
+
+_MB = 1 << 20
+
+
+@dataclass(slots=True)
+class AdmissionPolicy:
+    max_editors: int = 3
+    min_free_mem_mb: int = 6144         # queue below this much available memory
+    warn_free_mem_mb: int = 12288       # warn below this
+    max_load_per_cpu: float = 1.5       # queue above this 1-minute load per CPU
+    warn_load_per_cpu: float = 0.9      # warn above this
+    editor_mem_mb: int = 4096           # expected growth of a freshly started editor
+
+    @classmethod
+    def from_config(cls) -> "AdmissionPolicy":
+        return cls(
+            max_editors=config.MAX_EDITORS,
+            min_free_mem_mb=config.ADMIT_MIN_FREE_MEM_MB,
+            warn_free_mem_mb=config.ADMIT_WARN_FREE_MEM_MB,
+            max_load_per_cpu=config.ADMIT_MAX_LOAD_PER_CPU,
+            warn_load_per_cpu=config.ADMIT_WARN_LOAD_PER_CPU,
+            editor_mem_mb=config.ADMIT_EDITOR_MEM_MB,
+        )
+
+
+@dataclass(slots=True)
+class AdmissionDecision:
+    verdict: str                        # ADMIT | WARN | QUEUE
+    reasons: list[str]
+    sample: SystemSample | None = None
+
+    @property
+    def admitted(self) -> bool:
+        return self.verdict != QUEUE
+
+    def message(self) -> str:
+        return "; ".join(self.reasons)
+
+
+class AdmissionController:
+    def __init__(self, policy: AdmissionPolicy | None = None,
+                 metrics: Callable[[], SystemSample | None] = sample_system,
+                 clock: Callable[[], float] = time.monotonic):
+        self.policy = policy or AdmissionPolicy.from_config()
+        self.metrics = metrics
+        self.clock = clock
+        self._admitted_at: list[float] = []
+
+    def check(self, running: int) -> AdmissionDecision:
+        """Evaluate a launch with `running` editors already up. Does not reserve anything."""
+        p = self.policy
+        queue: list[str] = []
+        warn: list[str] = []
+
+        if running >= p.max_editors:
+            queue.append(f"{running} of {p.max_editors} editors already running")
+
+        sample = self.metrics()
+        if sample is not None:
+            # Memory editors started moments ago will still claim
+            settling = self._settling()
+            available = sample.mem_available - settling * p.editor_mem_mb * _MB
+            free_mb = max(0, available) // _MB
+            pending = f" with {settling} editor(s) still starting" if settling else ""
+            if free_mb < p.min_free_mem_mb:
+                queue.append(f"only {free_mb / 1024:.1f} GiB memory free{pending}")
+            elif free_mb < p.warn_free_mem_mb:
+                warn.append(f"{free_mb / 1024:.1f} GiB memory free{pending}")
+
+            load = sample.load_per_cpu
+            if load > p.max_load_per_cpu:
+                queue.append(f"CPU load {sample.load1:.1f} on {sample.cpu_count} cores")
+            elif load > p.warn_load_per_cpu:
+                warn.append(f"CPU load {sample.load1:.1f} on {sample.cpu_count} cores")
+
+        if queue:
+            return AdmissionDecision(QUEUE, queue, sample)
+        if warn:
+            return AdmissionDecision(WARN, warn, sample)
+        return AdmissionDecision(ADMIT, [], sample)
+
+    def admitted(self) -> None:
+        """Record that a launch went ahead (its memory counts as reserved while it settles)."""
+        self._admitted_at.append(self.clock())
+
+    def _settling(self) -> int:
+        cutoff = self.clock() - SETTLE_SECONDS
+        self._admitted_at = [t for t in self._admitted_at if t > cutoff]
+        return len(self._admitted_at)
@@ -1,7 +1,8 @@
 # launcher/services/ai_service.py
-import json
 from openai import OpenAI
 
+from launcher.util import json_codec
+
 from launcher.config import AI_API_KEY
 
 print(f"AI API Key loaded: {'yes' if AI_API_KEY else 'NO - KEY IS EMPTY'}")
@@ -61,4 +62,4 @@ def analyse_breakdown(scenes: list, character_appearances: dict) -> dict:
             content = content[4:]
     content = content.strip()
 
-    return json.loads(content)
\ No newline at end of file
+    return json_codec.loads(content)
\ No newline at end of file
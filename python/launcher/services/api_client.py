@@ -1,42 +1,24 @@
 from __future__ import annotations
 import requests
 from launcher import config
+from launcher.services.auth_service import SessionExpired
+
 
 class ApiClient:
+    """Authenticated calls for the UI services; an ended session is announced on ctx.session_expired."""
+
     def __init__(self, ctx):
         self._ctx = ctx
 
     def request(self, method: str, path: str, **kwargs) -> requests.Response:
-        url = f"{config.FASTAPI_BASE_URL}{config.FASTAPI_AUTH_PREFIX}{path}"
-
         try:
-            token = self._ctx.auth_service.get_access_token()
-        except Exception as e:
-            # already expired
-            self._ctx.auth_service.logout()
+            resp = self._ctx.http_client.request(
+                method, f"{config.FASTAPI_AUTH_PREFIX}{path}", auth=self._ctx.auth_service, **kwargs
+            )
+        except SessionExpired as e:
+            # The pipeline has already refreshed once and logged out
             self._ctx.session_expired.emit(str(e))
             raise
 
-        headers = kwargs.pop("headers", {})
-        headers["Authorization"] = f"Bearer {token}"
-        resp = requests.request(method, url, headers=headers, timeout=50, **kwargs)
-
-        # If token invalid, try one refresh and retry once
-        if resp.status_code == 401:
-            try:
-                # force refresh by expiring locally (optional) or just call get_access_token() again
-                token = self._ctx.auth_service.get_access_token()
-                headers["Authorization"] = f"Bearer {token}"
-                resp = requests.request(method, url, headers=headers, timeout=10, **kwargs)
-            except Exception as e:
-                self._ctx.auth_service.logout()
-                self._ctx.session_expired.emit("Session expired. Please log in again.")
-                raise
-
-        # If still 401, consider it expired
-        if resp.status_code == 401:
-            self._ctx.auth_service.logout()
-            self._ctx.session_expired.emit("Session expired. Please log in again.")
-
         resp.raise_for_status()
         return resp
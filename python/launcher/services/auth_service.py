@@ -1,31 +1,70 @@
 from __future__ import annotations
 
+import threading
+import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import requests
 
 
 from launcher import config
 from launcher.domain.user import User
-class AuthError(Exception):
-    pass
-
-
-class SessionExpired(AuthError):
-    pass
+from launcher.services.http_pipeline import HttpPipeline
+from launcher.services.jwks import JwksUnavailable, TokenVerifier
+from launcher.services.session_store import SessionStore
+from launcher.util import json_codec, jwt
+from launcher.util.errors import AuthError, SessionExpired   # re-exported: callers import them from here
 
 
 @dataclass
 class AuthTokens:
     access_token: str
     refresh_token: str | None
-    expires_at: datetime  # when access token should be considered expired
+    expires_at: datetime  # UTC; when access token should be considered expired
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
 
 
 class AuthService:
-    def __init__(self):
+    """
+    Keycloak login and token refresh. With a SessionStore the refresh token
+    and user profile survive restarts: resume_cached() signs in from disk
+    without any request, validate() checks that session against the server.
+
+    The User and the refresh schedule come from the access token's own
+    claims (sub, preferred_username, email, iat/exp); with a TokenVerifier
+    its signature is checked against Keycloak's cached keys first.
+
+    Keycloak calls go through `http` (an HttpPipeline) like every other
+    request; they carry no bearer token, so they are never auth-retried.
+    """
+
+    def __init__(self, store: SessionStore | None = None, verifier: TokenVerifier | None = None,
+                 http: HttpPipeline | None = None):
+        self._http = http or HttpPipeline.default()
         self._tokens: AuthTokens | None = None
-       
+        self._claims: dict = {}                    # of the current access token
+        self._current_user: User | None = None
+        self._store = store
+        self._verifier = verifier
+        self._refresh_expires_at: float | None = None    # time.time(), for the saved session
+        # One refresh at a time: Keycloak rotates refresh tokens, so a second
+        # concurrent refresh with the old one would fail and log us out
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def current_user(self) -> User | None:
+        return self._current_user
+
+    @property
+    def session_not_remembered(self) -> str | None:
+        """Why a login can't be kept across restarts; None if it can or remembering is off."""
+        if self._store is None or self._store.available:
+            return None
+        return self._store.unavailable_reason
+
     def auth_headers(self) -> dict[str, str]:
         token = self.get_access_token()
         return {"Authorization": f"Bearer {token}"}
@@ -44,38 +83,87 @@ class AuthService:
         if getattr(config, "KC_CLIENT_SECRET", None):
             payload["client_secret"] = config.KC_CLIENT_SECRET
 
-        token_resp = requests.post(token_url, data=payload, timeout=10)
+        token_resp = self._http.request("POST", token_url, data=payload)
         self._raise_auth_error(token_resp)
 
-        token_data = token_resp.json()
-        access_token = token_data["access_token"]
-        refresh_token = token_data.get("refresh_token")
-        expires_in = int(token_data.get("expires_in", 3600))
-
-        # refresh 60s early to avoid race conditions
-        self._tokens = AuthTokens(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            expires_at=datetime.utcnow() + timedelta(seconds=expires_in - 60),
-        )
-
-        me = self._api_get("/auth/me").json()
+        token_data = json_codec.loads(token_resp.content)
+        claims = self._accept(token_data)
 
+        # Everything /auth/me would tell us is in the token
         self._current_user = User(
-            id=me["kc_user_id"],
-            email=email,
-            display_name=me.get("username"),
+            id=claims["sub"],
+            email=claims.get("email") or email,
+            display_name=claims.get("preferred_username"),
         )
+        self._remember(token_data.get("refresh_expires_in", 0))
         return self._current_user
 
+    def resume_cached(self) -> User | None:
+        """Sign in from the saved session, without network. The first request refreshes the access token."""
+        if self._store is None:
+            return None
+        saved = self._store.load()
+        if saved is None:
+            return None
+        self._tokens = AuthTokens(
+            access_token="",
+            refresh_token=saved.refresh_token,
+            expires_at=_utcnow() - timedelta(seconds=1),
+        )
+        self._claims = {}
+        self._current_user = saved.user
+        self._refresh_expires_at = saved.refresh_expires_at
+        return saved.user
+
+    def validate(self) -> User:
+        """
+        Confirm the current session with the server: refresh the access token
+        if needed and check it names the same user. Raises SessionExpired if
+        the session is no longer valid; network errors propagate as requests
+        exceptions and leave the session alone.
+        """
+        user = self._current_user
+        if user is None:
+            raise SessionExpired("Not logged in.")
+        self.get_access_token()
+        claims = self._claims
+        if claims.get("sub") != user.id:
+            self.logout()
+            raise SessionExpired("The saved session belongs to another user. Please log in again.")
+        name = claims.get("preferred_username")
+        if name and name != user.display_name:
+            user.display_name = name
+            self._remember()
+        return user
+
     def get_access_token(self) -> str:
-        if not self._tokens:
+        tokens = self._tokens
+        if not tokens:
             raise SessionExpired("Not logged in.")
 
-        if datetime.utcnow() < self._tokens.expires_at:
-            return self._tokens.access_token
+        if _utcnow() < tokens.expires_at:
+            return tokens.access_token
+
+        with self._refresh_lock:
+            return self._refresh()
+
+    def refresh_after_rejection(self, rejected_token: str) -> str:
+        """
+        The server answered 401 to `rejected_token` although it hadn't expired
+        here (revoked, clock skew): refresh now. If another request already
+        replaced that token, its replacement is returned without a second refresh.
+        """
+        with self._refresh_lock:
+            if self._tokens and self._tokens.access_token == rejected_token:
+                self._tokens.expires_at = _utcnow() - timedelta(seconds=1)
+            return self._refresh()
+
+    def _refresh(self) -> str:
+        if not self._tokens:
+            raise SessionExpired("Not logged in.")
+        if _utcnow() < self._tokens.expires_at:
+            return self._tokens.access_token    # another thread refreshed while we waited
 
-        # refresh
         if not self._tokens.refresh_token:
             self.logout()
             raise SessionExpired("Session expired. Please log in again.")
@@ -89,41 +177,78 @@ class AuthService:
         if getattr(config, "KC_CLIENT_SECRET", None):
             payload["client_secret"] = config.KC_CLIENT_SECRET
 
-        resp = requests.post(url, data=payload, timeout=10)
-        if resp.status_code != 200:
+        resp = self._http.request("POST", url, data=payload)
+        if resp.status_code in (400, 401):
+            # invalid_grant: the refresh token is expired or revoked
             self.logout()
             raise SessionExpired("Session expired. Please log in again.")
+        if resp.status_code != 200:
+            # A proxy or a restarting Keycloak; the session may well still be good, keep it
+            raise requests.HTTPError(f"Token refresh failed: HTTP {resp.status_code}", response=resp)
 
-        data = resp.json()
-        expires_in = int(data.get("expires_in", 3600))
+        data = json_codec.loads(resp.content)
+        try:
+            self._accept(data, previous_refresh=self._tokens.refresh_token)
+        except AuthError as exc:
+            self.logout()
+            raise SessionExpired(f"{exc} Please log in again.") from exc
+        if data.get("refresh_token"):
+            self._remember(data.get("refresh_expires_in", 0))   # rotated: the saved one is now spent
+        return self._tokens.access_token
 
-        refresh_early = min(60, max(0, expires_in//10))  # refresh at least 30s before expiry, but no more than 60s early
+    def _accept(self, data: dict, previous_refresh: str | None = None) -> dict:
+        """Take the tokens of a token-endpoint response; returns the access token's claims."""
+        access_token = data["access_token"]
+        claims = self._read_claims(access_token)
+
+        # Schedule from the token's own lifetime (exp - iat): independent of this machine's clock
+        life = jwt.lifetime(claims)
+        if life is None:
+            life = float(data.get("expires_in", 300))
+        refresh_early = min(60, max(0, life // 10))  # a tenth of the lifetime early, at most 60 s
         self._tokens = AuthTokens(
-            access_token=data["access_token"],
-            refresh_token=data.get("refresh_token", self._tokens.refresh_token),
-            expires_at=datetime.utcnow() + timedelta(seconds=expires_in - refresh_early),
+            access_token=access_token,
+            refresh_token=data.get("refresh_token", previous_refresh),
+            expires_at=_utcnow() + timedelta(seconds=life - refresh_early),
         )
-        return self._tokens.access_token
-
-    def _api_get(self, path: str) -> requests.Response:
-        url = f"{config.FASTAPI_BASE_URL}{config.FASTAPI_AUTH_PREFIX}{path}"
-        token = self.get_access_token()
-        resp = requests.get(url, headers={"Authorization": f"Bearer {token}"}, timeout=10)
+        self._claims = claims
+        return claims
 
-        if resp.status_code == 401 and self._tokens and self._tokens.refresh_token:
-            self._tokens.expires_at = datetime.utcnow() - timedelta(seconds=1)
-            token = self.get_access_token()
-            resp = requests.get(url, headers={"Authorization": f"Bearer {token}"}, timeout=10)
+    def _read_claims(self, token: str) -> dict:
+        claims = None
+        if self._verifier is not None:
+            try:
+                # Straight from the token endpoint: expiry is scheduled from the lifetime, not checked here
+                claims = self._verifier.verify(token, check_exp=False)
+            except JwksUnavailable as exc:
+                print(f"[Auth] cannot verify the token signature ({exc}); using its claims unverified")
+            except jwt.InvalidToken as exc:
+                raise AuthError(f"Rejected access token: {exc}") from exc
+        if claims is None:
+            try:
+                claims = jwt.unverified_claims(token)
+            except jwt.InvalidToken as exc:
+                raise AuthError(f"Unreadable access token: {exc}") from exc
+        if not claims.get("sub"):
+            raise AuthError("Access token has no subject.")
+        return claims
 
-        resp.raise_for_status()
-        return resp
+    def _remember(self, refresh_expires_in=None) -> None:
+        """Save the session; `refresh_expires_in` comes with a new refresh token (0: never expires)."""
+        if refresh_expires_in is not None:
+            seconds = int(refresh_expires_in)
+            self._refresh_expires_at = time.time() + seconds if seconds > 0 else None
+        if self._store is None or self._current_user is None or not self._tokens:
+            return
+        if self._tokens.refresh_token:
+            self._store.save(self._current_user, self._tokens.refresh_token, self._refresh_expires_at)
 
     def _raise_auth_error(self, resp: requests.Response) -> None:
         if resp.status_code < 400:
             return
         # Keycloak returns JSON like {"error":"invalid_grant","error_description":"..."}
         try:
-            data = resp.json()
+            data = json_codec.loads(resp.content)
             msg = data.get("error_description") or data.get("error") or resp.text
         except Exception:
             msg = resp.text
@@ -139,12 +264,20 @@ class AuthService:
                 }
                 if getattr(config, "KC_CLIENT_SECRET", None):
                     payload["client_secret"] = config.KC_CLIENT_SECRET
-                requests.post(url, data=payload, timeout=10)
+                try:
+                    self._http.request("POST", url, data=payload)
+                except requests.RequestException as exc:
+                    # The local session is gone either way; the server one expires by itself
+                    print(f"[Auth] logout request failed: {exc}")
         finally:
             self._tokens = None
+            self._claims = {}
+            self._current_user = None
+            if self._store is not None:
+                self._store.clear()
     
     def access_token_minutes_left(self) -> float:
         if not self._tokens:
             return 0.0
-        delta = self._tokens.expires_at - datetime.utcnow()
+        delta = self._tokens.expires_at - _utcnow()
         return max(0.0, delta.total_seconds() / 60.0)
\ No newline at end of file
@@ -0,0 +1,131 @@
+# services/backend_health.py
+"""
+Which backends are reachable, and the launcher's offline mode.
+
+The HTTP pipeline's circuit breaker (services/http_pipeline.py) is what
+notices a backend going down: consecutive failed sends to one host open
+it, and calls then fail fast instead of each waiting out its timeout.
+This service maps those per-host states to the named backends (FastAPI,
+Keycloak), tells the UI when the launcher goes offline or comes back,
+and while anything is down probes it in the background, so recovery is
+noticed without the user pressing Refresh.
+
+Probes go straight to requests, not through the pipeline: the breaker
+would refuse them, and they shouldn't show up as API traffic in metrics.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+from urllib.parse import urlsplit
+
+import requests
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from launcher import config
+from .http_pipeline import BREAKER_STATUSES, CircuitBreakerMiddleware
+
+PROBE_TIMEOUT = (3.0, 5.0)
+
+
+@dataclass(slots=True)
+class Backend:
+    name: str
+    probe_url: str          # any cheap GET; every HTTP answer except 502/503/504 means "up"
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.probe_url).netloc
+
+
+def default_backends() -> list[Backend]:
+    return [
+        Backend("api", f"{config.FASTAPI_BASE_URL}/"),
+        Backend("keycloak", f"{config.KC_BASE}/realms/{config.KC_REALM}"),
+    ]
+
+
+def http_probe(url: str) -> bool:
+    try:
+        resp = requests.get(url, timeout=PROBE_TIMEOUT)
+        resp.close()
+    except requests.RequestException:
+        return False
+    return resp.status_code not in BREAKER_STATUSES
+
+
+class BackendHealth(QObject):
+    backend_changed = pyqtSignal(str, bool)     # backend name, online
+    offline_changed = pyqtSignal(bool)          # True while any backend is down
+
+    # Breaker transitions and probe results arrive on worker threads; these hop to ours
+    _breaker_event = pyqtSignal(str, bool)      # host, is_open
+    _probed = pyqtSignal(str, bool)             # host, reachable
+
+    def __init__(self, breaker: CircuitBreakerMiddleware, backends: list[Backend] | None = None,
+                 probe_interval: float | None = None, probe: Callable[[str], bool] = http_probe, parent=None):
+        super().__init__(parent)
+        self.breaker = breaker
+        self.backends = backends if backends is not None else default_backends()
+        self._probe = probe
+        self._down: set[str] = set()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backend-probe")
+        self._probing: Future | None = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(1000 * (probe_interval if probe_interval is not None
+                                            else config.HTTP_PROBE_INTERVAL)))
+        self._timer.timeout.connect(self.probe_now)
+
+        self._breaker_event.connect(self._on_breaker)
+        self._probed.connect(self._on_probed)
+        breaker.add_listener(self._breaker_event.emit)
+
+    @property
+    def is_offline(self) -> bool:
+        return bool(self._down)
+
+    def down(self) -> list[str]:
+        return [b.name for b in self.backends if b.name in self._down]
+
+    def is_up(self, name: str) -> bool:
+        return name not in self._down
+
+    def probe_now(self) -> None:
+        """Probe every backend that is down (no-op while a probe is running or all are up)."""
+        if not self._down or (self._probing is not None and not self._probing.done()):
+            return
+        targets = [b for b in self.backends if b.name in self._down]
+        self._probing = self._pool.submit(self._probe_all, targets)
+
+    def _probe_all(self, targets: list[Backend]) -> None:
+        for backend in targets:
+            self._probed.emit(backend.host, self._probe(backend.probe_url))
+
+    def _on_probed(self, host: str, ok: bool) -> None:
+        if ok:
+            self.breaker.reset(host)        # its listener call brings us back online
+
+    def _on_breaker(self, host: str, is_open: bool) -> None:
+        was_offline = self.is_offline
+        for backend in self.backends:
+            if backend.host != host or (backend.name in self._down) == is_open:
+                continue
+            if is_open:
+                self._down.add(backend.name)
+            else:
+                self._down.discard(backend.name)
+            print(f"[Health] {backend.name} {'unreachable' if is_open else 'reachable'}")
+            self.backend_changed.emit(backend.name, not is_open)
+
+        if self.is_offline and not self._timer.isActive():
+            self._timer.start()
+        elif not self.is_offline:
+            self._timer.stop()
+        if self.is_offline != was_offline:
+            self.offline_changed.emit(self.is_offline)
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,243 @@
+# services/bulk_operations.py
+"""
+One action applied to many projects: delete, archive, change status,
+grant access.
+
+A server with POST /projects/batch gets the selection in chunks of
+BULK_BATCH_SIZE ids and answers with a status per id:
+
+    {"op": "update", "ids": [...], "changes": {"archived": true}}
+    -> {"results": [{"id": "...", "status": 200}, {"id": "...", "status": 403, "detail": "..."}]}
+
+A server without it (404/405/501 on the first batch) is remembered as
+such, and each project then gets its own call, at most BULK_CONCURRENCY
+in flight. Either way the UI hears about every project as it settles
+(item_changed) and about the operation once they all have (finished), so
+a partial failure names exactly the projects that failed, and they can be
+retried on their own.
+
+Repeating an action is harmless: a project already deleted or a grant
+that already exists counts as done, and each call carries an
+Idempotency-Key, so the pipeline's retries never apply anything twice.
+"""
+from __future__ import annotations
+
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Iterable
+
+import requests
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from launcher import config
+from launcher.util import json_codec
+from launcher.util.errors import SessionExpired, describe_error
+
+if TYPE_CHECKING:
+    from launcher.ui.app_context import AppContext
+
+ACTIONS = ("delete", "archive", "set_status", "grant_access")
+
+# Per-project answers meaning the project already is the way the action wants it
+_ALREADY_DONE = {"delete": frozenset({404}), "grant_access": frozenset({409})}
+
+# Answers to POST /projects/batch from a server that doesn't have it
+_NO_BATCH = frozenset({404, 405, 501})
+
+
+@dataclass(slots=True)
+class BulkItem:
+    id: str
+    title: str
+    state: str = "pending"          # pending | running | done | failed
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class BulkOperation:
+    id: str
+    action: str
+    params: dict
+    items: dict[str, BulkItem] = field(default_factory=dict)   # project id -> item, in selection order
+
+    @property
+    def done(self) -> list[BulkItem]:
+        return [i for i in self.items.values() if i.state == "done"]
+
+    @property
+    def failed(self) -> list[BulkItem]:
+        return [i for i in self.items.values() if i.state == "failed"]
+
+    @property
+    def settled(self) -> int:
+        return sum(1 for i in self.items.values() if i.state in ("done", "failed"))
+
+    @property
+    def finished(self) -> bool:
+        return self.settled == len(self.items)
+
+
+class BulkOperations(QObject):
+    item_changed = pyqtSignal(str, object)      # (operation id, BulkItem snapshot)
+    finished = pyqtSignal(object)               # BulkOperation snapshot, once every item is done or failed
+
+    def __init__(self, ctx: AppContext, batch_size: int | None = None, concurrency: int | None = None,
+                 parent=None):
+        super().__init__(parent)
+        self._ctx = ctx
+        self.batch_size = batch_size or config.BULK_BATCH_SIZE
+        # Shared by every operation, so two bulk actions at once still keep to the bound
+        self._pool = ThreadPoolExecutor(max_workers=concurrency or config.BULK_CONCURRENCY,
+                                        thread_name_prefix="bulk")
+        self._lock = threading.Lock()
+        self._operations: dict[str, BulkOperation] = {}
+        self.batch_supported: bool | None = None    # None until the server has been asked
+
+    def start(self, action: str, projects: Iterable[tuple[str, str]], **params) -> BulkOperation:
+        """
+        Apply `action` to (project id, title) pairs in the background and
+        return the operation at once. set_status needs `status`;
+        grant_access needs `user_kc_id` and takes an optional `role`.
+        """
+        if action not in ACTIONS:
+            raise ValueError(f"unknown bulk action {action!r}")
+        if action == "set_status" and not params.get("status"):
+            raise ValueError("set_status needs a status")
+        if action == "grant_access":
+            if not params.get("user_kc_id"):
+                raise ValueError("grant_access needs a user_kc_id")
+            params.setdefault("role", "viewer")
+        op = BulkOperation(str(uuid.uuid4()), action, params,
+                           {str(pid): BulkItem(str(pid), title) for pid, title in projects})
+        if not op.items:
+            raise ValueError("no projects to act on")
+
+        with self._lock:
+            self._operations[op.id] = op
+            snapshot = _snapshot(op)
+        ids = list(op.items)
+        if self.batch_supported is False:
+            self._fan_out(op, ids)
+        else:
+            for chunk, first in enumerate(range(0, len(ids), self.batch_size)):
+                self._pool.submit(self._run_batch, op, ids[first:first + self.batch_size], chunk)
+        print(f"[Bulk] {action} on {len(ids)} project(s)")
+        return snapshot
+
+    def get(self, op_id: str) -> BulkOperation | None:
+        with self._lock:
+            op = self._operations.get(op_id)
+            return _snapshot(op) if op else None
+
+    def pending(self) -> int:
+        """Projects still waiting or in flight, over all operations."""
+        with self._lock:
+            return sum(len(op.items) - op.settled for op in self._operations.values())
+
+    def stop(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------ batched
+
+    def _run_batch(self, op: BulkOperation, ids: list[str], chunk: int) -> None:
+        if self.batch_supported is False:       # an earlier chunk found out
+            self._fan_out(op, ids)
+            return
+        for pid in ids:
+            self._set(op, pid, "running")
+        body = {"op": "update", "ids": ids, "changes": _changes(op)} if op.action in ("archive", "set_status") \
+            else {"op": op.action, "ids": ids, **op.params}
+        try:
+            resp = self._ctx.api_client.request(
+                "POST", "/projects/batch", json=body,
+                headers={"Idempotency-Key": f"{op.id}:{chunk}"}, idempotent=True,
+            )
+            results = json_codec.loads(resp.content).get("results", [])
+        except requests.HTTPError as exc:
+            status = exc.response.status_code if exc.response is not None else None
+            if status in _NO_BATCH and self.batch_supported is not True:
+                if self.batch_supported is None:
+                    print(f"[Bulk] no batch endpoint (HTTP {status}); one call per project from now on")
+                self.batch_supported = False
+                self._fan_out(op, ids)
+                return
+            for pid in ids:
+                self._set(op, pid, "failed", describe_error(exc))
+            return
+        except (SessionExpired, requests.RequestException, ValueError, AttributeError) as exc:
+            for pid in ids:
+                self._set(op, pid, "failed", describe_error(exc))
+            return
+
+        self.batch_supported = True
+        by_id = {str(r.get("id")): r for r in results if isinstance(r, dict)}
+        for pid in ids:
+            answer = by_id.get(pid)
+            if answer is None:
+                self._set(op, pid, "failed", "no answer for this project")
+                continue
+            status = int(answer.get("status", 200))
+            if status < 300 or status in _ALREADY_DONE.get(op.action, ()):
+                self._set(op, pid, "done")
+            else:
+                detail = answer.get("detail")
+                self._set(op, pid, "failed", f"HTTP {status}" + (f": {detail}" if detail else ""))
+
+    # ------------------------------------------------------------------ one call per project
+
+    def _fan_out(self, op: BulkOperation, ids: list[str]) -> None:
+        for pid in ids:
+            self._pool.submit(self._run_one, op, pid)
+
+    def _run_one(self, op: BulkOperation, pid: str) -> None:
+        self._set(op, pid, "running")
+        headers = {"Idempotency-Key": f"{op.id}:{pid}"}
+        try:
+            if op.action == "delete":
+                self._ctx.api_client.request("DELETE", f"/projects/{pid}", headers=headers)
+            elif op.action == "grant_access":
+                self._ctx.api_client.request(
+                    "POST", "/projects/access", json={"project_id": pid, **op.params},
+                    headers=headers, idempotent=True,
+                )
+            else:
+                # Setting fields is safe to repeat, so PATCH is retried like PUT
+                self._ctx.api_client.request(
+                    "PATCH", f"/projects/{pid}", json=_changes(op), headers=headers, idempotent=True,
+                )
+        except requests.HTTPError as exc:
+            status = exc.response.status_code if exc.response is not None else None
+            if status in _ALREADY_DONE.get(op.action, ()):
+                self._set(op, pid, "done")
+            else:
+                self._set(op, pid, "failed", describe_error(exc))
+        except (SessionExpired, requests.RequestException) as exc:
+            self._set(op, pid, "failed", describe_error(exc))
+        else:
+            self._set(op, pid, "done")
+
+    # ------------------------------------------------------------------ progress
+
+    def _set(self, op: BulkOperation, pid: str, state: str, error: str | None = None) -> None:
+        # Emitted under the lock, so the UI sees every item_changed of an operation before its finished
+        with self._lock:
+            item = op.items[pid]
+            item.state, item.error = state, error
+            self.item_changed.emit(op.id, replace(item))
+            if state == "running" or not op.finished or self._operations.pop(op.id, None) is None:
+                return
+            self.finished.emit(_snapshot(op))
+        failed = len(op.failed)
+        print(f"[Bulk] {op.action}: {len(op.items) - failed} done" + (f", {failed} failed" if failed else ""))
+
+
+def _changes(op: BulkOperation) -> dict:
+    if op.action == "archive":
+        return {"archived": True}
+    return {"status": op.params["status"]}
+
+
+def _snapshot(op: BulkOperation) -> BulkOperation:
+    return replace(op, params=dict(op.params), items={k: replace(v) for k, v in op.items.items()})
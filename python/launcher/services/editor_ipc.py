@@ -0,0 +1,156 @@
+# services/editor_ipc.py
+"""
+Local control channel to running editors, so a second sequence of the same
+project can be handed to the editor that already has it open instead of
+cold-starting another one.
+
+Discovery
+    The launcher starts every editor with
+        MVL_IPC_DIR     directory of registry files (CACHE_DIR/editors)
+        MVL_IPC_TOKEN   random per-launch secret
+    Once the editor (the MVL editor plugin, or test/fake_editor.py) is ready
+    for commands it listens on 127.0.0.1, an ephemeral port, and writes
+    <MVL_IPC_DIR>/<pid>.json atomically:
+        {"protocol": 1, "pid": 1234, "port": 50123, "token": "...",
+         "uproject": "C:/.../EW_EP1.uproject", "scope": "sq01"}
+    and removes it on exit. Entries whose editor has gone are pruned when
+    a connection to them is refused.
+
+Protocol
+    One JSON object per line, each way, over TCP. Every request carries the
+    token; the editor answers each request with one line:
+        -> {"id": 1, "token": "...", "cmd": "hello"}
+        <- {"id": 1, "ok": true, "pid": 1234, "uproject": "...", "scope": "sq01"}
+        -> {"id": 2, "token": "...", "cmd": "switch_scope", "env": {"MVL_SCOPE": "sq02", ...}}
+        <- {"id": 2, "ok": true, "scope": "sq02"}
+        <- {"id": 2, "ok": false, "error": "..."}
+    switch_scope is acknowledged as soon as the editor has accepted it; the
+    level/asset loading it triggers happens afterwards on the editor side.
+"""
+from __future__ import annotations
+
+import os
+import socket
+from dataclasses import dataclass
+from pathlib import Path
+
+from launcher.util import json_codec
+
+PROTOCOL = 1
+CONNECT_TIMEOUT = 0.5
+REQUEST_TIMEOUT = 3.0
+
+
+class EditorIpcError(RuntimeError):
+    pass
+
+
+class EditorUnreachable(EditorIpcError):
+    """Nothing is listening any more: the registry entry is stale."""
+
+
+@dataclass(slots=True)
+class EditorEndpoint:
+    pid: int
+    port: int
+    token: str
+    uproject: str
+    scope: str = ""
+    path: Path | None = None        # registry file it was read from
+
+    def same_project(self, uproject: str) -> bool:
+        return same_file(self.uproject, uproject)
+
+
+def same_file(a: str, b: str) -> bool:
+    return os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+
+class EditorRegistry:
+    """The registry files running editors leave in one directory."""
+
+    def __init__(self, directory: str | os.PathLike):
+        self.dir = Path(directory)
+
+    def get(self, pid: int) -> EditorEndpoint | None:
+        return self._read(self.dir / f"{pid}.json")
+
+    def endpoints(self) -> list[EditorEndpoint]:
+        if not self.dir.is_dir():
+            return []
+        found = []
+        for path in self.dir.glob("*.json"):
+            ep = self._read(path)
+            if ep is not None:
+                found.append(ep)
+        return found
+
+    def find(self, uproject: str) -> list[EditorEndpoint]:
+        return [ep for ep in self.endpoints() if ep.same_project(uproject)]
+
+    def forget(self, ep: EditorEndpoint) -> None:
+        if ep.path is not None:
+            try:
+                ep.path.unlink()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _read(path: Path) -> EditorEndpoint | None:
+        try:
+            data = json_codec.loads(path.read_bytes())
+            if data.get("protocol") != PROTOCOL:
+                return None
+            return EditorEndpoint(
+                pid=int(data["pid"]), port=int(data["port"]), token=str(data["token"]),
+                uproject=str(data.get("uproject", "")), scope=str(data.get("scope", "")), path=path,
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+
+class EditorIpcClient:
+    """Short-lived connection to one editor; a request is a round trip of one line each way."""
+
+    def __init__(self, endpoint: EditorEndpoint, timeout: float = REQUEST_TIMEOUT):
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self._next_id = 0
+
+    def request(self, cmd: str, **params) -> dict:
+        self._next_id += 1
+        msg = {"id": self._next_id, "token": self.endpoint.token, "cmd": cmd, **params}
+        try:
+            with socket.create_connection(("127.0.0.1", self.endpoint.port), timeout=CONNECT_TIMEOUT) as sock:
+                sock.settimeout(self.timeout)
+                sock.sendall(json_codec.dumps(msg) + b"\n")
+                reply = self._read_line(sock)
+        except ConnectionRefusedError as exc:
+            raise EditorUnreachable(f"editor pid={self.endpoint.pid} is not listening") from exc
+        except OSError as exc:
+            raise EditorIpcError(f"editor pid={self.endpoint.pid} did not answer: {exc}") from exc
+        try:
+            data = json_codec.loads(reply)
+        except ValueError as exc:
+            raise EditorIpcError(f"bad reply from editor pid={self.endpoint.pid}: {reply[:200]!r}") from exc
+        if not data.get("ok"):
+            raise EditorIpcError(data.get("error") or f"{cmd} refused by editor pid={self.endpoint.pid}")
+        return data
+
+    def hello(self) -> dict:
+        return self.request("hello")
+
+    def switch_scope(self, env: dict[str, str]) -> dict:
+        return self.request("switch_scope", env={k: str(v) for k, v in env.items()})
+
+    @staticmethod
+    def _read_line(sock: socket.socket) -> bytes:
+        buf = bytearray()
+        while True:
+            chunk = sock.recv(4096)
+            if not chunk:
+                raise OSError("connection closed before a reply")
+            buf += chunk
+            nl = buf.find(b"\n")
+            if nl >= 0:
+                return bytes(buf[:nl])
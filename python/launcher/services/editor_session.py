@@ -0,0 +1,233 @@
+# services/editor_session.py
+"""
+One running Unreal editor: its QProcess, output, status and resource usage.
+
+Output handling: reads are appended as raw bytes and decoded, split
+and emitted once per batch (every FLUSH_INTERVAL_MS or once FLUSH_BYTES
+are pending), into a bounded ring buffer and an optional compressed
+archive (services/log_archive.py).
+"""
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QProcess, QProcessEnvironment, QTimer, pyqtSignal
+
+from launcher.util.log_buffer import LineSplitter, LogBuffer
+from launcher.util.proc_stats import sample_process
+from .log_archive import LogArchiveWriter
+
+FLUSH_INTERVAL_MS = 100
+FLUSH_BYTES = 64 * 1024
+LOG_BUFFER_LINES = 20000
+
+QUEUED = "queued"        # waiting for admission (see services/admission.py)
+STARTING = "starting"
+RUNNING = "running"
+EXITED = "exited"
+FAILED = "failed"
+CANCELLED = "cancelled"  # dropped from the queue before it started
+
+
+class EditorSession(QObject):
+    started = pyqtSignal()
+    finished = pyqtSignal(int)
+    output = pyqtSignal(str)   # batch of complete stdout lines, "\n"-joined
+    error = pyqtSignal(str)    # batch of complete stderr lines, "\n"-joined
+    failed = pyqtSignal(str)   # the process could not be started or crashed
+    status_changed = pyqtSignal(str)
+
+    def __init__(self, key: str, editor_exe: str, uproject: str, args: list[str],
+                 env: dict[str, str] | None = None, parent=None):
+        super().__init__(parent)
+        self.key = key
+        self.editor_exe = editor_exe
+        self.uproject = uproject
+        self.args = list(args)
+        self.env = env
+
+        self.status = STARTING
+        self.queued_reason = ""
+        self.ipc_token = ""                       # MVL_IPC_TOKEN this editor was started with
+        self.pending_scope: dict[str, str] | None = None   # switch_scope to send once it registers
+        self.exit_code: int | None = None
+        self.started_at: float | None = None      # time.time()
+        self.ended_at: float | None = None
+        self.rss = 0                              # bytes, from the last sample
+        self.cpu_percent = 0.0                    # over the last sampling interval
+        self.cpu_seconds = 0.0                    # cumulative, from the last sample
+        self._last_cpu: tuple[float, float] | None = None   # (monotonic, cpu seconds)
+        self._stopping = False                    # terminate()/kill() asked for: not a crash
+
+        self.log_buffer = LogBuffer(LOG_BUFFER_LINES)
+        self.archive: LogArchiveWriter | None = None     # set by TheaterService before start()
+        self.watch = None                                 # SessionWatch, set by TheaterService before start()
+
+        self._pending = {"out": bytearray(), "err": bytearray()}
+        self._splitters = {"out": LineSplitter(), "err": LineSplitter()}
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush)
+
+        self.proc = QProcess(self)
+        self.proc.started.connect(self._on_started)
+        self.proc.finished.connect(self._on_finished)
+        self.proc.errorOccurred.connect(self._on_proc_error)
+        self.proc.readyReadStandardError.connect(self._on_err)
+        self.proc.readyReadStandardOutput.connect(self._on_out)
+
+    def __repr__(self) -> str:
+        return f"<EditorSession {self.key} {self.status} pid={self.pid}>"
+
+    @property
+    def pid(self) -> int | None:
+        pid = self.proc.processId()
+        return pid or None
+
+    def is_alive(self) -> bool:
+        return self.status in (STARTING, RUNNING)
+
+    def is_queued(self) -> bool:
+        return self.status == QUEUED
+
+    @property
+    def stop_requested(self) -> bool:
+        """terminate()/kill() was called: the exit is ours, not a crash."""
+        return self._stopping
+
+    # ------------------------------------------------------------------ control
+
+    def queue(self, reason: str) -> None:
+        self.queued_reason = reason
+        self._set_status(QUEUED)
+
+    def cancel(self) -> None:
+        """Drop a queued session; it will never start."""
+        if self.status == QUEUED:
+            self.ended_at = time.time()
+            self._set_status(CANCELLED)
+
+    def start(self) -> None:
+        self._set_status(STARTING)
+        # Working directory helps on Windows
+        self.proc.setWorkingDirectory(os.path.dirname(self.uproject))
+
+        if self.env:
+            pe = QProcessEnvironment.systemEnvironment()
+            for k, v in self.env.items():
+                pe.insert(k, str(v))
+            self.proc.setProcessEnvironment(pe)
+
+        # Ensure we see logs if -log is used
+        self.proc.setProcessChannelMode(QProcess.ProcessChannelMode.SeparateChannels)
+
+        self.proc.start(self.editor_exe, [self.uproject, *self.args])
+
+    def terminate(self) -> None:
+        if self.is_alive():
+            self._stopping = True
+            self.proc.terminate()
+
+    def kill(self) -> None:
+        if self.is_alive():
+            self._stopping = True
+            self.proc.kill()
+
+    def sample(self) -> None:
+        """Refresh rss / cpu_percent from the OS."""
+        pid = self.pid
+        if self.status != RUNNING or pid is None:
+            return
+        if self.archive is not None:
+            self.archive.seal_if_stale()   # keep a quiet session's tail readable in the viewer
+        s = sample_process(pid)
+        if s is None:
+            return
+        now = time.monotonic()
+        self.rss = s.rss
+        self.cpu_seconds = s.cpu_seconds
+        if self._last_cpu is not None:
+            dt = now - self._last_cpu[0]
+            if dt > 0:
+                self.cpu_percent = max(0.0, (s.cpu_seconds - self._last_cpu[1]) * 100.0 / dt)
+        self._last_cpu = (now, s.cpu_seconds)
+
+    def _set_status(self, status: str) -> None:
+        if status != self.status:
+            self.status = status
+            self.status_changed.emit(status)
+
+    # ------------------------------------------------------------------ process events
+
+    def _on_started(self):
+        self.started_at = time.time()
+        self._set_status(RUNNING)
+        print(f"[Theater] {self.key} started pid={self.pid}")
+        self.started.emit()
+
+    def _on_finished(self, code, status):
+        self._on_out()
+        self._on_err()
+        self._flush()
+        for stream, signal in (("out", self.output), ("err", self.error)):
+            rest = self._splitters[stream].flush()
+            if rest:
+                self._store(rest)
+                signal.emit(rest)
+        if self.archive is not None:
+            self.archive.close(code)
+
+        self.exit_code = code
+        self.ended_at = time.time()
+        crashed = status == QProcess.ExitStatus.CrashExit and not self._stopping
+        self._set_status(FAILED if crashed else EXITED)
+        print(f"[Theater] {self.key} finished code={code} status={status}")
+        self.finished.emit(code)
+
+    def _on_proc_error(self, err):
+        if err == QProcess.ProcessError.FailedToStart:
+            self.ended_at = time.time()
+            if self.archive is not None:
+                self.archive.close()
+            self._set_status(FAILED)
+            self.failed.emit(f"Failed to start process: {self.proc.errorString()}")
+        elif err == QProcess.ProcessError.Crashed and not self._stopping:
+            self.failed.emit(f"Editor crashed: {self.proc.errorString()}")
+
+    # ------------------------------------------------------------------ output
+
+    def _on_out(self):
+        self._collect("out", bytes(self.proc.readAllStandardOutput()))
+
+    def _on_err(self):
+        self._collect("err", bytes(self.proc.readAllStandardError()))
+
+    def _collect(self, stream: str, data: bytes):
+        # No decoding or signal per read: a chatty editor produces thousands of these a second
+        pending = self._pending[stream]
+        pending += data
+        if len(self._pending["out"]) + len(self._pending["err"]) >= FLUSH_BYTES:
+            self._flush()
+        elif not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush(self):
+        self._flush_timer.stop()
+        for stream, signal in (("out", self.output), ("err", self.error)):
+            pending = self._pending[stream]
+            if not pending:
+                continue
+            data = bytes(pending)
+            pending.clear()
+            text = self._splitters[stream].feed(data)
+            if text:
+                self._store(text)
+                signal.emit(text)
+
+    def _store(self, text: str):
+        self.log_buffer.extend_text(text)
+        if self.archive is not None:
+            self.archive.write(text)
@@ -1,34 +1,31 @@
+# services/http_client.py
 import requests
 
-from launcher.services.auth_service import SessionExpired
 from launcher import config
+from launcher.services.http_pipeline import HttpPipeline, endpoint_name
+
 
 class HttpClient:
-    def __init__(self, base_url: str | None = None):
+    """
+    Backend API calls relative to FASTAPI_BASE_URL, sent through an
+    HttpPipeline (timeouts, retry, circuit breaker, metrics). Pass `auth`
+    to send the user's bearer token; a 401 then refreshes it once and
+    replays, and a second 401 ends the session with SessionExpired.
+    """
+
+    def __init__(self, base_url: str | None = None, pipeline: HttpPipeline | None = None):
         self.base_url = (base_url or config.FASTAPI_BASE_URL).rstrip("/")
+        self.pipeline = pipeline or HttpPipeline.default()
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method: str, path: str, auth=None, **kwargs) -> requests.Response:
+        return self.pipeline.request(method, self.url(path), endpoint=endpoint_name(method, path),
+                                     auth=auth, **kwargs)
+
+    def get(self, path: str, auth=None, **kwargs) -> requests.Response:
+        return self.request("GET", path, auth=auth, **kwargs)
 
-    def get(self, path: str, headers=None, timeout=10, **kwargs):
-        url = f"{self.base_url}/{path.lstrip('/')}"
-        return requests.get(url, headers=headers, timeout=timeout, **kwargs)
-
-    def request(self, method: str, path: str, headers=None, timeout=10, **kwargs):
-        url = f"{self.base_url}/{path.lstrip('/')}"
-        return requests.request(method, url, headers=headers, timeout=timeout, **kwargs)
-
-    def get_with_auth_retry(self, auth, path: str, **kwargs):
-        # First try
-        resp = self.get(path, headers=auth.auth_headers(), **kwargs)
-        if resp.status_code != 401:
-            return resp
-
-        # Refresh + retry once
-        try:
-            auth.get_access_token()  # refresh if needed
-        except SessionExpired:
-            raise
-
-        resp2 = self.get(path, headers=auth.auth_headers(), **kwargs)
-        if resp2.status_code == 401:
-            auth.logout()
-            raise SessionExpired("Session expired. Please log in again.")
-        return resp2
+    def post(self, path: str, auth=None, **kwargs) -> requests.Response:
+        return self.request("POST", path, auth=auth, **kwargs)
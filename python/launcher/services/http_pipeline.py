@@ -0,0 +1,443 @@
+# services/http_pipeline.py
+"""
+One request path for every HTTP call the launcher makes.
+
+A request passes through a chain of middleware, outermost first:
+
+    MetricsMiddleware          latency / size / status per endpoint (util/metrics.py)
+    TimeoutMiddleware          (connect, read) timeout per endpoint
+    CompressionMiddleware      Accept-Encoding; large JSON bodies sent compressed
+    RetryMiddleware            jittered backoff on idempotent calls
+    CircuitBreakerMiddleware   stop calling a host that keeps failing (every attempt counts)
+    AuthMiddleware             bearer token; on 401 refresh once and replay
+    transport                  requests, one pooled Session per thread (or a recording of it,
+                               services/http_recording.py)
+
+Each middleware is a callable ``(request, call_next) -> Response``, so a
+chain can be assembled differently for tests or special clients.
+
+Endpoints are named ``"<METHOD> <path>"`` with id-like path segments
+replaced by ``{id}`` ("GET projects/{id}/sequences"), which keeps metrics
+and per-endpoint settings independent of which project was clicked.
+"""
+from __future__ import annotations
+
+import gzip
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+import requests
+from urllib3.util.request import ACCEPT_ENCODING
+
+from launcher import config
+from launcher.util import json_codec
+from launcher.util.errors import SessionExpired
+from launcher.util.metrics import REGISTRY, SIZE_BUCKETS, MetricsRegistry
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+BREAKER_STATUSES = frozenset({502, 503, 504})
+
+# (connect, read) seconds; the first matching "<METHOD> <path prefix>" wins
+ENDPOINT_TIMEOUTS: dict[str, tuple[float, float]] = {
+    "POST script/parse": (5.0, 120.0),
+}
+
+# Accept-Encoding per endpoint prefix, overriding the negotiated default. The event
+# stream stays uncompressed: a compressing proxy would hold events back to fill its blocks
+ENDPOINT_ACCEPT_ENCODING: dict[str, str] = {
+    "GET events": "identity",
+}
+
+_ID_SEGMENT = re.compile(r"^(?:\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$")
+
+
+class CircuitOpen(requests.ConnectionError):
+    """The host failed repeatedly; calls are refused locally until the cool-down ends."""
+
+
+def endpoint_name(method: str, path: str) -> str:
+    path = urlsplit(path).path if "://" in path else path.split("?", 1)[0]
+    segments = ["{id}" if _ID_SEGMENT.match(s) else s for s in path.strip("/").split("/")]
+    return f"{method.upper()} {'/'.join(segments)}"
+
+
+@dataclass(slots=True)
+class HttpRequest:
+    method: str
+    url: str
+    endpoint: str
+    headers: dict[str, str] = field(default_factory=dict)
+    options: dict[str, Any] = field(default_factory=dict)   # params / json / data / files / stream
+    timeout: float | tuple[float, float] | None = None
+    idempotent: bool = False
+    auth: Any = None                 # AuthService-like: get_access_token(), optional refresh_after_rejection()
+    attempts: int = 0                # sends so far, retries and auth replays included
+    resent: int = 0                  # retries after a send whose outcome is unknown (it may have landed)
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.url).netloc
+
+    @property
+    def replayable(self) -> bool:
+        # An open file in `files` / `data` is consumed by the first send
+        return "files" not in self.options and not hasattr(self.options.get("data"), "read")
+
+
+Handler = Callable[[HttpRequest], requests.Response]
+Middleware = Callable[[HttpRequest, Handler], requests.Response]
+
+
+# ---------------------------------------------------------------------- transport
+
+class SessionTransport:
+    """requests with keep-alive: one Session (connection pool) per thread."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def __call__(self, request: HttpRequest) -> requests.Response:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        request.attempts += 1
+        return session.request(request.method, request.url, headers=request.headers,
+                               timeout=request.timeout, **request.options)
+
+
+# ---------------------------------------------------------------------- middleware
+
+class AuthMiddleware:
+    def __call__(self, request: HttpRequest, call_next: Handler) -> requests.Response:
+        auth = request.auth
+        if auth is None:
+            return call_next(request)
+        token = auth.get_access_token()
+        request.headers["Authorization"] = f"Bearer {token}"
+        resp = call_next(request)
+
+        refresh = getattr(auth, "refresh_after_rejection", None)
+        if resp.status_code != 401 or refresh is None or not request.replayable:
+            return resp
+        # The server refused a token we thought valid (revoked, clock skew): refresh once and replay
+        resp.close()
+        request.headers["Authorization"] = f"Bearer {refresh(token)}"
+        resp = call_next(request)
+        if resp.status_code == 401:
+            resp.close()
+            auth.logout()
+            raise SessionExpired("Session expired. Please log in again.")
+        return resp
+
+
+class RetryMiddleware:
+    def __init__(self, attempts: int = 3, base_delay: float = 0.25, max_delay: float = 4.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+
+    def __call__(self, request: HttpRequest, call_next: Handler) -> requests.Response:
+        retry = request.idempotent and request.replayable
+        for attempt in range(1, self.attempts + 1):
+            last = attempt == self.attempts or not retry
+            try:
+                resp = call_next(request)
+            except CircuitOpen:
+                raise                       # known down: waiting out a backoff won't change that
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if last:
+                    raise
+                print(f"[Http] {request.endpoint}: {exc.__class__.__name__}, retry {attempt}")
+                request.resent += 1
+                self.sleep(self._delay(attempt, None))
+                continue
+            if resp.status_code not in RETRY_STATUSES or last:
+                return resp
+            print(f"[Http] {request.endpoint}: HTTP {resp.status_code}, retry {attempt}")
+            request.resent += 1
+            delay = self._delay(attempt, resp.headers.get("Retry-After"))
+            resp.close()
+            self.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def _delay(self, attempt: int, retry_after: str | None) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_delay)
+        # Full jitter: spread a fleet of launchers out instead of retrying in lockstep
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreakerMiddleware:
+    """
+    Per host: after `threshold` consecutive failed sends (connection errors,
+    timeouts, 502/503/504) calls fail fast with CircuitOpen for `cooldown`
+    seconds, then a single trial call decides whether to close again.
+
+    Listeners are called with (host, is_open) on every transition, from
+    whichever thread caused it.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._failures: Counter[str] = Counter()
+        self._open_until: dict[str, float] = {}
+        self._trial: set[str] = set()
+        self._listeners: list[Callable[[str, bool], None]] = []
+
+    def add_listener(self, fn: Callable[[str, bool], None]) -> None:
+        self._listeners.append(fn)
+
+    def state(self, host: str) -> str:
+        with self._lock:
+            until = self._open_until.get(host)
+            if until is None:
+                return "closed"
+            return "open" if self.clock() < until else "half-open"
+
+    def open_hosts(self) -> list[str]:
+        with self._lock:
+            return list(self._open_until)
+
+    def reset(self, host: str) -> None:
+        """Close the breaker for `host`, e.g. after a health probe got through."""
+        self._record(host, ok=True)
+
+    def __call__(self, request: HttpRequest, call_next: Handler) -> requests.Response:
+        host = request.host
+        with self._lock:
+            until = self._open_until.get(host)
+            if until is not None:
+                wait = until - self.clock()
+                if wait > 0 or host in self._trial:
+                    raise CircuitOpen(f"{host} is unavailable; not retrying for {max(wait, 0):.0f} s")
+                self._trial.add(host)
+        try:
+            resp = call_next(request)
+        except (requests.ConnectionError, requests.Timeout):
+            self._record(host, ok=False)
+            raise
+        self._record(host, ok=resp.status_code not in BREAKER_STATUSES)
+        return resp
+
+    def _record(self, host: str, ok: bool) -> None:
+        changed = None
+        with self._lock:
+            self._trial.discard(host)
+            if ok:
+                self._failures.pop(host, None)
+                if self._open_until.pop(host, None) is not None:
+                    print(f"[Http] {host} is reachable again")
+                    changed = False
+            else:
+                self._failures[host] += 1
+                was_open = host in self._open_until
+                if self._failures[host] >= self.threshold or was_open:
+                    self._open_until[host] = self.clock() + self.cooldown
+                    if not was_open:
+                        print(f"[Http] {host} failing; pausing calls for {self.cooldown:.0f} s")
+                        changed = True
+        if changed is not None:
+            for fn in list(self._listeners):
+                fn(host, changed)
+
+
+class TimeoutMiddleware:
+    def __init__(self, default: tuple[float, float], overrides: dict[str, tuple[float, float]] | None = None):
+        self.default = default
+        self.overrides = ENDPOINT_TIMEOUTS if overrides is None else overrides
+
+    def __call__(self, request: HttpRequest, call_next: Handler) -> requests.Response:
+        if request.timeout is None:
+            request.timeout = next(
+                (t for prefix, t in self.overrides.items() if request.endpoint.startswith(prefix)), self.default
+            )
+        return call_next(request)
+
+
+def _request_encoders() -> dict[str, Callable[[bytes], bytes]]:
+    encoders = {"gzip": lambda data: gzip.compress(data, compresslevel=6)}
+    try:
+        import zstandard
+        encoders["zstd"] = lambda data: zstandard.ZstdCompressor(level=3).compress(data)
+    except ImportError:  # optional dependency
+        pass
+    try:
+        import brotli
+        encoders["br"] = lambda data: brotli.compress(data, quality=5)
+    except ImportError:  # optional dependency
+        pass
+    return encoders
+
+
+REQUEST_ENCODERS = _request_encoders()
+
+# What urllib3 can decode here (br / zstd only with their modules installed), best first
+RESPONSE_ENCODINGS = tuple(e for e in ("zstd", "br", "gzip") if e in ACCEPT_ENCODING.split(","))
+
+# A server that can't read an encoded body answers one of these; the plain resend decides
+_REFUSED_BODY_STATUSES = frozenset({400, 415, 422})
+
+
+class CompressionMiddleware:
+    """
+    Content encoding in both directions, invisible to callers.
+
+    Responses: Accept-Encoding lists what urllib3 can decode, and requests
+    hands back decoded content as usual. Requests: JSON bodies of at least
+    `min_size` bytes to endpoints matching a `compress_endpoints` prefix are
+    sent with Content-Encoding. Servers don't have to
+    support that, so a refused encoded body is resent plain once, and when
+    the plain body gets a different answer the endpoint gets plain bodies
+    from then on.
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, accept: tuple[str, ...] = RESPONSE_ENCODINGS,
+                 compress_endpoints: tuple[str, ...] = (), encoding: str = "gzip", min_size: int = 4096,
+                 overrides: dict[str, str] | None = None):
+        if encoding not in REQUEST_ENCODERS:
+            print(f"[Http] request encoding {encoding!r} unavailable here; using gzip")
+            encoding = "gzip"
+        self.accept = ", ".join(accept) or "identity"
+        self.compress_endpoints = tuple(compress_endpoints)
+        self.encoding = encoding
+        self.min_size = min_size
+        self.overrides = ENDPOINT_ACCEPT_ENCODING if overrides is None else overrides
+        self._plain_only: set[str] = set()
+        self.wire = registry.counter("http_wire_bytes_total", "HTTP body bytes on the wire, after compression",
+                                     ("endpoint", "direction"))
+
+    def __call__(self, request: HttpRequest, call_next: Handler) -> requests.Response:
+        request.headers.setdefault("Accept-Encoding", next(
+            (v for prefix, v in self.overrides.items() if request.endpoint.startswith(prefix)), self.accept
+        ))
+        plain = None
+        body = request.options.get("data")
+        if isinstance(body, bytes):
+            if len(body) >= self.min_size and request.headers.get("Content-Type") == "application/json" \
+                    and request.endpoint.startswith(self.compress_endpoints) \
+                    and request.endpoint not in self._plain_only:
+                plain = body
+                request.options["data"] = REQUEST_ENCODERS[self.encoding](plain)
+                request.headers["Content-Encoding"] = self.encoding
+            self.wire.labels(request.endpoint, "sent").inc(len(request.options["data"]))
+
+        resp = call_next(request)
+        if plain is not None and resp.status_code in _REFUSED_BODY_STATUSES:
+            refused = resp.status_code
+            resp.close()
+            del request.headers["Content-Encoding"]
+            request.options["data"] = plain
+            self.wire.labels(request.endpoint, "sent").inc(len(plain))
+            resp = call_next(request)
+            if resp.status_code != refused:
+                print(f"[Http] {request.endpoint} refused a {self.encoding} body (HTTP {refused}); "
+                      f"sending it uncompressed from now on")
+                self._plain_only.add(request.endpoint)
+
+        raw = resp.raw
+        if not request.options.get("stream") and hasattr(raw, "tell"):
+            self.wire.labels(request.endpoint, "received").inc(raw.tell())   # bytes read off the socket
+        return resp
+
+
+class MetricsMiddleware:
+    """Latency (retries included), response size, final status and retries per endpoint."""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY):
+        self.latency = registry.histogram("http_request_seconds", "HTTP call latency, retries included",
+                                          ("endpoint",))
+        self.size = registry.histogram("http_response_bytes", "HTTP response body size", ("endpoint",),
+                                       SIZE_BUCKETS)
+        self.calls = registry.counter("http_requests_total",
+                                      "HTTP calls by final status (exception name when there was no response)",
+                                      ("endpoint", "status"))
+        self.retries = registry.counter("http_retries_total", "Extra sends: retries and auth replays",
+                                        ("endpoint",))
+        self.in_flight = registry.gauge("http_requests_in_flight", "HTTP calls waiting for a response").labels()
+
+    def __call__(self, request: HttpRequest, call_next: Handler) -> requests.Response:
+        start = time.perf_counter()
+        status = "error"
+        self.in_flight.inc()
+        try:
+            resp = call_next(request)
+            status = str(resp.status_code)
+            if request.options.get("stream"):
+                length = resp.headers.get("Content-Length")
+                if length and length.isdigit():
+                    self.size.labels(request.endpoint).observe(int(length))
+            else:
+                self.size.labels(request.endpoint).observe(len(resp.content))   # already read
+            return resp
+        except Exception as exc:
+            status = exc.__class__.__name__
+            raise
+        finally:
+            self.in_flight.dec()
+            endpoint = request.endpoint
+            self.latency.labels(endpoint).observe(time.perf_counter() - start)
+            self.calls.labels(endpoint, status).inc()
+            if request.attempts > 1:
+                self.retries.labels(endpoint).inc(request.attempts - 1)
+
+
+# ---------------------------------------------------------------------- pipeline
+
+class HttpPipeline:
+    def __init__(self, middleware: list[Middleware], transport: Handler | None = None,
+                 breaker: CircuitBreakerMiddleware | None = None):
+        self.middleware = list(middleware)
+        self.transport = transport or SessionTransport()
+        self.breaker = breaker
+        handler = self.transport
+        for mw in reversed(self.middleware):
+            handler = (lambda m, nxt: lambda req: m(req, nxt))(mw, handler)
+        self._handler = handler
+
+    @classmethod
+    def default(cls, transport: Handler | None = None, registry: MetricsRegistry = REGISTRY) -> "HttpPipeline":
+        breaker = CircuitBreakerMiddleware(config.HTTP_BREAKER_THRESHOLD, config.HTTP_BREAKER_COOLDOWN)
+        return cls(
+            [
+                MetricsMiddleware(registry),
+                TimeoutMiddleware((config.HTTP_CONNECT_TIMEOUT, config.HTTP_READ_TIMEOUT)),
+                CompressionMiddleware(
+                    registry, RESPONSE_ENCODINGS if config.HTTP_COMPRESS_RESPONSES else ("identity",),
+                    config.HTTP_COMPRESS_REQUESTS, config.HTTP_REQUEST_ENCODING, config.HTTP_COMPRESS_MIN_BYTES,
+                ),
+                RetryMiddleware(config.HTTP_RETRY_ATTEMPTS),
+                breaker,
+                AuthMiddleware(),
+            ],
+            transport, breaker=breaker,
+        )
+
+    def send(self, request: HttpRequest) -> requests.Response:
+        resp = self._handler(request)
+        resp.resent = request.resent    # for callers (and HTTPError handlers) that must know
+        return resp
+
+    def request(self, method: str, url: str, *, endpoint: str | None = None, headers: dict | None = None,
+                timeout=None, auth=None, idempotent: bool | None = None, **options) -> requests.Response:
+        method = method.upper()
+        headers = dict(headers or {})
+        if "json" in options:       # encoded here rather than by requests' stdlib json
+            options["data"] = json_codec.dumps(options.pop("json"))
+            headers.setdefault("Content-Type", "application/json")
+        return self.send(HttpRequest(
+            method=method, url=url, endpoint=endpoint or endpoint_name(method, url),
+            headers=headers, options=options, timeout=timeout,
+            idempotent=method in IDEMPOTENT_METHODS if idempotent is None else idempotent, auth=auth,
+        ))
@@ -0,0 +1,189 @@
+# services/http_recording.py
+"""
+Record the launcher's HTTP traffic to a file, and play it back.
+
+Both are transports for HttpPipeline (services/http_pipeline.py), so the
+whole middleware chain (auth, retry, breaker, compression, metrics) runs
+as usual above them.
+
+RecordingTransport sends for real and appends every exchange to a JSON
+Lines file: method and URL, status, response headers and body, the time
+the server took. ReplayTransport answers from such a file without any
+network. A request is matched on method, path and query, not host, so a
+session recorded against one server replays under any base URL. Repeats
+of a request get the recorded answers in order, then the last one again.
+Each answer can be held back for as long as the server originally took
+(`speed` 1), or given at once (0).
+
+Together they make every service call path repeatable without Keycloak
+or FastAPI: record a real session once, then run benchmarks against the
+replay. Select with [Http] transport = record | replay and recording =
+<file>, or MVL_HTTP_TRANSPORT / MVL_HTTP_RECORDING.
+
+Recordings hold response bodies as the server sent them, tokens from
+the token endpoint included: treat one like a saved session. Request
+headers and bodies (bearer tokens, passwords) are never written. Event
+streams (GET /events) pass through unrecorded and are refused on replay.
+"""
+from __future__ import annotations
+
+import base64
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from http import HTTPStatus
+from pathlib import Path
+
+import requests
+from requests.models import PreparedRequest
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from launcher import config
+from launcher.services.http_pipeline import Handler, HttpRequest, SessionTransport
+from launcher.util import json_codec
+
+# Describe the original transfer rather than the decoded body that is stored
+_UNRECORDED_HEADERS = frozenset({
+    "content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive", "date", "set-cookie",
+})
+
+
+class ReplayMiss(requests.RequestException):
+    """The recorded session never made this request."""
+
+
+def request_key(method: str, url: str, params=None) -> str:
+    """How a request is matched on replay: "GET /api/v1/projects/<id>/sequences?updated_since=12"."""
+    prepared = PreparedRequest()
+    prepared.prepare_url(url, params)
+    return f"{method.upper()} {prepared.path_url}"
+
+
+class RecordingTransport:
+    def __init__(self, path: str | Path, inner: Handler | None = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._inner = inner or SessionTransport()
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def __call__(self, request: HttpRequest) -> requests.Response:
+        start = time.perf_counter()
+        resp = self._inner(request)
+        if request.options.get("stream"):
+            return resp
+        body = resp.content                     # read in full already; stream=False
+        elapsed = time.perf_counter() - start
+        raw = resp.raw
+        entry = {
+            "key": request_key(request.method, request.url, request.options.get("params")),
+            "endpoint": request.endpoint,
+            "status": resp.status_code,
+            "headers": {k: v for k, v in resp.headers.items() if k.lower() not in _UNRECORDED_HEADERS},
+            "elapsed": round(elapsed, 4),
+            "wire_bytes": raw.tell() if hasattr(raw, "tell") else len(body),
+        }
+        try:
+            entry["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(body).decode("ascii")
+        line = json_codec.dumps(entry) + b"\n"
+        with self._lock:
+            with open(self.path, "ab") as f:
+                f.write(line)
+            self.recorded += 1
+        return resp
+
+
+class ReplayTransport:
+    def __init__(self, path: str | Path, speed: float = 0.0, sleep=time.sleep):
+        self.path = Path(path)
+        self.speed = speed
+        self._sleep = sleep
+        self._answers: dict[str, list[dict]] = {}
+        with open(self.path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    entry = json_codec.loads(line)
+                    self._answers.setdefault(entry["key"], []).append(entry)
+        self._lock = threading.Lock()
+        self._served: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    def __len__(self) -> int:
+        return sum(len(a) for a in self._answers.values())
+
+    def rewind(self) -> None:
+        """Start every request's answers from the first again."""
+        with self._lock:
+            self._served.clear()
+
+    def __call__(self, request: HttpRequest) -> requests.Response:
+        request.attempts += 1
+        key = request_key(request.method, request.url, request.options.get("params"))
+        answers = None if request.options.get("stream") else self._answers.get(key)
+        with self._lock:
+            if answers is None:
+                self.misses[key] += 1
+            else:
+                index = min(self._served[key], len(answers) - 1)
+                self._served[key] += 1
+        if answers is None:
+            raise ReplayMiss(f"not in the recording: {key}")
+        entry = answers[index]
+        if self.speed > 0:
+            self._sleep(entry["elapsed"] * self.speed)
+        return _response(request, entry)
+
+
+class _ReplayedRaw:
+    """Stands in for urllib3's response: only what the pipeline reads off it."""
+
+    def __init__(self, wire_bytes: int):
+        self._wire_bytes = wire_bytes
+
+    def tell(self) -> int:
+        return self._wire_bytes
+
+    def read(self, *args, **kwargs) -> bytes:
+        return b""
+
+    def close(self) -> None:
+        pass
+
+
+def _response(request: HttpRequest, entry: dict) -> requests.Response:
+    body = entry["body"].encode("utf-8") if "body" in entry else base64.b64decode(entry.get("body_b64", ""))
+    resp = requests.Response()
+    resp.status_code = entry["status"]
+    try:
+        resp.reason = HTTPStatus(resp.status_code).phrase
+    except ValueError:
+        resp.reason = ""
+    resp.headers = CaseInsensitiveDict(entry["headers"])
+    resp.encoding = get_encoding_from_headers(resp.headers)
+    resp._content = body
+    resp._content_consumed = True
+    resp.raw = _ReplayedRaw(entry.get("wire_bytes", len(body)))
+    resp.url = request.url
+    resp.elapsed = timedelta(seconds=entry["elapsed"])
+    return resp
+
+
+def transport_from_config() -> Handler | None:
+    """The transport [Http] transport selects; None for live (the pipeline's own requests transport)."""
+    mode = config.HTTP_TRANSPORT
+    if mode == "live":
+        return None
+    path = Path(config.HTTP_RECORDING) if config.HTTP_RECORDING else config.CACHE_DIR / "recordings" / "session.jsonl"
+    if mode == "record":
+        print(f"[Http] recording every exchange to {path}")
+        return RecordingTransport(path)
+    if mode == "replay":
+        transport = ReplayTransport(path, config.HTTP_REPLAY_SPEED)
+        print(f"[Http] replaying {len(transport)} recorded exchanges from {path}; nothing goes to the network")
+        return transport
+    print(f"[Http] unknown transport {mode!r}; using live")
+    return None
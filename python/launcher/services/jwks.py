@@ -0,0 +1,128 @@
+# services/jwks.py
+"""
+Keycloak's signing keys (JWKS), cached on disk, and token verification
+against them.
+
+The key set is fetched once and reused across runs for `ttl` seconds. A
+token signed with a key id we don't know (Keycloak rotated its keys)
+triggers one refetch, at most every REFETCH_INTERVAL seconds, so a flood
+of bad tokens can't turn into a flood of requests.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+from launcher import config
+from launcher.services.http_pipeline import HttpPipeline
+from launcher.util import json_codec
+from launcher.util.metrics import cache_lookup
+from launcher.util.jwt import InvalidToken, SUPPORTED_ALGORITHMS, check_expiry, split, verify_signature
+
+REFETCH_INTERVAL = 60.0
+
+
+class JwksUnavailable(InvalidToken):
+    """The key set could not be fetched; the token is neither accepted nor rejected."""
+
+
+def jwks_url() -> str:
+    return f"{config.KC_BASE}/realms/{config.KC_REALM}/protocol/openid-connect/certs"
+
+
+class JwksCache:
+    def __init__(self, url: str, path: str | os.PathLike | None = None, ttl: float = 86400.0,
+                 fetch=None, http: HttpPipeline | None = None):
+        self.url = url
+        self.path = Path(path) if path is not None else None
+        self.ttl = ttl
+        self._http = http
+        self._fetch = fetch or self._http_fetch
+        self._lock = threading.Lock()
+        self._keys: dict[str, dict] = {}
+        self._fetched_at = 0.0          # time.time() of the key set we hold
+        self._last_attempt = 0.0
+        self._load_disk()
+
+    def key(self, kid: str | None) -> dict:
+        with self._lock:
+            stale = time.time() - self._fetched_at > self.ttl
+            miss = stale or kid not in self._keys
+            cache_lookup("jwks", not miss)
+            if miss:
+                self._refresh()
+            if kid not in self._keys:
+                if not self._keys:
+                    raise JwksUnavailable(f"signing keys unavailable from {self.url}")
+                raise InvalidToken(f"unknown signing key {kid!r}")
+            return self._keys[kid]
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._last_attempt and now - self._last_attempt < REFETCH_INTERVAL:
+            return
+        self._last_attempt = now
+        try:
+            data = self._fetch(self.url)
+            keys = {k["kid"]: k for k in data.get("keys", []) if k.get("kid")}
+        except (requests.RequestException, ValueError, KeyError, TypeError) as exc:
+            print(f"[Auth] cannot fetch signing keys: {exc}")
+            return      # keep whatever we had
+        self._keys, self._fetched_at = keys, time.time()
+        self._save_disk(data)
+
+    def _http_fetch(self, url: str) -> dict:
+        resp = self._http.request("GET", url) if self._http is not None else requests.get(url, timeout=10)
+        resp.raise_for_status()
+        return json_codec.loads(resp.content)
+
+    def _load_disk(self) -> None:
+        if self.path is None:
+            return
+        try:
+            data = json_codec.loads(self.path.read_bytes())
+            self._keys = {k["kid"]: k for k in data["keys"] if k.get("kid")}
+            self._fetched_at = self.path.stat().st_mtime
+        except (OSError, ValueError, KeyError, TypeError):
+            self._keys = {}
+
+    def _save_disk(self, data: dict) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_bytes(json_codec.dumps(data))
+            os.replace(tmp, self.path)
+        except OSError as exc:
+            print(f"[Auth] cannot cache signing keys: {exc}")
+
+
+class TokenVerifier:
+    def __init__(self, jwks: JwksCache, issuer: str | None = None, leeway: float = 60.0):
+        self.jwks = jwks
+        self.issuer = issuer
+        self.leeway = leeway
+
+    def verify(self, token: str, check_exp: bool = True) -> dict:
+        """Claims of a correctly signed, unexpired token; raises InvalidToken (JwksUnavailable offline)."""
+        header, claims, signing_input, signature = split(token)
+        alg = header.get("alg")
+        if alg not in SUPPORTED_ALGORITHMS:
+            raise InvalidToken(f"unsupported algorithm {alg!r}")
+        verify_signature(signing_input, signature, self.jwks.key(header.get("kid")), alg)
+        if check_exp:
+            check_expiry(claims, self.leeway)
+        if self.issuer and claims.get("iss") != self.issuer:
+            # Keycloak stamps the hostname it was reached by; a mismatch is worth a note, not a logout
+            print(f"[Auth] token issuer {claims.get('iss')!r} differs from {self.issuer!r}")
+        return claims
+
+    @classmethod
+    def from_config(cls, cache_dir: str | os.PathLike, http: HttpPipeline | None = None) -> "TokenVerifier":
+        return cls(JwksCache(jwks_url(), Path(cache_dir) / "jwks.json", http=http),
+                   issuer=f"{config.KC_ISSUER}/realms/{config.KC_REALM}")
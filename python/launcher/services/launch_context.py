@@ -0,0 +1,94 @@
+# services/launch_context.py
+"""
+What an editor launch needs from the outside world: the editor binary, the
+template project and the MVL_* environment for the selected project and
+sequence.
+
+The environment is resolved as *overrides only*. The child process inherits
+the launcher's environment through QProcess, so nothing here copies
+os.environ and resolving costs the same however large the environment is.
+
+Path checks go through a shared PathProbe, so the editor binary, template and
+projects root (usually on a network drive) are stat'ed once per TTL, not on
+every click. invalidate() drops them, e.g. after a launch failed because a
+path went missing.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+
+from launcher import config
+from launcher.domain.project import Project
+from launcher.util.path_probe import PathProbe
+
+
+@dataclass(slots=True)
+class LaunchContext:
+    editor_exe: str
+    project_env: dict[str, str] = field(default_factory=dict)
+
+
+class LaunchContextResolver:
+    def __init__(self, editor_exe: str | None = None, projects_root: str | None = None,
+                 probe: PathProbe | None = None):
+        self.editor_exe = editor_exe if editor_exe is not None else config.EDITOR_EXECUTABLE
+        self.projects_root = projects_root if projects_root is not None else config.PROJECTS_ROOT_DIR
+        self.probe = probe or PathProbe(config.PATH_PROBE_TTL)
+        self._root_warned = False
+
+    # ------------------------------------------------------------------ paths
+
+    def editor_executable(self) -> str:
+        if not self.editor_exe:
+            raise FileNotFoundError("Editor executable not configured (THEATER_HOME / Paths.theater_executable).")
+        if not self.probe.is_file(self.editor_exe):
+            raise FileNotFoundError(f"UnrealEditor not found: {self.editor_exe}")
+        return self.editor_exe
+
+    def check_template(self, template_dir: str | os.PathLike) -> None:
+        if not self.probe.is_dir(template_dir):
+            raise FileNotFoundError(f"Template project not found: {template_dir}")
+
+    def check_projects_root(self) -> bool:
+        """The editor reads PROJECTS_ROOT_DIR itself; an unreachable root is worth a warning, not a failure."""
+        ok = not self.projects_root or self.probe.is_dir(self._root_path())
+        if not ok and not self._root_warned:
+            print(f"[Launch] projects root {self.projects_root} is not reachable")
+        self._root_warned = not ok
+        return ok
+
+    def invalidate(self, path: str | os.PathLike | None = None) -> None:
+        self.probe.invalidate(path)
+        if path is None:
+            self._root_warned = False
+
+    def _root_path(self) -> str:
+        # "J:" alone is the drive's current directory on Windows; probe its root
+        root = self.projects_root
+        return root + os.sep if len(root) == 2 and root[1] == ":" else root
+
+    # ------------------------------------------------------------------ environment
+
+    def project_env(self, project: Project) -> dict[str, str]:
+        env = {
+            "MVL_PROJECT": project.code or project.name,
+            "MVL_TYPE": config.LAUNCH_MVL_TYPE,
+            "MVL_CONTAINER": config.LAUNCH_MVL_CONTAINER,
+            "MVL_TASK": config.LAUNCH_MVL_TASK,
+            "MVL_STEP": config.LAUNCH_MVL_STEP,
+        }
+        if self.projects_root:
+            env["PROJECTS_ROOT_DIR"] = self.projects_root
+        return env
+
+    @staticmethod
+    def scope_env(sequence) -> dict[str, str]:
+        code = getattr(sequence, "code", None) if sequence is not None else None
+        return {"MVL_SCOPE": code} if code else {}
+
+    def resolve(self, project: Project) -> LaunchContext:
+        """Editor binary and project-level environment; raises FileNotFoundError if the editor is missing."""
+        exe = self.editor_executable()
+        self.check_projects_root()
+        return LaunchContext(exe, self.project_env(project))
@@ -1,25 +1,320 @@
-# # services/launch_service.py
-# import subprocess
-# from launcher import config
-# from launcher.domain.project import Project
-# from .auth_service import AuthService
-
-
-# class LaunchService:
-#     def __init__(self, auth: AuthService):
-#         self.auth = auth
-
-#     def launch_project(self, project: Project):
-#         tokens = self.auth.tokens
-#         if not tokens:
-#             raise RuntimeError("Not authenticated")
-
-#         args = [
-#             config.UNREAL_EDITOR_PATH,
-#             project.uproject_path,
-#             f"-projectId={project.id}",
-#             f"-authToken={tokens.access_token}",
-#         ]
-
-#         # Start Unreal as separate process
-#         subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+# services/launch_service.py
+"""
+Launch pipeline for the Unreal editor.
+
+Getting from "Open" to a running editor takes several independent steps.
+They are split into stages that can run ahead of the click:
+
+    prepare (on browse, background thread)
+        validate   editor binary and template are configured and exist
+                   (cached probes, see services/launch_context.py)
+        env        project-level environment overrides for the editor
+        provision  create / update the project from the template
+        prefetch   read the editor binaries, .uproject and Config/ into the
+                   OS page cache so the editor's own startup reads hit RAM
+    launch (on click, GUI thread)
+        scope      sequence-level environment overrides
+        handoff    if an editor already has the project open, send it the new
+                   scope over IPC (services/editor_ipc.py) and stop there; the
+                   round trip runs on TheaterService's switch worker, the
+                   launch finishes when it answers
+        start      hand over to TheaterService (returns before the process is up;
+                   click-to-process-start is logged when it is)
+
+Every stage is timed into the launch_stage_seconds histogram (labelled by
+stage, plus click_to_start once the process is up); LaunchPlan.report()
+gives a one-line breakdown of preparation.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from launcher import config
+from launcher.domain.project import Project
+from launcher.util.metrics import REGISTRY, cache_lookup
+from .provisioning_service import ProvisionCancelled, ProvisioningService
+from .editor_session import EditorSession
+from .launch_context import LaunchContextResolver
+from .theater_service import Handoff, TheaterService
+
+PLAN_TTL = 300.0                 # seconds a prepared plan is trusted before re-checking the template
+_PREFETCH_EXTENSIONS = {".exe", ".dll", ".so", ".dylib", ".pak", ".ucas", ".utoc"}
+_PREFETCH_CHUNK = 1 << 20
+
+LAUNCH_STAGE_SECONDS = REGISTRY.histogram("launch_stage_seconds", "Open click to editor, per launch stage",
+                                          ("stage",))
+
+
+@dataclass(slots=True)
+class LaunchPlan:
+    project_name: str
+    editor_exe: str = ""
+    uproject: str = ""
+    env: dict[str, str] = field(default_factory=dict)     # overrides on top of the launcher's environment
+    timings: list[tuple[str, float]] = field(default_factory=list)   # (stage, seconds)
+    prefetched_bytes: int = 0
+    prepared_at: float = 0.0      # time.monotonic()
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() - self.prepared_at < PLAN_TTL
+
+    def report(self) -> str:
+        stages = ", ".join(f"{name} {secs * 1000:.0f} ms" for name, secs in self.timings)
+        return f"{self.project_name}: {stages}"
+
+
+def prefetch_files(paths: list[Path], budget: int) -> int:
+    """
+    Pull files into the page cache, up to `budget` bytes. Returns bytes covered.
+
+    Uses posix_fadvise(WILLNEED) where available (the kernel reads ahead
+    asynchronously), otherwise reads the files through once.
+    """
+    done = 0
+    buf = bytearray(_PREFETCH_CHUNK)
+    for path in paths:
+        try:
+            size = path.stat().st_size
+            if done + size > budget:
+                continue
+            with open(path, "rb", buffering=0) as fh:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                else:
+                    while fh.readinto(buf):
+                        pass
+            done += size
+        except OSError:
+            continue
+    return done
+
+
+class LaunchPipeline(QObject):
+    """
+    Prepares editor launches ahead of time and runs the final launch.
+
+    Preparation signals (progress, prepared, failed) are emitted from the
+    preparation thread, launch signals from the GUI thread.
+    """
+    progress = pyqtSignal('qlonglong', 'qlonglong', int, int)   # provisioning progress
+    prepared = pyqtSignal(object)                               # LaunchPlan
+    failed = pyqtSignal(str, str)                               # project name, message
+    handed_off = pyqtSignal(str, str)                           # project name, session key
+    launched = pyqtSignal(object)                               # EditorSession started (or queued) afresh
+    start_failed = pyqtSignal(str, str)                         # project name, message; after a handoff fell through
+
+    def __init__(self, provisioning: ProvisioningService, theater: TheaterService,
+                 editor_exe: str | None = None, prefetch_mb: int | None = None, parent=None,
+                 resolver: LaunchContextResolver | None = None):
+        super().__init__(parent)
+        self.provisioning = provisioning
+        self.theater = theater
+        self.resolver = resolver or LaunchContextResolver(editor_exe=editor_exe)
+        self.prefetch_budget = (prefetch_mb if prefetch_mb is not None else config.LAUNCH_PREFETCH_MB) << 20
+
+        # One preparation at a time: they compete for the same disk
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="launch-prepare")
+        self._futures: dict[str, Future] = {}
+        self._cancel = threading.Event()
+        # key -> (plan, env, args, clicked_at, stage timings, handoff start) while an editor is asked
+        self._handoffs: dict[str, tuple] = {}
+        theater.handoff_finished.connect(self._on_handoff_finished)
+
+    # ------------------------------------------------------------------ preparation
+
+    def prepare(self, project: Project) -> Future:
+        """Start (or reuse) preparation for `project`. The future resolves to a LaunchPlan."""
+        name = project.name
+        fut = self._futures.get(name)
+        if fut is not None and not fut.cancelled():
+            if not fut.done():
+                return fut
+            if fut.exception() is None and fut.result().fresh:
+                return fut
+        fut = self._pool.submit(self._prepare, project)
+        fut.add_done_callback(lambda f: self._emit_result(name, f))
+        self._futures[name] = fut
+        return fut
+
+    def ready_plan(self, project: Project) -> LaunchPlan | None:
+        fut = self._futures.get(project.name)
+        plan = None
+        if fut is not None and fut.done() and not fut.cancelled() and fut.exception() is None:
+            plan = fut.result()
+            plan = plan if plan.fresh else None
+        cache_lookup("launch_plan", plan is not None)
+        return plan
+
+    def pending(self) -> int:
+        """Preparations queued or running."""
+        return sum(1 for f in list(self._futures.values()) if not f.done())
+
+    def cancel(self) -> None:
+        """Abort in-flight preparation (interrupted provisioning resumes next time)."""
+        self._cancel.set()
+        for fut in self._futures.values():
+            fut.cancel()
+        self._futures.clear()
+        self._cancel = threading.Event()
+
+    def stop(self) -> None:
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _emit_result(self, name: str, fut: Future) -> None:
+        if fut.cancelled():
+            return
+        exc = fut.exception()
+        if exc is None:
+            self.prepared.emit(fut.result())
+        elif not isinstance(exc, ProvisionCancelled):
+            self.failed.emit(name, str(exc))
+
+    @contextmanager
+    def _stage(self, plan: LaunchPlan, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            secs = time.perf_counter() - t0
+            plan.timings.append((name, secs))
+            LAUNCH_STAGE_SECONDS.labels(name).observe(secs)
+
+    def _prepare(self, project: Project) -> LaunchPlan:
+        cancel = self._cancel
+        plan = LaunchPlan(project.name)
+
+        with self._stage(plan, "validate"):
+            context = self.resolver.resolve(project)
+            self.resolver.check_template(self.provisioning.template_dir)
+            plan.editor_exe = context.editor_exe
+
+        with self._stage(plan, "env"):
+            plan.env = context.project_env
+
+        with self._stage(plan, "provision"):
+            result = self.provisioning.provision(project.name, progress=self.progress.emit, cancel=cancel)
+            plan.uproject = str(result.uproject)
+            if result.conflicts:
+                print(f"[Launch] kept {len(result.conflicts)} locally edited file(s) that changed in the template")
+
+        with self._stage(plan, "prefetch"):
+            plan.prefetched_bytes = prefetch_files(self._prefetch_paths(plan), self.prefetch_budget)
+
+        plan.prepared_at = time.monotonic()
+        return plan
+
+    def _prefetch_paths(self, plan: LaunchPlan) -> list[Path]:
+        exe = Path(plan.editor_exe)
+        paths = [exe, Path(plan.uproject)]
+        config_dir = Path(plan.uproject).parent / "Config"
+        if config_dir.is_dir():
+            paths.extend(p for p in config_dir.iterdir() if p.is_file())
+        try:
+            # Editor modules next to the binary, largest first (they dominate startup I/O)
+            libs = [p for p in exe.parent.iterdir() if p.suffix.lower() in _PREFETCH_EXTENSIONS and p != exe]
+            libs.sort(key=lambda p: -p.stat().st_size)
+            paths.extend(libs)
+        except OSError:
+            pass
+        return paths
+
+    # ------------------------------------------------------------------ launch
+
+    def launch(self, plan: LaunchPlan, sequence=None, args: list[str] | None = None,
+               clicked_at: float | None = None) -> EditorSession | None:
+        """
+        Start the editor from a prepared plan (`launched` is emitted and the
+        session returned), or hand `sequence` to an editor that already has
+        the project open. A queued or still loading editor of ours takes it
+        at once: `handed_off` is emitted and that session returned. A running
+        one is asked over IPC without blocking: None is returned, and once it
+        answers either `handed_off` is emitted or the editor is started
+        afresh (`launched`, or `start_failed`). `clicked_at`
+        (time.perf_counter() of the user's click) adds the time spent
+        waiting for preparation.
+        """
+        after_click: list[tuple[str, float]] = []
+        t0 = time.perf_counter()
+        if clicked_at is not None:
+            after_click.append(("waited", t0 - clicked_at))
+        env = {**plan.env, **self.resolver.scope_env(sequence)}
+        t1 = time.perf_counter()
+        after_click.append(("scope", t1 - t0))
+        key = self.session_key(plan.project_name, sequence)
+
+        target = self.theater.handoff(plan.uproject, env, key)
+        if isinstance(target, Handoff):
+            self._handoffs[key] = (plan, env, args, clicked_at, after_click, t1)
+            return None
+        after_click.append(("handoff", time.perf_counter() - t1))
+        if target is not None:
+            self._handed_off(plan, key, after_click)
+            return target
+        return self._start(plan, env, args, key, clicked_at, after_click)
+
+    def _on_handoff_finished(self, handoff: Handoff) -> None:
+        pending = self._handoffs.pop(handoff.key, None)
+        if pending is None:
+            return
+        plan, env, args, clicked_at, after_click, t1 = pending
+        after_click.append(("handoff", time.perf_counter() - t1))
+        if handoff.target is not None:
+            self._handed_off(plan, handoff.key, after_click)
+            return
+        try:
+            self._start(plan, env, args, handoff.key, clicked_at, after_click)
+        except (OSError, RuntimeError) as exc:
+            self.start_failed.emit(plan.project_name, str(exc))
+
+    def _handed_off(self, plan: LaunchPlan, key: str, after_click: list[tuple[str, float]]) -> None:
+        stages = _record(after_click)
+        print(f"[Launch] {key} handed to running editor | {stages}")
+        self.handed_off.emit(plan.project_name, key)
+
+    def _start(self, plan: LaunchPlan, env: dict[str, str], args: list[str] | None, key: str,
+               clicked_at: float | None, after_click: list[tuple[str, float]]) -> EditorSession:
+        t2 = time.perf_counter()
+        try:
+            session = self.theater.launch(plan.editor_exe, plan.uproject, args or ["-MVLEditor"], env=env, key=key)
+        except FileNotFoundError:
+            # A cached probe said yes but the path has gone: re-check everything next time
+            self.resolver.invalidate()
+            self._futures.pop(plan.project_name, None)
+            raise
+        after_click.append(("start", time.perf_counter() - t2))
+
+        print(f"[Launch] prepared {plan.report()} | launch {_record(after_click)}")
+
+        if clicked_at is not None:
+            # The process start itself is asynchronous; time it when it lands
+            session.started.connect(lambda: _click_to_start(session.key, clicked_at))
+        self.launched.emit(session)
+        return session
+
+    @staticmethod
+    def session_key(project_name: str, sequence=None) -> str:
+        """One editor per project/sequence pair."""
+        scope = (getattr(sequence, "code", None) or str(getattr(sequence, "id", ""))) if sequence else ""
+        return f"{project_name}/{scope}" if scope else project_name
+
+
+def _record(stages: list[tuple[str, float]]) -> str:
+    for name, secs in stages:
+        LAUNCH_STAGE_SECONDS.labels(name).observe(secs)
+    return ", ".join(f"{name} {secs * 1000:.0f} ms" for name, secs in stages)
+
+
+def _click_to_start(key: str, clicked_at: float) -> None:
+    secs = time.perf_counter() - clicked_at
+    LAUNCH_STAGE_SECONDS.labels("click_to_start").observe(secs)
+    print(f"[Launch] {key}: click to process start {secs * 1000:.0f} ms")
@@ -0,0 +1,236 @@
+# services/live_updates.py
+"""
+Server-push entity updates over Server-Sent Events.
+
+The backend streams change events from ``GET /events``:
+
+    id: 42
+    event: project.updated
+    data: {"id": "...", "sequence_count": 4, "shot_count": 31}
+
+Event names are ``<entity>.<op>`` with entity in project/sequence/shot and
+op in created/updated/deleted; ``data`` carries the changed fields and
+always the id. On reconnect the last seen id is sent as Last-Event-ID so
+the server can replay what was missed. If it cannot (or ids skip), the
+client asks for a resync, which the UI answers with a delta sync.
+"""
+from __future__ import annotations
+
+import random
+import socket
+import threading
+from dataclasses import dataclass
+from typing import Callable
+
+import requests
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from launcher.util import json_codec
+from .auth_service import AuthService, SessionExpired
+from .http_client import HttpClient
+
+EVENTS_PATH = "events"
+
+
+@dataclass(slots=True)
+class EntityEvent:
+    id: int | None
+    entity: str        # "project" | "sequence" | "shot"
+    op: str            # "created" | "updated" | "deleted"
+    data: dict
+
+
+class EventStream:
+    """
+    Blocking SSE reader with reconnect/backoff, run on its own thread.
+
+    Callbacks are invoked from the reader thread.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        headers: Callable[[], dict[str, str]],
+        on_event: Callable[[EntityEvent], None],
+        on_resync: Callable[[], None],
+        on_state: Callable[[bool], None] = lambda connected: None,
+        min_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        read_timeout: float = 45.0,
+        open_stream: Callable[..., requests.Response] = requests.get,
+    ):
+        self.url = url
+        self._headers = headers
+        self._open = open_stream            # (url, headers=, stream=, timeout=) -> Response
+        self._on_event = on_event
+        self._on_resync = on_resync
+        self._on_state = on_state
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._read_timeout = read_timeout   # server heartbeats must arrive faster than this
+
+        self.last_event_id: int | None = None
+        self._stop = threading.Event()
+        self._resp: requests.Response | None = None
+        self._sock: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="EventStream", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        sock = self._sock
+        if sock is not None:
+            # Closing the response from here would wait on the reader's lock;
+            # shutting the socket down unblocks the read instead.
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        backoff = self._min_backoff
+        while not self._stop.is_set():
+            try:
+                headers = {**self._headers(), "Accept": "text/event-stream", "Cache-Control": "no-cache"}
+                if self.last_event_id is not None:
+                    headers["Last-Event-ID"] = str(self.last_event_id)
+                resp = self._open(
+                    self.url, headers=headers, stream=True, timeout=(5, self._read_timeout)
+                )
+                self._resp = resp
+                self._sock = getattr(getattr(resp.raw, "connection", None), "sock", None)
+                resp.raise_for_status()
+
+                self._on_state(True)
+                backoff = self._min_backoff
+                if self.last_event_id is None:
+                    # No position to replay from, so anything before now may be missed
+                    self._on_resync()
+                self._consume(resp)
+            except SessionExpired:
+                return
+            except Exception as exc:
+                if self._stop.is_set():
+                    break
+                print(f"[LiveUpdates] stream error: {exc}")
+            finally:
+                self._sock = None
+                if self._resp is not None:
+                    self._resp.close()
+                    self._resp = None
+
+            if self._stop.is_set():
+                break
+            self._on_state(False)
+            # Full jitter keeps a fleet of launchers from reconnecting in lockstep
+            self._stop.wait(random.uniform(0, backoff))
+            backoff = min(self._max_backoff, backoff * 2)
+
+    def _consume(self, resp: requests.Response) -> None:
+        event_id, event_name, data_lines = None, "message", []
+        for raw in self._lines(resp):
+            if self._stop.is_set():
+                return
+            line = raw.decode("utf-8")
+            if not line:
+                self._dispatch(event_id, event_name, data_lines)
+                event_id, event_name, data_lines = None, "message", []
+                continue
+            if line.startswith(":"):
+                continue  # heartbeat / comment
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "id":
+                event_id = value
+            elif field == "event":
+                event_name = value
+            elif field == "data":
+                data_lines.append(value)
+
+    @staticmethod
+    def _lines(resp: requests.Response):
+        """
+        Yield lines as soon as they arrive. iter_lines() would wait for a full
+        chunk (or EOF when the server doesn't use chunked encoding).
+        """
+        read1 = getattr(resp.raw, "read1", None)
+        if read1 is None:
+            yield from resp.iter_lines(chunk_size=1)
+            return
+        buf = b""
+        while True:
+            chunk = read1(65536)
+            if not chunk:
+                return
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            for line in lines:
+                yield line.rstrip(b"\r")
+
+    def _dispatch(self, event_id: str | None, name: str, data_lines: list[str]) -> None:
+        if event_id is not None and event_id.isdigit():
+            new_id = int(event_id)
+            gap = self.last_event_id is not None and new_id > self.last_event_id + 1
+            self.last_event_id = new_id
+            if gap:
+                self._on_resync()
+
+        if name == "resync":
+            # Server could not replay from our Last-Event-ID
+            self._on_resync()
+            return
+
+        entity, _, op = name.partition(".")
+        if entity not in ("project", "sequence", "shot") or not op or not data_lines:
+            return
+        try:
+            data = json_codec.loads("\n".join(data_lines))
+        except ValueError:
+            return
+        self._on_event(EntityEvent(self.last_event_id, entity, op, data))
+
+
+class LiveUpdatesService(QObject):
+    """
+    Qt-facing wrapper: re-emits stream callbacks as signals for the GUI thread.
+    """
+    entity_changed = pyqtSignal(object)   # EntityEvent
+    resync_required = pyqtSignal()
+    connection_changed = pyqtSignal(bool)
+
+    def __init__(self, auth: AuthService, client: HttpClient | None = None, parent=None):
+        super().__init__(parent)
+        self.auth = auth
+        self.client = client or HttpClient()
+        self._stream: EventStream | None = None
+
+    def start(self) -> None:
+        if self._stream is None:
+            self._stream = EventStream(
+                f"{self.client.base_url}/{EVENTS_PATH}",
+                headers=lambda: {},     # the pipeline adds the bearer token
+                on_event=self.entity_changed.emit,
+                on_resync=self.resync_required.emit,
+                on_state=self.connection_changed.emit,
+                open_stream=self._open_stream,
+            )
+        self._stream.start()
+
+    def _open_stream(self, url: str, **kwargs) -> requests.Response:
+        # Not idempotent for the pipeline: the stream reconnects with its own backoff
+        return self.client.pipeline.request("GET", url, endpoint=f"GET {EVENTS_PATH}", auth=self.auth,
+                                            idempotent=False, **kwargs)
+
+    def stop(self) -> None:
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream = None
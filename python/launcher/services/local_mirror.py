@@ -0,0 +1,368 @@
+# services/local_mirror.py
+"""
+Local SQLite mirror of the project / sequence / shot hierarchy.
+
+ProjectService writes every successful fetch into the mirror so the
+dashboard can cold-start from disk and search without the network.
+Each user gets their own database file; the schema is versioned with
+PRAGMA user_version and rebuilt when it does not match (it is a cache,
+the server stays the source of truth).
+"""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable
+
+from launcher import config
+from launcher.domain.project import Project
+from launcher.domain.sequence import Sequence
+from launcher.domain.shot import Shot
+from launcher.util import json_codec
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE projects (
+    id             TEXT PRIMARY KEY,
+    name           TEXT NOT NULL,
+    code           TEXT NOT NULL,
+    sequence_count INTEGER NOT NULL DEFAULT 0,
+    shot_count     INTEGER NOT NULL DEFAULT 0,
+    updated_at     TEXT
+);
+CREATE INDEX ix_projects_code ON projects(code);
+
+CREATE TABLE sequences (
+    id         TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    name       TEXT,
+    code       TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    meta       TEXT,
+    updated_at TEXT
+);
+CREATE INDEX ix_sequences_project ON sequences(project_id);
+CREATE INDEX ix_sequences_code ON sequences(code);
+CREATE INDEX ix_sequences_status ON sequences(status);
+
+CREATE TABLE shots (
+    id          TEXT PRIMARY KEY,
+    project_id  TEXT NOT NULL,
+    sequence_id TEXT NOT NULL,
+    name        TEXT,
+    code        TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    meta        TEXT,
+    updated_at  TEXT
+);
+CREATE INDEX ix_shots_project ON shots(project_id);
+CREATE INDEX ix_shots_sequence ON shots(sequence_id);
+CREATE INDEX ix_shots_code ON shots(code);
+CREATE INDEX ix_shots_status ON shots(status);
+
+CREATE TABLE sync_state (
+    collection TEXT PRIMARY KEY,
+    cursor     TEXT
+);
+"""
+
+# Only overwrite a row when the incoming copy is newer (or either side has no timestamp)
+_NEWER = "excluded.updated_at IS NULL OR {t}.updated_at IS NULL OR excluded.updated_at > {t}.updated_at"
+
+# Counts are computed per fetch, not part of the project's updated_at: always
+# take them, but only take the project's own fields from a newer copy
+_UPSERT_PROJECT = f"""
+INSERT INTO projects (id, name, code, sequence_count, shot_count, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    name = CASE WHEN {_NEWER.format(t="projects")} THEN excluded.name ELSE projects.name END,
+    code = CASE WHEN {_NEWER.format(t="projects")} THEN excluded.code ELSE projects.code END,
+    updated_at = CASE WHEN {_NEWER.format(t="projects")} THEN excluded.updated_at ELSE projects.updated_at END,
+    sequence_count = excluded.sequence_count,
+    shot_count = excluded.shot_count
+WHERE {_NEWER.format(t="projects")}
+    OR projects.sequence_count != excluded.sequence_count
+    OR projects.shot_count != excluded.shot_count
+"""
+
+_UPSERT_SEQUENCE = f"""
+INSERT INTO sequences (id, project_id, name, code, status, meta, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    project_id = excluded.project_id,
+    name = excluded.name,
+    code = excluded.code,
+    status = excluded.status,
+    meta = excluded.meta,
+    updated_at = excluded.updated_at
+WHERE {_NEWER.format(t="sequences")}
+"""
+
+_UPSERT_SHOT = f"""
+INSERT INTO shots (id, project_id, sequence_id, name, code, status, meta, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    project_id = excluded.project_id,
+    sequence_id = excluded.sequence_id,
+    name = excluded.name,
+    code = excluded.code,
+    status = excluded.status,
+    meta = excluded.meta,
+    updated_at = excluded.updated_at
+WHERE {_NEWER.format(t="shots")}
+"""
+
+
+def _meta_text(raw) -> str | None:
+    if raw is None:
+        return None
+    if isinstance(raw, bytes):
+        return raw.decode("utf-8")
+    if isinstance(raw, str):
+        return raw
+    return json_codec.dumps(raw).decode("utf-8")
+
+
+def _like(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class LocalMirror:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Shared between the GUI thread and QThread workers, guarded by _lock
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    @classmethod
+    def for_user(cls, user_id: str, cache_dir: str | Path | None = None) -> LocalMirror:
+        # Hash the id so the filename is safe and does not leak the account
+        digest = hashlib.sha256(user_id.encode("utf-8")).hexdigest()[:16]
+        base = Path(cache_dir) if cache_dir else config.CACHE_DIR
+        return cls(base / "mirror" / f"{digest}.sqlite3")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _migrate(self) -> None:
+        with self._lock:
+            version = self._db.execute("PRAGMA user_version").fetchone()[0]
+            if version == SCHEMA_VERSION:
+                return
+            # Unknown or outdated layout: drop and rebuild, the next fetch refills it
+            with self._db:
+                for table in ("projects", "sequences", "shots", "sync_state"):
+                    self._db.execute(f"DROP TABLE IF EXISTS {table}")
+                self._db.executescript(_SCHEMA)
+                self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # ------------------------------------------------------------------ writes
+
+    def upsert_projects(self, projects: Iterable[Project]) -> None:
+        rows = [
+            (p.id, p.name, p.code, p.sequence_count, p.shot_count, p.updated_at)
+            for p in projects
+        ]
+        with self._lock, self._db:
+            self._db.executemany(_UPSERT_PROJECT, rows)
+
+    def replace_projects(self, projects: Iterable[Project]) -> None:
+        """Store a complete project listing, dropping projects no longer returned."""
+        self.sync_projects(projects, full=True)
+
+    def sync_projects(
+        self,
+        projects: Iterable[Project],
+        deleted: Iterable[str] = (),
+        cursor: str | None = None,
+        full: bool = False,
+    ) -> None:
+        """
+        Merge a project listing or delta and advance the "projects" sync cursor
+        in the same transaction. ``full`` means the listing is complete.
+        """
+        rows = [
+            (p.id, p.name, p.code, p.sequence_count, p.shot_count, p.updated_at)
+            for p in projects
+        ]
+        self._sync("projects", _UPSERT_PROJECT, rows, "1 = 1", (), deleted, cursor, full)
+
+    def upsert_sequences(self, sequences: Iterable[Sequence]) -> None:
+        with self._lock, self._db:
+            self._db.executemany(_UPSERT_SEQUENCE, [self._sequence_row(s) for s in sequences])
+
+    def replace_sequences(self, project_id: str, sequences: Iterable[Sequence]) -> None:
+        """Store the full sequence listing of one project."""
+        self.sync_sequences(project_id, sequences, full=True)
+
+    def sync_sequences(
+        self,
+        project_id: str,
+        sequences: Iterable[Sequence],
+        deleted: Iterable[str] = (),
+        cursor: str | None = None,
+        full: bool = False,
+    ) -> None:
+        rows = [self._sequence_row(s) for s in sequences]
+        self._sync(
+            f"sequences/{project_id}", _UPSERT_SEQUENCE, rows,
+            "project_id = ?", (str(project_id),), deleted, cursor, full,
+        )
+
+    def upsert_shots(self, shots: Iterable[Shot]) -> None:
+        with self._lock, self._db:
+            self._db.executemany(_UPSERT_SHOT, [self._shot_row(s) for s in shots])
+
+    def replace_shots(self, sequence_id: str, shots: Iterable[Shot]) -> None:
+        """Store the full shot listing of one sequence."""
+        self.sync_shots(sequence_id, shots, full=True)
+
+    def sync_shots(
+        self,
+        sequence_id: str,
+        shots: Iterable[Shot],
+        deleted: Iterable[str] = (),
+        cursor: str | None = None,
+        full: bool = False,
+    ) -> None:
+        rows = [self._shot_row(s) for s in shots]
+        self._sync(
+            f"shots/{sequence_id}", _UPSERT_SHOT, rows,
+            "sequence_id = ?", (str(sequence_id),), deleted, cursor, full,
+        )
+
+    def cursor(self, collection: str) -> str | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT cursor FROM sync_state WHERE collection = ?", (collection,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def reset_cursor(self, collection: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM sync_state WHERE collection = ?", (collection,))
+
+    def _sync(
+        self,
+        collection: str,
+        upsert_sql: str,
+        rows: list[tuple],
+        scope: str,
+        params: tuple,
+        deleted: Iterable[str],
+        cursor: str | None,
+        full: bool,
+    ) -> None:
+        table = collection.split("/", 1)[0]
+        with self._lock, self._db:
+            self._db.executemany(upsert_sql, rows)
+            if full:
+                self._delete_missing(table, scope, params, [r[0] for r in rows])
+            deleted = [(str(i),) for i in deleted]
+            if deleted:
+                self._db.executemany(f"DELETE FROM {table} WHERE id = ?", deleted)
+            if cursor is not None:
+                self._db.execute(
+                    "INSERT INTO sync_state (collection, cursor) VALUES (?, ?) "
+                    "ON CONFLICT(collection) DO UPDATE SET cursor = excluded.cursor",
+                    (collection, cursor),
+                )
+
+    def _delete_missing(self, table: str, scope: str, params: tuple, keep_ids: list[str]) -> None:
+        # Temp table keeps this O(n) and avoids SQLite's bound-parameter limit
+        self._db.execute("CREATE TEMP TABLE IF NOT EXISTS _keep (id TEXT PRIMARY KEY)")
+        self._db.execute("DELETE FROM _keep")
+        self._db.executemany("INSERT OR IGNORE INTO _keep (id) VALUES (?)", [(i,) for i in keep_ids])
+        self._db.execute(
+            f"DELETE FROM {table} WHERE {scope} AND id NOT IN (SELECT id FROM _keep)", params
+        )
+
+    @staticmethod
+    def _sequence_row(s: Sequence) -> tuple:
+        return (s.id, str(s.project_id), s.name, s.code, s.status, _meta_text(s.raw_meta), s.updated_at)
+
+    @staticmethod
+    def _shot_row(s: Shot) -> tuple:
+        return (
+            s.id, str(s.project_id), str(s.sequence_id), s.name, s.code, s.status,
+            _meta_text(s.raw_meta), s.updated_at,
+        )
+
+    # ------------------------------------------------------------------ reads
+
+    def projects(self) -> list[Project]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, name, code, sequence_count, shot_count, updated_at "
+                "FROM projects ORDER BY name COLLATE NOCASE"
+            ).fetchall()
+        return [Project(*r) for r in rows]
+
+    def sequences(self, project_id: str) -> list[Sequence]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, project_id, name, code, status, meta, updated_at "
+                "FROM sequences WHERE project_id = ? ORDER BY code",
+                (str(project_id),),
+            ).fetchall()
+        # meta stays as JSON text until first access
+        return [Sequence(*r) for r in rows]
+
+    def all_sequences(self) -> list[Sequence]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, project_id, name, code, status, meta, updated_at FROM sequences"
+            ).fetchall()
+        return [Sequence(*r) for r in rows]
+
+    def all_shots(self) -> list[Shot]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, project_id, sequence_id, name, code, status, meta, updated_at FROM shots"
+            ).fetchall()
+        return [Shot(*r) for r in rows]
+
+    def shots(self, sequence_id: str) -> list[Shot]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, project_id, sequence_id, name, code, status, meta, updated_at "
+                "FROM shots WHERE sequence_id = ? ORDER BY code",
+                (str(sequence_id),),
+            ).fetchall()
+        return [Shot(*r) for r in rows]
+
+    def search(self, text: str, limit: int = 50) -> list[Project | Sequence | Shot]:
+        """Substring match on name/code/id/status across all cached entities."""
+        pattern = _like(text.strip())
+        where = (
+            "name LIKE ?1 ESCAPE '\\' OR code LIKE ?1 ESCAPE '\\' OR id LIKE ?1 ESCAPE '\\'"
+        )
+        with self._lock:
+            projects = self._db.execute(
+                "SELECT id, name, code, sequence_count, shot_count, updated_at "
+                f"FROM projects WHERE {where} LIMIT ?2",
+                (pattern, limit),
+            ).fetchall()
+            sequences = self._db.execute(
+                "SELECT id, project_id, name, code, status, meta, updated_at "
+                f"FROM sequences WHERE {where} OR status LIKE ?1 ESCAPE '\\' LIMIT ?2",
+                (pattern, limit),
+            ).fetchall()
+            shots = self._db.execute(
+                "SELECT id, project_id, sequence_id, name, code, status, meta, updated_at "
+                f"FROM shots WHERE {where} OR status LIKE ?1 ESCAPE '\\' LIMIT ?2",
+                (pattern, limit),
+            ).fetchall()
+        results: list[Project | Sequence | Shot] = [Project(*r) for r in projects]
+        results += [Sequence(*r) for r in sequences]
+        results += [Shot(*r) for r in shots]
+        return results[:limit]
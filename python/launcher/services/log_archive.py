@@ -0,0 +1,464 @@
+# services/log_archive.py
+"""
+Compressed on-disk archive of editor session logs.
+
+Each session gets a directory under the archive root:
+
+    meta.json           key, start/end time, exit code, line count
+    seg-000001.zlog     zlib blocks back to back, each independently
+    seg-000002.zlog     decompressible (~BLOCK_BYTES of text each); a new
+    ...                 segment starts every SEGMENT_BYTES
+    index.bin           one fixed-size record per block:
+                        segment, offset, compressed length, first line,
+                        line count, mask of log levels present
+
+A block is appended to its segment before its index record is written,
+so a reader never sees a record for data that isn't there yet, and a
+session that is still running can be followed by re-reading the index.
+
+Readers load the index (one small record per block) and memory-map the
+segments, decompressing only the blocks they need (a few are kept in an
+LRU), so opening a multi-gigabyte log costs the size of its index. Searches skip blocks whose level mask or a
+whole-block regex test rules them out before splitting lines.
+
+Retention: once the archive exceeds `max_bytes`, the oldest finished
+sessions are deleted.
+"""
+from __future__ import annotations
+
+import bisect
+import mmap
+import os
+import re
+import shutil
+import struct
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+from launcher.util import json_codec
+
+BLOCK_BYTES = 64 * 1024
+SEGMENT_BYTES = 8 << 20
+SEAL_SECONDS = 1.0               # a partial block is written out once it is this old
+CACHED_BLOCKS = 16
+
+_RECORD = struct.Struct("<IIIQII")   # segment, offset, compressed length, first line, line count, levels
+_META = "meta.json"
+_INDEX = "index.bin"
+
+# Unreal verbosity, most severe first. Lines without one are plain "Log".
+FATAL, ERROR, WARNING, DISPLAY, LOG, VERBOSE = 1, 2, 4, 8, 16, 32
+LEVELS = {"Fatal": FATAL, "Error": ERROR, "Warning": WARNING, "Display": DISPLAY, "Log": LOG,
+          "Verbose": VERBOSE, "VeryVerbose": VERBOSE}
+_LEVEL_RE = re.compile(r": (Fatal|Error|Warning|Display|Verbose|VeryVerbose): ")
+_LEVEL_MARKERS = [(f": {name}: ", bit) for name, bit in LEVELS.items() if name != "Log"]
+
+
+def line_level(line: str) -> int:
+    m = _LEVEL_RE.search(line)
+    return LEVELS[m.group(1)] if m else LOG
+
+
+def levels_at_least(level: int) -> int:
+    """Mask of `level` and everything more severe (ERROR -> FATAL | ERROR)."""
+    return (level << 1) - 1
+
+
+def _block_levels(text: str) -> int:
+    # Substring tests over the whole block: a superset of the per-line levels, at C speed
+    mask = LOG
+    for marker, bit in _LEVEL_MARKERS:
+        if marker in text:
+            mask |= bit
+    return mask
+
+
+def _level_regex(mask: int) -> re.Pattern:
+    names = "|".join(name for name, bit in LEVELS.items() if bit & mask and name != "Log")
+    return re.compile(f": (?:{names}): ")
+
+
+def _scan_block(text: str, first: int, scan: re.Pattern, check: re.Pattern | None) -> Iterator[int]:
+    """Line numbers of the lines in `text` where `scan` matches (and `check` too, if given)."""
+    pos = last = 0
+    n = first
+    end_of_text = len(text)
+    while pos <= end_of_text:
+        m = scan.search(text, pos)
+        if m is None:
+            return
+        start = text.rfind("\n", 0, m.start()) + 1
+        end = text.find("\n", m.start())
+        if end < 0:
+            end = end_of_text
+        n += text.count("\n", last, start)
+        last = start
+        line = text[start:end]
+        # A match running past its line (e.g. \s+ over the line break) only counts if the line matches alone
+        if (m.end() <= end or scan.search(line) is not None) and (check is None or check.search(line) is not None):
+            yield n
+        pos = end + 1
+
+
+def _slug(key: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", key).strip("_") or "editor"
+
+
+@dataclass(slots=True)
+class ArchivedLog:
+    session_id: str
+    key: str
+    path: Path
+    started_at: float
+    ended_at: float | None = None
+    exit_code: int | None = None
+    lines: int = 0
+    size: int = 0                   # bytes on disk
+
+    @property
+    def live(self) -> bool:
+        return self.ended_at is None
+
+
+class LogArchiveWriter:
+    """
+    Appends one session's output. Call it from one thread (where the output
+    arrives); compression and disk writes happen on a private worker thread,
+    in order.
+    """
+
+    def __init__(self, path: Path, key: str, on_close: Callable[["LogArchiveWriter"], None] | None = None,
+                 block_bytes: int = BLOCK_BYTES, segment_bytes: int = SEGMENT_BYTES, level: int = 1):
+        self.path = path
+        self.key = key
+        self.block_bytes = block_bytes
+        self.segment_bytes = segment_bytes
+        self.level = level
+        self.lines = 0
+        self.raw_bytes = 0
+        self._on_close = on_close
+        self._meta = {"key": key, "started_at": time.time(), "ended_at": None, "exit_code": None, "lines": 0}
+
+        path.mkdir(parents=True, exist_ok=True)
+        self._write_meta()
+        self._index = open(path / _INDEX, "ab")
+        self._segment_no = 0
+        self._segment = None
+        self._segment_size = 0
+        self._next_segment()
+
+        self._pending: list[str] = []
+        self._pending_chars = 0
+        self._pending_since = 0.0
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-archive")
+
+    @property
+    def session_id(self) -> str:
+        return self.path.name
+
+    def write(self, text: str) -> None:
+        """Append a "\n"-separated block of lines (no trailing newline)."""
+        if not text or self._segment is None:
+            return
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.append(text)
+        self._pending_chars += len(text) + 1
+        if self._pending_chars >= self.block_bytes:
+            self.seal()
+
+    def seal_if_stale(self) -> None:
+        if self._pending and time.monotonic() - self._pending_since >= SEAL_SECONDS:
+            self.seal()
+
+    def seal(self) -> None:
+        """Compress and write whatever is pending as one block."""
+        if not self._pending or self._segment is None:
+            return
+        text = "\n".join(self._pending)
+        self._pending.clear()
+        self._pending_chars = 0
+        count = text.count("\n") + 1
+        self._io.submit(self._write_block, text, self.lines, count)
+        self.lines += count
+
+    def _write_block(self, text: str, first: int, count: int) -> None:
+        try:
+            raw = text.encode("utf-8", errors="replace")
+            blob = zlib.compress(raw, self.level)
+            if self._segment_size and self._segment_size + len(blob) > self.segment_bytes:
+                self._next_segment()
+            offset = self._segment_size
+            self._segment.write(blob)
+            self._segment.flush()
+            self._segment_size += len(blob)
+            self._index.write(_RECORD.pack(self._segment_no, offset, len(blob), first, count, _block_levels(text)))
+            self._index.flush()
+            self.raw_bytes += len(raw)
+        except OSError as exc:
+            print(f"[Logs] {self.key}: cannot write log block: {exc}")
+
+    def flush(self) -> None:
+        """Seal and wait until everything written so far is on disk."""
+        self.seal()
+        self._io.submit(lambda: None).result()
+
+    def close(self, exit_code: int | None = None) -> None:
+        if self._segment is None:
+            return
+        self.seal()
+        self._io.shutdown(wait=True)
+        self._segment.close()
+        self._index.close()
+        self._segment = None
+        self._meta.update(ended_at=time.time(), exit_code=exit_code, lines=self.lines, raw_bytes=self.raw_bytes)
+        self._write_meta()
+        if self._on_close is not None:
+            self._on_close(self)
+
+    def _next_segment(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+        self._segment_no += 1
+        self._segment = open(self.path / f"seg-{self._segment_no:06d}.zlog", "ab")
+        self._segment_size = self._segment.tell()
+
+    def _write_meta(self) -> None:
+        tmp = self.path / (_META + ".tmp")
+        tmp.write_bytes(json_codec.dumps(self._meta))
+        os.replace(tmp, self.path / _META)
+
+
+class LogArchiveReader:
+    """
+    Random access to one archived session. Not thread-safe: give each
+    thread its own reader (they are cheap).
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        self._segment_no = array("I")
+        self._offset = array("I")
+        self._length = array("I")
+        self._first_line = array("Q")
+        self._count = array("I")
+        self._levels = array("I")
+        self._index_size = 0
+        self._maps: dict[int, tuple[object, mmap.mmap]] = {}
+        self._blocks: OrderedDict[int, list[str]] = OrderedDict()
+        self.refresh()
+
+    @property
+    def line_count(self) -> int:
+        if not self._first_line:
+            return 0
+        return self._first_line[-1] + self._count[-1]
+
+    @property
+    def block_count(self) -> int:
+        return len(self._first_line)
+
+    def refresh(self) -> int:
+        """Pick up blocks written since the last call; returns the new line count."""
+        try:
+            with open(self.path / _INDEX, "rb") as fh:
+                fh.seek(self._index_size)
+                data = fh.read()
+        except OSError:
+            return self.line_count
+        usable = len(data) - len(data) % _RECORD.size
+        for seg, off, length, first, count, levels in _RECORD.iter_unpack(data[:usable]):
+            self._segment_no.append(seg)
+            self._offset.append(off)
+            self._length.append(length)
+            self._first_line.append(first)
+            self._count.append(count)
+            self._levels.append(levels)
+        self._index_size += usable
+        return self.line_count
+
+    def line(self, n: int) -> str:
+        b = self._block_of(n)
+        return self._block(b)[n - self._first_line[b]]
+
+    def lines(self, start: int, count: int) -> list[str]:
+        out: list[str] = []
+        end = min(start + count, self.line_count)
+        n = max(0, start)
+        while n < end:
+            b = self._block_of(n)
+            block = self._block(b)
+            first = self._first_line[b]
+            take = block[n - first:end - first]
+            out.extend(take)
+            n += len(take)
+        return out
+
+    def search(self, pattern: str | re.Pattern | None = None, min_level: int | None = None,
+               start_line: int = 0, cancelled: Callable[[], bool] | None = None) -> Iterator[int]:
+        """
+        Line numbers matching `pattern` (^ and $ match at line boundaries)
+        and at least as severe as `min_level`, in order.
+        """
+        if isinstance(pattern, str):
+            regex = re.compile(pattern, re.MULTILINE) if pattern else None
+        elif pattern is not None and not pattern.flags & re.MULTILINE:
+            regex = re.compile(pattern.pattern, pattern.flags | re.MULTILINE)
+        else:
+            regex = pattern
+        wanted = levels_at_least(min_level) if min_level else 0
+        # Each block is scanned as one string; only matching lines are located and split out
+        level_re = _level_regex(wanted) if wanted and not wanted & LOG else None
+        scan, check = (level_re, regex) if level_re is not None else (regex, None)
+        b = self._block_of(start_line) if start_line < self.line_count else self.block_count
+        while b < self.block_count:
+            if cancelled is not None and cancelled():
+                return
+            if wanted and not self._levels[b] & wanted:
+                b += 1
+                continue
+            first = self._first_line[b]
+            if scan is None:
+                # Plain or verbose levels requested: no marker to scan for, test line by line
+                for i, line in enumerate(self._block(b)):
+                    if first + i >= start_line and line_level(line) & wanted:
+                        yield first + i
+            else:
+                for n in _scan_block(self._block_text(b), first, scan, check):
+                    if n >= start_line:
+                        yield n
+            b += 1
+
+    def close(self) -> None:
+        for fh, mm in self._maps.values():
+            mm.close()
+            fh.close()
+        self._maps.clear()
+        self._blocks.clear()
+
+    # ------------------------------------------------------------------ blocks
+
+    def _block_of(self, n: int) -> int:
+        if not 0 <= n < self.line_count:
+            raise IndexError(n)
+        return bisect.bisect_right(self._first_line, n) - 1
+
+    def _block_text(self, b: int) -> str:
+        seg, off, length = self._segment_no[b], self._offset[b], self._length[b]
+        mm = self._map(seg, off + length)
+        return zlib.decompress(mm[off:off + length]).decode("utf-8", errors="replace")
+
+    def _block(self, b: int) -> list[str]:
+        block = self._blocks.get(b)
+        if block is not None:
+            self._blocks.move_to_end(b)
+            return block
+        block = self._block_text(b).split("\n")
+        self._blocks[b] = block
+        if len(self._blocks) > CACHED_BLOCKS:
+            self._blocks.popitem(last=False)
+        return block
+
+    def _map(self, seg: int, needed: int) -> mmap.mmap:
+        entry = self._maps.get(seg)
+        if entry is not None and len(entry[1]) >= needed:
+            return entry[1]
+        if entry is not None:
+            # The live segment grew past what was mapped
+            entry[1].close()
+            entry[0].close()
+        fh = open(self.path / f"seg-{seg:06d}.zlog", "rb")
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[seg] = (fh, mm)
+        return mm
+
+
+class LogArchive:
+    """All archived sessions under one root, capped at `max_bytes` in total."""
+
+    def __init__(self, root: str | os.PathLike, max_bytes: int = 2 << 30):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._active: set[str] = set()
+
+    def create(self, key: str) -> LogArchiveWriter:
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.enforce_retention()
+        base = f"{time.strftime('%Y%m%d-%H%M%S')}-{_slug(key)}"
+        path, n = self.root / base, 1
+        while path.exists():
+            n += 1
+            path = self.root / f"{base}-{n}"
+        writer = LogArchiveWriter(path, key, on_close=self._closed)
+        self._active.add(writer.session_id)
+        return writer
+
+    def sessions(self) -> list[ArchivedLog]:
+        """Archived sessions, newest first."""
+        if not self.root.is_dir():
+            return []
+        found = []
+        for path in self.root.iterdir():
+            log = self._load(path)
+            if log is not None:
+                found.append(log)
+        found.sort(key=lambda log: log.started_at, reverse=True)
+        return found
+
+    def open(self, session_id: str) -> LogArchiveReader:
+        return LogArchiveReader(self.root / session_id)
+
+    def total_bytes(self) -> int:
+        return sum(log.size for log in self.sessions())
+
+    def enforce_retention(self) -> list[str]:
+        """Delete the oldest finished sessions until the archive fits; returns their ids."""
+        logs = self.sessions()
+        total = sum(log.size for log in logs)
+        removed = []
+        for log in reversed(logs):
+            if total <= self.max_bytes:
+                break
+            if log.session_id in self._active:
+                continue
+            shutil.rmtree(log.path, ignore_errors=True)
+            total -= log.size
+            removed.append(log.session_id)
+        if removed:
+            print(f"[Logs] retention removed {len(removed)} old session log(s)")
+        return removed
+
+    def _closed(self, writer: LogArchiveWriter) -> None:
+        self._active.discard(writer.session_id)
+        self.enforce_retention()
+
+    @staticmethod
+    def _load(path: Path) -> ArchivedLog | None:
+        try:
+            meta = json_codec.loads((path / _META).read_bytes())
+            size = sum(f.stat().st_size for f in path.iterdir())
+        except (OSError, ValueError):
+            return None
+        lines = meta.get("lines") or 0
+        if meta.get("ended_at") is None:
+            # Still being written (or the launcher died): count from the index
+            try:
+                index = (path / _INDEX).stat().st_size
+                if index >= _RECORD.size:
+                    with open(path / _INDEX, "rb") as fh:
+                        fh.seek(index - index % _RECORD.size - _RECORD.size)
+                        rec = _RECORD.unpack(fh.read(_RECORD.size))
+                    lines = rec[3] + rec[4]
+            except OSError:
+                pass
+        return ArchivedLog(
+            session_id=path.name, key=meta.get("key", path.name), path=path,
+            started_at=meta.get("started_at") or 0.0, ended_at=meta.get("ended_at"),
+            exit_code=meta.get("exit_code"), lines=lines, size=size,
+        )
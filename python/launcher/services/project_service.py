@@ -1,87 +1,179 @@
 # services/project_service.py
 from .http_client import HttpClient
 from .auth_service import AuthService
+from .local_mirror import LocalMirror
 from launcher.domain.project import Project
 from launcher.domain.sequence import Sequence
 from launcher.domain.shot import Shot
+from launcher.util import json_codec
+from launcher.util.metrics import cache_lookup
 
+import sqlite3
 from uuid import UUID
 
 class ProjectService:
     def __init__(self, auth: AuthService, client: HttpClient | None = None):
         self.auth = auth
         self.client = client or HttpClient()
+        self.mirror: LocalMirror | None = None
+
+    def attach_mirror(self, mirror: LocalMirror | None) -> None:
+        if self.mirror is not None and self.mirror is not mirror:
+            self.mirror.close()
+        self.mirror = mirror
+
+    def _write_mirror(self, method: str, *args) -> None:
+        # The mirror is best-effort: a cache failure must never fail a fetch
+        if self.mirror is None:
+            return
+        try:
+            getattr(self.mirror, method)(*args)
+        except sqlite3.Error as exc:
+            print(f"[LocalMirror] {method} failed: {exc}")
+
+    # Cached reads for cold start / offline use; empty when no mirror is attached
+
+    def cached_projects(self) -> list[Project]:
+        return self._cached(self.mirror.projects() if self.mirror else [])
+
+    def cached_sequences(self, project_id: str | UUID) -> list[Sequence]:
+        return self._cached(self.mirror.sequences(str(project_id)) if self.mirror else [])
+
+    def cached_shots(self, sequence_id: str | UUID) -> list[Shot]:
+        return self._cached(self.mirror.shots(str(sequence_id)) if self.mirror else [])
+
+    @staticmethod
+    def _cached(items: list) -> list:
+        cache_lookup("mirror", bool(items))     # a hit means the screen could show something before the network
+        return items
+
+    def remember(self, entity: Project | Sequence | Shot) -> None:
+        """Write a single entity changed outside a fetch (e.g. a live update) to the mirror."""
+        if isinstance(entity, Project):
+            self._write_mirror("upsert_projects", [entity])
+        elif isinstance(entity, Sequence):
+            self._write_mirror("upsert_sequences", [entity])
+        elif isinstance(entity, Shot):
+            self._write_mirror("upsert_shots", [entity])
+
+    def cached_entities(self) -> list[Project | Sequence | Shot]:
+        """Everything in the mirror, e.g. to seed the search index at startup."""
+        if not self.mirror:
+            return []
+        return [*self.mirror.projects(), *self.mirror.all_sequences(), *self.mirror.all_shots()]
+
+    def search_cached(self, text: str, limit: int = 50) -> list[Project | Sequence | Shot]:
+        return self.mirror.search(text, limit) if self.mirror else []
 
     def list_my_projects(self) -> list[Project]:
-        headers = self.auth.auth_headers()
-        resp = self.client.get_with_auth_retry(self.auth, "auth/me/projects")
+        resp = self.client.get("auth/me/projects", auth=self.auth)
         resp.raise_for_status()
-        items = resp.json()
+        items = json_codec.loads(resp.content)
 
-        projects: list[Project] = []
-        for p in items:
-            count_resp = self.client.get_with_auth_retry(
-                self.auth, f"projects/{p['id']}/sequences/count"
-            )
+        projects = [self._project_from_item(p) for p in items]
+        self._write_mirror("replace_projects", projects)
+        return projects
+
+    def _project_from_item(self, p: dict) -> Project:
+        # Delta-aware servers embed the counts; otherwise ask the count endpoints
+        seq_count = p.get("sequence_count")
+        if seq_count is None:
+            count_resp = self.client.get(f"projects/{p['id']}/sequences/count", auth=self.auth)
             count_resp.raise_for_status()
-            seq_count = count_resp.json().get("sequence_count", 0)
+            seq_count = json_codec.loads(count_resp.content).get("sequence_count", 0)
 
-            # shots count (summed from Sequence.meta["shots"])
-            shot_resp = self.client.get_with_auth_retry(
-                self.auth, f"projects/{p['id']}/shots/count"
-            )
+        # shots count (summed from Sequence.meta["shots"])
+        shot_count = p.get("shot_count")
+        if shot_count is None:
+            shot_resp = self.client.get(f"projects/{p['id']}/shots/count", auth=self.auth)
             shot_resp.raise_for_status()
-            shot_count = shot_resp.json().get("shot_count", 0)
-
-            projects.append(
-                Project(
-                    id=p["id"],
-                    name=p["name"],
-                    code=p["code"],
-                    sequence_count=int(seq_count),
-                    shot_count=int(shot_count),
-                )
-            )
+            shot_count = json_codec.loads(shot_resp.content).get("shot_count", 0)
 
-        return projects
+        return Project.from_dict(p, seq_count, shot_count)
     
     def list_sequences(self, project_id: str | UUID) -> list[Sequence]:
-        resp = self.client.get_with_auth_retry(self.auth, f"projects/{project_id}/sequences")
+        resp = self.client.get(f"projects/{project_id}/sequences", auth=self.auth)
         resp.raise_for_status()
-        items = resp.json()
-
-        return [
-            Sequence(
-                id=s["id"],
-                project_id=s["project_id"],
-                code=s["code"],
-                name=s.get("name"),
-                status=s.get("status", "new"),
-                meta=s.get("meta", {}),
-            )
-            for s in items
-        ]
+        sequences = Sequence.list_from_json(resp.content)
+        self._write_mirror("replace_sequences", str(project_id), sequences)
+        return sequences
 
     def list_shots(self, project_id: str | UUID, sequence_id: str | UUID) -> list[Shot]:
        
-        resp = self.client.get_with_auth_retry(
-            self.auth, f"projects/{project_id}/sequences/{sequence_id}/shots"
+        resp = self.client.get(f"projects/{project_id}/sequences/{sequence_id}/shots", auth=self.auth)
+        resp.raise_for_status()
+        shots = Shot.list_from_json(resp.content)
+        self._write_mirror("replace_shots", str(sequence_id), shots)
+        return shots
+
+    # ------------------------------------------------------------------ delta sync
+    #
+    # Each collection keeps a cursor in the mirror. With a cursor the listing is
+    # requested with ?updated_since=<cursor>; a delta-aware server answers with
+    #     {"items": [...changed...], "deleted": [ids], "cursor": "<next>"}
+    # while older servers ignore the parameter and return the full list, which
+    # is then merged as a complete listing. Without a mirror there is no local
+    # state to merge into, so these fall back to the plain list_* calls.
+
+    def sync_projects(self) -> list[Project]:
+        if self.mirror is None:
+            return self.list_my_projects()
+
+        items, deleted, cursor, full = self._fetch_changes("auth/me/projects", "projects")
+        projects = [self._project_from_item(p) for p in items]
+        try:
+            self.mirror.sync_projects(projects, deleted, cursor, full)
+            return self.mirror.projects()
+        except sqlite3.Error as exc:
+            print(f"[LocalMirror] sync_projects failed: {exc}")
+            return projects if full else self.list_my_projects()
+
+    def sync_sequences(self, project_id: str | UUID) -> list[Sequence]:
+        if self.mirror is None:
+            return self.list_sequences(project_id)
+
+        project_id = str(project_id)
+        items, deleted, cursor, full = self._fetch_changes(
+            f"projects/{project_id}/sequences", f"sequences/{project_id}"
         )
+        sequences = [Sequence.from_dict(s) for s in items]
+        try:
+            self.mirror.sync_sequences(project_id, sequences, deleted, cursor, full)
+            return self.mirror.sequences(project_id)
+        except sqlite3.Error as exc:
+            print(f"[LocalMirror] sync_sequences failed: {exc}")
+            return sequences if full else self.list_sequences(project_id)
+
+    def sync_shots(self, project_id: str | UUID, sequence_id: str | UUID) -> list[Shot]:
+        if self.mirror is None:
+            return self.list_shots(project_id, sequence_id)
+
+        sequence_id = str(sequence_id)
+        items, deleted, cursor, full = self._fetch_changes(
+            f"projects/{project_id}/sequences/{sequence_id}/shots", f"shots/{sequence_id}"
+        )
+        shots = [Shot.from_dict(s) for s in items]
+        try:
+            self.mirror.sync_shots(sequence_id, shots, deleted, cursor, full)
+            return self.mirror.shots(sequence_id)
+        except sqlite3.Error as exc:
+            print(f"[LocalMirror] sync_shots failed: {exc}")
+            return shots if full else self.list_shots(project_id, sequence_id)
+
+    def _fetch_changes(self, path: str, collection: str) -> tuple[list[dict], list[str], str | None, bool]:
+        """Returns (items, deleted_ids, next_cursor, is_full_listing)."""
+        cursor = self.mirror.cursor(collection)
+        params = {"updated_since": cursor} if cursor else None
+
+        resp = self.client.get(path, params=params, auth=self.auth)
         resp.raise_for_status()
-        items = resp.json()
-
-        return [
-            Shot(
-                id=s["id"],
-                project_id=s["project_id"],
-                sequence_id=s["sequence_id"],
-                code=s["code"],
-                name=s.get("name"),
-                status=s.get("status", "new"),
-                meta=s.get("meta", {}),
-            )
-            for s in items
-        ]
-    
+        data = json_codec.loads(resp.content)
 
+        if isinstance(data, dict):
+            return data.get("items", []), data.get("deleted", []), data.get("cursor") or cursor, False
 
+        # Full listing: prefer the server's cursor, else the newest updated_at seen
+        next_cursor = resp.headers.get("X-Sync-Cursor") or max(
+            (i["updated_at"] for i in data if i.get("updated_at")), default=None
+        )
+        return data, [], next_cursor, True
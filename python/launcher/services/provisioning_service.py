@@ -0,0 +1,374 @@
+# services/provisioning_service.py
+"""
+Creates per-project Unreal projects from the template project.
+
+Replaces the blocking shutil.copytree of the whole template:
+
+- regenerable folders (DerivedDataCache, Intermediate, Saved) are skipped,
+  the editor rebuilds them on first open;
+- files are reflinked (copy-on-write clone) where the filesystem supports
+  it, hardlinked only when explicitly asked for (the editor rewrites some
+  files in place, which would leak into the template), and copied
+  otherwise. Links are made on a thread pool; real copies are disk-bound,
+  so they get at most COPY_WORKERS threads (one on a single core), since
+  more threads only contend for the disk;
+- every file gets the template's mtime stamped on once it is fully
+  written, and a manifest in the target records the plan, so an
+  interrupted run resumes by skipping files whose size and mtime already
+  match (a half-written file still carries the current time);
+- the manifest is marked complete only after the copy verifies;
+- once provisioned, a project is brought up to date with the template by
+  comparing content hashes (see template_manifest.py) and copying only
+  what changed. Files edited in the project are never overwritten.
+
+Runs on a worker thread; progress is reported through a callback.
+"""
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from launcher import config
+from launcher.util import json_codec
+from .template_manifest import TemplateFile, TemplateManifest, load_template_manifest
+
+MANIFEST_NAME = ".mvl_provision.json"
+
+FICLONE = 0x40049409            # linux/fs.h: _IOW(0x94, 9, int)
+_NO_REFLINK = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS}
+_PROGRESS_INTERVAL = 0.1        # seconds between progress callbacks
+COPY_WORKERS = min(2, os.cpu_count() or 1)   # threads when files are copied, not linked
+
+Progress = Callable[[int, int, int, int], None]   # done_bytes, total_bytes, done_files, total_files
+
+
+class ProvisionCancelled(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class ProvisionResult:
+    target_dir: Path
+    uproject: Path
+    mode: str
+    files: int = 0
+    copied: int = 0
+    linked: int = 0          # reflinked or hardlinked
+    skipped: int = 0         # already present from an earlier (interrupted) run
+    bytes_written: int = 0
+    seconds: float = 0.0
+    already_provisioned: bool = False   # nothing to do
+    updated: int = 0         # files refreshed from a newer template
+    removed: int = 0         # files dropped from the template
+    template_version: str | None = None
+    conflicts: list[str] = field(default_factory=list)   # edited in the project, not overwritten
+    errors: list[str] = field(default_factory=list)
+
+
+class ProvisioningService:
+    def __init__(self, template_uproject: str | os.PathLike | None = None,
+                 projects_dir: str | os.PathLike | None = None,
+                 link_mode: str | None = None, workers: int = 8, cache_dir: Path | None = None):
+        template_uproject = template_uproject or config.UPROJECT_TEMPLATE
+        self.template_uproject = Path(template_uproject) if template_uproject else None
+        self.projects_dir = Path(projects_dir or config.UNREAL_PROJECTS_DIR)
+        self.link_mode = link_mode or config.PROVISION_LINK_MODE
+        self.workers = workers
+        self.cache_dir = cache_dir    # template manifest cache, defaults to config.CACHE_DIR
+        self._reflink_ok = fcntl is not None   # cleared on the first unsupported filesystem
+
+    # ------------------------------------------------------------------ paths
+
+    @property
+    def template_dir(self) -> Path:
+        if self.template_uproject is None:
+            raise FileNotFoundError("No Unreal template project configured (Paths.uproject_template).")
+        return self.template_uproject.parent
+
+    def target_dir(self, project_name: str) -> Path:
+        return self.projects_dir / project_name
+
+    def target_uproject(self, project_name: str) -> Path:
+        return self.target_dir(project_name) / f"{project_name}.uproject"
+
+    def _target_rel(self, rel: str, project_name: str) -> str:
+        # The template's .uproject is renamed after the project on the way in
+        if rel == self.template_uproject.name:
+            return f"{project_name}.uproject"
+        return rel
+
+    # ------------------------------------------------------------------ manifest
+
+    @staticmethod
+    def read_manifest(target_dir: Path) -> dict | None:
+        try:
+            with open(target_dir / MANIFEST_NAME, "rb") as fh:
+                return json_codec.loads(fh.read())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_manifest(target_dir: Path, manifest: dict) -> None:
+        tmp = target_dir / (MANIFEST_NAME + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(json_codec.dumps(manifest))
+        os.replace(tmp, target_dir / MANIFEST_NAME)
+
+    def is_provisioned(self, project_name: str) -> bool:
+        target = self.target_dir(project_name)
+        manifest = self.read_manifest(target)
+        if manifest is not None:
+            return bool(manifest.get("complete"))
+        # Projects copied before manifests existed: the .uproject is the marker
+        return self.target_uproject(project_name).exists()
+
+    def verify(self, project_name: str, rels: Iterable[str] | None = None) -> list[str]:
+        """Relative paths (all, or just `rels`) whose size or mtime no longer match the manifest."""
+        target = self.target_dir(project_name)
+        manifest = self.read_manifest(target)
+        if manifest is None:
+            return ["<no manifest>"]
+        wanted = set(rels) if rels is not None else None
+        bad = []
+        for rel, size, mtime_ns, *_ in manifest["files"]:
+            if wanted is not None and rel not in wanted:
+                continue
+            if not self._matches(target / rel, size, mtime_ns):
+                bad.append(rel)
+        return bad
+
+    @staticmethod
+    def _matches(path: Path, size: int, mtime_ns: int) -> bool:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return st.st_size == size and st.st_mtime_ns == mtime_ns
+
+    # ------------------------------------------------------------------ provisioning
+
+    def provision(self, project_name: str, progress: Progress | None = None,
+                  cancel: threading.Event | None = None) -> ProvisionResult:
+        """Create the project from the template, or bring an existing one up to date."""
+        started = time.perf_counter()
+        target = self.target_dir(project_name)
+        result = ProvisionResult(target, self.target_uproject(project_name), self.link_mode)
+
+        existing = self.read_manifest(target)
+        if existing is None and result.uproject.exists():
+            # Copied before manifests existed; we can't tell template files from user edits
+            result.already_provisioned = True
+            return result
+
+        tm = load_template_manifest(self.template_dir, self.cache_dir)
+        result.template_version = tm.version
+
+        if existing is not None and existing.get("complete"):
+            self._update(project_name, tm, existing, result, progress, cancel)
+        else:
+            self._create(project_name, tm, existing is not None, result, progress, cancel)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def _create(self, project_name: str, tm: TemplateManifest, resuming: bool,
+                result: ProvisionResult, progress: Progress | None, cancel: threading.Event | None) -> None:
+        target = result.target_dir
+        plan = [(f, self._target_rel(f.rel, project_name)) for f in tm.files.values()]
+        result.files = len(plan)
+
+        # Record the plan first: a manifest with complete=false marks a resumable run
+        target.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "template": str(tm.root),
+            "template_version": tm.version,
+            "complete": False,
+            "files": [[dst_rel, f.size, f.mtime_ns, f.digest] for f, dst_rel in plan],
+        }
+        self._write_manifest(target, manifest)
+
+        self._copy(tm.root, target, plan, resuming, result, progress, cancel)
+
+        bad = self.verify(project_name)
+        if bad:
+            raise OSError(f"Provisioned project failed verification ({len(bad)} file(s), first: {bad[0]})")
+
+        manifest["complete"] = True
+        self._write_manifest(target, manifest)
+
+    def _update(self, project_name: str, tm: TemplateManifest, existing: dict,
+                result: ProvisionResult, progress: Progress | None, cancel: threading.Event | None) -> None:
+        """
+        Copy only template files that changed since the project was provisioned.
+
+        Files the user modified in the project (size/mtime differ from what
+        was provisioned) are left alone and reported as conflicts.
+        """
+        target = result.target_dir
+        result.files = len(tm)
+        if existing.get("template_version") == tm.version:
+            result.already_provisioned = True
+            return
+
+        old = {e[0]: e for e in existing["files"]}
+        entries: dict[str, list] = {}
+        plan: list[tuple[TemplateFile, str]] = []
+
+        for f in tm.files.values():
+            dst_rel = self._target_rel(f.rel, project_name)
+            prev = old.pop(dst_rel, None)
+            if prev is not None:
+                _, size, mtime_ns, *rest = prev
+                digest = rest[0] if rest else None
+                unchanged = f.digest == digest if digest else (f.size, f.mtime_ns) == (size, mtime_ns)
+                if unchanged:
+                    entries[dst_rel] = [dst_rel, size, mtime_ns, f.digest]
+                    continue
+                if not self._matches(target / dst_rel, size, mtime_ns) \
+                        and not self._matches(target / dst_rel, f.size, f.mtime_ns):
+                    # Edited in the project (and not by an interrupted update of ours)
+                    result.conflicts.append(dst_rel)
+                    entries[dst_rel] = prev
+                    continue
+            elif (target / dst_rel).exists() and not self._matches(target / dst_rel, f.size, f.mtime_ns):
+                result.conflicts.append(dst_rel)   # user created a file of the same name
+                continue
+            entries[dst_rel] = [dst_rel, f.size, f.mtime_ns, f.digest]
+            plan.append((f, dst_rel))
+
+        # Dropped from the template: delete unless the user changed it since
+        for dst_rel, (_, size, mtime_ns, *_rest) in old.items():
+            if self._matches(target / dst_rel, size, mtime_ns):
+                os.unlink(target / dst_rel)
+                result.removed += 1
+            elif (target / dst_rel).exists():
+                result.conflicts.append(dst_rel)
+
+        self._copy(tm.root, target, plan, True, result, progress, cancel)
+        result.updated = len(plan)
+
+        bad = self._verify_plan(target, plan)
+        if bad:
+            raise OSError(f"Updated project failed verification ({len(bad)} file(s), first: {bad[0]})")
+
+        self._write_manifest(target, {
+            "template": str(tm.root),
+            "template_version": tm.version,
+            "complete": True,
+            "files": sorted(entries.values()),
+        })
+
+    def _verify_plan(self, target: Path, plan: list[tuple[TemplateFile, str]]) -> list[str]:
+        return [dst_rel for f, dst_rel in plan if not self._matches(target / dst_rel, f.size, f.mtime_ns)]
+
+    def _copy(self, template: Path, target: Path, plan: list[tuple[TemplateFile, str]], resuming: bool,
+              result: ProvisionResult, progress: Progress | None, cancel: threading.Event | None) -> None:
+        total_bytes = sum(f.size for f, _ in plan)
+        for d in sorted({str(Path(dst_rel).parent) for _, dst_rel in plan}):
+            (target / d).mkdir(parents=True, exist_ok=True)
+
+        lock = threading.Lock()
+        state = {"bytes": 0, "files": 0, "last": 0.0}
+
+        def report(force: bool = False):
+            now = time.monotonic()
+            if progress and (force or now - state["last"] >= _PROGRESS_INTERVAL):
+                state["last"] = now
+                progress(state["bytes"], total_bytes, state["files"], len(plan))
+
+        def work(batch: list[tuple[TemplateFile, str]]):
+            for f, dst_rel in batch:
+                if cancel is not None and cancel.is_set():
+                    raise ProvisionCancelled()
+                try:
+                    how = self._place(template / f.rel, target / dst_rel, f, resuming)
+                except OSError as exc:
+                    with lock:
+                        result.errors.append(str(exc))
+                    continue
+                with lock:
+                    state["bytes"] += f.size
+                    state["files"] += 1
+                    if how == "skipped":
+                        result.skipped += 1
+                    elif how == "copied":
+                        result.copied += 1
+                        result.bytes_written += f.size
+                    else:
+                        result.linked += 1
+                    report()
+
+        # The first file tells whether this volume links; plain copies get a smaller pool
+        by_size = sorted(plan, key=lambda p: -p[0].size)
+        work(by_size[:1])
+        workers = self.workers if self._linking(result) else min(self.workers, COPY_WORKERS)
+        rest = by_size[1:]
+        if workers <= 1:
+            work(rest)
+        else:
+            # One batch per worker (a future per file costs more than copying a small
+            # .uasset). Dealing largest-first round-robin keeps the batches even.
+            batches = [rest[i::workers] for i in range(workers)]
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="provision") as pool:
+                for fut in [pool.submit(work, b) for b in batches if b]:
+                    fut.result()   # re-raises ProvisionCancelled
+        report(force=True)
+
+        if result.errors:
+            raise OSError(f"{len(result.errors)} file(s) failed to copy, first: {result.errors[0]}")
+
+    def _linking(self, result: ProvisionResult) -> bool:
+        if result.linked:
+            return True
+        if result.copied:
+            return False
+        # Nothing placed yet (skipped on resume, or failed): go by the mode
+        return self.link_mode == "hardlink" or (self.link_mode in ("reflink", "auto") and self._reflink_ok)
+
+    def _place(self, src: Path, dst: Path, f: TemplateFile, resuming: bool) -> str:
+        if resuming:
+            try:
+                st = os.stat(dst)
+                if st.st_size == f.size and st.st_mtime_ns == f.mtime_ns:
+                    return "skipped"
+            except FileNotFoundError:
+                pass
+
+        how = "copied"
+        if self.link_mode == "hardlink":
+            try:
+                if resuming and os.path.lexists(dst):
+                    os.unlink(dst)
+                os.link(src, dst)
+                return "linked"   # shares the template's inode, mtime included
+            except OSError:
+                pass  # other volume, or a filesystem without hardlinks
+        if self.link_mode in ("reflink", "auto") and self._reflink_ok and self._reflink(src, dst):
+            how = "linked"
+        else:
+            shutil.copyfile(src, dst)
+
+        # Stamped last: until then the file reads as incomplete to a resumed run
+        os.utime(dst, ns=(f.mtime_ns, f.mtime_ns))
+        return how
+
+    def _reflink(self, src: Path, dst: Path) -> bool:
+        with open(src, "rb") as fin, open(dst, "wb") as fout:
+            try:
+                fcntl.ioctl(fout.fileno(), FICLONE, fin.fileno())
+                return True
+            except OSError as exc:
+                if exc.errno in _NO_REFLINK:
+                    self._reflink_ok = False
+                return False
@@ -0,0 +1,367 @@
+# services/save_queue.py
+"""
+Durable queue for saves that take several API calls.
+
+Creating a project is two calls (POST /projects/, then POST
+/projects/access). Run inline, a failure between them left a project
+nobody could open, and saving again made a duplicate. Here a save is a
+job in a per-user SQLite file: enqueueing returns at once, a background
+worker runs the job's steps in order, and each finished step is recorded
+before the next starts, so a retry (after an error, or after the
+launcher restarts) resumes at the step that failed.
+
+Every step is sent with an Idempotency-Key derived from the job id. A
+server that honours it answers a repeated call with the original result,
+which covers the one case the queue can't see: the server did the work
+but the response was lost.
+
+Unlike the mirror (services/local_mirror.py) this file is not a cache:
+its schema is only ever migrated forward, never rebuilt.
+"""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable
+
+import requests
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from launcher import config
+from launcher.services.http_pipeline import CircuitOpen
+from launcher.util import json_codec
+from launcher.util.errors import SessionExpired, describe_error
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id              TEXT PRIMARY KEY,        -- also the idempotency key
+    kind            TEXT NOT NULL,
+    title           TEXT NOT NULL,
+    dedupe_key      TEXT,
+    payload         TEXT NOT NULL,
+    state           TEXT NOT NULL,           -- pending | running | done | failed
+    step            INTEGER NOT NULL DEFAULT 0,
+    result          TEXT,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    error           TEXT,
+    created_at      REAL NOT NULL,
+    updated_at      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_state ON jobs(state, next_attempt_at);
+CREATE INDEX IF NOT EXISTS ix_jobs_dedupe ON jobs(dedupe_key);
+"""
+
+_COLUMNS = "id, kind, title, dedupe_key, payload, state, step, result, attempts, next_attempt_at, error, created_at"
+
+# Finished jobs are kept this long for the UI, then pruned when the queue opens
+KEEP_DONE_S = 7 * 24 * 3600
+
+# HTTP statuses worth retrying; any other 4xx means the request itself is wrong
+_TRANSIENT_STATUSES = frozenset({408, 425, 429})
+
+# next_attempt_at of a job waiting for the user to sign in again rather than for a timer
+_ON_HOLD = float("inf")
+
+
+@dataclass(slots=True)
+class SaveJob:
+    id: str
+    kind: str
+    title: str
+    payload: dict
+    state: str = "pending"
+    step: int = 0                           # index of the next step to run
+    result: dict = field(default_factory=dict)      # what finished steps produced
+    attempts: int = 0                       # failed attempts at the current step
+    next_attempt_at: float = 0.0
+    error: str | None = None
+    created_at: float = 0.0
+    dedupe_key: str | None = None
+
+    @property
+    def key(self) -> str:
+        """Idempotency-Key for the current step."""
+        return self.id if self.step == 0 else f"{self.id}:{self.step}"
+
+
+# A step gets the job (payload, results of earlier steps) and records what it produced in job.result
+Step = Callable[[SaveJob], None]
+
+
+class SaveQueue(QObject):
+    job_changed = pyqtSignal(object)        # SaveJob snapshot, after every state change
+
+    _schedule = pyqtSignal(float)           # seconds until the next retry is due; hops to our thread
+
+    def __init__(self, retry_base: float = 5.0, retry_max: float = 300.0, parent=None):
+        super().__init__(parent)
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._steps: dict[str, tuple[Step, ...]] = {}
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save-queue")
+        self._queued: Future | None = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.kick)
+        self._schedule.connect(self._on_schedule)
+
+    @staticmethod
+    def path_for_user(user_id: str, cache_dir: str | Path | None = None) -> Path:
+        digest = hashlib.sha256(user_id.encode("utf-8")).hexdigest()[:16]
+        return (Path(cache_dir) if cache_dir else config.CACHE_DIR) / "jobs" / f"{digest}.sqlite3"
+
+    def register(self, kind: str, steps: tuple[Step, ...]) -> None:
+        self._steps[kind] = tuple(steps)
+
+    # ------------------------------------------------------------------ lifecycle
+
+    def open(self, path: str | Path) -> None:
+        """Open a user's queue and resume whatever it still holds."""
+        self.close()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(path), check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=FULL")       # a save must survive a power cut, not just a crash
+        with db:
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                db.close()
+                print(f"[SaveQueue] {path} is from a newer launcher; not touching it")
+                return
+            db.executescript(_SCHEMA)
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            # A job that was running when the launcher stopped resumes at its current step
+            interrupted = db.execute("UPDATE jobs SET state = 'pending' WHERE state = 'running'").rowcount
+            db.execute("DELETE FROM jobs WHERE state = 'done' AND updated_at < ?", (time.time() - KEEP_DONE_S,))
+        with self._lock:
+            self._db = db
+        pending = self.pending()
+        if pending:
+            print(f"[SaveQueue] resuming {pending} save(s)" + (f", {interrupted} interrupted" if interrupted else ""))
+        self.resume()
+
+    def close(self) -> None:
+        self._timer.stop()
+        with self._lock:
+            db, self._db = self._db, None
+        if db is not None:
+            db.close()
+
+    def stop(self) -> None:
+        self.close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------ queue
+
+    def enqueue(self, kind: str, title: str, payload: dict, dedupe_key: str | None = None) -> SaveJob:
+        """
+        Store a job and start it. A job with the same `dedupe_key` that hasn't
+        completed is returned instead (a failed one is retried), so saving
+        the same thing twice never runs it twice.
+        """
+        if kind not in self._steps:
+            raise ValueError(f"no steps registered for {kind!r}")
+        now = time.time()
+        with self._lock:
+            db = self._require_db()
+            with db:
+                row = None
+                if dedupe_key is not None:
+                    row = db.execute(
+                        f"SELECT {_COLUMNS} FROM jobs WHERE dedupe_key = ? AND state != 'done'", (dedupe_key,)
+                    ).fetchone()
+                if row is None:
+                    job = SaveJob(str(uuid.uuid4()), kind, title, payload, created_at=now, dedupe_key=dedupe_key)
+                    db.execute(
+                        f"INSERT INTO jobs ({_COLUMNS}, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (job.id, kind, title, dedupe_key, json_codec.dumps(payload).decode("utf-8"), job.state,
+                         0, None, 0, 0.0, None, now, now),
+                    )
+                else:
+                    job = _job_from_row(row)
+                    if job.state == "failed":
+                        job.state, job.attempts, job.next_attempt_at, job.error = "pending", 0, 0.0, None
+                        if job.step == 0:       # nothing reached the server yet: take the latest input
+                            job.title, job.payload = title, payload
+                        self._write(db, job)
+        self.job_changed.emit(replace(job, result=dict(job.result)))
+        self.kick()
+        return job
+
+    def jobs(self, include_done: bool = False) -> list[SaveJob]:
+        with self._lock:
+            if self._db is None:
+                return []
+            rows = self._db.execute(
+                f"SELECT {_COLUMNS} FROM jobs" + ("" if include_done else " WHERE state != 'done'")
+                + " ORDER BY created_at"
+            ).fetchall()
+        return [_job_from_row(r) for r in rows]
+
+    def get(self, job_id: str) -> SaveJob | None:
+        with self._lock:
+            if self._db is None:
+                return None
+            row = self._db.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job_from_row(row) if row else None
+
+    def pending(self) -> int:
+        with self._lock:
+            if self._db is None:
+                return 0
+            return self._db.execute("SELECT COUNT(*) FROM jobs WHERE state IN ('pending', 'running')").fetchone()[0]
+
+    def retry(self, job_id: str) -> None:
+        """Run a failed (or waiting) job again now, from the step it stopped at."""
+        with self._lock:
+            db = self._require_db()
+            with db:
+                db.execute("UPDATE jobs SET state = 'pending', attempts = 0, next_attempt_at = 0, error = NULL, "
+                           "updated_at = ? WHERE id = ? AND state != 'done'", (time.time(), job_id))
+        job = self.get(job_id)
+        if job is not None:
+            self.job_changed.emit(job)
+        self.kick()
+
+    def discard(self, job_id: str) -> None:
+        """Forget a job that hasn't completed. Steps already done stay done on the server."""
+        with self._lock:
+            db = self._require_db()
+            with db:
+                db.execute("DELETE FROM jobs WHERE id = ? AND state != 'running'", (job_id,))
+
+    # ------------------------------------------------------------------ worker
+
+    def resume(self) -> None:
+        """Run every waiting job now: whatever they waited for (network, sign-in) may be over."""
+        with self._lock:
+            if self._db is None:
+                return
+            with self._db:
+                self._db.execute("UPDATE jobs SET next_attempt_at = 0 WHERE state = 'pending'")
+        self.kick()
+
+    def kick(self) -> None:
+        """Run due jobs in the background (no-op while a run is already waiting to start)."""
+        if self._db is None or (self._queued is not None and not self._queued.running() and not self._queued.done()):
+            return
+        self._queued = self._pool.submit(self._drain)
+
+    def _on_schedule(self, delay: float) -> None:
+        if self._db is not None:
+            self._timer.start(max(0, int(delay * 1000)))
+
+    def _drain(self) -> None:
+        while True:
+            job = self._claim_next()
+            if job is None:
+                break
+            self._run(job)
+        with self._lock:
+            if self._db is None:
+                return
+            due = self._db.execute("SELECT MIN(next_attempt_at) FROM jobs WHERE state = 'pending' "
+                                   "AND next_attempt_at < ?", (_ON_HOLD,)).fetchone()[0]
+        if due is not None:
+            self._schedule.emit(due - time.time())
+
+    def _claim_next(self) -> SaveJob | None:
+        with self._lock:
+            if self._db is None:
+                return None
+            with self._db:
+                rows = self._db.execute(
+                    f"SELECT {_COLUMNS} FROM jobs WHERE state = 'pending' AND next_attempt_at <= ? "
+                    "ORDER BY created_at", (time.time(),)
+                ).fetchall()
+                for row in rows:
+                    job = _job_from_row(row)
+                    if job.kind in self._steps:
+                        job.state = "running"
+                        self._write(self._db, job)
+                        return job
+        return None
+
+    def _run(self, job: SaveJob) -> None:
+        steps = self._steps[job.kind]
+        self.job_changed.emit(replace(job, result=dict(job.result)))
+        while job.step < len(steps):
+            try:
+                steps[job.step](job)
+            except SessionExpired as exc:
+                # Signed out: wait for the next sign-in (open() resumes) rather than burning attempts
+                self._settle(job, "pending", str(exc), retry_in=None)
+                return
+            except Exception as exc:
+                transient = _is_transient(exc)
+                job.attempts += 1
+                delay = min(self.retry_max, self.retry_base * 2 ** (job.attempts - 1))
+                if isinstance(exc, CircuitOpen):
+                    delay = self.retry_max      # known down; resume() brings it forward once it's back
+                print(f"[SaveQueue] {job.title}: step {job.step + 1}/{len(steps)} failed "
+                      f"({describe_error(exc)}); " + (f"retrying in {delay:.3g} s" if transient else "giving up"))
+                self._settle(job, "pending" if transient else "failed", describe_error(exc),
+                             delay if transient else None)
+                return
+            job.step += 1
+            job.attempts = 0
+            job.error = None
+            if job.step < len(steps):
+                self._settle(job, "running")
+        self._settle(job, "done")
+        print(f"[SaveQueue] {job.title}: saved")
+
+    def _settle(self, job: SaveJob, state: str, error: str | None = None, retry_in: float | None = 0.0) -> None:
+        """Record the job's new state; `retry_in` None means not on a timer (failed, or on hold)."""
+        job.state = state
+        job.error = error
+        job.next_attempt_at = _ON_HOLD if retry_in is None else time.time() + retry_in
+        with self._lock:
+            if self._db is None:
+                return                          # signed out mid-run; the job resumes from its last step
+            with self._db:
+                self._write(self._db, job)
+        self.job_changed.emit(replace(job, result=dict(job.result)))
+
+    def _write(self, db: sqlite3.Connection, job: SaveJob) -> None:
+        db.execute(
+            "UPDATE jobs SET title = ?, payload = ?, state = ?, step = ?, result = ?, attempts = ?, "
+            "next_attempt_at = ?, error = ?, updated_at = ? WHERE id = ?",
+            (job.title, json_codec.dumps(job.payload).decode("utf-8"), job.state, job.step,
+             json_codec.dumps(job.result).decode("utf-8"), job.attempts, job.next_attempt_at, job.error,
+             time.time(), job.id),
+        )
+
+    def _require_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            raise RuntimeError("the save queue is not open (no user signed in)")
+        return self._db
+
+
+def _job_from_row(row) -> SaveJob:
+    (job_id, kind, title, dedupe_key, payload, state, step, result, attempts, next_attempt_at, error,
+     created_at) = row
+    return SaveJob(
+        job_id, kind, title, json_codec.loads(payload), state, step,
+        json_codec.loads(result) if result else {}, attempts, next_attempt_at, error, created_at, dedupe_key,
+    )
+
+
+def _is_transient(exc: Exception) -> bool:
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        return status >= 500 or status in _TRANSIENT_STATUSES
+    return isinstance(exc, requests.RequestException)       # no answer: connection, timeout, circuit open
@@ -3,7 +3,11 @@ from __future__ import annotations
 import os
 from typing import TYPE_CHECKING
 
+import requests
+
 from launcher.domain.script_breakdown import ScriptBreakdown
+from launcher.services.save_queue import SaveJob
+from launcher.util import json_codec
 
 if TYPE_CHECKING:
     from launcher.ui.app_context import AppContext
@@ -13,6 +17,7 @@ class ScriptBreakdownService:
 
     def __init__(self, ctx: AppContext):
         self._ctx = ctx
+        ctx.save_queue.register("create_project", (self._create_project, self._grant_access))
 
     def parse(self, pdf_path: str) -> ScriptBreakdown:
         if not os.path.exists(pdf_path):
@@ -29,10 +34,16 @@ class ScriptBreakdownService:
             )
 
         response.raise_for_status()
-        data = response.json()
+        data = json_codec.loads(response.content)
         return ScriptBreakdown(**data)
 
-    def save_project(self, name: str, code: str, project_type: str, breakdown: ScriptBreakdown, ai_result):
+    def save_project(self, name: str, code: str, project_type: str, breakdown: ScriptBreakdown, ai_result) -> SaveJob:
+        """
+        Queue the project for creation and return at once; the save queue
+        creates it and grants the current user access in the background.
+        Saving the same code again while that is unfinished returns the
+        same job.
+        """
         payload = {
             "name": name,
             "code": code,
@@ -53,25 +64,72 @@ class ScriptBreakdownService:
                 "ai_analysis": ai_result,
             },
         }
-
-        response = self._ctx.api_client.request(
-            "POST",
-            "/projects/",
-            json=payload,
-        )
-        response.raise_for_status()
-        project = response.json()
-
         user_kc_id = self._ctx.auth_service._current_user.id
-        access_response = self._ctx.api_client.request(
-            "POST",
-            "/projects/access",
-            json={
-                "project_id": project["id"],
-                "user_kc_id": user_kc_id,
-                "role": "admin",
-            },
+        return self._ctx.save_queue.enqueue(
+            "create_project", name, {"project": payload, "user_kc_id": user_kc_id},
+            dedupe_key=f"create_project:{code}",
         )
-        access_response.raise_for_status()
 
-        return project
\ No newline at end of file
+    # Save queue steps: the Idempotency-Key makes a resend after a lost response safe
+
+    def _create_project(self, job: SaveJob) -> None:
+        project = job.payload["project"]
+        # Kept with the job until an answer settles it: a create whose outcome is unknown may have landed
+        sent_before = bool(job.result.get("create_sent"))
+        job.result["create_sent"] = True
+        try:
+            response = self._ctx.api_client.request(
+                "POST",
+                "/projects/",
+                json=project,
+                headers={"Idempotency-Key": job.key},
+                idempotent=True,
+            )
+        except requests.HTTPError as exc:
+            if exc.response is None or exc.response.status_code != 409:
+                raise
+            # 409: the code is taken. By this job, if the server ignores Idempotency-Key and
+            # a resend after a lost response landed: carry on with that project. Anyone else's is a refusal
+            if not (sent_before or getattr(exc.response, "resent", 0)):
+                del job.result["create_sent"]       # only this send, and it was refused
+                raise
+            try:
+                existing = self._find_project(project["code"])
+            except requests.HTTPError:
+                raise exc from None                  # can't tell; the flag stays for a retry
+            if existing is None or not _same_project(existing, project):
+                del job.result["create_sent"]       # not ours: none of our sends landed
+                raise exc
+            job.result["project"] = existing
+            return
+        job.result["project"] = json_codec.loads(response.content)
+
+    def _find_project(self, code: str) -> dict | None:
+        response = self._ctx.api_client.request("GET", "/projects/", params={"code": code})
+        data = json_codec.loads(response.content)
+        items = data.get("items", []) if isinstance(data, dict) else data
+        return next((p for p in items if p.get("code") == code), None)
+
+    def _grant_access(self, job: SaveJob) -> None:
+        try:
+            self._ctx.api_client.request(
+                "POST",
+                "/projects/access",
+                json={
+                    "project_id": job.result["project"]["id"],
+                    "user_kc_id": job.payload["user_kc_id"],
+                    "role": "admin",
+                },
+                headers={"Idempotency-Key": job.key},
+                idempotent=True,
+            )
+        except requests.HTTPError as exc:
+            if exc.response is None or exc.response.status_code != 409:
+                raise
+            # 409: the grant already exists (a retry of a call whose response was lost)
+
+
+def _same_project(existing: dict, sent: dict) -> bool:
+    """The project the server has is the one this job asked for; it must echo at least one field."""
+    compared = [k for k in ("name", "type", "description") if k in existing]
+    return bool(compared) and all(existing[k] == sent.get(k) for k in compared)
@@ -0,0 +1,238 @@
+# services/search_index.py
+"""
+In-memory fuzzy search over projects, sequences and shots.
+
+Every entity is reduced to one lowercase string (name, code, status)
+and indexed by its character trigrams. A query matches an entity when at
+least MIN_SIMILARITY of the query's trigrams occur in it, so typos and
+partial codes still hit; plain substring matches rank first. Queries
+shorter than three characters fall back to a substring scan. IDs are
+matched by prefix through a sorted list instead, which keeps the UUIDs'
+~34 trigrams each out of the index.
+
+Posting lists are kept as sets for cheap incremental updates and turned
+into int bitmasks (one bit per document) on first use, so a query is a
+handful of big-int AND/OR/XOR operations regardless of how many entities
+share a trigram.
+"""
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Iterable
+
+from launcher.domain.project import Project
+from launcher.domain.sequence import Sequence
+from launcher.domain.shot import Shot
+
+MIN_SIMILARITY = 0.5
+MIN_ID_PREFIX = 4
+_ID_CHARS = frozenset("0123456789abcdef-")
+
+# byte value -> positions of its set bits
+_BYTE_BITS = [tuple(i for i in range(8) if b >> i & 1) for b in range(256)]
+
+
+@dataclass(slots=True, frozen=True)
+class SearchEntry:
+    kind: str                 # "project" | "sequence" | "shot"
+    id: str
+    project_id: str
+    sequence_id: str | None
+    text: str
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _entry(entity: Project | Sequence | Shot) -> SearchEntry:
+    if isinstance(entity, Project):
+        kind, project_id, sequence_id, status = "project", entity.id, None, ""
+    elif isinstance(entity, Sequence):
+        kind, project_id, sequence_id, status = "sequence", entity.project_id, None, entity.status
+    elif isinstance(entity, Shot):
+        kind, project_id, sequence_id, status = "shot", entity.project_id, entity.sequence_id, entity.status
+    else:
+        raise TypeError(f"Cannot index {type(entity).__name__}")
+
+    text = _normalize(f"{entity.name or ''} {entity.code} {status}")
+    return SearchEntry(
+        kind, str(entity.id), str(project_id), str(sequence_id) if sequence_id else None, text
+    )
+
+
+def _mask_from_docs(docs: Iterable[int], nbits: int) -> int:
+    buf = bytearray((nbits + 7) // 8)
+    for d in docs:
+        buf[d >> 3] |= 1 << (d & 7)
+    return int.from_bytes(buf, "little")
+
+
+def _docs_from_mask(mask: int) -> list[int]:
+    docs: list[int] = []
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    for i, byte in enumerate(data):
+        if byte:
+            base = i << 3
+            docs.extend(base + b for b in _BYTE_BITS[byte])
+    return docs
+
+
+def _at_least(masks: list[int], need: int, all_docs: int) -> int:
+    """Bitmask of documents set in at least `need` of `masks` (bit-sliced counting)."""
+    digits: list[int] = []  # per-document counters, least significant bit first
+    for m in masks:
+        carry = m
+        for i, d in enumerate(digits):
+            digits[i] = d ^ carry
+            carry &= d
+            if not carry:
+                break
+        if carry:
+            digits.append(carry)
+
+    if need.bit_length() > len(digits):
+        return 0
+
+    # Compare every counter against `need`, most significant bit first
+    gt, eq = 0, all_docs
+    for i in range(len(digits) - 1, -1, -1):
+        d = digits[i]
+        if need >> i & 1:
+            eq &= d
+        else:
+            gt |= eq & d
+            eq &= all_docs ^ d
+    return gt | eq
+
+
+class SearchIndex:
+    def __init__(self):
+        self._entries: list[SearchEntry | None] = []   # document number -> entry
+        self._doc_by_id: dict[str, int] = {}
+        self._sorted_ids: list[str] = []               # lowercase ids, for prefix lookup
+        self._doc_by_key: dict[str, int] = {}          # lowercase id -> document number
+        self._postings: dict[str, set[int]] = {}
+        self._masks: dict[str, int] = {}              # cached bitmask per trigram
+
+    def __len__(self) -> int:
+        return len(self._doc_by_id)
+
+    def add(self, entity: Project | Sequence | Shot) -> None:
+        """Index an entity, replacing any previous version with the same id."""
+        for gram in self._add(_entry(entity)):
+            self._masks.pop(gram, None)
+
+    def add_many(self, entities: Iterable[Project | Sequence | Shot]) -> None:
+        touched: set[str] = set()
+        for entity in entities:
+            touched.update(self._add(_entry(entity)))
+        if len(touched) > len(self._masks):
+            self._masks.clear()
+        else:
+            for gram in touched:
+                self._masks.pop(gram, None)
+
+    def _add(self, entry: SearchEntry) -> set[str]:
+        """Index one entry and return the trigrams whose posting lists changed."""
+        doc = self._doc_by_id.get(entry.id)
+        if doc is not None:
+            old = self._entries[doc]
+            if old == entry:
+                return set()
+            stale = self._unindex(doc)
+            self._entries[doc] = entry
+        else:
+            stale = set()
+            doc = len(self._entries)
+            self._entries.append(entry)
+            self._doc_by_id[entry.id] = doc
+            key = entry.id.lower()
+            self._doc_by_key[key] = doc
+            insort(self._sorted_ids, key)
+
+        grams = _trigrams(entry.text)
+        postings = self._postings
+        for gram in grams:
+            docs = postings.get(gram)
+            if docs is None:
+                postings[gram] = {doc}
+            else:
+                docs.add(doc)
+        return grams | stale
+
+    def remove(self, entity_id: str) -> None:
+        doc = self._doc_by_id.pop(str(entity_id), None)
+        if doc is not None:
+            for gram in self._unindex(doc):
+                self._masks.pop(gram, None)
+            key = str(entity_id).lower()
+            self._doc_by_key.pop(key, None)
+            i = bisect_left(self._sorted_ids, key)
+            if i < len(self._sorted_ids) and self._sorted_ids[i] == key:
+                del self._sorted_ids[i]
+            self._entries[doc] = None
+
+    def _unindex(self, doc: int) -> set[str]:
+        grams = _trigrams(self._entries[doc].text)
+        for gram in grams:
+            docs = self._postings.get(gram)
+            if docs is not None:
+                docs.discard(doc)
+                if not docs:
+                    del self._postings[gram]
+        return grams
+
+    def _mask(self, gram: str) -> int:
+        mask = self._masks.get(gram)
+        if mask is None:
+            docs = self._postings.get(gram)
+            mask = _mask_from_docs(docs, len(self._entries)) if docs else 0
+            self._masks[gram] = mask
+        return mask
+
+    def _match(self, q: str) -> list[int]:
+        if len(q) < 3:
+            docs = [i for i, e in enumerate(self._entries) if e is not None and q in e.text]
+        else:
+            grams = _trigrams(q)
+            # short queries tolerate one miss so results don't blink out mid-word
+            need = max(1, min(math.ceil(len(grams) * MIN_SIMILARITY), len(grams) - 1))
+            all_docs = (1 << len(self._entries)) - 1
+            docs = _docs_from_mask(_at_least([self._mask(g) for g in grams], need, all_docs))
+
+        if len(q) >= MIN_ID_PREFIX and _ID_CHARS.issuperset(q):
+            seen = set(docs)
+            docs.extend(d for d in self._id_prefix_docs(q) if d not in seen)
+        return docs
+
+    def _id_prefix_docs(self, prefix: str) -> list[int]:
+        ids, docs = self._sorted_ids, []
+        i = bisect_left(ids, prefix)
+        while i < len(ids) and ids[i].startswith(prefix):
+            docs.append(self._doc_by_key[ids[i]])
+            i += 1
+        return docs
+
+    def matches(self, query: str) -> list[SearchEntry]:
+        """All matching entries, unordered. This is the fast path for filtering."""
+        q = _normalize(query)
+        if not q:
+            return []
+        entries = self._entries
+        return [entries[d] for d in self._match(q)]
+
+    def search(self, query: str, limit: int | None = None) -> list[SearchEntry]:
+        """Matching entries, exact substring matches first."""
+        q = _normalize(query)
+        if not q:
+            return []
+        hits = self.matches(q)
+        hits.sort(key=lambda e: q not in e.text)
+        return hits[:limit] if limit else hits
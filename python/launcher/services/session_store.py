@@ -0,0 +1,249 @@
+# services/session_store.py
+"""
+Encrypted on-disk copy of the login session, so the launcher can start
+signed in: the refresh token and the cached User profile, nothing else (the
+access token is short-lived and simply refreshed).
+
+Encryption, best available:
+
+    dpapi   Windows DPAPI (CryptProtectData, current user), no key to manage
+    fernet  `cryptography`'s Fernet with a random key kept in the OS keyring
+            (`keyring`) or, without one, in a key file next to the session
+            readable only by the user
+
+With neither available the store is disabled, every launch asks for the
+password as before, and `unavailable_reason` says why for the login screen. A session that can't be decrypted, was saved for a
+different server, or whose refresh token has expired is ignored.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from launcher import config
+from launcher.domain.user import User
+from launcher.util import json_codec
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # optional dependency
+    Fernet = None
+
+try:
+    import keyring
+except ImportError:  # optional dependency
+    keyring = None
+
+FORMAT = 1
+KEYRING_SERVICE = "MVLTheater"
+KEYRING_USER = "session-key"
+
+
+@dataclass(slots=True)
+class StoredSession:
+    user: User
+    refresh_token: str
+    refresh_expires_at: float | None     # time.time(); None = no known expiry
+    server: str
+    saved_at: float
+
+
+def server_id() -> str:
+    """Which identity server a session belongs to; sessions for another one are ignored."""
+    return f"{config.KC_BASE}/realms/{config.KC_REALM}#{config.KC_CLIENT_ID}"
+
+
+# ---------------------------------------------------------------------- ciphers
+
+class _DpapiCipher:
+    name = b"D"
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class Blob(ctypes.Structure):
+            _fields_ = [("cbData", wintypes.DWORD), ("pbData", ctypes.POINTER(ctypes.c_char))]
+
+        self._ctypes = ctypes
+        self._Blob = Blob
+        self._crypt32 = ctypes.windll.crypt32
+        self._kernel32 = ctypes.windll.kernel32
+        self._entropy = b"MVLTheater.session"
+
+    def _call(self, fn, data: bytes, *middle) -> bytes:
+        ctypes = self._ctypes
+        buf = ctypes.create_string_buffer(data, len(data))
+        blob_in = self._Blob(len(data), ctypes.cast(buf, ctypes.POINTER(ctypes.c_char)))
+        ent = ctypes.create_string_buffer(self._entropy, len(self._entropy))
+        blob_ent = self._Blob(len(self._entropy), ctypes.cast(ent, ctypes.POINTER(ctypes.c_char)))
+        blob_out = self._Blob()
+        CRYPTPROTECT_UI_FORBIDDEN = 0x1
+        if not fn(ctypes.byref(blob_in), *middle, ctypes.byref(blob_ent), None, None,
+                  CRYPTPROTECT_UI_FORBIDDEN, ctypes.byref(blob_out)):
+            raise ctypes.WinError()
+        try:
+            return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+        finally:
+            self._kernel32.LocalFree(blob_out.pbData)
+
+    def encrypt(self, data: bytes) -> bytes:
+        return self._call(self._crypt32.CryptProtectData, data, "MVL Theater session")
+
+    def decrypt(self, data: bytes) -> bytes:
+        return self._call(self._crypt32.CryptUnprotectData, data, None)
+
+
+class _FernetCipher:
+    name = b"F"
+
+    def __init__(self, key: bytes):
+        self._fernet = Fernet(key)
+
+    def encrypt(self, data: bytes) -> bytes:
+        return self._fernet.encrypt(data)
+
+    def decrypt(self, data: bytes) -> bytes:
+        try:
+            return self._fernet.decrypt(data)
+        except InvalidToken as exc:
+            raise ValueError("session was encrypted with another key") from exc
+
+
+def _keyring_key() -> bytes | None:
+    if keyring is None:
+        return None
+    try:
+        key = keyring.get_password(KEYRING_SERVICE, KEYRING_USER)
+        if not key:
+            key = Fernet.generate_key().decode("ascii")
+            keyring.set_password(KEYRING_SERVICE, KEYRING_USER, key)
+        return key.encode("ascii")
+    except Exception as exc:   # no backend, locked keychain, D-Bus errors...
+        print(f"[Session] OS keyring unavailable ({exc.__class__.__name__}), using a key file")
+        return None
+
+
+def _file_key(path: Path) -> bytes:
+    try:
+        return path.read_bytes().strip()
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    key = Fernet.generate_key()
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:     # another launcher instance just made one
+        return path.read_bytes().strip()
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(key)
+    return key
+
+
+# ---------------------------------------------------------------------- store
+
+class SessionStore:
+    def __init__(self, directory: str | os.PathLike, cipher=None):
+        self.dir = Path(directory)
+        self.path = self.dir / "session.bin"
+        self.key_path = self.dir / "session.key"
+        self._cipher = cipher
+        self._resolved = cipher is not None
+        self.unavailable_reason: str | None = None    # set when no cipher could be made
+
+    @property
+    def available(self) -> bool:
+        return self._get_cipher() is not None
+
+    def load(self) -> StoredSession | None:
+        """The saved session, or None if there is none usable. Never touches the network."""
+        try:
+            blob = self.path.read_bytes()
+        except OSError:
+            return None
+        cipher = self._get_cipher()
+        if cipher is None or not blob or blob[:1] != cipher.name:
+            return None
+        try:
+            data = json_codec.loads(cipher.decrypt(blob[1:]))
+            if data.get("format") != FORMAT:
+                return None
+            u = data["user"]
+            session = StoredSession(
+                user=User(id=u["id"], email=u["email"], display_name=u.get("display_name")),
+                refresh_token=data["refresh_token"],
+                refresh_expires_at=data.get("refresh_expires_at"),
+                server=data["server"],
+                saved_at=data["saved_at"],
+            )
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            print(f"[Session] ignoring unreadable saved session: {exc}")
+            return None
+        if session.server != server_id():
+            print(f"[Session] saved session is for {session.server}, not this server")
+            return None
+        if session.refresh_expires_at is not None and session.refresh_expires_at <= time.time():
+            print("[Session] saved session has expired")
+            self.clear()
+            return None
+        return session
+
+    def save(self, user: User, refresh_token: str, refresh_expires_at: float | None = None) -> bool:
+        cipher = self._get_cipher()
+        if cipher is None or not refresh_token:
+            return False
+        now = time.time()
+        data = {
+            "format": FORMAT,
+            "server": server_id(),
+            "user": {"id": user.id, "email": user.email, "display_name": user.display_name},
+            "refresh_token": refresh_token,
+            "refresh_expires_at": refresh_expires_at,
+            "saved_at": now,
+        }
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            blob = cipher.name + cipher.encrypt(json_codec.dumps(data))
+            tmp = self.path.with_suffix(".tmp")
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(blob)
+            os.replace(tmp, self.path)
+        except OSError as exc:
+            print(f"[Session] cannot save the session: {exc}")
+            return False
+        return True
+
+    def clear(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            print(f"[Session] cannot remove the saved session: {exc}")
+
+    def _get_cipher(self):
+        if not self._resolved:
+            self._resolved = True
+            self._cipher = self._make_cipher()
+        return self._cipher
+
+    def _make_cipher(self):
+        if sys.platform == "win32":
+            try:
+                return _DpapiCipher()
+            except (AttributeError, OSError) as exc:
+                print(f"[Session] DPAPI unavailable: {exc}")
+        if Fernet is not None:
+            try:
+                return _FernetCipher(_keyring_key() or _file_key(self.key_path))
+            except (OSError, ValueError) as exc:
+                self.unavailable_reason = f"cannot set up the session key: {exc}"
+                print(f"[Session] {self.unavailable_reason}")
+                return None
+        self.unavailable_reason = "no encryption available (install 'cryptography')"
+        print(f"[Session] {self.unavailable_reason}; sessions are not remembered")
+        return None
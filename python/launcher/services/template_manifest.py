@@ -0,0 +1,169 @@
+# services/template_manifest.py
+"""
+Content manifest of the Unreal template project.
+
+Lists every file the provisioner copies with its size, mtime and a
+blake2b content hash. The manifest is cached under CACHE_DIR per template
+path; rebuilding it re-stats the tree but only re-hashes files whose size
+or mtime changed, so checking a large template for changes costs one
+directory walk. Hashing runs on a thread pool (hashlib releases the GIL
+while digesting), one batch per core.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from launcher import config
+from launcher.util import json_codec
+
+SKIP_DIRS = frozenset({"DerivedDataCache", "Intermediate", "Saved"})
+SKIP_FILES = frozenset({".mvl_provision.json", ".mvl_provision.json.tmp"})
+
+_DIGEST_SIZE = 16
+_BUF_SIZE = 1 << 20
+
+
+@dataclass(slots=True)
+class TemplateFile:
+    rel: str            # path relative to the template root, "/" separated
+    size: int
+    mtime_ns: int
+    digest: str | None = None
+
+
+def scan_template(root: Path, skip_dirs=SKIP_DIRS) -> list[TemplateFile]:
+    """All files under `root`, minus regenerable folders and launcher bookkeeping."""
+    files: list[TemplateFile] = []
+    stack = [(root, "")]
+    while stack:
+        path, prefix = stack.pop()
+        with os.scandir(path) as it:
+            for entry in it:
+                rel = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in skip_dirs:
+                        stack.append((Path(entry.path), rel + "/"))
+                elif entry.is_file() and entry.name not in SKIP_FILES:
+                    st = entry.stat()
+                    files.append(TemplateFile(rel, st.st_size, st.st_mtime_ns))
+    files.sort(key=lambda f: f.rel)
+    return files
+
+
+def hash_file(path: str | os.PathLike) -> str:
+    h = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    buf = bytearray(_BUF_SIZE)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as fh:
+        while n := fh.readinto(buf):
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+def hash_files(root: Path, files: list[TemplateFile], workers: int | None = None) -> None:
+    """Fill in `digest` for `files`, in parallel."""
+    if not files:
+        return
+    workers = max(1, min(workers or os.cpu_count() or 1, len(files)))
+
+    def work(batch: list[TemplateFile]):
+        for f in batch:
+            f.digest = hash_file(root / f.rel)
+
+    # Largest first, dealt round-robin, so every worker gets a similar byte count
+    by_size = sorted(files, key=lambda f: -f.size)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash") as pool:
+        for fut in [pool.submit(work, by_size[i::workers]) for i in range(workers)]:
+            fut.result()
+
+
+class TemplateManifest:
+    def __init__(self, root: Path, files: dict[str, TemplateFile]):
+        self.root = Path(root)
+        self.files = files
+        self.hashed = 0   # files hashed by the last build (the rest reused cached digests)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    @property
+    def total_size(self) -> int:
+        return sum(f.size for f in self.files.values())
+
+    @property
+    def version(self) -> str:
+        """Hash over every (path, digest) pair: equal versions mean identical templates."""
+        h = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+        for rel in sorted(self.files):
+            h.update(f"{rel}\0{self.files[rel].digest}\n".encode("utf-8"))
+        return h.hexdigest()
+
+    # ------------------------------------------------------------------ build
+
+    @classmethod
+    def build(cls, root: Path, previous: "TemplateManifest | None" = None,
+              workers: int | None = None) -> "TemplateManifest":
+        root = Path(root)
+        files = scan_template(root)
+        known = previous.files if previous is not None else {}
+
+        stale = []
+        for f in files:
+            old = known.get(f.rel)
+            if old is not None and old.size == f.size and old.mtime_ns == f.mtime_ns and old.digest:
+                f.digest = old.digest
+            else:
+                stale.append(f)
+        hash_files(root, stale, workers)
+
+        manifest = cls(root, {f.rel: f for f in files})
+        manifest.hashed = len(stale)
+        return manifest
+
+    # ------------------------------------------------------------------ persistence
+
+    @staticmethod
+    def cache_path(root: Path, cache_dir: Path | None = None) -> Path:
+        key = hashlib.sha256(str(Path(root).resolve()).encode("utf-8")).hexdigest()[:16]
+        return Path(cache_dir or config.CACHE_DIR) / "templates" / f"{key}.json"
+
+    @classmethod
+    def load(cls, path: Path) -> "TemplateManifest | None":
+        try:
+            with open(path, "rb") as fh:
+                data = json_codec.loads(fh.read())
+            files = {rel: TemplateFile(rel, size, mtime_ns, digest)
+                     for rel, size, mtime_ns, digest in data["files"]}
+            return cls(Path(data["root"]), files)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "root": str(self.root),
+            "files": [[f.rel, f.size, f.mtime_ns, f.digest] for f in self.files.values()],
+        }
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(json_codec.dumps(data))
+        os.replace(tmp, path)
+
+
+def load_template_manifest(root: Path, cache_dir: Path | None = None,
+                           workers: int | None = None) -> TemplateManifest:
+    """Current manifest of `root`, reusing (and refreshing) the cached one."""
+    path = TemplateManifest.cache_path(root, cache_dir)
+    previous = TemplateManifest.load(path)
+    manifest = TemplateManifest.build(root, previous, workers)
+    if previous is None or manifest.hashed or len(manifest) != len(previous) \
+            or any(f.mtime_ns != previous.files[f.rel].mtime_ns for f in manifest.files.values()):
+        try:
+            manifest.save(path)
+        except OSError as exc:
+            print(f"[Provision] could not cache template manifest: {exc}")
+    return manifest
@@ -1,75 +1,295 @@
-from PyQt6.QtCore import QObject, QProcess, pyqtSignal
+from PyQt6.QtCore import QObject, QProcess, QTimer, pyqtSignal
 from .http_client import HttpClient
 from .auth_service import AuthService
 
 from PyQt6.QtCore import QProcess, QProcessEnvironment
 
 import os
+import re
+import secrets
 import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from launcher import config
+from launcher.util.path_probe import PathProbe
+from .admission import QUEUE, WARN, AdmissionController, AdmissionPolicy
+from .editor_ipc import (
+    EditorEndpoint, EditorIpcClient, EditorIpcError, EditorRegistry, EditorUnreachable,
+    same_file,
+)
+from .editor_session import FAILED, EditorSession
+from .log_archive import LogArchive
+from .watchdog import CRASH, HANG, KILL, RELAUNCH, SessionWatch, WatchdogPolicy, WatchdogReport
+
+SAMPLE_INTERVAL_MS = 2000
+
+
+class SessionLimitReached(RuntimeError):
+    """Too many editors or too few resources, and queueing is disabled."""
+
+
+@dataclass(slots=True)
+class Handoff:
+    """A switch_scope on its way to a running editor; `handoff_finished` reports the answer."""
+    key: str
+    uproject: str
+    env: dict[str, str]
+    session: EditorSession | None = None    # ours, if the project is open in an editor we started
+    target: EditorSession | EditorEndpoint | None = None    # what took the scope; None: launch afresh
+    done: bool = False
+
 
 class TheaterService(QObject):
+    """
+    Runs Unreal editor sessions, several at once, keyed by project/sequence.
+
+    Each session owns its process, log buffer and status (see
+    EditorSession). RSS / CPU of running sessions is sampled every
+    SAMPLE_INTERVAL_MS while any are alive.
+
+    Launches go through admission control first (services/admission.py):
+    on a busy machine they start with a warning or wait in a queue, which
+    is re-checked on the same timer and whenever an editor exits.
+
+    With an `ipc_dir`, editors are started with the IPC environment from
+    services/editor_ipc.py, and handoff() can hand a new sequence to an
+    editor that already has the project open. The IPC round trip runs on
+    a worker thread; the answer comes back through `handoff_finished`.
+
+    A watchdog (services/watchdog.py) checks every running session on the
+    sampling tick for hangs and crashes, saves a report and, per its
+    policy, kills or relaunches the editor.
+    """
+    # Any session (kept for listeners that don't care which)
     started = pyqtSignal()
     finished = pyqtSignal(int)
-    output = pyqtSignal(str)
-    error = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    session_started = pyqtSignal(object)    # EditorSession
+    session_finished = pyqtSignal(object)   # EditorSession
+    session_queued = pyqtSignal(object)     # EditorSession (reason in .queued_reason)
+    sessions_changed = pyqtSignal()
+    admission_warning = pyqtSignal(str)     # a launch went ahead on a busy machine
+    session_unhealthy = pyqtSignal(object, object)   # EditorSession, WatchdogReport
+    handoff_finished = pyqtSignal(object)   # Handoff, once the editor answered (or didn't)
+    _handoff_answered = pyqtSignal(object, object)   # Handoff, Future; from the switch worker
 
-    def __init__(self, auth: AuthService, client: HttpClient | None = None, parent = None):
+    def __init__(self, auth: AuthService, client: HttpClient | None = None, parent = None,
+                 log_dir: str | os.PathLike | None = None, max_sessions: int | None = None,
+                 admission: AdmissionController | None = None, queue_when_busy: bool | None = None,
+                 ipc_dir: str | os.PathLike | None = None, probe: PathProbe | None = None,
+                 watchdog: WatchdogPolicy | None = None):
         super().__init__(parent)
-        self.proc = QProcess(self)
-        self.proc.started.connect(self.started)
-        self.proc.finished.connect(lambda code, status: self.finished.emit(code))
-        self.proc.errorOccurred.connect(self._on_err)
-        self.proc.started.connect(lambda: print("[QProcess] started"))
-        self.proc.finished.connect(lambda code, status: print(f"[QProcess] finished code={code} status={status}"))
-        self.proc.readyReadStandardError.connect(self._on_err)
-        self.proc.readyReadStandardOutput.connect(self._on_out)
-
-    def launch(self, editor_exe: str, uproject: str, args=None, env: dict[str, str] | None = None):
+        self.probe = probe or PathProbe(config.PATH_PROBE_TTL)
+        self.log_dir = Path(log_dir) if log_dir is not None else None
+        self.archive = (LogArchive(self.log_dir / "archive", config.LOG_ARCHIVE_MAX_MB << 20)
+                        if self.log_dir is not None else None)
+        self.registry = EditorRegistry(ipc_dir) if ipc_dir is not None else None
+        self.admission = admission or AdmissionController(AdmissionPolicy.from_config())
+        if max_sessions is not None:
+            self.admission.policy.max_editors = max_sessions
+        self.queue_when_busy = config.LAUNCH_QUEUE_WHEN_BUSY if queue_when_busy is None else queue_when_busy
+        self.watchdog = watchdog or WatchdogPolicy.from_config()
+        self.report_dir = self.log_dir / "reports" if self.log_dir is not None else None
+        self.sessions: dict[str, EditorSession] = {}
+        self._queue: list[EditorSession] = []
+        self._relaunches: dict[str, int] = {}       # key -> watchdog relaunches in a row
+        self._pinger: ThreadPoolExecutor | None = None
+        self._switcher: ThreadPoolExecutor | None = None    # switch_scope round trips, off the GUI thread
+        self._handoffs: dict[str, Handoff] = {}     # key -> waiting for the editor's answer
+        self._handoff_answered.connect(self._on_handoff_answered)
+
+        self._sampler = QTimer(self)
+        self._sampler.setInterval(SAMPLE_INTERVAL_MS)
+        self._sampler.timeout.connect(self.sample)
+
+    @property
+    def max_sessions(self) -> int:
+        return self.admission.policy.max_editors
+
+    def running(self) -> list[EditorSession]:
+        return [s for s in self.sessions.values() if s.is_alive()]
+
+    def queued(self) -> list[EditorSession]:
+        return list(self._queue)
+
+    def session(self, key: str) -> EditorSession | None:
+        return self.sessions.get(key)
+
+    def is_running(self, key: str | None = None) -> bool:
+        if key is None:
+            return bool(self.running())
+        s = self.sessions.get(key)
+        return s is not None and s.is_alive()
+
+    def launch(self, editor_exe: str, uproject: str, args=None, env: dict[str, str] | None = None,
+               key: str | None = None) -> EditorSession:
+        """
+        Start an editor session and return it immediately; its `started`,
+        `failed` and `finished` signals report what happens next. If the
+        machine is too busy the session is returned queued (status "queued")
+        and starts by itself once admission allows.
+        """
         args = args or []
+        key = key or uproject
 
-        # Hard validation (do this first!)
-        if not os.path.exists(editor_exe):
+        # Hard validation (do this first!) - cached, the paths may be on a network drive
+        if not self.probe.exists(editor_exe):
             raise FileNotFoundError(f"UnrealEditor not found: {editor_exe}")
-        if not os.path.exists(uproject):
+        if not self.probe.exists(uproject):
             raise FileNotFoundError(f".uproject not found: {uproject}")
+        self._relaunches.pop(key, None)
+        existing = self.sessions.get(key)
+        if existing is not None and existing.is_queued():
+            raise RuntimeError(f"{key} is already waiting to open.")
+        if self.is_running(key):
+            raise RuntimeError(f"{key} is already open in an editor.")
 
-        # Working directory helps on Windows
-        self.proc.setWorkingDirectory(os.path.dirname(uproject))
+        decision = self.admission.check(len(self.running()))
+        if self._queue and decision.admitted:
+            # First come, first served: don't overtake launches already waiting
+            decision.verdict = QUEUE
+            decision.reasons = [f"{len(self._queue)} launch(es) waiting ahead"]
+        if not decision.admitted and not self.queue_when_busy:
+            raise SessionLimitReached(f"Cannot open {key} now: {decision.message()}.")
 
-        # Env
-        if env:
-            pe = QProcessEnvironment.systemEnvironment()
-            for k, v in env.items():
-                pe.insert(k, str(v))
-            self.proc.setProcessEnvironment(pe)
+        if existing is not None:
+            del self.sessions[key]
+            existing.deleteLater()
 
-        # Ensure we see logs if -log is used
-        self.proc.setProcessChannelMode(QProcess.ProcessChannelMode.SeparateChannels)
+        token = ""
+        if self.registry is not None:
+            token = secrets.token_urlsafe(16)
+            env = {**(env or {}), "MVL_IPC_DIR": str(self.registry.dir), "MVL_IPC_TOKEN": token}
+            self.registry.dir.mkdir(parents=True, exist_ok=True)
 
-        # Start
-        self.proc.start(editor_exe, [uproject, *args])
+        session = EditorSession(key, editor_exe, uproject, args, env, parent=self)
+        session.ipc_token = token
+        session.started.connect(lambda: self._on_session_started(session))
+        session.finished.connect(lambda code: self._on_session_finished(session, code))
+        session.failed.connect(lambda msg: self._on_session_failed(session, msg))
+        self.sessions[key] = session
 
-        # If it fails to start, show why
-        if not self.proc.waitForStarted(5000):
-            raise RuntimeError(f"Failed to start process: {self.proc.errorString()}")
+        if decision.admitted:
+            self._start(session, decision)
+        else:
+            session.queue(decision.message())
+            self._queue.append(session)
+            print(f"[Theater] {key} queued: {session.queued_reason}")
+            if not self._sampler.isActive():
+                self._sampler.start()
+            self.session_queued.emit(session)
+        self.sessions_changed.emit()
+        return session
+
+    def handoff(self, uproject: str, env: dict[str, str], key: str) -> EditorSession | Handoff | None:
+        """
+        Open `key` in an editor that already has `uproject` open. Returns
+        None when a fresh launch is needed.
+
+        An editor of ours that is still queued or loading gets the new scope
+        in its environment / once it registers, rather than a second editor:
+        that session is returned. A running editor (ours, or one started by
+        an earlier launcher run) is sent switch_scope with `env` from a worker
+        thread, and a Handoff is returned; `handoff_finished` settles it,
+        with its `target` None if no editor took the scope.
+        """
+        if self.registry is None:
+            return None
+        current = self.sessions.get(key)
+        if current is not None and (current.is_alive() or current.is_queued()):
+            return current
+        pending = self._handoffs.get(key)
+        if pending is not None:
+            return pending
+
+        for s in [*self.queued(), *self.running()]:
+            if not same_file(s.uproject, uproject):
+                continue
+            if s.is_queued():
+                s.env = {**(s.env or {}), **env}
+                print(f"[Theater] {s.key} (queued) will open as {key}")
+                self._rekey(s, key)
+                return s
+            ep = self.registry.get(s.pid) if s.pid else None
+            if ep is None or ep.token != s.ipc_token:
+                s.pending_scope = dict(env)
+                print(f"[Theater] {s.key} still loading; switching to {key} once it is ready")
+                self._rekey(s, key)
+                return s
+            return self._send_handoff(Handoff(key, uproject, dict(env), session=s), [ep])
+
+        # Editors left over from an earlier launcher run
+        endpoints = self.registry.find(uproject)
+        if not endpoints:
+            return None
+        return self._send_handoff(Handoff(key, uproject, dict(env)), endpoints)
+
+    def stop(self, key: str) -> None:
+        s = self.sessions.get(key)
+        if s is None:
+            return
+        if s.is_queued():
+            self._queue.remove(s)
+            s.cancel()
+            self.sessions_changed.emit()
+        else:
+            s.terminate()
+
+    def stop_all(self) -> None:
+        for s in self.queued():
+            self.stop(s.key)
+        for s in self.running():
+            s.terminate()
+
+    def shutdown(self) -> None:
+        """Stop sampling and the IPC workers (watchdog pings, switches); running editors are left open."""
+        self._sampler.stop()
+        for pool in (self._pinger, self._switcher):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._pinger = self._switcher = None
+
+    def sample(self) -> None:
+        """Refresh RSS / CPU of every running session, check their health and retry the queue."""
+        alive = self.running()
+        for s in alive:
+            s.sample()
+            self._check_health(s)
+        self._deliver_pending_scopes(alive)
+        self._drain_queue()
+        if not alive and not self._queue:
+            self._sampler.stop()
 
     def launch_detached(self, editor_exe: str, uproject: str, args=None, env=None):
         args = args or []
 
+        proc = QProcess()
+        proc.setProgram(editor_exe)
+        proc.setArguments([uproject, *args])
+        proc.setWorkingDirectory(os.path.dirname(uproject))
         if env:
             pe = QProcessEnvironment.systemEnvironment()
             for k, v in env.items():
                 pe.insert(k, str(v))
-            self.proc.setProcessEnvironment(pe)
+            proc.setProcessEnvironment(pe)
 
-        ok = QProcess.startDetached(editor_exe, [uproject, *args], os.path.dirname(uproject))
+        ok, _pid = proc.startDetached()
         if not ok:
             raise RuntimeError("startDetached failed (check paths/permissions).")
 
 
 
-    def launch_with_subprocess(self, editor_exe: str, uproject: str, args=None, env=None):
-        args = args or []
+    def launch_with_subprocess(self, editor_exe: str, uproject: str, args=None, env=None,
+                               key: str | None = None) -> subprocess.Popen:
+        """
+        Start the editor outside Qt's event loop. Output goes to the session's
+        log file (or is discarded); `finished` is emitted from a watcher thread.
+        """
+        args = args if args is not None else ["-MVLEditor"]
 
         # Hard validation (do this first!)
         if not os.path.exists(editor_exe):
@@ -77,11 +297,204 @@ class TheaterService(QObject):
         if not os.path.exists(uproject):
             raise FileNotFoundError(f".uproject not found: {uproject}")
 
-        subprocess.run([editor_exe,uproject, "-MVLEditor"], env=env, shell=True, check=True)
+        log_path = self._log_path(key or uproject)
+        if log_path is not None:
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            sink = open(log_path, "ab")
+        else:
+            sink = subprocess.DEVNULL
+        try:
+            popen = subprocess.Popen(
+                [editor_exe, uproject, *args], env={**os.environ, **env} if env else None,
+                cwd=os.path.dirname(uproject),
+                stdout=sink, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+            )
+        finally:
+            if sink is not subprocess.DEVNULL:
+                sink.close()   # the child keeps its own handle
+
+        def wait():
+            self.finished.emit(popen.wait())
+        threading.Thread(target=wait, name="editor-wait", daemon=True).start()
+        return popen
+
+    # ------------------------------------------------------------------ sessions
+
+    def _send_handoff(self, handoff: Handoff, endpoints: list[EditorEndpoint]) -> Handoff:
+        self._handoffs[handoff.key] = handoff
+        fut = self._switch_pool().submit(self._switch_first, endpoints, handoff.env)
+        fut.add_done_callback(lambda f: self._handoff_answered.emit(handoff, f))
+        return handoff
+
+    def _on_handoff_answered(self, handoff: Handoff, fut: Future) -> None:
+        if self._handoffs.get(handoff.key) is handoff:
+            del self._handoffs[handoff.key]
+        ep = fut.result() if not fut.cancelled() and fut.exception() is None else None
+        s = handoff.session
+        if ep is not None and s is not None:
+            if s.is_alive():        # it may have exited while the switch was on its way
+                self._rekey(s, handoff.key)
+                handoff.target = s
+        else:
+            handoff.target = ep
+        handoff.done = True
+        self.handoff_finished.emit(handoff)
+
+    def _switch_pool(self) -> ThreadPoolExecutor:
+        if self._switcher is None:
+            self._switcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="editor-switch")
+        return self._switcher
+
+    def _switch_first(self, endpoints: list[EditorEndpoint], env: dict[str, str]) -> EditorEndpoint | None:
+        # Switch-worker thread: the first editor that takes the scope
+        for ep in endpoints:
+            if self._switch(ep, env):
+                return ep
+        return None
+
+    def _switch(self, ep: EditorEndpoint, env: dict[str, str]) -> bool:
+        try:
+            reply = EditorIpcClient(ep).switch_scope(env)
+        except EditorUnreachable:
+            self.registry.forget(ep)
+            return False
+        except EditorIpcError as exc:
+            print(f"[Theater] switch_scope to pid={ep.pid} failed: {exc}")
+            return False
+        print(f"[Theater] pid={ep.pid} switched to scope {reply.get('scope', '?')}")
+        return True
+
+    def _deliver_pending_scopes(self, alive: list[EditorSession]) -> None:
+        if self.registry is None:
+            return
+        for s in alive:
+            if s.pending_scope is None or not s.pid:
+                continue
+            ep = self.registry.get(s.pid)
+            if ep is not None and ep.token == s.ipc_token:
+                env, s.pending_scope = s.pending_scope, None
+                self._switch_pool().submit(self._switch, ep, env)
+
+    def _rekey(self, session: EditorSession, key: str) -> None:
+        if session.key == key:
+            return
+        if self.sessions.get(session.key) is session:
+            del self.sessions[session.key]
+        stale = self.sessions.pop(key, None)
+        if stale is not None and stale is not session:
+            stale.deleteLater()
+        session.key = key
+        self.sessions[key] = session
+        self.sessions_changed.emit()
+
+    def _start(self, session: EditorSession, decision) -> None:
+        if decision.verdict == WARN:
+            message = f"{session.key}: starting on a busy machine ({decision.message()})"
+            print(f"[Theater] {message}")
+            self.admission_warning.emit(message)
+        self.admission.admitted()
+        if self.archive is not None:
+            try:
+                session.archive = self.archive.create(session.key)
+            except OSError as exc:
+                print(f"[Theater] cannot archive the log of {session.key}: {exc}")
+        session.watch = SessionWatch(session, self.watchdog)
+        session.output.connect(session.watch.feed)
+        session.error.connect(session.watch.feed)
+        session.start()
+
+    # ------------------------------------------------------------------ watchdog
+
+    def _check_health(self, session: EditorSession) -> None:
+        if session.watch is None:
+            return
+        if self._pinger is None:
+            self._pinger = ThreadPoolExecutor(max_workers=1, thread_name_prefix="editor-ping")
+        verdict = session.watch.check(self.registry, self._pinger)
+        if session.watch.ready:
+            self._relaunches.pop(session.key, None)     # came up fine: the relaunch budget is per failure streak
+        if verdict is not None:
+            self._flag(session, *verdict)
+
+    def _flag(self, session: EditorSession, kind: str, reason: str, exit_code: int | None = None) -> WatchdogReport:
+        watch = session.watch
+        watch.flagged = kind
+        report = watch.report(kind, reason, exit_code)
+        if self.report_dir is not None:
+            try:
+                report.save(self.report_dir)
+            except OSError as exc:
+                print(f"[Watchdog] cannot save report for {session.key}: {exc}")
+        print(f"[Watchdog] {report.summary()}" + (f" (report: {report.path})" if report.path else ""))
+
+        action = self.watchdog.action
+        if kind in (HANG, CRASH) and session.is_alive() and action in (KILL, RELAUNCH):
+            watch.relaunch = action == RELAUNCH
+            print(f"[Watchdog] killing {session.key} pid={session.pid}")
+            session.kill()
+        self.session_unhealthy.emit(session, report)
+        return report
+
+    def _after_exit(self, session: EditorSession, code: int) -> None:
+        watch = session.watch
+        if watch is None:
+            return
+        unexpected = not session.stop_requested and (session.status == FAILED or code != 0)
+        if unexpected and watch.flagged != CRASH:
+            self._flag(session, CRASH, f"editor exited with code {code}"
+                       + (" (crashed)" if session.status == FAILED else ""), exit_code=code)
+        relaunch = watch.relaunch or (unexpected and self.watchdog.action == RELAUNCH)
+        if not relaunch:
+            return
+        count = self._relaunches.get(session.key, 0)
+        if count >= self.watchdog.max_relaunches:
+            print(f"[Watchdog] not relaunching {session.key}: {count} relaunch(es) already")
+            return
+        env = {k: v for k, v in (session.env or {}).items() if k not in ("MVL_IPC_DIR", "MVL_IPC_TOKEN")}
+        print(f"[Watchdog] relaunching {session.key}")
+        try:
+            self.launch(session.editor_exe, session.uproject, session.args, env, session.key)
+        except (OSError, RuntimeError) as exc:
+            print(f"[Watchdog] relaunch of {session.key} failed: {exc}")
+            return
+        self._relaunches[session.key] = count + 1
+
+    def _drain_queue(self) -> None:
+        # One launch per check: the next check sees the load it adds
+        if not self._queue:
+            return
+        head = self._queue[0]
+        decision = self.admission.check(len(self.running()))
+        if not decision.admitted:
+            head.queued_reason = decision.message()
+            return
+        self._queue.pop(0)
+        print(f"[Theater] {head.key} leaving the queue")
+        self._start(head, decision)
+        self.sessions_changed.emit()
+
+    def _log_path(self, key: str) -> Path | None:
+        if self.log_dir is None:
+            return None
+        slug = re.sub(r"[^A-Za-z0-9._-]+", "_", key).strip("_") or "editor"
+        return self.log_dir / f"{slug}.log"
 
-    def _on_out(self):
-        self.output.emit(bytes(self.proc.readAllStandardOutput()).decode(errors="replace"))
+    def _on_session_started(self, session: EditorSession):
+        if not self._sampler.isActive():
+            self._sampler.start()
+        self.session_started.emit(session)
+        self.started.emit()
+        self.sessions_changed.emit()
 
-    def _on_err(self):
-        self.error.emit(bytes(self.proc.readAllStandardError()).decode(errors="replace"))
+    def _on_session_finished(self, session: EditorSession, code: int):
+        self.session_finished.emit(session)
+        self.finished.emit(code)
+        self.sessions_changed.emit()
+        self._after_exit(session, code)
+        self._drain_queue()
 
+    def _on_session_failed(self, session: EditorSession, message: str):
+        self.failed.emit(f"{session.key}: {message}")
+        if not session.is_alive():
+            self.sessions_changed.emit()
+            self._drain_queue()
@@ -0,0 +1,220 @@
+# services/watchdog.py
+"""
+Hang and crash detection for running editor sessions.
+
+Signals watched, all cheap:
+
+    output      time of the last output batch (heartbeat)
+    milestones  startup markers found in output batches with plain substring
+                tests, one per *batch* and only for markers not yet seen
+                (no per-line regex on the GUI thread)
+    cpu         cumulative CPU time from the 2 s resource samples
+    ipc         once the editor has registered (services/editor_ipc.py), a
+                "hello" round trip every PING_INTERVAL, off the GUI thread
+
+Verdicts:
+
+    hang            starting up: silent for `startup_silence` seconds while
+                    the CPU is idle too (a silent but busy editor is compiling
+                    shaders, not hung). After startup: IPC pings keep failing.
+    startup_timeout the "ready" milestone hasn't appeared after `startup_timeout`
+    crash           a crash marker in the output (the crash reporter can keep
+                    the process alive), or an unexpected non-zero / crash exit
+
+Each verdict produces one WatchdogReport (last N log lines, process stats,
+milestone timings) saved as JSON. TheaterService then reports, kills or
+kills-and-relaunches per `action`.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from launcher import config
+from launcher.util import json_codec
+from .editor_ipc import EditorIpcClient, EditorIpcError, EditorRegistry
+
+# (name, marker) in the order the editor reaches them; the last one means "ready"
+STARTUP_MILESTONES = [
+    ("engine_init", "Engine is initialized"),
+    ("map_loaded", "LogLoad: Took "),
+    ("ready", "(Engine Initialization) Total time:"),
+]
+CRASH_MARKERS = ("=== Critical error: ===", "Fatal error: [File:", "LogWindows: Error: appError called")
+
+PING_INTERVAL = 10.0
+REPORT_LINES = 200
+
+HANG = "hang"
+STARTUP_TIMEOUT = "startup_timeout"
+CRASH = "crash"
+
+REPORT = "report"
+KILL = "kill"
+RELAUNCH = "relaunch"
+
+
+@dataclass(slots=True)
+class WatchdogPolicy:
+    startup_silence: float = 180.0     # seconds of silence (with idle CPU) before startup counts as hung
+    idle_cpu_percent: float = 2.0      # below this the process is considered idle
+    startup_timeout: float = 1800.0    # seconds to reach "ready"
+    ping_failures: int = 3             # consecutive failed IPC pings after startup
+    action: str = REPORT               # report | kill | relaunch
+    max_relaunches: int = 1
+
+    @classmethod
+    def from_config(cls) -> "WatchdogPolicy":
+        return cls(
+            startup_silence=config.WATCHDOG_STARTUP_SILENCE,
+            startup_timeout=config.WATCHDOG_STARTUP_TIMEOUT,
+            ping_failures=config.WATCHDOG_PING_FAILURES,
+            action=config.WATCHDOG_ACTION,
+            max_relaunches=config.WATCHDOG_MAX_RELAUNCHES,
+        )
+
+
+@dataclass(slots=True)
+class WatchdogReport:
+    key: str
+    kind: str                          # HANG | STARTUP_TIMEOUT | CRASH
+    reason: str
+    detected_at: float                 # time.time()
+    pid: int | None
+    uptime: float
+    silent_for: float
+    rss: int
+    cpu_percent: float
+    cpu_seconds: float
+    exit_code: int | None
+    milestones: dict[str, float]       # name -> seconds after start
+    last_lines: list[str] = field(default_factory=list)
+    path: str = ""                     # where it was saved
+
+    def summary(self) -> str:
+        return f"{self.key}: {self.kind} - {self.reason}"
+
+    def save(self, directory: Path) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = "".join(c if c.isalnum() or c in "._-" else "_" for c in self.key)
+        path = directory / f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(self.detected_at))}-{slug}-{self.kind}.json"
+        self.path = str(path)
+        path.write_bytes(json_codec.dumps(asdict(self)))
+        return path
+
+
+class SessionWatch:
+    """Watch state of one session. feed() is connected to its output; check() runs on the sampling tick."""
+
+    def __init__(self, session, policy: WatchdogPolicy, clock=time.monotonic):
+        self.session = session
+        self.policy = policy
+        self.clock = clock
+        self.started = clock()
+        self.last_output = self.started
+        self.milestones: dict[str, float] = {}
+        self._next_milestone = 0
+        self.crash_marker: str | None = None
+        self.flagged: str | None = None        # verdict already reported
+        self.relaunch = False                  # killed by the watchdog, start it again on exit
+        self._cpu_at_output = 0.0              # cpu seconds when output last arrived
+        self._ping: Future | None = None
+        self._ping_failures = 0
+        self._last_ping = 0.0
+        self._registered = False               # its registry entry was seen: it speaks IPC
+
+    @property
+    def ready(self) -> bool:
+        return "ready" in self.milestones
+
+    def feed(self, text: str) -> None:
+        self.last_output = now = self.clock()
+        self._cpu_at_output = self.session.cpu_seconds
+        while self._next_milestone < len(STARTUP_MILESTONES):
+            name, marker = STARTUP_MILESTONES[self._next_milestone]
+            if marker not in text:
+                break
+            self.milestones[name] = now - self.started
+            self._next_milestone += 1
+        if self.crash_marker is None:
+            for marker in CRASH_MARKERS:
+                if marker in text:
+                    self.crash_marker = marker
+                    break
+        if self.flagged == HANG:
+            print(f"[Watchdog] {self.session.key} is producing output again")
+            self.flagged = None
+
+    def check(self, registry: EditorRegistry | None, pinger: ThreadPoolExecutor) -> tuple[str, str] | None:
+        """(verdict, reason) if something new is wrong, else None."""
+        now = self.clock()
+        p = self.policy
+
+        if self.crash_marker is not None and self.flagged != CRASH:
+            return CRASH, f"crash marker in log: {self.crash_marker!r}"
+        if self.flagged is not None:
+            return None
+
+        silent = now - self.last_output
+        if not self.ready:
+            cpu_used = self.session.cpu_seconds - self._cpu_at_output
+            idle = silent <= 0 or cpu_used * 100.0 / silent < p.idle_cpu_percent
+            if silent >= p.startup_silence and idle:
+                return HANG, (f"no output for {silent:.0f} s during startup and CPU idle "
+                              f"({cpu_used:.1f} s CPU in that time)")
+            if now - self.started >= p.startup_timeout:
+                reached = ", ".join(self.milestones) or "none"
+                return STARTUP_TIMEOUT, f"not ready after {now - self.started:.0f} s (milestones: {reached})"
+            return None
+
+        # Started up: an idle editor is silent legitimately; ask it directly instead
+        if registry is None or not self.session.ipc_token:
+            return None
+        if self._ping is not None:
+            if not self._ping.done():
+                return None
+            ok = self._ping.result()
+            self._ping = None
+            if ok is None and not self._registered:
+                return None    # never registered: an editor without the IPC plugin, nothing to ask
+            self._registered = True
+            self._ping_failures = 0 if ok else self._ping_failures + 1
+            if self._ping_failures >= p.ping_failures:
+                return HANG, f"editor did not answer {self._ping_failures} pings; no output for {silent:.0f} s"
+        if now - self._last_ping >= PING_INTERVAL:
+            self._last_ping = now
+            self._ping = pinger.submit(_ping, registry, self.session.pid, self.session.ipc_token)
+        return None
+
+    def report(self, kind: str, reason: str, exit_code: int | None = None) -> WatchdogReport:
+        s = self.session
+        now = self.clock()
+        return WatchdogReport(
+            key=s.key, kind=kind, reason=reason, detected_at=time.time(), pid=s.pid,
+            uptime=now - self.started, silent_for=now - self.last_output,
+            rss=s.rss, cpu_percent=s.cpu_percent, cpu_seconds=s.cpu_seconds,
+            exit_code=exit_code, milestones=dict(self.milestones),
+            last_lines=s.log_buffer.tail(REPORT_LINES),
+        )
+
+
+def _ping(registry: EditorRegistry, pid: int | None, token: str) -> bool | None:
+    """True if the editor answered, False if not, None if it has no registry entry."""
+    if not pid:
+        return None
+    ep = registry.get(pid)
+    if ep is None or ep.token != token:
+        return None
+    try:
+        EditorIpcClient(ep, timeout=PING_INTERVAL / 2).hello()
+        return True
+    except EditorIpcError:
+        return False
+
+
+__all__ = [
+    "CRASH", "HANG", "KILL", "RELAUNCH", "REPORT", "STARTUP_TIMEOUT",
+    "SessionWatch", "WatchdogPolicy", "WatchdogReport",
+]
@@ -1,11 +1,27 @@
 # ui/app_context.py
+from launcher import config
 from launcher.services.auth_service import AuthService
+from launcher.services.backend_health import BackendHealth
+from launcher.services.bulk_operations import BulkOperations
 from launcher.services.project_service import ProjectService
+from launcher.services.save_queue import SaveQueue
 from launcher.services.script_breakdown_service import ScriptBreakdownService
 
 from launcher.services.theater_service import TheaterService
 from launcher.services.http_client import HttpClient
+from launcher.services.http_pipeline import HttpPipeline
+from launcher.services.http_recording import transport_from_config
 from launcher.services.api_client import ApiClient
+from launcher.services.local_mirror import LocalMirror
+from launcher.services.live_updates import LiveUpdatesService
+from launcher.services.provisioning_service import ProvisioningService
+from launcher.services.launch_service import LaunchPipeline
+from launcher.services.launch_context import LaunchContextResolver
+from launcher.services.jwks import TokenVerifier
+from launcher.services.session_store import SessionStore
+from launcher.util import json_codec
+from launcher.util.metrics import REGISTRY
+from launcher.util.path_probe import PathProbe
 
 from PyQt6.QtCore import QObject, pyqtSignal
 
@@ -15,9 +31,57 @@ class AppContext(QObject):
 
     def __init__(self):
         super().__init__()
-        client = HttpClient()
-        self.auth_service = AuthService()
+        json_codec.use(config.JSON_CODEC)
+        # Every request (backend, Keycloak, JWKS, event stream) shares one pipeline and its metrics
+        self.http = HttpPipeline.default(transport_from_config())
+        client = self.http_client = HttpClient(pipeline=self.http)
+        self.backend_health = BackendHealth(self.http.breaker)
+        auth_dir = config.CACHE_DIR / "auth"
+        self.auth_service = AuthService(
+            store=SessionStore(auth_dir) if config.AUTH_REMEMBER_SESSION else None,
+            verifier=TokenVerifier.from_config(auth_dir, http=self.http) if config.AUTH_VERIFY_TOKENS else None,
+            http=self.http,
+        )
         self.project_service = ProjectService(self.auth_service, client)
-        self.theater_service = TheaterService(self.auth_service, client)
+        # One cache of editor / template / project-root probes for the whole launch path
+        probe = PathProbe(config.PATH_PROBE_TTL)
+        self.theater_service = TheaterService(
+            self.auth_service, client, log_dir=config.CACHE_DIR / "logs",
+            ipc_dir=config.CACHE_DIR / "editors", probe=probe,
+        )
         self.api_client = ApiClient(self)
+        # Multi-call saves run from a durable per-user queue, opened at sign-in
+        self.save_queue = SaveQueue()
+        self.backend_health.offline_changed.connect(lambda offline: offline or self.save_queue.resume())
         self.script_breakdown_service = ScriptBreakdownService(self)
+        self.bulk_operations = BulkOperations(self)
+        self.live_updates = LiveUpdatesService(self.auth_service, client)
+        self.provisioning_service = ProvisioningService()
+        self.launch_pipeline = LaunchPipeline(
+            self.provisioning_service, self.theater_service, resolver=LaunchContextResolver(probe=probe)
+        )
+        self.metrics = REGISTRY
+        self._register_gauges()
+
+    def _register_gauges(self) -> None:
+        depth = self.metrics.gauge("worker_queue_depth", "Work queued or running, per queue", ("queue",))
+        depth.labels("editor_admission").set_function(lambda: len(self.theater_service.queued()))
+        depth.labels("launch_prepare").set_function(self.launch_pipeline.pending)
+        depth.labels("project_save").set_function(self.save_queue.pending)
+        depth.labels("bulk_projects").set_function(self.bulk_operations.pending)
+        self.metrics.gauge("editor_sessions_running", "Editor processes alive").labels().set_function(
+            lambda: len(self.theater_service.running())
+        )
+        up = self.metrics.gauge("backend_up", "1 while the backend's circuit is closed", ("backend",))
+        for backend in self.backend_health.backends:
+            up.labels(backend.name).set_function(lambda name=backend.name: self.backend_health.is_up(name))
+
+    def set_user(self, user) -> None:
+        # Per-user local state (the SQLite mirror) is opened once identity is known
+        self.project_service.attach_mirror(LocalMirror.for_user(user.id))
+        self.save_queue.open(SaveQueue.path_for_user(user.id))
+
+    def clear_user(self) -> None:
+        self.live_updates.stop()
+        self.save_queue.close()
+        self.project_service.attach_mirror(None)
@@ -7,16 +7,24 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QScrollArea, QFra
 class CardListPage(QWidget):
     back_requested = pyqtSignal()
     action = pyqtSignal(str, str, object)  # (entity_id, action, item)
+    selection_changed = pyqtSignal()       # selectable cards only
 
     def __init__(
         self,
         *,
         make_card: Callable[[Any], QWidget],   # <-- key: project vs sequence renderer
+        update_card: Callable[[QWidget, Any], None] | None = None,
         show_back: bool = False,
         parent: QWidget | None = None,
     ) -> None:
         super().__init__(parent)
         self._make_card = make_card
+        self._update_card = update_card
+        self._cards: dict[str, QWidget] = {}
+        self._filter: set[str] | None = None
+        # Kept across set_items, so a refresh mid-operation doesn't drop what the user picked or its progress
+        self._selected: set[str] = set()
+        self._statuses: dict[str, tuple[str, str]] = {}
 
         root = QVBoxLayout(self)
         root.setContentsMargins(0, 0, 0, 0)
@@ -47,6 +55,7 @@ class CardListPage(QWidget):
 
     def set_items(self, items: Iterable[Any]) -> None:
         # clear
+        self._cards = {}
         while self.list_layout.count():
             it = self.list_layout.takeAt(0)
             w = it.widget()
@@ -61,7 +70,107 @@ class CardListPage(QWidget):
             # assumes card is EntityCard (has action_clicked)
             if hasattr(card, "action_clicked"):
                 card.action_clicked.connect(lambda eid, act, o=obj: self.action.emit(eid, act, o))
+            if hasattr(card, "selection_toggled"):
+                card.selection_toggled.connect(self._on_selection_toggled)
 
             self.list_layout.addWidget(card)
+            entity_id = str(getattr(obj, "id", id(obj)))
+            self._cards[entity_id] = card
+            if self._filter is not None and entity_id not in self._filter:
+                card.setVisible(False)
+            if entity_id in self._selected:
+                card.set_selected(True)
+            if entity_id in self._statuses:
+                card.set_status(*self._statuses[entity_id])
 
         self.list_layout.addStretch(1)
+        self._statuses = {k: v for k, v in self._statuses.items() if k in self._cards}
+        if not self._selected <= self._cards.keys():
+            self._selected &= self._cards.keys()
+            self.selection_changed.emit()
+
+    def set_filter(self, visible_ids: set[str] | None) -> int:
+        """Show only cards whose entity id is in visible_ids (None shows all). Returns the shown count."""
+        self._filter = visible_ids
+        shown = 0
+        for entity_id, card in self._cards.items():
+            show = visible_ids is None or entity_id in visible_ids
+            if card.isHidden() == show:
+                card.setVisible(show)
+            shown += show
+        # Hidden cards leave the selection: a bulk action only touches what is on screen
+        hidden = {i for i in self._selected if visible_ids is not None and i not in visible_ids}
+        if hidden:
+            self.set_selected(hidden, False)
+        return shown
+
+    def update_item(self, obj: Any) -> bool:
+        """Refresh the card showing obj in place. Returns False if it isn't shown."""
+        card = self._cards.get(str(getattr(obj, "id", id(obj))))
+        if card is None or self._update_card is None:
+            return False
+        self._update_card(card, obj)
+        return True
+
+    def remove_item(self, entity_id: str) -> bool:
+        card = self._cards.pop(str(entity_id), None)
+        if card is None:
+            return False
+        self._statuses.pop(str(entity_id), None)
+        if str(entity_id) in self._selected:
+            self._selected.discard(str(entity_id))
+            self.selection_changed.emit()
+        self.list_layout.removeWidget(card)
+        card.setParent(None)
+        card.deleteLater()
+        return True
+
+    def item_count(self) -> int:
+        return len(self._cards)
+
+    # ------------------------------------------------------------------ selection
+
+    def _on_selection_toggled(self, entity_id: str, selected: bool) -> None:
+        if selected:
+            self._selected.add(entity_id)
+        else:
+            self._selected.discard(entity_id)
+        self.selection_changed.emit()
+
+    def selected_ids(self) -> list[str]:
+        """Selected entity ids, in list order."""
+        return [i for i in self._cards if i in self._selected]
+
+    def set_selected(self, entity_ids: Iterable[str], selected: bool = True) -> None:
+        changed = False
+        for entity_id in map(str, entity_ids):
+            card = self._cards.get(entity_id)
+            if card is None or (entity_id in self._selected) == selected:
+                continue
+            changed = True
+            if selected:
+                self._selected.add(entity_id)
+            else:
+                self._selected.discard(entity_id)
+            if hasattr(card, "set_selected"):
+                card.set_selected(selected)
+        if changed:
+            self.selection_changed.emit()
+
+    def select_all(self) -> None:
+        """Select every card the filter shows."""
+        self.set_selected(i for i, card in self._cards.items() if not card.isHidden())
+
+    def clear_selection(self) -> None:
+        self.set_selected(list(self._selected), False)
+
+    def set_item_status(self, entity_id: str, text: str, state: str = "") -> None:
+        """Progress text on one card (empty text clears it); survives set_items."""
+        entity_id = str(entity_id)
+        if text:
+            self._statuses[entity_id] = (text, state)
+        else:
+            self._statuses.pop(entity_id, None)
+        card = self._cards.get(entity_id)
+        if card is not None and hasattr(card, "set_status"):
+            card.set_status(text, state)
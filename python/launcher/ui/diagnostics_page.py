@@ -0,0 +1,224 @@
+# ui/diagnostics_page.py
+"""
+Hidden diagnostics page (Ctrl+Shift+D in the main window): live view of
+the metrics registry (util/metrics.py), for telling a slow Keycloak from
+a slow FastAPI endpoint from a slow screen, and an export of everything
+as Prometheus text or JSON to attach to a support ticket.
+
+Tables refresh once a second while the page is visible; reading the
+registry copies a few hundred counters, nothing the launcher notices.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+from PyQt6.QtWidgets import (
+    QAbstractItemView, QFileDialog, QHBoxLayout, QHeaderView, QLabel, QLineEdit, QPushButton, QTableWidget,
+    QTableWidgetItem, QVBoxLayout, QWidget,
+)
+
+from launcher.util import json_codec, proc_stats
+from launcher.util.metrics import MetricsRegistry
+
+REFRESH_MS = 1000
+_ENDPOINT_COLUMNS = ("Endpoint", "Calls", "Errors", "p50", "p95", "p99", "Max", "Avg size")
+_METRIC_COLUMNS = ("Metric", "Labels", "Count / value", "p50", "p95", "p99")
+
+
+def _ms(seconds: float | None) -> str:
+    return "" if seconds is None else f"{seconds * 1000:.1f} ms"
+
+
+def _size(n: float | None) -> str:
+    if n is None:
+        return ""
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+def _series(data: dict, name: str) -> list[dict]:
+    return next((m["series"] for m in data["metrics"] if m["name"] == name), [])
+
+
+def endpoint_rows(data: dict) -> list[tuple]:
+    """Per endpoint: calls, error share (4xx/5xx or no response), latency percentiles, mean response size."""
+    calls: dict[str, float] = {}
+    errors: dict[str, float] = {}
+    for s in _series(data, "http_requests_total"):
+        endpoint, status = s["labels"]["endpoint"], s["labels"]["status"]
+        calls[endpoint] = calls.get(endpoint, 0) + s["value"]
+        if not status.isdigit() or int(status) >= 400:
+            errors[endpoint] = errors.get(endpoint, 0) + s["value"]
+    sizes = {s["labels"]["endpoint"]: s["sum"] / s["count"] for s in _series(data, "http_response_bytes") if s["count"]}
+    rows = []
+    for s in _series(data, "http_request_seconds"):
+        endpoint = s["labels"]["endpoint"]
+        n = calls.get(endpoint, s["count"])
+        rows.append((endpoint, int(n), errors.get(endpoint, 0) / n if n else 0.0,
+                     s["p50"], s["p95"], s["p99"], s["max"], sizes.get(endpoint)))
+    # Slowest first: what the page is for
+    return sorted(rows, key=lambda r: -(r[5] or 0))
+
+
+def cache_hit_rates(data: dict) -> dict[str, tuple[float, int]]:
+    """cache -> (hit rate, lookups)."""
+    counts: dict[str, list[float]] = {}
+    for s in _series(data, "cache_lookups_total"):
+        pair = counts.setdefault(s["labels"]["cache"], [0, 0])
+        pair[0 if s["labels"]["result"] == "hit" else 1] += s["value"]
+    return {cache: (hit / (hit + miss), int(hit + miss)) for cache, (hit, miss) in counts.items() if hit + miss}
+
+
+class DiagnosticsPage(QWidget):
+    back_requested = pyqtSignal()
+
+    def __init__(self, registry: MetricsRegistry, parent=None):
+        super().__init__(parent)
+        self._registry = registry
+        self._build_ui()
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+
+    def _build_ui(self):
+        root = QVBoxLayout(self)
+        root.setContentsMargins(0, 0, 0, 0)
+        root.setSpacing(12)
+
+        row = QHBoxLayout()
+        row.setSpacing(8)
+        self.filter_input = QLineEdit(self)
+        self.filter_input.setObjectName("SearchBar")
+        self.filter_input.setPlaceholderText("Filter metrics and endpoints")
+        self.filter_input.setClearButtonEnabled(True)
+        self.filter_input.textChanged.connect(lambda _: self.refresh())
+        row.addWidget(self.filter_input, 1)
+
+        self.reset_button = QPushButton("Reset", self)
+        self.reset_button.setToolTip("Forget recorded samples and counts (gauges stay)")
+        self.reset_button.clicked.connect(self._reset)
+        row.addWidget(self.reset_button)
+
+        self.copy_button = QPushButton("Copy JSON", self)
+        self.copy_button.clicked.connect(self._copy_json)
+        row.addWidget(self.copy_button)
+
+        self.export_button = QPushButton("Export...", self)
+        self.export_button.clicked.connect(self._export)
+        row.addWidget(self.export_button)
+        root.addLayout(row)
+
+        self.summary_label = QLabel("", self)
+        self.summary_label.setObjectName("StatusLabelProjects")
+        self.summary_label.setWordWrap(True)
+        root.addWidget(self.summary_label)
+
+        self.endpoint_table = self._make_table(_ENDPOINT_COLUMNS)
+        root.addWidget(self.endpoint_table, 1)
+        self.metric_table = self._make_table(_METRIC_COLUMNS)
+        root.addWidget(self.metric_table, 1)
+
+    def _make_table(self, columns) -> QTableWidget:
+        table = QTableWidget(0, len(columns), self)
+        table.setHorizontalHeaderLabels(columns)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.verticalHeader().hide()
+        header = table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        return table
+
+    # ------------------------------------------------------------------ refresh
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        data = self._registry.to_json()
+        needle = self.filter_input.text().strip().lower()
+
+        all_endpoints = endpoint_rows(data)
+        self._fill(self.endpoint_table, [
+            (name, str(n), f"{err:.1%}", _ms(p50), _ms(p95), _ms(p99), _ms(top), _size(size))
+            for name, n, err, p50, p95, p99, top, size in all_endpoints if needle in name.lower()
+        ])
+
+        rows = []
+        for metric in data["metrics"]:
+            seconds = metric["name"].endswith("_seconds")
+            fmt = _ms if seconds else (_size if metric["name"].endswith("_bytes") else
+                                       lambda v: "" if v is None else f"{v:.0f}")
+            for s in metric["series"]:
+                labels = ", ".join(f"{k}={v}" for k, v in s["labels"].items())
+                if needle and needle not in metric["name"] and needle not in labels.lower():
+                    continue
+                if metric["type"] == "histogram":
+                    rows.append((metric["name"], labels, str(s["count"]), fmt(s["p50"]), fmt(s["p95"]), fmt(s["p99"])))
+                else:
+                    value = s["value"]
+                    text = "n/a" if value is None else (f"{value:.0f}" if float(value).is_integer() else f"{value:.3f}")
+                    rows.append((metric["name"], labels, text, "", "", ""))
+        self._fill(self.metric_table, rows)
+
+        calls = sum(r[1] for r in all_endpoints)
+        failed = sum(r[1] * r[2] for r in all_endpoints)
+        summary = f"HTTP: {calls} calls, {failed / calls:.1%} failed" if calls else "HTTP: no calls yet"
+        caches = ", ".join(f"{name} {rate:.0%} of {n}" for name, (rate, n) in sorted(cache_hit_rates(data).items()))
+        if caches:
+            summary += f"   |   cache hits: {caches}"
+        if not proc_stats.AVAILABLE:
+            summary += "   |   resource checks unavailable (install psutil)"
+        self.summary_label.setText(summary)
+
+    @staticmethod
+    def _fill(table: QTableWidget, rows: list[tuple]):
+        table.setUpdatesEnabled(False)
+        table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, text in enumerate(row):
+                item = table.item(r, c)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if c:
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                    table.setItem(r, c, item)
+                item.setText(text)
+        table.setUpdatesEnabled(True)
+
+    # ------------------------------------------------------------------ actions
+
+    def _reset(self):
+        self._registry.reset()
+        self.refresh()
+
+    def _copy_json(self):
+        QGuiApplication.clipboard().setText(json_codec.dumps(self._registry.to_json()).decode())
+        self.summary_label.setText("Metrics copied to the clipboard as JSON.")
+
+    def _export(self):
+        path, chosen = QFileDialog.getSaveFileName(
+            self, "Export metrics", "launcher-metrics.prom", "Prometheus text (*.prom *.txt);;JSON (*.json)"
+        )
+        if not path:
+            return
+        try:
+            if path.endswith(".json") or chosen.startswith("JSON"):
+                Path(path).write_bytes(json_codec.dumps(self._registry.to_json()))
+            else:
+                Path(path).write_text(self._registry.to_prometheus(), encoding="utf-8")
+        except OSError as exc:
+            self.summary_label.setText(f"Export failed: {exc}")
+            return
+        self.summary_label.setText(f"Metrics exported to {path}")
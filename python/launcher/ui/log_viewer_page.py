@@ -0,0 +1,315 @@
+# ui/log_viewer_page.py
+"""
+Browse and search archived editor session logs (services/log_archive.py).
+
+The table view asks the model only for the rows it paints (fixed row
+heights, so no per-row layout pass either), and the model reads those
+lines from the archive on demand, so a multi-gigabyte log
+costs the memory of its index plus a few decompressed blocks. Searches
+run in a worker thread with their own reader and stream matching line
+numbers back in chunks.
+"""
+from __future__ import annotations
+
+import re
+from array import array
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt, QThread, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QFontDatabase
+from PyQt6.QtWidgets import (
+    QAbstractItemView, QCheckBox, QComboBox, QHBoxLayout, QHeaderView, QLabel, QLineEdit, QPushButton,
+    QTableView, QVBoxLayout, QWidget,
+)
+
+from launcher.services.log_archive import (
+    ERROR, FATAL, WARNING, LogArchive, LogArchiveReader, line_level,
+)
+
+SEARCH_CHUNK = 2000
+FOLLOW_INTERVAL_MS = 1000
+
+_LEVEL_FILTERS = [("All levels", None), ("Warnings and errors", WARNING), ("Errors", ERROR)]
+_LEVEL_COLORS = {FATAL: QColor("#ff5c5c"), ERROR: QColor("#ff7b72"), WARNING: QColor("#e3b341")}
+
+
+class LogLinesModel(QAbstractListModel):
+    """Rows are archive lines, or only the matching ones when a filter is set."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._reader: LogArchiveReader | None = None
+        self._rows: array | None = None     # matching line numbers, None = every line
+        self._count = 0
+
+    def set_reader(self, reader: LogArchiveReader | None):
+        self.beginResetModel()
+        if self._reader is not None:
+            self._reader.close()
+        self._reader = reader
+        self._rows = None
+        self._count = reader.line_count if reader is not None else 0
+        self.endResetModel()
+
+    def set_filtered(self, filtered: bool):
+        self.beginResetModel()
+        self._rows = array("Q") if filtered else None
+        self._count = 0 if filtered else (self._reader.line_count if self._reader else 0)
+        self.endResetModel()
+
+    def add_matches(self, lines: list[int]):
+        if self._rows is None or not lines:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(lines) - 1)
+        self._rows.extend(lines)
+        self._count = len(self._rows)
+        self.endInsertRows()
+
+    def refresh(self) -> bool:
+        """Pick up lines appended to a live log (unfiltered view only). True if rows were added."""
+        if self._reader is None or self._rows is not None:
+            return False
+        total = self._reader.refresh()
+        if total <= self._count:
+            return False
+        self.beginInsertRows(QModelIndex(), self._count, total - 1)
+        self._count = total
+        self.endInsertRows()
+        return True
+
+    @property
+    def total_lines(self) -> int:
+        return self._reader.line_count if self._reader is not None else 0
+
+    def line_number(self, row: int) -> int:
+        return self._rows[row] if self._rows is not None else row
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._count
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or self._reader is None:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._reader.line(self.line_number(index.row()))
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return _LEVEL_COLORS.get(line_level(self._reader.line(self.line_number(index.row()))))
+        return None
+
+
+class LogSearchWorker(QThread):
+    found = pyqtSignal(list)        # chunk of matching line numbers
+    done = pyqtSignal(int)          # total matches
+    error = pyqtSignal(str)
+
+    def __init__(self, path, pattern: str, min_level: int | None, parent=None):
+        super().__init__(parent)
+        self._path = path
+        self._pattern = pattern
+        self._min_level = min_level
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            regex = re.compile(self._pattern, re.IGNORECASE | re.MULTILINE) if self._pattern else None
+        except re.error as exc:
+            self.error.emit(f"Invalid pattern: {exc}")
+            return
+        reader = LogArchiveReader(self._path)
+        try:
+            chunk: list[int] = []
+            total = 0
+            for n in reader.search(regex, self._min_level, cancelled=lambda: self._cancelled):
+                chunk.append(n)
+                if len(chunk) >= SEARCH_CHUNK:
+                    total += len(chunk)
+                    self.found.emit(chunk)
+                    chunk = []
+            if self._cancelled:
+                return
+            total += len(chunk)
+            if chunk:
+                self.found.emit(chunk)
+            self.done.emit(total)
+        finally:
+            reader.close()
+
+
+class LogViewerPage(QWidget):
+    back_requested = pyqtSignal()
+
+    def __init__(self, archive: LogArchive | None, parent=None):
+        super().__init__(parent)
+        self._archive = archive
+        self._logs = []
+        self._search: LogSearchWorker | None = None
+        self._build_ui()
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(250)
+        self._search_timer.timeout.connect(self._start_search)
+
+        self._follow_timer = QTimer(self)
+        self._follow_timer.setInterval(FOLLOW_INTERVAL_MS)
+        self._follow_timer.timeout.connect(self._follow)
+
+    def _build_ui(self):
+        root = QVBoxLayout(self)
+        root.setContentsMargins(0, 0, 0, 0)
+        root.setSpacing(12)
+
+        row = QHBoxLayout()
+        row.setSpacing(8)
+
+        self.session_combo = QComboBox(self)
+        self.session_combo.setMinimumWidth(320)
+        self.session_combo.currentIndexChanged.connect(self._open_selected)
+        row.addWidget(self.session_combo)
+
+        self.level_combo = QComboBox(self)
+        for label, _ in _LEVEL_FILTERS:
+            self.level_combo.addItem(label)
+        self.level_combo.currentIndexChanged.connect(lambda _: self._search_timer.start())
+        row.addWidget(self.level_combo)
+
+        self.search_input = QLineEdit(self)
+        self.search_input.setObjectName("SearchBar")
+        self.search_input.setPlaceholderText("Regex, e.g. LogTexture|Shader.*failed")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(lambda _: self._search_timer.start())
+        row.addWidget(self.search_input, 1)
+
+        self.follow_check = QCheckBox("Follow", self)
+        self.follow_check.setChecked(True)
+        row.addWidget(self.follow_check)
+
+        self.reload_button = QPushButton("Reload", self)
+        self.reload_button.clicked.connect(self.reload_sessions)
+        row.addWidget(self.reload_button)
+
+        root.addLayout(row)
+
+        self.model = LogLinesModel(self)
+        self.view = QTableView(self)
+        self.view.setModel(self.model)
+        self.view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.view.setShowGrid(False)
+        self.view.setWordWrap(False)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.view.horizontalHeader().hide()
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        rows = self.view.verticalHeader()
+        rows.hide()
+        # Fixed row height: positions are computed, not laid out row by row (millions of rows)
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(self.view.fontMetrics().height() + 2)
+        root.addWidget(self.view, 1)
+
+        self.info_label = QLabel("", self)
+        self.info_label.setObjectName("StatusLabelProjects")
+        root.addWidget(self.info_label)
+
+    # ------------------------------------------------------------------ sessions
+
+    def reload_sessions(self):
+        current = self._selected_log()
+        self._logs = self._archive.sessions() if self._archive is not None else []
+        self.session_combo.blockSignals(True)
+        self.session_combo.clear()
+        for log in self._logs:
+            state = "running" if log.live else f"exit {log.exit_code}"
+            self.session_combo.addItem(f"{log.key} - {log.session_id[:15]} ({state}, {log.lines:,} lines)")
+        self.session_combo.blockSignals(False)
+        if not self._logs:
+            self.model.set_reader(None)
+            self.info_label.setText("No editor logs yet.")
+            return
+        index = next((i for i, log in enumerate(self._logs)
+                      if current is not None and log.session_id == current.session_id), 0)
+        self.session_combo.setCurrentIndex(index)
+        self._open_selected()
+
+    def show_session(self, session_id: str):
+        self.reload_sessions()
+        for i, log in enumerate(self._logs):
+            if log.session_id == session_id:
+                self.session_combo.setCurrentIndex(i)
+                return
+
+    def _selected_log(self):
+        i = self.session_combo.currentIndex()
+        return self._logs[i] if 0 <= i < len(self._logs) else None
+
+    def _open_selected(self):
+        log = self._selected_log()
+        self._cancel_search()
+        if log is None:
+            return
+        self.model.set_reader(self._archive.open(log.session_id))
+        self._follow_timer.start()
+        if self.search_input.text() or self._min_level():
+            self._start_search()
+        else:
+            self._show_counts()
+            self.view.scrollToBottom()
+
+    # ------------------------------------------------------------------ search / follow
+
+    def _min_level(self) -> int | None:
+        return _LEVEL_FILTERS[self.level_combo.currentIndex()][1]
+
+    def _start_search(self):
+        self._cancel_search()
+        log = self._selected_log()
+        if log is None:
+            return
+        pattern, min_level = self.search_input.text(), self._min_level()
+        if not pattern and not min_level:
+            self.model.set_filtered(False)
+            self._show_counts()
+            return
+        self.model.set_filtered(True)
+        self.info_label.setText("Searching...")
+        self._search = LogSearchWorker(log.path, pattern, min_level, self)
+        self._search.found.connect(self.model.add_matches)
+        self._search.done.connect(lambda n: self._show_counts(matches=n))
+        self._search.error.connect(self.info_label.setText)
+        self._search.start()
+
+    def _cancel_search(self):
+        if self._search is not None:
+            self._search.found.disconnect()
+            self._search.done.disconnect()
+            self._search.error.disconnect()
+            self._search.cancel()
+            self._search.wait(2000)
+            self._search = None
+
+    def _follow(self):
+        if not self.isVisible():
+            return
+        bar = self.view.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum() - 2
+        if self.model.refresh():
+            self._show_counts()
+            if self.follow_check.isChecked() and at_bottom:
+                self.view.scrollToBottom()
+
+    def _show_counts(self, matches: int | None = None):
+        log = self._selected_log()
+        total = self.model.total_lines
+        size = f"{log.size / 2**20:.1f} MiB on disk" if log else ""
+        if matches is None:
+            self.info_label.setText(f"{total:,} lines, {size}")
+        else:
+            self.info_label.setText(f"{matches:,} of {total:,} lines match, {size}")
+
+    def shutdown(self):
+        self._follow_timer.stop()
+        self._cancel_search()
+        self.model.set_reader(None)
@@ -17,6 +17,9 @@ from PyQt6.QtWidgets import (
     QButtonGroup,
 )
 
+import requests
+
+from launcher.services.auth_service import AuthError, SessionExpired
 from launcher.util.helper import icon_path
 
 if TYPE_CHECKING:
@@ -42,6 +45,27 @@ class LoginWorker(QThread):
             self.error.emit(str(exc))
 
 
+class SessionResumeWorker(QThread):
+    """Validates a session restored from disk while the main window is already up."""
+    validated = pyqtSignal(object)   # User
+    expired = pyqtSignal(str)        # back to the login screen
+    offline = pyqtSignal(str)        # couldn't check; keep the cached identity
+
+    def __init__(self, app_context: AppContext, parent=None):
+        super().__init__(parent)
+        self._ctx = app_context
+
+    def run(self):
+        try:
+            self.validated.emit(self._ctx.auth_service.validate())
+        except SessionExpired as exc:
+            self.expired.emit(str(exc))
+        except AuthError as exc:
+            self.expired.emit(f"Please log in again ({exc}).")
+        except requests.RequestException as exc:
+            self.offline.emit(str(exc))
+
+
 class LoginWindow(QWidget):
     def __init__(self, app_context: AppContext, on_login_success, parent=None):
         super().__init__(parent)
@@ -122,6 +146,16 @@ class LoginWindow(QWidget):
         self.status_label.setObjectName("StatusLabel")
         center.addWidget(self.status_label, alignment=Qt.AlignmentFlag.AlignHCenter)
 
+        # remember-me can be unavailable (no encryption); say so rather than silently forget
+        reason = self._ctx.auth_service.session_not_remembered
+        self.session_note = QLabel("", self)
+        self.session_note.setObjectName("SessionNoteLabel")
+        if reason:
+            self.session_note.setText("You will be asked to log in at every start on this computer.")
+            self.session_note.setToolTip(f"The login session can't be saved securely: {reason}.")
+        self.session_note.setVisible(bool(reason))
+        center.addWidget(self.session_note, alignment=Qt.AlignmentFlag.AlignHCenter)
+
         main.addLayout(center)
 
         # bottom bar: version text bottom-right
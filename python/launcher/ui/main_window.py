@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import os, sys
+import time
 from typing import TYPE_CHECKING, List, Dict
 
-from PyQt6.QtCore import QThread, pyqtSignal, Qt
+from PyQt6.QtCore import QThread, QTimer, pyqtSignal, Qt
 from PyQt6.QtWidgets import (
     QMainWindow,
     QMenu,
@@ -22,21 +23,41 @@ from PyQt6.QtWidgets import (
     QSizePolicy,
     QStackedWidget,
     QToolButton,
+    QLineEdit,
+    QInputDialog,
 )
 
-from PyQt6.QtGui import QIcon
+from PyQt6.QtGui import QCursor, QIcon, QKeySequence, QShortcut
 
 from launcher.ui.card_list_page import CardListPage
 from launcher.ui.widgets.project_card import ProjectCard
 from launcher.ui.widgets.entity_card import CardButtonSpec, EntityCard
-from launcher.domain.project import Project
+from launcher.domain.project import ACCESS_ROLES, PROJECT_STATUSES, Project
+from launcher.services.search_index import SearchIndex
+from launcher import config
 from launcher.ui.script_breakdown_page import ScriptBreakdownPage
+from launcher.ui.log_viewer_page import LogViewerPage
+from launcher.ui.diagnostics_page import DiagnosticsPage
+from launcher.util.metrics import REGISTRY
 
 if TYPE_CHECKING:
     from launcher.ui.app_context import AppContext
     from launcher.domain.project import Project
     from launcher.domain.user import User
 
+# Where a slow screen spends its time: the worker (network + mirror) or the GUI thread
+UI_TASK_SECONDS = REGISTRY.histogram("ui_task_seconds", "Background loads, worker start to result", ("task",))
+UI_RENDER_SECONDS = REGISTRY.histogram("ui_render_seconds", "GUI-thread time to show loaded items", ("view",))
+
+# Bulk project actions: (card text while running, card text when done, summary verb)
+_BULK_TEXT = {
+    "delete": ("Deleting…", "Deleted", "Deleted"),
+    "archive": ("Archiving…", "Archived", "Archived"),
+    "set_status": ("Updating status…", "Status updated", "Updated the status of"),
+    "grant_access": ("Granting access…", "Access granted", "Granted access to"),
+}
+
+
 class ClickableLabel(QLabel):
     clicked = pyqtSignal()
 
@@ -48,20 +69,22 @@ class ClickableLabel(QLabel):
         super().mousePressEvent(event)
 
 class LoadSequencesWorker(QThread):
-    success = pyqtSignal(list)
-    error = pyqtSignal(str)
+    # Both carry the project id, so results for a project the user has left can be dropped
+    success = pyqtSignal(str, list)
+    error = pyqtSignal(str, str)
 
     def __init__(self, ctx, project_id: str, parent=None):
         super().__init__(parent)
         self._ctx = ctx
-        self._project_id = project_id
+        self.project_id = project_id
 
     def run(self):
         try:
-            seqs = self._ctx.project_service.list_sequences(self._project_id)
-            self.success.emit(seqs)
+            with UI_TASK_SECONDS.labels("load_sequences").time():
+                seqs = self._ctx.project_service.sync_sequences(self.project_id)
+            self.success.emit(self.project_id, seqs)
         except Exception as e:
-            self.error.emit(str(e))
+            self.error.emit(self.project_id, str(e))
         
 class LoadProjectsWorker(QThread):
     """
@@ -76,11 +99,32 @@ class LoadProjectsWorker(QThread):
 
     def run(self):
         try:
-            projects = self._ctx.project_service.list_my_projects()
+            with UI_TASK_SECONDS.labels("load_projects").time():
+                projects = self._ctx.project_service.sync_projects()
             self.success.emit(projects)
         except Exception as exc:
             self.error.emit(str(exc))
 
+class BuildSearchIndexWorker(QThread):
+    """
+    Builds a SearchIndex from the local mirror off the GUI thread.
+    """
+    success = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, app_context: AppContext, parent=None):
+        super().__init__(parent)
+        self._ctx = app_context
+
+    def run(self):
+        try:
+            with UI_TASK_SECONDS.labels("build_search_index").time():
+                index = SearchIndex()
+                index.add_many(self._ctx.project_service.cached_entities())
+            self.success.emit(index)
+        except Exception as exc:
+            self.error.emit(str(exc))
+
 class MainWindow(QMainWindow):
     """
     Projects window styled via global theme.qss.
@@ -104,12 +148,54 @@ class MainWindow(QMainWindow):
         self._projects: List[Project] = []
         self._projects_by_id: Dict[str, Project] = {}
         self._load_worker: LoadProjectsWorker | None = None
+        self._sequences: list = []
+        self._seq_worker: LoadSequencesWorker | None = None
+        self._current_project_id: str | None = None    # project whose sequences are wanted
+        self._search_index = SearchIndex()
+        self._index_worker: BuildSearchIndexWorker | None = None
+        self._pending_launch = None   # (project name, sequence, click time) awaiting preparation
+        self._bulk_ops: dict = {}     # operation id -> BulkOperation, started from this window and unfinished
+        self._bulk_done_ids: list[str] = []
+        self._bulk_summary = ""       # outcome of the last operation, on the bar until the card statuses clear
 
         self.setWindowTitle("Mihira Theatre – Projects")
         self.resize(1365, 768)
 
         self._build_ui()
+        self._ctx.backend_health.offline_changed.connect(self._on_offline_changed)
+        self._ctx.backend_health.backend_changed.connect(self._on_backend_changed)
+        if self._ctx.backend_health.is_offline:
+            self._on_offline_changed(True)
         self._load_projects()
+        self._build_search_index()
+
+        self._ctx.launch_pipeline.progress.connect(self._on_provision_progress)
+        self._ctx.launch_pipeline.prepared.connect(self._on_launch_prepared)
+        self._ctx.launch_pipeline.failed.connect(self._on_launch_failed)
+        self._ctx.launch_pipeline.handed_off.connect(self._on_launch_handed_off)
+        self._ctx.launch_pipeline.launched.connect(self._on_launch_started)
+        self._ctx.launch_pipeline.start_failed.connect(self._on_launch_start_failed)
+        self._ctx.theater_service.failed.connect(self._on_editor_failed)
+        self._ctx.theater_service.admission_warning.connect(self.status_label.setText)
+        self._ctx.theater_service.session_unhealthy.connect(self._on_editor_unhealthy)
+
+        # Server push: apply entity changes to visible cards, delta-sync when events were missed
+        self._resync_timer = QTimer(self)
+        self._resync_timer.setSingleShot(True)
+        self._resync_timer.setInterval(500)
+        self._resync_timer.timeout.connect(self._resync)
+        self._ctx.live_updates.entity_changed.connect(self._on_entity_changed)
+        self._ctx.live_updates.resync_required.connect(self._resync_timer.start)
+        self._ctx.live_updates.start()
+        self._ctx.save_queue.job_changed.connect(self._on_save_job_changed)
+
+        # "Deleted" / "Archived" stay on the cards for a moment after an operation, failures until acted on
+        self._bulk_status_timer = QTimer(self)
+        self._bulk_status_timer.setSingleShot(True)
+        self._bulk_status_timer.setInterval(5000)
+        self._bulk_status_timer.timeout.connect(self._clear_bulk_done_statuses)
+        self._ctx.bulk_operations.item_changed.connect(self._on_bulk_item_changed)
+        self._ctx.bulk_operations.finished.connect(self._on_bulk_finished)
 
     def _make_dummy_projects(self) -> list[Project]:
         return [
@@ -152,6 +238,14 @@ class MainWindow(QMainWindow):
 
         header.addStretch(1)
 
+        self.search_input = QLineEdit(central)
+        self.search_input.setObjectName("SearchBar")
+        self.search_input.setPlaceholderText("Search projects, sequences, shots...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setFixedWidth(320)
+        self.search_input.textChanged.connect(self._apply_search)
+        header.addWidget(self.search_input)
+
         self.refresh_button = QPushButton("Refresh", central)
         self.refresh_button.setObjectName("RefreshButton")
         self.refresh_button.clicked.connect(self._load_projects)
@@ -198,6 +292,11 @@ class MainWindow(QMainWindow):
         self.status_label.setObjectName("StatusLabelProjects")
         outer.addWidget(self.status_label)
 
+        self.offline_label = QLabel("", central)
+        self.offline_label.setObjectName("OfflineBanner")
+        self.offline_label.setVisible(False)
+        outer.addWidget(self.offline_label)
+
         # ----- Projects container (dark card from QSS) -----
         self.projects_container = QFrame(central)
         self.projects_container.setObjectName("ProjectsContainer")
@@ -211,6 +310,9 @@ class MainWindow(QMainWindow):
         container_layout.setSpacing(12)
 
         
+        self._build_bulk_bar()
+        container_layout.addWidget(self.bulk_bar)
+
         self.stack = QStackedWidget(self.projects_container)
         self.stack.setAutoFillBackground(False)
         self.stack.setObjectName("MainStack")
@@ -235,12 +337,61 @@ class MainWindow(QMainWindow):
         self._build_pages()
         self.script_breakdown_page.results_ready.connect(self._on_breakdown_results_ready)
 
+    def _build_bulk_bar(self):
+        # Acts on the selected project cards; shown while any are selected or an operation runs
+        self.bulk_bar = QFrame(self.projects_container)
+        self.bulk_bar.setObjectName("BulkBar")
+        self.bulk_bar.setVisible(False)
+        layout = QHBoxLayout(self.bulk_bar)
+        layout.setContentsMargins(12, 6, 12, 6)
+        layout.setSpacing(8)
+
+        self.bulk_label = QLabel("", self.bulk_bar)
+        self.bulk_label.setObjectName("BulkLabel")
+        layout.addWidget(self.bulk_label)
+        layout.addStretch(1)
+
+        def button(text: str, slot, name: str = "BulkButton") -> QPushButton:
+            btn = QPushButton(text, self.bulk_bar)
+            btn.setObjectName(name)
+            btn.clicked.connect(slot)
+            layout.addWidget(btn)
+            return btn
+
+        button("Select all", lambda: self.projects_page.select_all())
+        self.bulk_archive_button = button("Archive", lambda: self._run_bulk("archive", self._selected_project_ids()))
+
+        self.bulk_status_button = QToolButton(self.bulk_bar)
+        self.bulk_status_button.setObjectName("BulkButton")
+        self.bulk_status_button.setText("Set status")
+        self.bulk_status_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        self.bulk_status_button.setMenu(self._build_status_menu(self._selected_project_ids, self.bulk_status_button))
+        layout.addWidget(self.bulk_status_button)
+
+        self.bulk_access_button = button(
+            "Grant access…", lambda: self._run_bulk("grant_access", self._selected_project_ids())
+        )
+        self.bulk_delete_button = button(
+            "Delete", lambda: self._run_bulk("delete", self._selected_project_ids()), "BulkDangerButton"
+        )
+        button("Clear", lambda: self.projects_page.clear_selection())
+
+    def _build_status_menu(self, project_ids, parent) -> QMenu:
+        menu = QMenu("Set status", parent)
+        for status in PROJECT_STATUSES:
+            menu.addAction(status, lambda s=status: self._run_bulk("set_status", project_ids(), status=s))
+        return menu
+
+    def _selected_project_ids(self) -> list[str]:
+        return self.projects_page.selected_ids()
+
     def _on_breakdown_results_ready(self, ready: bool):
         if self.stack.currentWidget() == self.script_breakdown_page:
             self.new_project_button.setEnabled(ready)
 
     def _on_stack_changed(self, _):
         self._update_breadcrumb()
+        self._update_bulk_bar()
         on_breakdown = self.stack.currentWidget() == self.script_breakdown_page
         if on_breakdown:
             self.new_project_button.setText("Save")
@@ -249,7 +400,7 @@ class MainWindow(QMainWindow):
             self.new_project_button.clicked.connect(self.script_breakdown_page.save)
         else:
             self.new_project_button.setText("New Project")
-            self.new_project_button.setEnabled(True)
+            self.new_project_button.setEnabled(not self._ctx.backend_health.is_offline)
             self.new_project_button.clicked.disconnect()
             self.new_project_button.clicked.connect(self._show_script_breakdown)
     
@@ -258,6 +409,13 @@ class MainWindow(QMainWindow):
         self.stack.setCurrentWidget(self.script_breakdown_page)
         self.new_project_button.setEnabled(False)
 
+    def _show_log_viewer(self):
+        self.stack.setCurrentWidget(self.log_viewer_page)
+        self.log_viewer_page.reload_sessions()
+
+    def _show_diagnostics(self):
+        self.stack.setCurrentWidget(self.diagnostics_page)
+
     def _logout_clicked(self):
         self._on_logout("Logged out.", self)
 
@@ -288,6 +446,9 @@ class MainWindow(QMainWindow):
 
         menu.addSeparator()
 
+        logs = menu.addAction("Editor logs")
+        logs.triggered.connect(self._show_log_viewer)
+
         signout = menu.addAction("Sign out")
         signout.triggered.connect(self._logout_clicked)  # your existing logout handler
         return menu
@@ -297,6 +458,8 @@ class MainWindow(QMainWindow):
         on_projects = (current == self.projects_page)
         on_script_breakdown = (current == self.script_breakdown_page)
         on_sequences = (current == self.sequences_page)
+        on_logs = (current == self.log_viewer_page)
+        on_diagnostics = (current == self.diagnostics_page)
 
         if on_projects:
             self.crumb_projects.setText("Projects")
@@ -311,8 +474,22 @@ class MainWindow(QMainWindow):
             self.crumb_current.setVisible(True)
             self.crumb_current.setText("Script Breakdown")
 
+        elif on_logs:
+            self.crumb_projects.setText("Projects")
+            self.crumb_projects.setEnabled(True)
+            self.crumb_sep.setVisible(True)
+            self.crumb_current.setVisible(True)
+            self.crumb_current.setText("Editor Logs")
+
+        elif on_diagnostics:
+            self.crumb_projects.setText("Projects")
+            self.crumb_projects.setEnabled(True)
+            self.crumb_sep.setVisible(True)
+            self.crumb_current.setVisible(True)
+            self.crumb_current.setText("Diagnostics")
+
         elif on_sequences:
-            proj = self._projects_by_id.get(getattr(self, "_current_project_id", None))
+            proj = self._projects_by_id.get(self._current_project_id)
             self.crumb_projects.setText("Projects")
             self.crumb_projects.setEnabled(True)
             self.crumb_sep.setVisible(True)
@@ -328,30 +505,57 @@ class MainWindow(QMainWindow):
         enabled = not loading
         self.refresh_button.setEnabled(enabled)
         if self.stack.currentWidget() != self.script_breakdown_page:
-            self.new_project_button.setEnabled(enabled)
+            self.new_project_button.setEnabled(enabled and not self._ctx.backend_health.is_offline)
         self.stack.setEnabled(enabled)
         self.status_label.setText(message)
 
     def _load_sequences(self, project_id: str):
-        # Avoid overlapping loads
-        if getattr(self, "_seq_worker", None) is not None and self._seq_worker.isRunning():
+        self._current_project_id = project_id
+
+        # Cold start from the local mirror, then refresh in the background
+        cached = self._ctx.project_service.cached_sequences(project_id)
+        if cached:
+            self._show_sequence_list(cached)
+            self.stack.setCurrentWidget(self.sequences_page)
+            self.status_label.setText("Refreshing sequences...")
+        if self._offline_fallback(bool(cached), "sequences"):
+            if not cached:
+                self._show_sequence_list([])
+                self.stack.setCurrentWidget(self.sequences_page)
             return
+        if not cached:
+            self._set_loading(True, "Loading sequences...")
 
-        self._current_project_id = project_id
-        self._set_loading(True, "Loading sequences...")
+        # Avoid overlapping loads of one project; a load still running for
+        # another project is left to finish and its result dropped
+        worker = self._seq_worker
+        if worker is not None and worker.isRunning() and worker.project_id == project_id:
+            return
 
-        self._seq_worker = LoadSequencesWorker(self._ctx, project_id, self)
-        self._seq_worker.success.connect(self._handle_sequences_loaded)
-        self._seq_worker.error.connect(self._handle_sequences_error)
-        self._seq_worker.finished.connect(self._cleanup_seq_worker)
-        self._seq_worker.start()
+        worker = self._seq_worker = LoadSequencesWorker(self._ctx, project_id, self)
+        worker.success.connect(self._handle_sequences_loaded)
+        worker.error.connect(self._handle_sequences_error)
+        worker.finished.connect(lambda: self._cleanup_seq_worker(worker))
+        worker.start()
 
     def _load_projects(self):
         #Avoid overlapping loads
         if self._load_worker is not None and self._load_worker.isRunning():
             return
 
-        self._set_loading(True, "Loading projects...")
+        # Cold start from the local mirror, then refresh in the background
+        if not self._projects:
+            cached = self._ctx.project_service.cached_projects()
+            if cached:
+                self._show_project_list(cached)
+
+        if self._offline_fallback(bool(self._projects), "projects"):
+            return
+        if self._projects:
+            self.refresh_button.setEnabled(False)
+            self.status_label.setText("Refreshing projects...")
+        else:
+            self._set_loading(True, "Loading projects...")
 
         self._load_worker = LoadProjectsWorker(self._ctx, self)
         self._load_worker.success.connect(self._handle_projects_loaded)
@@ -361,6 +565,7 @@ class MainWindow(QMainWindow):
 
     def _make_project_card(self, project: Project) -> EntityCard:
         card = EntityCard(
+            selectable=True,
             entity_id=project.id,
             title=project.name,
             meta_text=f"sequences {project.sequence_count} • shots {project.shot_count}",
@@ -375,6 +580,19 @@ class MainWindow(QMainWindow):
         )
         return card
 
+    def _update_project_card(self, card: EntityCard, project: Project) -> None:
+        card.set_texts(
+            title=project.name,
+            meta_text=f"sequences {project.sequence_count} • shots {project.shot_count}",
+            id_text=f"ID: {project.code}",
+        )
+
+    def _update_sequence_card(self, card: EntityCard, seq) -> None:
+        card.set_texts(
+            title=f"{seq.code} {seq.name or ''}".strip(),
+            meta_text=f"status {seq.status}",
+        )
+
     def _make_sequence_card(self, seq) -> EntityCard:
         card = EntityCard(
             entity_id=seq.id,
@@ -389,29 +607,53 @@ class MainWindow(QMainWindow):
         )
         return card
 
-    def _handle_sequences_loaded(self, sequences):
+    def _handle_sequences_loaded(self, project_id: str, sequences):
+        if project_id != self._current_project_id:
+            return      # the user has moved on to another project or back to the list
         self._set_loading(False, "")
 
         sequences = list(sequences or [])
         if not sequences:
             self.status_label.setText("No sequences available.")
-            self.sequences_page.set_items([])
         else:
             self.status_label.setText(f"Loaded {len(sequences)} sequence(s).")
-            self.sequences_page.set_items(sequences)
-
-        self.stack.setCurrentWidget(self.sequences_page)
-
-    def _handle_sequences_error(self, msg: str):
+        self._show_sequence_list(sequences)
+
+        # Still waiting on the project list for a first load; don't pull the user off other pages
+        if self.stack.currentWidget() == self.projects_page:
+            self.stack.setCurrentWidget(self.sequences_page)
+
+    def _show_sequence_list(self, sequences):
+        with UI_RENDER_SECONDS.labels("sequences").time():
+            self._sequences = list(sequences)
+            self._search_index.add_many(self._sequences)
+            self.sequences_page.set_items(self._sequences)
+            if self.search_input.text().strip():
+                self._apply_search(self.search_input.text())
+
+    def _handle_sequences_error(self, project_id: str, msg: str):
+        if project_id != self._current_project_id:
+            return
         self._set_loading(False, msg)
+        if self._ctx.backend_health.is_offline:
+            self._offline_fallback(bool(self._sequences), "sequences")
 
-    def _cleanup_seq_worker(self):
-        self._seq_worker = None
+    def _cleanup_seq_worker(self, worker: LoadSequencesWorker):
+        if self._seq_worker is worker:
+            self._seq_worker = None
 
     def _handle_projects_loaded(self, projects: List[Project]):
         self._set_loading(False, "")
+        self._show_project_list(projects)
+
+    def _show_project_list(self, projects: List[Project]):
+        with UI_RENDER_SECONDS.labels("projects").time():
+            self._render_project_list(projects)
+
+    def _render_project_list(self, projects: List[Project]):
         self._projects = list(projects or [])
         self._projects_by_id = {p.id: p for p in self._projects}
+        self._search_index.add_many(self._projects)
 
         if not self._projects:
             self.status_label.setText("No projects available.")
@@ -420,10 +662,61 @@ class MainWindow(QMainWindow):
 
         self.status_label.setText(f"Loaded {len(self._projects)} project(s).")
         self.projects_page.set_items(self._projects)
+        if self.search_input.text().strip():
+            self._apply_search(self.search_input.text())
+
+    # ------------------------------------------------------------------ search
+
+    def _build_search_index(self):
+        self._index_worker = BuildSearchIndexWorker(self._ctx, self)
+        self._index_worker.success.connect(self._handle_search_index_built)
+        self._index_worker.error.connect(lambda msg: print(f"[Search] index build failed: {msg}"))
+        self._index_worker.finished.connect(self._cleanup_index_worker)
+        self._index_worker.start()
+
+    def _handle_search_index_built(self, index: SearchIndex):
+        # Entities loaded while the worker ran are newer than the mirror snapshot
+        index.add_many(self._projects)
+        index.add_many(self._sequences)
+        self._search_index = index
+        if self.search_input.text().strip():
+            self._apply_search(self.search_input.text())
+
+    def _cleanup_index_worker(self):
+        self._index_worker = None
+
+    def _apply_search(self, text: str):
+        text = text.strip()
+        if not text:
+            self.projects_page.set_filter(None)
+            self.sequences_page.set_filter(None)
+            return
+
+        # A project stays visible if it or anything below it matches
+        project_ids: set[str] = set()
+        sequence_ids: set[str] = set()
+        for hit in self._search_index.matches(text):
+            project_ids.add(hit.project_id)
+            if hit.kind == "sequence":
+                sequence_ids.add(hit.id)
+            elif hit.kind == "shot":
+                sequence_ids.add(hit.sequence_id)
+
+        shown_projects = self.projects_page.set_filter(project_ids)
+        shown_sequences = self.sequences_page.set_filter(sequence_ids)
+
+        current = self.stack.currentWidget()
+        if current == self.projects_page:
+            self.status_label.setText(f"{shown_projects} of {self.projects_page.item_count()} project(s) match.")
+        elif current == self.sequences_page:
+            self.status_label.setText(f"{shown_sequences} of {self.sequences_page.item_count()} sequence(s) match.")
     
     def _on_projects_action(self, project_id: str, action: str, project_obj):
         if action == "browse":
             self._load_sequences(project_id)  
+            if config.LAUNCH_WARM_ON_BROWSE:
+                # Provision and pre-read the editor while the user picks a sequence
+                self._ctx.launch_pipeline.prepare(project_obj)
         elif action == "assemble":
             self._on_card_assemble(project_id)
         elif action == "delete":
@@ -434,11 +727,11 @@ class MainWindow(QMainWindow):
         self._projects_obj = project_obj
 
     def _handle_projects_error(self, message: str):
-       
-        self._set_loading(False, "")
-        QMessageBox.critical(self, "Error loading projects", message)
-
         self._set_loading(False, "")
+        if self._ctx.backend_health.is_offline:
+            # The backend went down during the load: whatever the mirror had stays on screen
+            self._offline_fallback(bool(self._projects), "projects")
+            return
         QMessageBox.critical(self, "Error loading projects", message)
 
     def _cleanup_load_worker(self):
@@ -467,26 +760,120 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Launch failed", str(exc))
 
     def _on_card_delete(self, project_id: str):
+        self._run_bulk("delete", [project_id])
+
+    def _on_card_menu(self, project_id: str):
         project = self._get_project(project_id)
         if not project:
             return
+        offline = self._ctx.backend_health.is_offline
+        menu = QMenu(self)
+        menu.addAction("Archive", lambda: self._run_bulk("archive", [project_id])).setEnabled(not offline)
+        menu.addMenu(self._build_status_menu(lambda: [project_id], menu)).setEnabled(not offline)
+        menu.addAction("Grant access…", lambda: self._run_bulk("grant_access", [project_id])).setEnabled(not offline)
+        menu.addSeparator()
+        selected = project_id in self.projects_page.selected_ids()
+        menu.addAction("Deselect" if selected else "Select",
+                       lambda: self.projects_page.set_selected([project_id], not selected))
+        menu.exec(QCursor.pos())
 
-        reply = QMessageBox.question(
-            self,
-            "Delete project",
-            f"Are you sure you want to delete '{project.name}'?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-        )
-        if reply == QMessageBox.StandardButton.Yes:
-            # TODO: implement deletion via backend
-            QMessageBox.information(self, "Delete", f"(Not implemented) Would delete: {project.name}")
+    # ------------------------------------------------------------------ bulk actions
 
-    def _on_card_menu(self, project_id: str):
-        project = self._get_project(project_id)
-        if not project:
+    def _run_bulk(self, action: str, project_ids: list[str], **params):
+        """Confirm / ask for what the action needs, then start it in the background."""
+        projects = [p for p in map(self._get_project, project_ids) if p is not None]
+        if not projects:
             return
-        # TODO: show context menu / options dialog
-        QMessageBox.information(self, "Menu", f"(Not implemented) Menu for: {project.name}")
+
+        if action in ("delete", "archive"):
+            verb = "Delete" if action == "delete" else "Archive"
+            names = "\n".join(f"• {p.name}" for p in projects[:8])
+            if len(projects) > 8:
+                names += f"\n…and {len(projects) - 8} more"
+            reply = QMessageBox.question(
+                self,
+                f"{verb} projects",
+                f"{verb} {len(projects)} project(s)?\n\n{names}",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+        elif action == "grant_access" and "user_kc_id" not in params:
+            user_id, ok = QInputDialog.getText(
+                self, "Grant access", f"User ID (Keycloak) to give access to {len(projects)} project(s):"
+            )
+            if not ok or not user_id.strip():
+                return
+            role, ok = QInputDialog.getItem(self, "Grant access", "Role:", ACCESS_ROLES, 0, False)
+            if not ok:
+                return
+            params = {"user_kc_id": user_id.strip(), "role": role}
+
+        op = self._ctx.bulk_operations.start(action, [(p.id, p.name) for p in projects], **params)
+        self._bulk_ops[op.id] = op
+        for p in projects:
+            self.projects_page.set_item_status(p.id, "Queued")
+        self._update_bulk_bar()
+
+    def _on_bulk_item_changed(self, op_id: str, item):
+        op = self._bulk_ops.get(op_id)
+        if op is None:
+            return
+        op.items[item.id] = item
+        running, done, _ = _BULK_TEXT[op.action]
+        if item.state == "running":
+            self.projects_page.set_item_status(item.id, running)
+        elif item.state == "failed":
+            # Stays selected: retrying is picking the same action again
+            self.projects_page.set_item_status(item.id, f"Failed: {item.error}", "failed")
+        elif item.state == "done" and op.action == "delete":
+            self._search_index.remove(item.id)
+            self.projects_page.remove_item(item.id)
+            self._projects = [p for p in self._projects if p.id != item.id]
+            self._projects_by_id.pop(item.id, None)
+        elif item.state == "done":
+            self.projects_page.set_item_status(item.id, done, "done")
+            self.projects_page.set_selected([item.id], False)
+            self._bulk_done_ids.append(item.id)
+        self._update_bulk_bar()
+
+    def _on_bulk_finished(self, op):
+        if self._bulk_ops.pop(op.id, None) is None:
+            return
+        failed = op.failed
+        summary = f"{_BULK_TEXT[op.action][2]} {len(op.done)} of {len(op.items)} project(s)"
+        # On the bar rather than the status label, which the resync below overwrites
+        self._bulk_summary = summary + (f"; {len(failed)} failed and stay selected" if failed else "")
+        self._update_bulk_bar()
+        self._bulk_status_timer.start()
+        # Counts, ordering and the mirror catch up through the usual delta sync
+        self._resync_timer.start()
+        if failed:
+            lines = "\n".join(f"• {i.title}: {i.error}" for i in failed[:10])
+            if len(failed) > 10:
+                lines += f"\n…and {len(failed) - 10} more"
+            QMessageBox.warning(self, "Some projects failed", f"{summary}.\n\nFailed:\n{lines}")
+
+    def _clear_bulk_done_statuses(self):
+        for project_id in self._bulk_done_ids:
+            self.projects_page.set_item_status(project_id, "")
+        self._bulk_done_ids.clear()
+        self._bulk_summary = ""
+        self._update_bulk_bar()
+
+    def _update_bulk_bar(self):
+        selected = len(self.projects_page.selected_ids())
+        parts = [f"{selected} selected"] if selected else []
+        for op in self._bulk_ops.values():
+            parts.append(f"{_BULK_TEXT[op.action][0]} {op.settled}/{len(op.items)}")
+        if self._bulk_summary and not self._bulk_ops:
+            parts.append(self._bulk_summary)
+        self.bulk_bar.setVisible(self.stack.currentWidget() == self.projects_page and bool(parts))
+        self.bulk_label.setText(" • ".join(parts))
+        enabled = bool(selected) and not self._ctx.backend_health.is_offline
+        for btn in (self.bulk_archive_button, self.bulk_status_button, self.bulk_access_button,
+                    self.bulk_delete_button):
+            btn.setEnabled(enabled)
 
     def closeEvent(self, event):
         # Safely stop worker to avoid signals firing after widgets are gone
@@ -498,23 +885,68 @@ class MainWindow(QMainWindow):
             self._load_worker.quit()
             self._load_worker.wait(200)
         self._load_worker = None
+        self._ctx.live_updates.stop()
+        try:
+            self._ctx.live_updates.entity_changed.disconnect(self._on_entity_changed)
+            self._ctx.live_updates.resync_required.disconnect(self._resync_timer.start)
+        except TypeError:
+            pass
+        if self._index_worker and self._index_worker.isRunning():
+            self._index_worker.success.disconnect()
+            self._index_worker.wait(200)
+        pipeline = self._ctx.launch_pipeline
+        pipeline.progress.disconnect(self._on_provision_progress)
+        pipeline.prepared.disconnect(self._on_launch_prepared)
+        pipeline.failed.disconnect(self._on_launch_failed)
+        pipeline.handed_off.disconnect(self._on_launch_handed_off)
+        pipeline.launched.disconnect(self._on_launch_started)
+        pipeline.start_failed.disconnect(self._on_launch_start_failed)
+        pipeline.stop()     # interrupted provisioning resumes on the next open
+        self._ctx.theater_service.failed.disconnect(self._on_editor_failed)
+        self._ctx.theater_service.admission_warning.disconnect(self.status_label.setText)
+        self._ctx.theater_service.session_unhealthy.disconnect(self._on_editor_unhealthy)
+        self._ctx.theater_service.shutdown()
+        self._ctx.backend_health.offline_changed.disconnect(self._on_offline_changed)
+        self._ctx.backend_health.backend_changed.disconnect(self._on_backend_changed)
+        self._ctx.save_queue.job_changed.disconnect(self._on_save_job_changed)
+        self._ctx.bulk_operations.item_changed.disconnect(self._on_bulk_item_changed)
+        self._ctx.bulk_operations.finished.disconnect(self._on_bulk_finished)
+        # Worker pools and timers of the app-wide services (queued saves resume on the next start)
+        self._ctx.save_queue.stop()
+        self._ctx.bulk_operations.stop()
+        self._ctx.backend_health.stop()
+        self.log_viewer_page.shutdown()
         super().closeEvent(event)
 
     def _build_pages(self):
-        self.projects_page = CardListPage(make_card=self._make_project_card, show_back=False)
-        self.sequences_page = CardListPage(make_card=self._make_sequence_card, show_back=True)
+        self.projects_page = CardListPage(
+            make_card=self._make_project_card, update_card=self._update_project_card, show_back=False
+        )
+        self.sequences_page = CardListPage(
+            make_card=self._make_sequence_card, update_card=self._update_sequence_card, show_back=True
+        )
         self.script_breakdown_page = ScriptBreakdownPage(ctx=self._ctx)
+        self.log_viewer_page = LogViewerPage(self._ctx.theater_service.archive)
+        self.diagnostics_page = DiagnosticsPage(self._ctx.metrics)
 
         self.stack.addWidget(self.projects_page)
         self.stack.addWidget(self.sequences_page)
         self.stack.addWidget(self.script_breakdown_page) 
+        self.stack.addWidget(self.log_viewer_page)
+        self.stack.addWidget(self.diagnostics_page)
 
         self.projects_page.action.connect(self._on_projects_action)
+        self.projects_page.selection_changed.connect(self._update_bulk_bar)
         self.sequences_page.action.connect(self._on_sequences_action)
         self.sequences_page.back_requested.connect(self._back_to_projects)
         self.script_breakdown_page.back_requested.connect(self._back_to_projects) 
+        self.log_viewer_page.back_requested.connect(self._back_to_projects)
+        self.diagnostics_page.back_requested.connect(self._back_to_projects)
+        # Not in any menu: a support tool
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, activated=self._show_diagnostics)
 
     def _show_projects(self):
+        self._current_project_id = None     # a sequence load still running is no longer wanted
         self.stack.setCurrentWidget(self.projects_page)
 
     def _show_sequences(self, project_id: str):
@@ -522,43 +954,150 @@ class MainWindow(QMainWindow):
         self.stack.setCurrentWidget(self.sequences_page)
 
     def _on_sequences_action(self, sequence_id: str, action: str, sequence_obj):
-        env = os.environ.copy()
-        env["PROJECTS_ROOT_DIR"] = r"J:"
-
-        # Pick the right fields for your domain objects:
-        env["MVL_PROJECT"] = "tg63" #getattr(self._projects_obj, "code", None) or str(getattr(self._projects_obj, "id", ""))
-        env["MVL_TYPE"] = "sequences"
-        env["MVL_SCOPE"] = "sq01"#getattr(sequence_obj, "code", None) or str(getattr(sequence_obj, "id", ""))
-        env["MVL_CONTAINER"] = "master"
-        env["MVL_TASK"] = "layout"
-        env["MVL_STEP"] = "lay"
-
         if action == "open":
-            import shutil
-
-            project_name = getattr(self._projects_obj, "name", None) or "MyProjectName"
-            UNREAL_PROJECTS_DIR = r"C:\dev\Unreal Projects"
-            TEMPLATE_DIR = os.path.join(UNREAL_PROJECTS_DIR, "MyProject")
-            target_dir = os.path.join(UNREAL_PROJECTS_DIR, project_name)
-            target_uproject = os.path.join(target_dir, f"{project_name}.uproject")
-
-            if not os.path.exists(target_uproject):
-                try:
-                    shutil.copytree(TEMPLATE_DIR, target_dir)
-                    os.rename(os.path.join(target_dir, "MyProject.uproject"), target_uproject)
-                except Exception as exc:
-                    QMessageBox.critical(self, "Copy failed", str(exc))
-                    return
-
-            if os.environ.get("THEATER_EXECUTABLE") and os.environ.get("THEATER_UPROJECT_TEMPLATE"):
-                ue_editor = os.path.join(os.environ.get("THEATER_HOME")) #, r"Engine\Binaries\Win64\UnrealEditor.exe") 
-                uproject = target_uproject   
-                service = self._ctx.theater_service.launch(ue_editor, uproject, ["-MVLEditor"], env=env)
-            else:
-                print(f"THEATER_EXECUTABLE or THEATER_UPROJECT_TEMPLATE env not set")
+            project = getattr(self, "_projects_obj", None)
+            if project is None:
+                return
+            pipeline = self._ctx.launch_pipeline
+            self._pending_launch = (project.name, sequence_obj, time.perf_counter())
+
+            plan = pipeline.ready_plan(project)
+            if plan is not None:
+                self._on_launch_prepared(plan)
+                return
+
+            # Usually already running since the project was browsed; this just waits for it
+            verb = "Checking" if pipeline.provisioning.is_provisioned(project.name) else "Preparing"
+            self.status_label.setText(f"{verb} {project.name}...")
+            pipeline.prepare(project)
         elif action == "delete":
             print("Delete sequence", sequence_id)
 
+    def _on_provision_progress(self, done_bytes: int, total_bytes: int, done_files: int, total_files: int):
+        if self._pending_launch is None:
+            return  # background warm-up; don't take over the status bar
+        pct = int(done_bytes * 100 / total_bytes) if total_bytes else 100
+        self.status_label.setText(f"Preparing project... {pct}% ({done_files}/{total_files} files)")
+
+    def _on_launch_prepared(self, plan):
+        pending, self._pending_launch = self._pending_launch, None
+        if pending is None or pending[0] != plan.project_name:
+            self._pending_launch = pending
+            return
+        _, sequence, clicked_at = pending
+        self.status_label.setText(f"Starting {plan.project_name}...")
+        try:
+            self._ctx.launch_pipeline.launch(plan, sequence, clicked_at=clicked_at)
+        except Exception as exc:
+            self._on_launch_start_failed(plan.project_name, str(exc))
+
+    def _on_launch_started(self, session):
+        if session.is_queued():
+            self.status_label.setText(f"{session.key} will open when resources free up ({session.queued_reason}).")
+
+    def _on_launch_start_failed(self, project_name: str, message: str):
+        self.status_label.setText("Launch failed.")
+        QMessageBox.critical(self, "Launch failed", message)
+
+    def _on_launch_handed_off(self, project_name: str, key: str):
+        self.status_label.setText(f"Switched the open {project_name} editor to {key}.")
+
+    def _on_editor_failed(self, message: str):
+        self.status_label.setText("Editor stopped unexpectedly.")
+        QMessageBox.critical(self, "Editor", message)
+
+    def _on_editor_unhealthy(self, session, report):
+        self.status_label.setText(f"Editor problem: {report.summary()}")
+        if not session.is_alive() or session.stop_requested:
+            return  # gone already, or the watchdog is killing / relaunching it
+        text = report.reason + (f"\n\nA report was saved to:\n{report.path}" if report.path else "")
+        QMessageBox.warning(self, f"Editor not responding: {session.key}", text)
+
+    def _on_launch_failed(self, project_name: str, message: str):
+        if self._pending_launch is None or self._pending_launch[0] != project_name:
+            print(f"[Launch] background preparation of {project_name} failed: {message}")
+            return
+        self._pending_launch = None
+        self.status_label.setText("Project preparation failed.")
+        QMessageBox.critical(self, "Launch failed", message)
+
+    # ------------------------------------------------------------------ offline mode
+
+    def _offline_fallback(self, have_cached: bool, what: str) -> bool:
+        """While offline, skip the network load (cached data is already shown); True if skipped."""
+        health = self._ctx.backend_health
+        if not health.is_offline:
+            return False
+        self._set_loading(False, f"Offline: showing cached {what}." if have_cached
+                          else f"Offline: no cached {what} yet.")
+        health.probe_now()
+        return True
+
+    def _on_backend_changed(self, name: str, online: bool):
+        if self._ctx.backend_health.is_offline:
+            self._on_offline_changed(True)      # update which backends the banner names
+
+    def _on_offline_changed(self, offline: bool):
+        self.offline_label.setVisible(offline)
+        self._update_bulk_bar()
+        # Script breakdown and project creation need the API
+        if self.stack.currentWidget() != self.script_breakdown_page:
+            self.new_project_button.setEnabled(not offline)
+        if offline:
+            names = {"api": "the project server", "keycloak": "the login server"}
+            down = " and ".join(names.get(n, n) for n in self._ctx.backend_health.down())
+            self.offline_label.setText(
+                f"Offline: {down} can't be reached. Showing cached data; reconnecting automatically."
+            )
+            return
+        self.status_label.setText("Back online.")
+        self._resync()
+
+    # ------------------------------------------------------------------ live updates
+
+    def _on_entity_changed(self, event):
+        entity_id = str(event.data.get("id", ""))
+        if event.op != "updated":
+            # Creations need counts and ordering from the server; deletions are
+            # cheap either way, so both go through the (debounced) delta sync.
+            if event.op == "deleted":
+                self._search_index.remove(entity_id)
+                self.projects_page.remove_item(entity_id)
+                self.sequences_page.remove_item(entity_id)
+            self._resync_timer.start()
+            return
+
+        if event.entity == "project":
+            target = self._projects_by_id.get(entity_id)
+            fields = ("name", "code", "sequence_count", "shot_count", "updated_at")
+            page = self.projects_page
+        elif event.entity == "sequence":
+            target = next((s for s in self._sequences if s.id == entity_id), None)
+            fields = ("name", "code", "status", "updated_at")
+            page = self.sequences_page
+        else:
+            return  # shots have no cards yet
+
+        if target is None:
+            return
+        for field in fields:
+            if field in event.data:
+                setattr(target, field, event.data[field])
+
+        page.update_item(target)
+        self._search_index.add(target)
+        self._ctx.project_service.remember(target)
+
+    def _on_save_job_changed(self, job):
+        # A queued save finished (possibly one resumed from an earlier session): show the new project
+        if job.state == "done" and job.kind == "create_project":
+            self._resync_timer.start()
+
+    def _resync(self):
+        self._load_projects()
+        if self.stack.currentWidget() == self.sequences_page and self._current_project_id:
+            self._load_sequences(self._current_project_id)
+
     def _refresh_current_page(self):
         current = self.stack.currentWidget()
         if hasattr(current, "refresh"):
@@ -568,6 +1107,6 @@ class MainWindow(QMainWindow):
         self._show_projects()
 
     def _on_session_expired(self, msg: str):
-        QMessageBox.information(self, "Session expired", mg)
+        QMessageBox.information(self, "Session expired", msg)
         self._ctx.auth_service.logout()
         self._on_logout(msg, self)
@@ -47,29 +47,6 @@ class AIWorker(QThread):
             self.error.emit(str(e))
 
 
-class SaveProjectWorker(QThread):
-    success = pyqtSignal(object)
-    error = pyqtSignal(str)
-
-    def __init__(self, ctx, name: str, code: str, project_type: str, breakdown, ai_result, parent=None):
-        super().__init__(parent)
-        self._ctx = ctx
-        self._name = name
-        self._code = code
-        self._type = project_type
-        self._breakdown = breakdown
-        self._ai_result = ai_result
-
-    def run(self):
-        try:
-            result = self._ctx.script_breakdown_service.save_project(
-                self._name, self._code, self._type, self._breakdown, self._ai_result
-            )
-            self.success.emit(result)
-        except Exception as e:
-            self.error.emit(str(e))
-
-
 class ScriptBreakdownPage(QWidget):
     back_requested = pyqtSignal()
     results_ready = pyqtSignal(bool)
@@ -79,12 +56,14 @@ class ScriptBreakdownPage(QWidget):
         self._ctx = ctx
         self._worker = None
         self._ai_worker = None
-        self._save_worker = None
+        self._save_jobs: set[str] = set()     # queued saves started from this page
+        self._form_job = None                 # the save of what the form currently shows
         self._last_result = None
         self._last_ai_result = None 
         self._parse_done = False 
         self._ai_done = False  
         self._build_ui()
+        ctx.save_queue.job_changed.connect(self._on_save_job_changed)
 
     def _build_ui(self):
         root = QVBoxLayout(self)
@@ -260,6 +239,7 @@ class ScriptBreakdownPage(QWidget):
             return
 
         self.lbl_file.setText(f"📄 {os.path.basename(path)}")
+        self._form_job = None
         self.btn_upload.setEnabled(False)
         self.btn_upload.setText("⏳ Processing...")
         self._last_result = None
@@ -375,19 +355,38 @@ class ScriptBreakdownPage(QWidget):
             self.lbl_status.setText("❌ Please fill in all project fields.")
             return
 
-        self.lbl_status.setText("💾 Saving project...")
-        self.btn_upload.setEnabled(False)
-        self.results_ready.emit(False)
-
-        self._save_worker = SaveProjectWorker(
-            self._ctx, name, code, project_type, self._last_result, self._last_ai_result, self
-        )
-        self._save_worker.success.connect(self._on_save_success)
-        self._save_worker.error.connect(self._on_save_error)
-        self._save_worker.start()
+        # Queued, not sent: returns at once, and the queue finishes it even across a restart.
+        # The form keeps its input until the project exists, so a refused save can be fixed
+        try:
+            job = self._ctx.script_breakdown_service.save_project(
+                name, code, project_type, self._last_result, self._last_ai_result
+            )
+        except Exception as e:
+            self._on_save_error(str(e))
+            return
+        self._save_jobs.add(job.id)
+        self._form_job = job.id
+        self.lbl_status.setText(f"💾 Saving project '{job.title}' in the background...")
 
-    def _on_save_success(self, project):
-        self.lbl_status.setText(f"✅ Project '{project.get('name')}' created successfully.")
+    def _on_save_job_changed(self, job):
+        if job.id not in self._save_jobs:
+            return
+        if job.state == "done":
+            self._save_jobs.discard(job.id)
+            self.lbl_status.setText(f"✅ Project '{job.title}' created successfully.")
+            if self._form_job == job.id:
+                self._reset_form()
+        elif job.state == "failed":
+            self._save_jobs.discard(job.id)
+            if job.step == 0:
+                # Nothing reached the server; the form still holds the input to correct and save again
+                self._ctx.save_queue.discard(job.id)
+            self._on_save_error(f"'{job.title}': {job.error}")
+        elif job.error:
+            self.lbl_status.setText(f"⏳ Saving '{job.title}' is waiting to retry ({job.error}).")
+
+    def _reset_form(self):
+        self._form_job = None
         self._reset_button()
         self.input_name.clear()
         self.input_code.clear()
@@ -400,4 +399,4 @@ class ScriptBreakdownPage(QWidget):
     def _on_save_error(self, msg: str):
         self.lbl_status.setText(f"❌ Save failed: {msg}")
         self._reset_button()
-        self._check_save_ready()
\ No newline at end of file
+        self._check_save_ready()
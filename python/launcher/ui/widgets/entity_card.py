@@ -6,7 +6,7 @@ from typing import Callable, Iterable, Optional
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import (
-    QWidget, QFrame, QLabel, QPushButton,
+    QWidget, QFrame, QLabel, QPushButton, QCheckBox,
     QHBoxLayout, QVBoxLayout, QSizePolicy
 )
 
@@ -29,8 +29,10 @@ class EntityCard(QFrame):
 
     Emits:
       action_clicked(entity_id: str, action: str)
+      selection_toggled(entity_id: str, selected: bool)   (selectable cards: checkbox or Ctrl+click)
     """
     action_clicked = pyqtSignal(str, str)
+    selection_toggled = pyqtSignal(str, bool)
 
     def __init__(
         self,
@@ -41,10 +43,12 @@ class EntityCard(QFrame):
         accent_color: str = "#4AC0FF",
         icon: str | None = None,
         buttons: Iterable[CardButtonSpec] = (),
+        selectable: bool = False,
         parent: QWidget | None = None,
     ) -> None:
         super().__init__(parent)
         self._entity_id = entity_id
+        self._selectable = selectable
         self._accent_color = accent_color
         self._icon = icon
         self._buttons = list(buttons)
@@ -69,6 +73,12 @@ class EntityCard(QFrame):
         self._refresh_styles(self._card)
         super().leaveEvent(event)
 
+    def mousePressEvent(self, event) -> None:
+        if self._selectable and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            self.select_box.toggle()
+            return
+        super().mousePressEvent(event)
+
     def _refresh_styles(self, widget: QWidget) -> None:
         widget.style().unpolish(widget)
         widget.style().polish(widget)
@@ -87,6 +97,13 @@ class EntityCard(QFrame):
         card_layout.setContentsMargins(20, 16, 20, 16)
         card_layout.setSpacing(16)
 
+        # Selection checkbox (multi-select lists only)
+        self.select_box = QCheckBox(self._card)
+        self.select_box.setObjectName("CardSelect")
+        self.select_box.setVisible(self._selectable)
+        self.select_box.toggled.connect(self._on_select_toggled)
+        card_layout.addWidget(self.select_box)
+
         # Left stripe
         stripe = QFrame(self._card)
         stripe.setObjectName("AccentStripe")
@@ -142,6 +159,13 @@ class EntityCard(QFrame):
 
         card_layout.addWidget(info_wrapper, stretch=1)
 
+        # Progress / outcome of an operation on this entity (e.g. a bulk delete)
+        self.status_label = QLabel("", self._card)
+        self.status_label.setObjectName("EntityStatus")
+        self.status_label.setMaximumWidth(280)
+        self.status_label.setVisible(False)
+        card_layout.addWidget(self.status_label)
+
         # Right container with buttons
         right_container = QFrame(self._card)
         right_container.setObjectName("RightContainer")
@@ -190,6 +214,10 @@ class EntityCard(QFrame):
                 background-color: #343844;
             }}
 
+            #CardBackground[selected="true"] {{
+                border: 2px solid #7B61FF;
+            }}
+
             #AccentStripe {{
                 background-color: {self._accent_color};
                 border-radius: 3px;
@@ -215,6 +243,17 @@ class EntityCard(QFrame):
                 font-size: 12px;
             }}
 
+            #EntityStatus {{
+                color: #C9B8FF;
+                font-size: 12px;
+            }}
+            #EntityStatus[state="failed"] {{
+                color: #FF6A7A;
+            }}
+            #EntityStatus[state="done"] {{
+                color: #6FD08C;
+            }}
+
             #RightContainer {{
                 background-color: #33363F;
                 border-radius: 16px;
@@ -283,6 +322,42 @@ class EntityCard(QFrame):
                 )
             )
 
+    def set_texts(self, title: str | None = None, meta_text: str | None = None,
+                  id_text: str | None = None) -> None:
+        """Update labels in place (e.g. after a live update)."""
+        if title is not None:
+            self.title_label.setText(title)
+        if meta_text is not None:
+            self.meta_label.setText(meta_text)
+            self.meta_label.setVisible(bool(meta_text))
+        if id_text is not None:
+            self.id_label.setText(id_text)
+            self.id_label.setVisible(bool(id_text))
+
+    def set_status(self, text: str, state: str = "") -> None:
+        """Show progress of an operation on the entity; state "failed" / "done" colours it, "" clears."""
+        self.status_label.setText(text)
+        self.status_label.setToolTip(text if state == "failed" else "")
+        self.status_label.setVisible(bool(text))
+        self.status_label.setProperty("state", state)
+        self._refresh_styles(self.status_label)
+
+    def _on_select_toggled(self, selected: bool) -> None:
+        self._card.setProperty("selected", selected)
+        self._refresh_styles(self._card)
+        self.selection_toggled.emit(self._entity_id, selected)
+
+    def set_selected(self, selected: bool) -> None:
+        """Check or uncheck without emitting selection_toggled."""
+        self.select_box.blockSignals(True)
+        self.select_box.setChecked(selected)
+        self.select_box.blockSignals(False)
+        self._card.setProperty("selected", selected)
+        self._refresh_styles(self._card)
+
+    def is_selected(self) -> bool:
+        return self.select_box.isChecked()
+
     def set_accent_color(self, color: str) -> None:
         self._accent_color = color
         self._apply_style()
@@ -0,0 +1,24 @@
+# util/errors.py
+"""Exceptions shared across services, kept here so low-level modules can raise them without import cycles."""
+import requests
+
+from launcher.util import json_codec
+
+
+class AuthError(Exception):
+    pass
+
+
+class SessionExpired(AuthError):
+    pass
+
+
+def describe_error(exc: Exception) -> str:
+    """One line for the user: "HTTP 403: Project is locked", or the exception's message."""
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        try:
+            detail = json_codec.loads(exc.response.content).get("detail")
+        except (ValueError, AttributeError):
+            detail = None
+        return f"HTTP {exc.response.status_code}" + (f": {detail}" if detail else "")
+    return str(exc) or exc.__class__.__name__
@@ -0,0 +1,129 @@
+# util/json_codec.py
+"""
+JSON encode/decode for everything the launcher reads and writes.
+
+Backed by a pluggable codec: orjson or msgspec when installed (several
+times faster on multi-megabyte payloads), the stdlib json module
+otherwise. Every codec decodes raw bytes directly, so callers hand over
+``resp.content`` without decoding it to text first, and every codec
+encodes to compact UTF-8 bytes with the same handling of UUIDs,
+datetimes and non-string keys, so switching codecs never changes what
+goes over the wire. Malformed input raises ValueError whichever codec
+is in use.
+
+    data = json_codec.loads(resp.content)
+    body = json_codec.dumps(payload)
+
+``use("stdlib")`` (or [Json] codec in config.ini, applied at startup)
+picks a codec explicitly; ``available()`` lists what is installed.
+"""
+from __future__ import annotations
+
+import gc
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import Any, Callable, TypeVar
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional dependency
+    msgspec = None
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True, frozen=True)
+class Codec:
+    name: str
+    loads: Callable[[bytes | bytearray | memoryview | str], Any]
+    dumps: Callable[[Any], bytes]
+
+
+def _default(obj: Any) -> Any:
+    # What orjson and msgspec serialize natively
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_stdlib_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_default)
+
+
+def _stdlib_loads(data):
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+
+CODECS: dict[str, Codec] = {}
+if orjson is not None:
+    CODECS["orjson"] = Codec(
+        "orjson", orjson.loads,
+        lambda obj: orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS),
+    )
+if msgspec is not None:
+    def _msgspec_loads(data):
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as exc:     # not a ValueError, unlike the others
+            raise ValueError(str(exc)) from exc
+
+    def _msgspec_dumps(obj):
+        try:
+            return msgspec.json.encode(obj, enc_hook=_default)
+        except msgspec.EncodeError as exc:
+            raise TypeError(str(exc)) from exc
+
+    CODECS["msgspec"] = Codec("msgspec", _msgspec_loads, _msgspec_dumps)
+CODECS["stdlib"] = Codec("stdlib", _stdlib_loads, lambda obj: _stdlib_encoder.encode(obj).encode("utf-8"))
+
+codec: Codec = next(iter(CODECS.values()))      # best installed: orjson, msgspec, stdlib
+loads = codec.loads
+dumps = codec.dumps
+
+
+def available() -> list[str]:
+    return list(CODECS)
+
+
+def use(name: str) -> Codec:
+    """Switch codecs ("auto" for the fastest installed); unknown or missing ones fall back to auto."""
+    global codec, loads, dumps
+    chosen = CODECS.get(name)
+    if chosen is None:
+        if name != "auto":
+            print(f"[Json] codec {name!r} not available (have {', '.join(CODECS)}); using {next(iter(CODECS))}")
+        chosen = next(iter(CODECS.values()))
+    codec, loads, dumps = chosen, chosen.loads, chosen.dumps
+    return chosen
+
+
+@contextmanager
+def gc_paused():
+    """
+    Suspend the cyclic GC while building many small objects at once.
+
+    Decoding 100k entities otherwise triggers dozens of full generation
+    scans that find nothing to collect; this roughly halves decode time.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def decode_list(data: bytes | bytearray | str, factory: Callable[[dict], T]) -> list[T]:
+    """Decode a JSON array straight into a list of typed objects."""
+    with gc_paused():
+        return [factory(item) for item in loads(data)]
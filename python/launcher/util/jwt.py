@@ -0,0 +1,106 @@
+# util/jwt.py
+"""
+Minimal JWT (JWS compact form) decoding and RSA signature checks.
+
+Keycloak access tokens already carry what the launcher asks /auth/me for
+(sub, preferred_username, email) plus their own lifetime (iat / exp), so
+reading them locally saves a round trip per login and refresh.
+
+Only the RS256/RS384/RS512 algorithms Keycloak signs with are verified.
+Verification needs the public key alone: the signature is raised to the
+key's exponent and compared, whole, with the expected PKCS#1 v1.5 encoding
+of the digest, so no third-party crypto library is required.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import time
+from typing import Any
+
+from launcher.util import json_codec
+
+# DER DigestInfo prefixes (RFC 8017, section 9.2, note 1)
+_DIGESTS = {
+    "RS256": (hashlib.sha256, bytes.fromhex("3031300d060960864801650304020105000420")),
+    "RS384": (hashlib.sha384, bytes.fromhex("3041300d060960864801650304020205000430")),
+    "RS512": (hashlib.sha512, bytes.fromhex("3051300d060960864801650304020305000440")),
+}
+SUPPORTED_ALGORITHMS = tuple(_DIGESTS)
+
+
+class InvalidToken(ValueError):
+    """Malformed token, bad signature, or expired."""
+
+
+def b64url_decode(data: str | bytes) -> bytes:
+    if isinstance(data, str):
+        data = data.encode("ascii")
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def split(token: str) -> tuple[dict, dict, bytes, bytes]:
+    """(header, claims, signing input, signature) of a compact JWS; nothing is checked."""
+    try:
+        head, body, sig = token.split(".")
+        header = json_codec.loads(b64url_decode(head))
+        claims = json_codec.loads(b64url_decode(body))
+        signature = b64url_decode(sig)
+    except (ValueError, TypeError, UnicodeError) as exc:
+        raise InvalidToken(f"malformed token: {exc}") from exc
+    if not isinstance(header, dict) or not isinstance(claims, dict):
+        raise InvalidToken("malformed token: header and payload must be objects")
+    return header, claims, f"{head}.{body}".encode("ascii"), signature
+
+
+def unverified_claims(token: str) -> dict[str, Any]:
+    return split(token)[1]
+
+
+def jwk_int(value: str) -> int:
+    return int.from_bytes(b64url_decode(value), "big")
+
+
+def verify_signature(signing_input: bytes, signature: bytes, jwk: dict, alg: str) -> None:
+    if alg not in _DIGESTS:
+        raise InvalidToken(f"unsupported algorithm {alg!r}")
+    if jwk.get("kty") != "RSA":
+        raise InvalidToken(f"key {jwk.get('kid')!r} is not an RSA key")
+    digest, prefix = _DIGESTS[alg]
+    n, e = jwk_int(jwk["n"]), jwk_int(jwk["e"])
+    k = (n.bit_length() + 7) // 8
+    if len(signature) != k:
+        raise InvalidToken("bad signature length")
+    s = int.from_bytes(signature, "big")
+    if s >= n:
+        raise InvalidToken("bad signature")
+    em = pow(s, e, n).to_bytes(k, "big")
+    t = prefix + digest(signing_input).digest()
+    if k < len(t) + 11:
+        raise InvalidToken("key too short")
+    expected = b"\x00\x01" + b"\xff" * (k - len(t) - 3) + b"\x00" + t
+    if not hmac.compare_digest(em, expected):
+        raise InvalidToken("bad signature")
+
+
+def check_expiry(claims: dict, leeway: float = 60.0, now: float | None = None) -> None:
+    exp = claims.get("exp")
+    if exp is None:
+        return
+    if (now if now is not None else time.time()) > float(exp) + leeway:
+        raise InvalidToken("token has expired")
+
+
+def lifetime(claims: dict) -> float | None:
+    """Seconds the token is valid for as issued (exp - iat), independent of the local clock."""
+    exp, iat = claims.get("exp"), claims.get("iat")
+    if exp is None:
+        return None
+    if iat is None:
+        return float(exp) - time.time()
+    return float(exp) - float(iat)
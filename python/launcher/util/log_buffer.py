@@ -0,0 +1,67 @@
+# util/log_buffer.py
+"""
+Bounded in-memory log for child process output.
+
+Output arrives as raw byte chunks that split lines arbitrarily. LineSplitter
+keeps the trailing partial line per stream, so decoding and splitting
+happen once per batch instead of once per read.
+"""
+from __future__ import annotations
+
+from collections import deque
+
+
+class LineSplitter:
+    def __init__(self, encoding: str = "utf-8"):
+        self._encoding = encoding
+        self._partial = b""
+
+    def feed(self, data: bytes) -> str:
+        """
+        The complete lines in `data` (plus what was left over last time) as
+        one "\n"-separated string without the final newline; "" if none.
+        """
+        if not data:
+            return ""
+        if self._partial:
+            data = self._partial + data
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            self._partial = data
+            return ""
+        self._partial = data[cut + 1:]
+        text = data[:cut].decode(self._encoding, errors="replace")
+        return text.replace("\r", "") if "\r" in text else text
+
+    def flush(self) -> str:
+        """Whatever partial line is left (call when the stream ends)."""
+        rest, self._partial = self._partial, b""
+        return rest.decode(self._encoding, errors="replace").rstrip("\r")
+
+
+class LogBuffer:
+    """The last `max_lines` lines, oldest dropped first."""
+
+    def __init__(self, max_lines: int = 20000):
+        self._lines: deque[str] = deque(maxlen=max_lines)
+        self.total = 0       # lines ever appended, including dropped ones
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def extend(self, lines: list[str]) -> None:
+        self._lines.extend(lines)
+        self.total += len(lines)
+
+    def extend_text(self, text: str) -> None:
+        """Append a "\n"-separated block of lines."""
+        if text:
+            self.extend(text.split("\n"))
+
+    def tail(self, n: int | None = None) -> list[str]:
+        if n is None or n >= len(self._lines):
+            return list(self._lines)
+        return list(self._lines)[-n:]
+
+    def clear(self) -> None:
+        self._lines.clear()
@@ -0,0 +1,57 @@
+# util/path_probe.py
+"""
+Cached existence checks for paths that are slow to stat.
+
+Editor binaries and project roots often sit on mapped network drives (J:),
+where a single os.path.exists can take tens of milliseconds, or seconds
+when the share is asleep. Results are kept for `ttl` seconds; callers
+invalidate a path when using it failed.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from launcher.util.metrics import cache_lookup
+
+
+class PathProbe:
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._cache: dict[tuple[str, str], tuple[float, bool]] = {}   # (kind, path) -> (checked at, result)
+
+    def exists(self, path: str | os.PathLike) -> bool:
+        return self._probe("exists", os.fspath(path), os.path.exists)
+
+    def is_file(self, path: str | os.PathLike) -> bool:
+        return self._probe("file", os.fspath(path), os.path.isfile)
+
+    def is_dir(self, path: str | os.PathLike) -> bool:
+        return self._probe("dir", os.fspath(path), os.path.isdir)
+
+    def invalidate(self, path: str | os.PathLike | None = None) -> None:
+        """Forget `path` (every kind of check on it), or everything."""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+                return
+            p = os.fspath(path)
+            for key in [k for k in self._cache if k[1] == p]:
+                del self._cache[key]
+
+    def _probe(self, kind: str, path: str, check) -> bool:
+        key = (kind, path)
+        now = time.monotonic()
+        with self._lock:
+            hit = self._cache.get(key)
+        if hit is not None and now - hit[0] < self.ttl:
+            cache_lookup("path_probe", True)
+            return hit[1]
+        cache_lookup("path_probe", False)
+        # Outside the lock: a slow share must not block probes of other paths
+        result = check(path)
+        with self._lock:
+            self._cache[key] = (time.monotonic(), result)
+        return result
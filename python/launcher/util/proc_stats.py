@@ -0,0 +1,109 @@
+# util/proc_stats.py
+"""
+Cheap resource samples: per process (RSS, cumulative CPU time) and
+system-wide (available memory, load average).
+
+Reads /proc directly on Linux, a couple of small reads and no subprocess.
+Elsewhere psutil is used when it is installed; without it samples are
+unavailable (None), which is said once on the console (and AVAILABLE is
+False for the diagnostics page): admission then only counts editors and
+the watchdog has no CPU signal.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+try:
+    import psutil
+except ImportError:  # optional dependency
+    psutil = None
+
+HAVE_PROC = os.path.isdir("/proc/self")
+AVAILABLE = HAVE_PROC or psutil is not None
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_warned = False
+
+
+def _unavailable() -> None:
+    global _warned
+    if not _warned:
+        _warned = True
+        print("[Resources] no /proc and psutil is not installed: memory / load limits, "
+              "editor RSS/CPU and the watchdog's CPU check are off (install 'psutil')")
+
+
+@dataclass(slots=True)
+class ProcessSample:
+    rss: int                 # bytes
+    cpu_seconds: float       # user + system, cumulative
+
+
+def sample_process(pid: int) -> ProcessSample | None:
+    if HAVE_PROC:
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as fh:
+                stat = fh.read()
+            with open(f"/proc/{pid}/statm", "rb") as fh:
+                statm = fh.read().split()
+        except OSError:
+            return None
+        # comm (field 2) may contain spaces and parens: fields resume after the last ')'
+        fields = stat[stat.rfind(b")") + 2:].split()
+        utime, stime = int(fields[11]), int(fields[12])
+        return ProcessSample(int(statm[1]) * _PAGE_SIZE, (utime + stime) / _CLK_TCK)
+
+    if psutil is not None:
+        try:
+            p = psutil.Process(pid)
+            with p.oneshot():
+                times = p.cpu_times()
+                return ProcessSample(p.memory_info().rss, times.user + times.system)
+        except psutil.Error:
+            return None
+    _unavailable()
+    return None
+
+
+@dataclass(slots=True)
+class SystemSample:
+    mem_total: int           # bytes
+    mem_available: int       # bytes the kernel could hand out without swapping
+    load1: float             # 1-minute load average (CPU utilisation % where there is none)
+    cpu_count: int
+
+    @property
+    def load_per_cpu(self) -> float:
+        return self.load1 / max(1, self.cpu_count)
+
+
+def sample_system() -> SystemSample | None:
+    cpus = os.cpu_count() or 1
+    if HAVE_PROC:
+        try:
+            with open("/proc/meminfo", "rb") as fh:
+                meminfo = fh.read()
+            with open("/proc/loadavg", "rb") as fh:
+                load1 = float(fh.read().split(None, 1)[0])
+        except (OSError, ValueError):
+            return None
+        total = available = 0
+        for line in meminfo.splitlines():
+            if line.startswith(b"MemTotal:"):
+                total = int(line.split()[1]) * 1024
+            elif line.startswith(b"MemAvailable:"):
+                available = int(line.split()[1]) * 1024
+                break
+        return SystemSample(total, available, load1, cpus)
+
+    if psutil is not None:
+        vm = psutil.virtual_memory()
+        try:
+            load1 = os.getloadavg()[0]
+        except (AttributeError, OSError):
+            # No load average on Windows: scale CPU utilisation to the same units
+            load1 = psutil.cpu_percent(interval=None) / 100.0 * cpus
+        return SystemSample(vm.total, vm.available, load1, cpus)
+    _unavailable()
+    return None
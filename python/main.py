@@ -3,7 +3,7 @@ import sys
 from PyQt6.QtWidgets import QApplication
 
 from launcher.ui.app_context import AppContext
-from launcher.ui.login_window import LoginWindow
+from launcher.ui.login_window import LoginWindow, SessionResumeWorker
 from launcher.ui.main_window import MainWindow
 from launcher.ui.script_breakdown_page import ScriptBreakdownPage
 from launcher.ui.theme import apply_global_theme
@@ -15,7 +15,7 @@ def main():
 
     ctx = AppContext()
 
-    holder = {"login": None, "main": None}
+    holder = {"login": None, "main": None, "resume": None}
 
     def show_login(message: str = ""):
         # hide main if present
@@ -35,20 +35,43 @@ def main():
 
     def on_logout(reason: str, main_window: MainWindow):
         ctx.auth_service.logout()
+        ctx.clear_user()
         # don't close the app window chain; just return to login
         show_login(reason or "Logged out.")
 
     def open_main_window(user, login_win: LoginWindow):
         # Hide (don't close) login so we can show it again on logout
         login_win.hide()
+        ctx.set_user(user)
 
         win = MainWindow(ctx, user, on_logout=on_logout)  # <-- pass callback
         win.show()
         holder["main"] = win
         holder["login"] = login_win  # keep ref
 
+    def on_session_rejected(user, message: str):
+        current = ctx.auth_service.current_user
+        if (current is not None and current is not user) or holder["main"] is None:
+            return  # signed out / in again meanwhile
+        on_logout(message, holder["main"])
+
+    def resume_session(user):
+        # Straight to the main window from the saved session; the server check runs behind it
+        open_main_window(user, holder["login"])
+        worker = SessionResumeWorker(ctx)
+        worker.validated.connect(lambda u: print(f"[Session] resumed as {u.email}"))
+        worker.offline.connect(lambda msg: print(f"[Session] could not validate the saved session: {msg}"))
+        worker.expired.connect(lambda msg: on_session_rejected(user, msg))
+        worker.finished.connect(lambda: holder.update(resume=None))
+        holder["resume"] = worker
+        worker.start()
+
     holder["login"] = LoginWindow(ctx, on_login_success=open_main_window)
-    holder["login"].show()
+    cached = ctx.auth_service.resume_cached()
+    if cached is not None:
+        resume_session(cached)
+    else:
+        holder["login"].show()
 
     sys.exit(app.exec())
 
@@ -0,0 +1,98 @@
+# Benchmark: bytes on the wire and wall time for the two big payloads, a
+# save_project upload (config with scenes, character appearances and the AI
+# analysis) and a list_sequences download with large meta dicts, plain vs
+# each encoding available here, over a throttled local link to the stand-in
+# in fake_backend.py. Also checks that a server refusing encoded bodies
+# gets them plain from then on.
+#
+#   python test/bench_compression.py [KiB/s] [ms latency]
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import time
+
+from fake_backend import FakeBackend
+from payloads import save_project_body, sequence_meta
+from launcher.services.http_client import HttpClient
+from launcher.services.http_pipeline import (
+    REQUEST_ENCODERS, RESPONSE_ENCODINGS, AuthMiddleware, CompressionMiddleware, HttpPipeline, MetricsMiddleware,
+    TimeoutMiddleware,
+)
+from launcher.services.project_service import ProjectService
+from launcher.util.metrics import MetricsRegistry
+
+BANDWIDTH = float(sys.argv[1]) * 1024 if len(sys.argv) > 1 else 512 * 1024     # ~4 Mbit/s, a slow VPN
+LATENCY = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.03
+
+
+class StaticAuth:
+    def get_access_token(self):
+        return "test"
+
+    def logout(self):
+        pass
+
+
+def pipeline(registry, encoding: str | None) -> HttpPipeline:
+    compression = CompressionMiddleware(
+        registry, accept=(encoding,) if encoding else ("identity",),
+        compress_endpoints=("POST projects",) if encoding else (), encoding=encoding or "gzip", min_size=4096,
+    )
+    return HttpPipeline([MetricsMiddleware(registry), TimeoutMiddleware((5.0, 120.0)), compression,
+                         AuthMiddleware()])
+
+
+backend = FakeBackend().start()
+backend.compress_min_size = 500
+pid = backend.add_project("Big", "BIG")
+for j in range(400):
+    sid = backend.add_sequence(pid, f"sq{j:03d}", f"Sequence {j}")
+    backend.sequences[sid]["meta"] = sequence_meta()
+payload = save_project_body()
+
+try:
+    for bandwidth, latency, label in ((BANDWIDTH, LATENCY, f"{BANDWIDTH / 1024:.0f} KiB/s, {1000 * LATENCY:.0f} ms"),
+                                      (None, 0.0, "unthrottled")):
+        backend.bandwidth, backend.latency = bandwidth, latency
+        print(f"\n{label}")
+        print(f"{'':<10} {'save_project up':>17} {'':>9}   {'list_sequences down':>19} {'':>9}")
+        plain_up = plain_down = None
+        for encoding in (None, *sorted(set(RESPONSE_ENCODINGS) | set(REQUEST_ENCODERS))):
+            client = HttpClient(backend.base_url, pipeline(MetricsRegistry(), encoding))
+            service = ProjectService(StaticAuth(), client)
+            service.list_sequences(pid)     # connect and warm up outside the timing
+
+            backend.reset_counters()
+            t0 = time.perf_counter()
+            body = dict(payload, code=f"{payload['code']}-{label[:3]}-{encoding}")     # codes are unique
+            resp = client.post("projects/", auth=StaticAuth(), json=body)
+            up_time = time.perf_counter() - t0
+            resp.raise_for_status()
+            up = backend.bytes_received
+            assert backend.posted[-1] == body and resp.json()["config"] == payload["config"]
+
+            backend.reset_counters()
+            t0 = time.perf_counter()
+            sequences = service.list_sequences(pid)
+            down_time = time.perf_counter() - t0
+            down = backend.bytes_sent
+            assert len(sequences) == 400 and sequences[0].meta["camera"]["fps"] == 24
+
+            plain_up, plain_down = plain_up or up, plain_down or down
+            print(f"{encoding or 'plain':<10} {up / 1024:8.0f} KiB {1000 * up_time:7.0f} ms {up / plain_up:5.0%}"
+                  f"   {down / 1024:8.0f} KiB {1000 * down_time:7.0f} ms {down / plain_down:5.0%}")
+
+    # ------------------------------------------------------------ server without body decoding
+
+    backend.bandwidth, backend.latency = None, 0.0
+    backend.accept_encoded_bodies = False
+    client = HttpClient(backend.base_url, pipeline(MetricsRegistry(), "gzip"))
+    backend.reset_counters()
+    for i in range(3):
+        client.post("projects/", auth=StaticAuth(), json=dict(payload, code=f"REFUSED{i}")).raise_for_status()
+    print(f"\nserver refusing encoded bodies: 3 saves took {backend.requests} requests")
+    assert backend.requests == 4
+finally:
+    backend.stop()
+print("ok")
@@ -0,0 +1,61 @@
+# Benchmark: bytes transferred per dashboard refresh on a 1,000-project account,
+# full listing (list_my_projects) vs delta sync (sync_projects), against the
+# local stand-in in fake_backend.py.
+#
+#   python test/bench_delta_sync.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import random
+import tempfile
+
+from fake_backend import FakeBackend
+from launcher.services.http_client import HttpClient
+from launcher.services.local_mirror import LocalMirror
+from launcher.services.project_service import ProjectService
+
+
+class StaticAuth:
+    """Just enough of AuthService for the fake backend (it accepts any token)."""
+
+    def auth_headers(self):
+        return {"Authorization": "Bearer test"}
+
+    def get_access_token(self):
+        return "test"
+
+    def logout(self):
+        pass
+
+
+def refresh(label, fn, backend):
+    backend.reset_counters()
+    projects = fn()
+    print(f"{label:<34} {backend.requests:>5} requests  {backend.bytes_sent / 1024:9.1f} KiB  ({len(projects)} projects)")
+    return projects
+
+
+backend = FakeBackend(projects=1000, sequences_per_project=3).start()
+try:
+    service = ProjectService(StaticAuth(), HttpClient(backend.base_url))
+
+    refresh("full listing", service.list_my_projects, backend)
+
+    service.attach_mirror(LocalMirror(os.path.join(tempfile.mkdtemp(), "mirror.sqlite3")))
+    refresh("delta: first sync", service.sync_projects, backend)
+    refresh("delta: nothing changed", service.sync_projects, backend)
+
+    ids = list(backend.projects)
+    for pid in random.sample(ids, 10):
+        backend.update_project(pid, name=backend.projects[pid]["name"] + " (renamed)")
+    backend.add_sequence(ids[0], "sq99", "Added")
+    backend.delete_project(ids[-1])
+    projects = refresh("delta: 11 changed, 1 deleted", service.sync_projects, backend)
+    assert len(projects) == 999
+    assert sum(p.name.endswith("(renamed)") for p in projects) == 10
+    assert next(p for p in projects if p.id == ids[0]).sequence_count == 4
+
+    refresh("full listing (same account)", service.list_my_projects, backend)
+finally:
+    backend.stop()
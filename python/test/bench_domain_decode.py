@@ -0,0 +1,75 @@
+# Benchmark: decode time and resident size of Shot lists.
+# Compares the old path (resp.json() + plain dataclass) with
+# Shot.list_from_json (raw bytes -> slotted dataclass).
+#
+#   python test/bench_domain_decode.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+from launcher.domain.shot import Shot
+
+
+@dataclass
+class PlainShot:
+    id: str
+    project_id: str
+    sequence_id: str
+    name: str
+    code: str
+    status: str
+    meta: dict
+
+
+def make_payload(n: int) -> bytes:
+    items = [
+        {
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "project_id": "11111111-1111-1111-1111-111111111111",
+            "sequence_id": f"22222222-2222-2222-2222-{i // 50:012d}",
+            "name": f"Shot {i}",
+            "code": f"sh{i:05d}",
+            "status": "wip",
+            "meta": {"frame_in": 1001, "frame_out": 1100, "tags": ["a", "b"]},
+        }
+        for i in range(n)
+    ]
+    return json.dumps(items).encode("utf-8")
+
+
+def old_path(data: bytes):
+    return [
+        PlainShot(
+            id=s["id"], project_id=s["project_id"], sequence_id=s["sequence_id"],
+            code=s["code"], name=s.get("name"), status=s.get("status", "new"),
+            meta=s.get("meta", {}),
+        )
+        for s in json.loads(data.decode("utf-8"))
+    ]
+
+
+def measure(fn, data: bytes):
+    gc.collect()
+    t0 = time.perf_counter()
+    fn(data)
+    elapsed = time.perf_counter() - t0
+
+    gc.collect()
+    tracemalloc.start()
+    result = fn(data)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, size
+
+
+for n in (10_000, 100_000):
+    data = make_payload(n)
+    for label, fn in (("old", old_path), ("new", Shot.list_from_json)):
+        elapsed, size = measure(fn, data)
+        print(f"{n:>7} shots  {label}: {elapsed * 1000:8.1f} ms  {size / 1e6:7.1f} MB")
@@ -0,0 +1,70 @@
+# Benchmark: decode / encode throughput of each JSON codec installed here
+# (util/json_codec.py) on real-size payloads, against the old path, which
+# was resp.json(): decode the body to text, then stdlib json.loads.
+#
+# Payloads default to the generated ones in payloads.py; pass a directory of
+# recorded response bodies (*.json, e.g. saved from the diagnostics page or
+# the browser's network tab) to benchmark those instead.
+#
+#   python test/bench_json_codec.py [recorded-dir]
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import json
+import time
+from pathlib import Path
+
+from payloads import save_project_body, sequence_meta, shot_list
+from launcher.domain.shot import Shot
+from launcher.util import json_codec
+
+
+def best_of(fn, repeat=5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+if len(sys.argv) > 1:
+    payloads = {p.name: p.read_bytes() for p in sorted(Path(sys.argv[1]).glob("*.json"))}
+    assert payloads, f"no *.json in {sys.argv[1]}"
+else:
+    payloads = {
+        "save_project (1000 scenes)": save_project_body(1000),
+        "shots (10k, big meta)": shot_list(10_000),
+        "sequences (2k, big meta)": [{"id": str(i), "project_id": "p", "code": f"sq{i:04d}", "name": f"Sequence {i}",
+                                     "status": "wip", "meta": sequence_meta()} for i in range(2000)],
+    }
+    payloads = {name: json.dumps(obj).encode() for name, obj in payloads.items()}
+
+codecs = json_codec.available()
+print(f"codecs: {', '.join(codecs)}\n")
+print(f"{'payload':<28} {'size':>9}  {'codec':<14} {'decode':>10} {'encode':>10}")
+for name, data in payloads.items():
+    mib = len(data) / (1 << 20)
+    obj = json.loads(data)
+    baseline = best_of(lambda: json.loads(data.decode("utf-8")))
+    print(f"{name:<28} {mib:6.1f} MiB  {'resp.json()':<14} {mib / baseline:6.0f} MB/s {'':>10}")
+    for codec_name in codecs:
+        codec = json_codec.CODECS[codec_name]
+        decode = best_of(lambda: codec.loads(data))
+        encode = best_of(lambda: codec.dumps(obj))
+        assert codec.loads(codec.dumps(obj)) == obj
+        print(f"{'':<28} {'':>10} {codec_name:<14} {mib / decode:6.0f} MB/s {mib / encode:6.0f} MB/s"
+              f"   {baseline / decode:4.1f}x")
+    print()
+
+# ------------------------------------------------------------ into domain objects
+
+data = json.dumps(shot_list(10_000)).encode()
+print("Shot.list_from_json, 10k shots:")
+for codec_name in codecs:
+    json_codec.use(codec_name)
+    seconds = best_of(lambda: Shot.list_from_json(data))
+    print(f"  {codec_name:<10} {1000 * seconds:7.1f} ms")
+json_codec.use("auto")
+print("ok")
@@ -0,0 +1,114 @@
+# Launch-prep cost vs. size of the launcher's environment.
+#
+# "before" is what a click used to do: copy os.environ, overlay the MVL_*
+# values and stat the editor binary and template. "after" is
+# LaunchContextResolver: overrides only, with cached path probes. Use
+# --probe-latency-ms to make every stat as slow as a sleepy network drive.
+# The final column is Qt merging the overrides into the inherited
+# environment when the process is spawned, which is O(environment) in any
+# design (execve copies it anyway); it is shown for scale.
+#
+# Asserts that "after" passes only the launch variables and costs the same
+# at every environment size.
+#
+#   python test/bench_launch_env.py --probe-latency-ms 20
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from PyQt6.QtCore import QProcessEnvironment
+
+from launcher.domain.project import Project
+from launcher.domain.sequence import Sequence
+from launcher.services.launch_context import LaunchContextResolver
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--sizes", default="100,1000,10000,50000")
+parser.add_argument("--probe-latency-ms", type=float, default=0.0)
+parser.add_argument("--repeat", type=int, default=200)
+opts = parser.parse_args()
+
+tmp = Path(tempfile.mkdtemp())
+editor = tmp / "UnrealEditor.exe"
+editor.write_bytes(b"")
+template = tmp / "Template"
+template.mkdir()
+project = Project("p1", "EW_EP1", "tg63", 3, 40)
+sequence = Sequence("s1", "p1", "Opening", "sq01", "new")
+
+if opts.probe_latency_ms:
+    delay = opts.probe_latency_ms / 1000
+
+    def slow(fn):
+        def wrapper(path):
+            time.sleep(delay)
+            return fn(path)
+        return wrapper
+
+    os.path.exists = slow(os.path.exists)
+    os.path.isfile = slow(os.path.isfile)
+    os.path.isdir = slow(os.path.isdir)
+
+
+def before() -> dict:
+    env = os.environ.copy()
+    env["PROJECTS_ROOT_DIR"] = r"J:"
+    env["MVL_PROJECT"] = "tg63"
+    env["MVL_TYPE"] = "sequences"
+    env["MVL_CONTAINER"] = "master"
+    env["MVL_TASK"] = "layout"
+    env["MVL_STEP"] = "lay"
+    if not os.path.exists(editor) or not os.path.isdir(template):
+        raise FileNotFoundError
+    return {**env, "MVL_SCOPE": "sq01"}
+
+
+resolver = LaunchContextResolver(editor_exe=str(editor), projects_root=str(tmp))
+
+
+def after() -> dict:
+    context = resolver.resolve(project)
+    resolver.check_template(template)
+    return {**context.project_env, **resolver.scope_env(sequence)}
+
+
+def spawn_env(overrides: dict):
+    pe = QProcessEnvironment.systemEnvironment()
+    for k, v in overrides.items():
+        pe.insert(k, v)
+    return pe
+
+
+def per_call(fn, repeat: int) -> float:
+    fn()   # warm (fills the probe cache for "after")
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+print(f"{'env vars':>9} {'before':>11} {'after':>11} {'spawn merge':>12}")
+overrides = after()
+timings = []
+for n in (int(x) for x in opts.sizes.split(",")):
+    for i in range(len(os.environ), n):
+        os.environ[f"BENCH_DUMMY_{i:06d}"] = "x" * 40
+    repeat = max(3, opts.repeat if not opts.probe_latency_ms else 10)
+    b = per_call(before, repeat)
+    a = per_call(after, opts.repeat)
+    s = per_call(lambda: spawn_env(overrides), max(3, opts.repeat // 10))
+    timings.append((len(os.environ), b, a))
+    print(f"{len(os.environ):>9} {b * 1e6:>9.0f}us {a * 1e6:>9.1f}us {s * 1e6:>10.0f}us")
+
+# Only the launch variables are passed, whatever the environment holds
+assert set(after()) == {"PROJECTS_ROOT_DIR", "MVL_PROJECT", "MVL_TYPE", "MVL_CONTAINER", "MVL_TASK",
+                        "MVL_STEP", "MVL_SCOPE"}, sorted(after())
+print(f"after: {len(overrides)} variables passed, none copied from os.environ")
+# ... and resolving them does not grow with it: the largest environment costs about what the smallest
+# does (3x and 50 us of slack for scheduler noise), while "before" is O(environment)
+(small, _, a_small), (large, _, a_large) = timings[0], timings[-1]
+assert a_large < 3 * a_small + 50e-6, f"after: {a_small * 1e6:.1f} us at {small} vars, {a_large * 1e6:.1f} us at {large}"
@@ -0,0 +1,100 @@
+# Cost of recording a metric sample (target: under a microsecond) and the
+# accuracy of bucketed percentiles against exact ones, plus a look at the
+# Prometheus / JSON exports of a registry shaped like a busy session.
+#
+#   python test/bench_metrics.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import random
+import statistics
+import time
+
+from launcher.util import json_codec
+from launcher.util.metrics import Histogram, MetricsRegistry
+
+N = 200_000
+
+
+def per_call(fn, n=N) -> float:
+    best = float("inf")
+    for _ in range(5):
+        t0 = time.perf_counter()
+        fn(n)
+        best = min(best, time.perf_counter() - t0)
+    return best / n * 1e9
+
+
+def loop_overhead(n):
+    for _ in range(n):
+        pass
+
+
+registry = MetricsRegistry()
+family = registry.histogram("http_request_seconds", "latency", ("endpoint",))
+series = family.labels("GET projects/{id}/sequences")
+counter = registry.counter("http_requests_total", "calls", ("endpoint", "status")).labels("GET x", "200")
+values = [random.lognormvariate(-3, 1) for _ in range(1024)]
+
+
+def observe(n):
+    v, obs = values, series.observe
+    for i in range(n):
+        obs(v[i & 1023])
+
+
+def observe_by_label(n):
+    v, labels = values, family.labels
+    for i in range(n):
+        labels("GET projects/{id}/sequences").observe(v[i & 1023])
+
+
+def inc(n):
+    c = counter.inc
+    for _ in range(n):
+        c()
+
+
+base = per_call(loop_overhead)
+results = {
+    "histogram.observe": per_call(observe) - base,
+    "family.labels().observe": per_call(observe_by_label) - base,
+    "counter.inc": per_call(inc) - base,
+}
+for name, ns in results.items():
+    print(f"{name:<26} {ns:6.0f} ns/sample")
+assert results["histogram.observe"] < 1000, "recording a sample costs more than a microsecond"
+
+# ---------------------------------------------------------------- accuracy
+
+for name, draw in (("lognormal", lambda: random.lognormvariate(-3, 1)),
+                   ("bimodal", lambda: random.choice((0.02, 1.5)) * random.uniform(0.9, 1.1))):
+    h = Histogram()
+    samples = [draw() for _ in range(50_000)]
+    for s in samples:
+        h.observe(s)
+    exact = statistics.quantiles(samples, n=100)
+    errors = []
+    for q, est in zip((0.5, 0.95, 0.99), h.quantiles()):
+        true = exact[int(q * 100) - 1]
+        errors.append(abs(est - true) / true)
+        print(f"{name:<10} p{int(q * 100):<3} exact {1000 * true:8.2f} ms  bucketed {1000 * est:8.2f} ms")
+    assert max(errors) < 0.05, errors       # measured 1-2%; one bucket is ~9% wide
+
+# ---------------------------------------------------------------- exports
+
+for e in range(40):
+    for status in ("200", "404", "503"):
+        registry.counter("http_requests_total", "", ("endpoint", "status")).labels(f"GET route{e}", status).inc()
+    h = family.labels(f"GET route{e}")
+    for v in values[:200]:
+        h.observe(v)
+t0 = time.perf_counter()
+text = registry.to_prometheus()
+t1 = time.perf_counter()
+data = json_codec.dumps(registry.to_json())
+t2 = time.perf_counter()
+print(f"prometheus: {len(text) / 1024:.0f} KiB in {1000 * (t1 - t0):.1f} ms; "
+      f"json: {len(data) / 1024:.0f} KiB in {1000 * (t2 - t1):.1f} ms")
+assert '# TYPE http_request_seconds histogram' in text and 'le="+Inf"' in text
+print("ok")
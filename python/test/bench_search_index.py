@@ -0,0 +1,88 @@
+# Benchmark: search keystroke latency at 20k entities.
+# Simulates typing queries one character at a time through
+# MainWindow._apply_search: the index lookup, then hiding / showing the
+# project and sequence cards (offscreen, laid out once per keystroke as the
+# event loop would).
+#
+# The index lookup must stay under one 60 Hz frame (16 ms). The card pass is
+# only reported: hiding cards is cheap, but a keystroke that brings back
+# hundreds of hidden cards (deleting down to a broad query) costs tens of ms
+# per hundred cards in Qt's show / relayout, whatever the index does.
+#
+#   python test/bench_search_index.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import time
+import uuid
+from types import SimpleNamespace
+
+from PyQt6.QtWidgets import QApplication, QLabel, QStackedWidget
+
+from launcher.domain.project import Project
+from launcher.domain.sequence import Sequence
+from launcher.domain.shot import Shot
+from launcher.services.search_index import SearchIndex
+from launcher.ui.card_list_page import CardListPage
+from launcher.ui.main_window import MainWindow
+
+LOOKUP_BUDGET_MS = 16.0      # one 60 Hz frame
+STATUSES = ["new", "wip", "review", "approved", "final"]
+
+
+def make_entities(projects=500, sequences=8, shots=4):
+    for p in range(projects):
+        pid = str(uuid.uuid4())
+        yield Project(pid, f"Eternal Wars EP{p:03d}", f"EW{p:03d}", sequences, sequences * shots)
+        for q in range(sequences):
+            sid = str(uuid.uuid4())
+            yield Sequence(sid, pid, f"Battle on the bridge {q}", f"sq{q:02d}", STATUSES[q % 5])
+            for s in range(shots):
+                yield Shot(str(uuid.uuid4()), pid, sid, f"Shot {s:03d}", f"sh{q:02d}{s:02d}0", STATUSES[s % 5])
+
+
+app = QApplication(sys.argv)
+entities = list(make_entities())
+index = SearchIndex()
+t0 = time.perf_counter()
+index.add_many(entities)
+print(f"indexed {len(index)} entities in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+# The pages as MainWindow builds them: every project, and the sequences of the one being browsed
+projects = [e for e in entities if isinstance(e, Project)]
+browsed = [e for e in entities if isinstance(e, Sequence) and e.project_id == projects[42].id]
+window = SimpleNamespace(_search_index=index, stack=QStackedWidget(), status_label=QLabel())
+window.projects_page = CardListPage(make_card=lambda p: MainWindow._make_project_card(window, p))
+window.sequences_page = CardListPage(make_card=lambda s: MainWindow._make_sequence_card(window, s))
+window.stack.addWidget(window.projects_page)
+window.stack.addWidget(window.sequences_page)
+t0 = time.perf_counter()
+window.projects_page.set_items(projects)
+window.sequences_page.set_items(browsed)
+window.stack.resize(1200, 800)
+window.stack.show()
+app.processEvents()
+print(f"{len(projects)} project and {len(browsed)} sequence cards in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+worst_lookup = worst = 0.0
+for query in ["eternal wars ep042", "batle on teh bridge", "sh03020", "review", "ew12", entities[777].id[:13]]:
+    for i in range(1, len(query) + 1):
+        t0 = time.perf_counter()
+        hits = index.matches(query[:i])
+        lookup = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        MainWindow._apply_search(window, query[:i])
+        app.processEvents()         # relayout of the cards shown / hidden
+        elapsed = (time.perf_counter() - t0) * 1000
+        worst_lookup, worst = max(worst_lookup, lookup), max(worst, elapsed)
+        if elapsed > LOOKUP_BUDGET_MS:
+            print(f"  {query[:i]!r}: {elapsed:.0f} ms with cards ({window.status_label.text()})")
+    print(f"{query!r:<24} {len(hits):>6} hits  last keystroke {lookup:6.2f} ms lookup, {elapsed:6.2f} ms with cards"
+          f"  ({window.status_label.text()})")
+
+MainWindow._apply_search(window, "")
+assert window.projects_page.set_filter(None) == len(projects)
+print(f"worst keystroke: {worst_lookup:.2f} ms index lookup (budget {LOOKUP_BUDGET_MS} ms), "
+      f"{worst:.2f} ms with cards (not asserted)")
+assert worst_lookup < LOOKUP_BUDGET_MS
@@ -0,0 +1,172 @@
+# Benchmark: every service call path (login, token refresh, project /
+# sequence / shot listings, script parse, queued project save, bulk action,
+# logout) through the real services and HTTP pipeline, timed end to end.
+#
+# By default against the stand-in in fake_backend.py, with auth required
+# and the link shaped as asked. --record FILE also writes the session down
+# (services/http_recording.py); --replay FILE runs the same calls against
+# that recording with no server at all, so a run is repeatable anywhere:
+#
+#   python test/bench_service_calls.py [--latency 30] [--bandwidth 512] [--error-rate 0.05]
+#   python test/bench_service_calls.py --record /tmp/session.jsonl [--live]
+#   python test/bench_service_calls.py --replay /tmp/session.jsonl [--speed 1]
+#
+# --live records against the servers in config (KC_BASE / MVL_DOMAIN)
+# instead of the stand-in; give it a real login with --user / --password.
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from PyQt6.QtCore import QCoreApplication
+
+from payloads import save_project_body
+from launcher import config
+from launcher.domain.script_breakdown import ScriptBreakdown
+from launcher.services.api_client import ApiClient
+from launcher.services.auth_service import AuthService
+from launcher.services.bulk_operations import BulkOperations
+from launcher.services.http_client import HttpClient
+from launcher.services.http_pipeline import HttpPipeline
+from launcher.services.http_recording import RecordingTransport, ReplayTransport
+from launcher.services.jwks import JwksCache, TokenVerifier, jwks_url
+from launcher.services.project_service import ProjectService
+from launcher.services.save_queue import SaveQueue
+from launcher.services.script_breakdown_service import ScriptBreakdownService
+from launcher.util.metrics import MetricsRegistry
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--repeat", type=int, default=5)
+parser.add_argument("--projects", type=int, default=20)
+parser.add_argument("--latency", type=float, default=0.0, help="ms added per request by the stand-in")
+parser.add_argument("--bandwidth", type=float, help="KiB/s each way at the stand-in")
+parser.add_argument("--error-rate", type=float, default=0.0, help="share of stand-in answers that are 503")
+parser.add_argument("--record", metavar="FILE")
+parser.add_argument("--replay", metavar="FILE")
+parser.add_argument("--speed", type=float, default=0.0, help="replay: scale of the recorded server time")
+parser.add_argument("--live", action="store_true")
+parser.add_argument("--user", default="bob")
+parser.add_argument("--password", default="1234")
+opts = parser.parse_args()
+
+app = QCoreApplication([])
+backend = None
+if opts.replay:
+    transport = ReplayTransport(opts.replay, speed=opts.speed)
+    config.KC_BASE = config.KC_ISSUER = "http://replay.invalid"
+    base_url = "http://replay.invalid/api/v1"
+    print(f"replaying {len(transport)} exchanges from {opts.replay} at speed {opts.speed:g}")
+else:
+    transport = None
+    base_url = config.FASTAPI_BASE_URL
+    if not opts.live:
+        from fake_backend import FakeBackend
+        backend = FakeBackend(projects=opts.projects, sequences_per_project=5).start()
+        backend.require_auth = True
+        backend.latency = opts.latency / 1000
+        backend.bandwidth = opts.bandwidth * 1024 if opts.bandwidth else None
+        backend.error_rate = opts.error_rate
+        backend.issuer          # generate the signing key outside the timings
+        config.KC_BASE = config.KC_ISSUER = backend.kc_base
+        base_url = backend.base_url
+    if opts.record:
+        Path(opts.record).unlink(missing_ok=True)
+        transport = RecordingTransport(opts.record)
+
+http = HttpPipeline.default(transport, registry=MetricsRegistry())
+# Replayed tokens name the host they were recorded from; signatures are still checked
+issuer = None if opts.replay else f"{config.KC_ISSUER}/realms/{config.KC_REALM}"
+auth = AuthService(verifier=TokenVerifier(JwksCache(jwks_url(), None, http=http), issuer=issuer), http=http)
+ctx = SimpleNamespace(http_client=HttpClient(base_url, http), auth_service=auth,
+                      save_queue=SaveQueue(retry_base=0.05, retry_max=1.0),
+                      session_expired=SimpleNamespace(emit=lambda msg: print(f"session expired: {msg}")))
+ctx.api_client = ApiClient(ctx)
+projects = ProjectService(auth, ctx.http_client)
+breakdown_service = ScriptBreakdownService(ctx)
+bulk = BulkOperations(ctx)
+ctx.save_queue.open(Path(tempfile.mkdtemp()) / "jobs.sqlite3")
+
+script = Path(tempfile.mkdtemp()) / "script.pdf"
+script.write_bytes(b"%PDF-1.4\n" + b"0" * 200_000)
+body = save_project_body(50)
+breakdown = ScriptBreakdown(total_pages=25, total_scenes=50, total_characters=40,
+                            scenes=body["config"]["scenes"], character_appearances=body["config"]["character_appearances"])
+
+
+def pump(until, timeout=60.0):
+    end = time.monotonic() + timeout
+    while not until() and time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.001)
+    if not until():
+        raise TimeoutError("no result")
+
+
+def save_project(i):
+    job = breakdown_service.save_project(f"Bench {i}", f"BENCH{i}", "Feature", breakdown, body["config"]["ai_analysis"])
+    pump(lambda: ctx.save_queue.get(job.id).state in ("done", "failed"))
+    job = ctx.save_queue.get(job.id)
+    if job.state == "failed":
+        raise RuntimeError(job.error)
+
+
+def bulk_archive(_):
+    finished = []
+    bulk.finished.connect(finished.append)
+    try:
+        bulk.start("archive", [(p.id, p.name) for p in listing[:20]])
+        pump(lambda: finished)
+    finally:
+        bulk.finished.disconnect(finished.append)
+    if finished[0].failed:
+        raise RuntimeError(finished[0].failed[0].error)
+
+
+def bench(name, fn, repeat=opts.repeat):
+    times, errors = [], []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        try:
+            fn(i)
+        except Exception as exc:
+            errors.append(exc)
+        else:
+            times.append(time.perf_counter() - t0)
+    if times:
+        ordered = sorted(times)
+        p90 = ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))]
+        print(f"{name:<22} {1000 * statistics.median(times):8.1f} ms {1000 * p90:8.1f} ms   {len(errors)} error(s)")
+    else:
+        print(f"{name:<22} {'':>11} {'':>11}   {len(errors)} error(s)")
+    if errors:
+        print(f"{'':<22} last: {errors[-1]}")
+
+
+print(f"{'call path':<22} {'median':>11} {'p90':>11}")
+bench("login", lambda i: auth.login(opts.user, opts.password))
+bench("token refresh", lambda i: auth.refresh_after_rejection(auth.get_access_token()))
+listing = projects.list_my_projects()
+bench(f"list projects ({len(listing)})", lambda i: projects.list_my_projects())
+sequences = projects.list_sequences(listing[0].id)
+bench("list sequences", lambda i: projects.list_sequences(listing[0].id))
+bench("list shots", lambda i: projects.list_shots(listing[0].id, sequences[0].id))
+bench("parse script", lambda i: breakdown_service.parse(str(script)))
+bench("save project (queued)", save_project)
+bench("bulk archive (20)", bulk_archive)
+bench("logout", lambda i: auth.logout(), repeat=1)
+
+if isinstance(transport, RecordingTransport):
+    print(f"recorded {transport.recorded} exchanges to {transport.path}")
+if isinstance(transport, ReplayTransport) and transport.misses:
+    print(f"not in the recording: {dict(transport.misses)}")
+ctx.save_queue.stop()
+bulk.stop()
+if backend is not None:
+    backend.stop()
+print("ok")
@@ -0,0 +1,101 @@
+# Benchmark: bringing a provisioned project up to date after a template change.
+# Builds a synthetic template (many small assets plus a few large ones),
+# provisions a project from it, changes/adds/removes a handful of template
+# files, edits one of them in the project too, then times the update.
+#
+#   python test/bench_template_update.py [--size-mb 2048] [--files 20000] [--changed 50]
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from launcher.services.provisioning_service import ProvisioningService
+from launcher.services.template_manifest import TemplateManifest, load_template_manifest
+
+
+def make_template(root: Path, files: int, size_mb: int) -> Path:
+    rnd = random.Random(3)
+    big = max(1, size_mb // 128)                 # ~128 MiB "map" files carry most of the bytes
+    block = os.urandom(1 << 20)
+    for i in range(big):
+        d = root / "Content" / "Maps"
+        d.mkdir(parents=True, exist_ok=True)
+        with open(d / f"Map_{i:03d}.umap", "wb") as fh:
+            for _ in range(128):
+                fh.write(block)
+                block = block[1:] + block[:1]    # keep blocks distinct for the hash
+    for i in range(files):
+        d = root / "Content" / f"Dir{i // 200:03d}"
+        d.mkdir(parents=True, exist_ok=True)
+        (d / f"Asset_{i:05d}.uasset").write_bytes(os.urandom(rnd.randint(512, 24 * 1024)))
+    uproject = root / "MyProject.uproject"
+    uproject.write_text('{"FileVersion": 3}')
+    return uproject
+
+
+def timed(label: str, fn):
+    t0 = time.perf_counter()
+    try:
+        return fn()
+    finally:
+        print(f"{label:<40} {time.perf_counter() - t0:7.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--changed", type=int, default=50)
+    parser.add_argument("--dir", default=None, help="scratch directory (defaults to the system temp dir)")
+    opts = parser.parse_args()
+
+    scratch = Path(tempfile.mkdtemp(prefix="mvl_template_", dir=opts.dir))
+    cache = scratch / "cache"
+    try:
+        uproject = make_template(scratch / "MyProject", opts.files, opts.size_mb)
+        template = uproject.parent
+
+        m = timed("manifest, cold (hash everything)", lambda: load_template_manifest(template, cache))
+        print(f"  {len(m)} files, {m.total_size / 2**30:.2f} GiB, {m.hashed} hashed, {os.cpu_count()} cores")
+        m = timed("manifest, warm (stat only)", lambda: load_template_manifest(template, cache))
+        print(f"  {m.hashed} hashed")
+
+        service = ProvisioningService(uproject, scratch / "Projects", link_mode="copy", cache_dir=cache)
+        timed("provision project", lambda: service.provision("Shot"))
+        timed("re-open, template unchanged", lambda: service.provision("Shot"))
+
+        # Template change: rewrite N assets, add one, remove one
+        assets = sorted((template / "Content").glob("Dir*/*.uasset"))
+        changed = random.Random(5).sample(assets, opts.changed)
+        for p in changed:
+            p.write_bytes(os.urandom(p.stat().st_size))
+        (template / "Content" / "Dir000" / "NewAsset.uasset").write_bytes(b"new")
+        removed = assets[-1] if assets[-1] not in changed else assets[-2]
+        removed.unlink()
+        # ...and the artist also edited one of the changed files inside the project
+        edited = service.target_dir("Shot") / changed[0].relative_to(template).as_posix()
+        edited.write_bytes(b"local work")
+
+        result = timed(f"update ({opts.changed} changed, +1, -1)", lambda: service.provision("Shot"))
+        print(f"  {result.updated} copied, {result.removed} removed, conflicts: {result.conflicts}")
+
+        target = service.target_dir("Shot")
+        assert edited.read_bytes() == b"local work"
+        assert result.updated == opts.changed            # N-1 changed + 1 new
+        assert (target / "Content/Dir000/NewAsset.uasset").read_bytes() == b"new"
+        assert not (target / removed.relative_to(template)).exists()
+        for p in changed[1:]:
+            assert (target / p.relative_to(template)).read_bytes() == p.read_bytes()
+        assert TemplateManifest.load(TemplateManifest.cache_path(template, cache)) is not None
+        print("ok")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# Checks launch admission control with injected metrics and dummy editors
+# (test/fake_editor.py): warnings, queueing on memory / load / editor count,
+# FIFO draining as resources free up, cancelling a queued launch and the
+# refuse-instead-of-queue mode.
+#
+#   python test/check_admission.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import tempfile
+import time
+from pathlib import Path
+
+from PyQt6.QtWidgets import QApplication
+
+from launcher.services import admission, theater_service
+from launcher.services.admission import AdmissionController, AdmissionPolicy
+from launcher.services.theater_service import SessionLimitReached, TheaterService
+from launcher.util.proc_stats import SystemSample
+
+GiB = 1 << 30
+
+app = QApplication(sys.argv)
+theater_service.SAMPLE_INTERVAL_MS = 100
+admission.SETTLE_SECONDS = 0.5
+
+metrics = SystemSample(mem_total=64 * GiB, mem_available=40 * GiB, load1=1.0, cpu_count=8)
+policy = AdmissionPolicy(max_editors=2, min_free_mem_mb=6144, warn_free_mem_mb=12288,
+                         max_load_per_cpu=1.5, warn_load_per_cpu=0.9, editor_mem_mb=4096)
+controller = AdmissionController(policy, metrics=lambda: metrics)
+
+log_dir = Path(tempfile.mkdtemp())
+service = TheaterService(auth=None, log_dir=log_dir, admission=controller, queue_when_busy=True)
+warnings: list[str] = []
+service.admission_warning.connect(warnings.append)
+fake_editor = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_editor.py")
+
+
+def pump(seconds: float, until=lambda: False):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end and not until():
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def launch(key: str, seconds: float = 30):
+    return service.launch(sys.executable, fake_editor, ["--rate", "50", "--seconds", str(seconds)], key=key)
+
+
+# Plenty of everything: straight in
+a = launch("EP1/sq01")
+assert a.status == "starting" and not warnings, a
+
+# Memory reserved for the editor that's still settling pushes the next one into "warn"
+metrics.mem_available = 14 * GiB
+b = launch("EP1/sq02")
+assert b.status == "starting" and warnings, (b, warnings)
+print("warned:", warnings[-1])
+
+# Editor cap: queued, not refused
+c = launch("EP1/sq03", seconds=1)
+assert c.status == "queued", c
+print("queued:", c.queued_reason)
+
+# A later launch doesn't overtake, and can be cancelled
+d = launch("EP1/sq04")
+assert d.status == "queued" and service.queued() == [c, d]
+service.stop("EP1/sq04")
+assert d.status == "cancelled" and service.queued() == [c]
+
+# Slot frees up but the machine is loaded: still waiting
+metrics.load1 = 16.0
+a.terminate()
+pump(3.0, until=lambda: not a.is_alive())
+pump(0.5)
+assert c.status == "queued", c
+print("still queued:", c.queued_reason)
+
+# Load drops: the queued launch starts on its own
+metrics.load1 = 2.0
+metrics.mem_available = 30 * GiB
+pump(5.0, until=lambda: c.status == "running")
+assert c.status == "running", c
+pump(5.0, until=lambda: c.status == "exited")
+print("c:", c.status, c.exit_code)
+
+# Refuse mode: nothing queues
+service.queue_when_busy = False
+metrics.mem_available = 2 * GiB
+try:
+    launch("EP2/sq01")
+    raise AssertionError("low memory launch admitted")
+except SessionLimitReached as exc:
+    print("refused:", exc)
+
+service.stop_all()
+pump(5.0, until=lambda: not service.running())
+assert not service.running() and not service.queued()
+print("ok")
@@ -0,0 +1,136 @@
+# Checks bulk project actions (services/bulk_operations.py) against the
+# stand-in backend:
+#
+# - with POST /projects/batch: one request per chunk of ids, every project
+#   reported as it settles and the operation once at the end;
+# - locked projects fail on their own, with the server's reason, the rest
+#   go through; repeating a delete or a grant counts as done;
+# - without the batch endpoint: one call per project, never more than the
+#   concurrency bound in flight, and the batch isn't asked for again;
+# - the Qt event loop keeps ticking while hundreds of results come in.
+#
+#   python test/check_bulk_operations.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import time
+from types import SimpleNamespace
+
+from PyQt6.QtCore import QCoreApplication, QTimer
+
+from fake_backend import FakeBackend
+from launcher.services.api_client import ApiClient
+from launcher.services.bulk_operations import BulkOperations
+from launcher.services.http_client import HttpClient
+from launcher.services.http_pipeline import AuthMiddleware, HttpPipeline, RetryMiddleware, TimeoutMiddleware
+
+app = QCoreApplication([])
+
+
+def pump(until, timeout=20.0):
+    end = time.monotonic() + timeout
+    while not until() and time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.002)
+    return until()
+
+
+class StaticAuth:
+    def get_access_token(self):
+        return "test"
+
+    def logout(self):
+        pass
+
+
+def make_service(backend, concurrency=4, batch_size=100):
+    pipeline = HttpPipeline([TimeoutMiddleware((1.0, 10.0)), RetryMiddleware(3, base_delay=0.01), AuthMiddleware()])
+    ctx = SimpleNamespace(http_client=HttpClient(backend.base_url, pipeline), auth_service=StaticAuth(),
+                          session_expired=SimpleNamespace(emit=print))
+    ctx.api_client = ApiClient(ctx)
+    service = BulkOperations(ctx, batch_size=batch_size, concurrency=concurrency)
+    seen, finished = [], []
+    service.item_changed.connect(lambda op_id, item: seen.append((item.id, item.state)))
+    service.finished.connect(finished.append)
+    return service, seen, finished
+
+
+def run(service, finished, action, ids, **params):
+    finished.clear()
+    op = service.start(action, [(pid, pid[:8]) for pid in ids], **params)
+    assert pump(lambda: finished)
+    assert len(finished) == 1 and finished[0].id == op.id
+    return finished[0]
+
+
+backend = FakeBackend(projects=250).start()
+ids = list(backend.projects)
+
+# ---------------------------------------------------------------- batched
+
+service, seen, finished = make_service(backend)
+before = backend.requests
+op = run(service, finished, "archive", ids)
+print(f"archive 250 with a batch endpoint: {backend.requests - before} requests, {len(op.done)} done")
+assert backend.requests - before == 3 and len(op.done) == 250 and service.batch_supported
+assert all(p["archived"] for p in backend.projects.values())
+assert {state for _, state in seen} == {"running", "done"} and sum(s == "done" for _, s in seen) == 250
+assert service.pending() == 0
+
+backend.locked = set(ids[:3])
+op = run(service, finished, "set_status", ids[:20], status="On Hold")
+print(f"set_status with 3 locked: {len(op.done)} done, {len(op.failed)} failed ({op.failed[0].error})")
+assert [i.id for i in op.failed] == ids[:3] and op.failed[0].error == "HTTP 403: Project is locked"
+assert all(backend.projects[pid]["status"] == "On Hold" for pid in ids[3:20])
+backend.locked.clear()
+
+op = run(service, finished, "grant_access", ids[:10], user_kc_id="kc-2", role="editor")
+op = run(service, finished, "grant_access", ids[:10], user_kc_id="kc-2", role="editor")
+assert len(op.done) == 10 and all(backend.access[pid] == {"kc-2": "editor"} for pid in ids[:10])
+
+op = run(service, finished, "delete", ids[:5])
+op = run(service, finished, "delete", ids[:6])     # five are already gone
+assert len(op.done) == 6 and not set(ids[:6]) & backend.projects.keys()
+print("repeated grant and delete: all done, nothing applied twice")
+ids = ids[6:]
+
+# ---------------------------------------------------------------- one call per project
+
+backend.batch_endpoint = False
+backend.latency = 0.02
+backend.max_in_flight = 0
+service, seen, finished = make_service(backend, concurrency=4)
+before = backend.requests
+t0 = time.perf_counter()
+op = run(service, finished, "set_status", ids[:100], status="Completed")
+elapsed = time.perf_counter() - t0
+print(f"set_status on 100 without a batch endpoint: {backend.requests - before} requests, "
+      f"{backend.max_in_flight} at most in flight, {1000 * elapsed:.0f} ms")
+assert service.batch_supported is False and len(op.done) == 100
+assert backend.requests - before == 101 and backend.max_in_flight == 4
+
+before = backend.requests
+op = run(service, finished, "delete", ids[:10])
+assert backend.requests - before == 10 and len(op.done) == 10     # no second try at the batch endpoint
+backend.fail("PATCH", f"/projects/{ids[10]}", 500, times=5)
+op = run(service, finished, "archive", ids[10:20])
+assert [i.id for i in op.failed] == [ids[10]] and len(op.done) == 9
+print(f"one project erroring: {op.failed[0].error}; the other 9 archived")
+
+# ---------------------------------------------------------------- event loop
+
+ticks = []
+timer = QTimer()
+timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+timer.start(10)
+backend.latency = 0.0
+op = run(service, finished, "archive", ids[20:])
+timer.stop()
+worst = max(b - a for a, b in zip(ticks, ticks[1:]))
+print(f"{len(op.items)} results delivered; longest event-loop gap {1000 * worst:.0f} ms")
+assert len(op.done) == len(ids) - 20 and worst < 0.1
+
+service.stop()
+backend.stop()
+print("ok")
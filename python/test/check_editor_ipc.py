@@ -0,0 +1,150 @@
+# Checks handing a sequence to an already-running editor over the editor IPC
+# channel, using test/fake_editor.py as the editor:
+#   - a switch requested while the editor is still loading is delivered once it registers
+#   - later switches go straight over IPC (timed against a cold start)
+#   - editors from an earlier launcher run are found through the registry
+#   - stale registry entries are dropped and fall back to a fresh launch
+#   - the switch round trip runs off the GUI thread: an editor that stopped
+#     answering doesn't hold up the event loop
+#
+#   python test/check_editor_ipc.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import json
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+
+from launcher.services import theater_service
+from launcher.services.admission import AdmissionController, AdmissionPolicy
+from launcher.services.editor_ipc import EditorEndpoint, EditorIpcClient
+from launcher.services.theater_service import Handoff, TheaterService
+
+app = QApplication(sys.argv)
+theater_service.SAMPLE_INTERVAL_MS = 100
+tmp = Path(tempfile.mkdtemp())
+ipc_dir = tmp / "editors"
+fake_editor = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_editor.py")
+ARGS = ["--rate", "20", "--seconds", "60", "--ipc-delay", "0.5"]
+
+
+def make_service() -> TheaterService:
+    admission = AdmissionController(AdmissionPolicy(max_editors=4), metrics=lambda: None)
+    return TheaterService(auth=None, log_dir=tmp / "logs", admission=admission, ipc_dir=ipc_dir)
+
+
+def pump(seconds: float, until=lambda: False):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end and not until():
+        app.processEvents()
+        time.sleep(0.002)
+
+
+def log_has(session, text: str) -> bool:
+    return any(text in line for line in session.log_buffer.tail())
+
+
+def handoff(service, env, key):
+    """TheaterService.handoff(), waiting for a running editor's answer as LaunchPipeline does."""
+    target = service.handoff(fake_editor, env, key)
+    if isinstance(target, Handoff):
+        assert service.handoff(fake_editor, env, key) is target      # asked twice, sent once
+        pump(10, until=lambda: target.done)
+        assert target.done
+        return target.target
+    return target
+
+
+service = make_service()
+
+# Cold start
+t0 = time.perf_counter()
+a = service.launch(sys.executable, fake_editor, ARGS, env={"MVL_SCOPE": "sq01"}, key="EP1/sq01")
+pump(10, until=lambda: log_has(a, "IPC listening"))
+cold = time.perf_counter() - t0
+assert log_has(a, "IPC listening"), a.log_buffer.tail(5)
+print(f"cold start to ready: {cold * 1000:.0f} ms")
+
+# Another sequence of the same project: the running editor switches, the session is re-keyed
+assert handoff(service, {"MVL_SCOPE": "sq02"}, "EP1/sq02") is a
+assert service.session("EP1/sq02") is a and service.session("EP1/sq01") is None
+pump(2, until=lambda: log_has(a, "Switching scope to sq02"))
+assert log_has(a, "Switching scope to sq02")
+
+# Warm switch, timed
+t0 = time.perf_counter()
+target = handoff(service, {"MVL_SCOPE": "sq03"}, "EP1/sq03")
+warm = time.perf_counter() - t0
+assert target is a
+reg = service.registry.get(a.pid)
+assert EditorIpcClient(reg).hello()["scope"] == "sq03"
+print(f"handoff: {warm * 1000:.1f} ms (cold start {cold * 1000:.0f} ms)")
+
+# Same key again: nothing to do
+assert service.handoff(fake_editor, {"MVL_SCOPE": "sq03"}, "EP1/sq03") is a
+a.terminate()
+pump(5, until=lambda: not a.is_alive())
+assert service.registry.get(a.pid) is None, "registry entry left behind"
+
+# Switch while still loading: delivered when it registers
+c = service.launch(sys.executable, fake_editor, ARGS, env={"MVL_SCOPE": "sq01"}, key="EP2/sq01")
+assert service.handoff(fake_editor, {"MVL_SCOPE": "sq05"}, "EP2/sq05") is c
+assert c.pending_scope is not None
+pump(5, until=lambda: log_has(c, "Switching scope to sq05"))
+assert log_has(c, "Switching scope to sq05") and c.pending_scope is None
+print("pending switch delivered after registration")
+c.terminate()
+pump(5, until=lambda: not c.is_alive())
+
+# Editor from an earlier launcher run: only the registry knows about it
+env = {**os.environ, "MVL_IPC_DIR": str(ipc_dir), "MVL_IPC_TOKEN": "earlier-run", "MVL_SCOPE": "sq01"}
+orphan = subprocess.Popen([sys.executable, fake_editor, "--rate", "5", "--seconds", "30"], env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+deadline = time.monotonic() + 10
+while not (ipc_dir / f"{orphan.pid}.json").exists() and time.monotonic() < deadline:
+    time.sleep(0.05)
+fresh = make_service()
+ep = handoff(fresh, {"MVL_SCOPE": "sq07"}, "EP3/sq07")
+assert isinstance(ep, EditorEndpoint) and ep.pid == orphan.pid, ep
+assert EditorIpcClient(fresh.registry.get(orphan.pid)).hello()["scope"] == "sq07"
+print("switched an editor from an earlier run")
+orphan.terminate()
+orphan.wait(5)
+
+# Stale entry (editor died without cleaning up): dropped, fresh launch needed
+stale = ipc_dir / "999999.json"
+with open(stale, "w") as fh:
+    json.dump({"protocol": 1, "pid": 999999, "port": 9, "token": "x", "uproject": fake_editor}, fh)
+assert handoff(fresh, {"MVL_SCOPE": "sq08"}, "EP4/sq08") is None
+assert not stale.exists()
+
+# An editor that stopped answering: the GUI thread only hands the request over
+h = service.launch(sys.executable, fake_editor, ["--rate", "20", "--seconds", "1", "--then", "hang"],
+                   env={"MVL_SCOPE": "sq01"}, key="EP5/sq01")
+pump(10, until=lambda: log_has(h, "IPC listening"))
+pump(1.5)       # past the output phase: the editor holds IPC connections without answering
+ticks = []
+timer = QTimer()
+timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+timer.start(10)
+t0 = time.perf_counter()
+pending = service.handoff(fake_editor, {"MVL_SCOPE": "sq02"}, "EP5/sq02")
+returned = time.perf_counter() - t0
+assert isinstance(pending, Handoff) and returned < 0.05, returned
+pump(10, until=lambda: pending.done)
+timer.stop()
+worst = max(b - a for a, b in zip(ticks, ticks[1:]))
+print(f"handoff to a hung editor: returned in {returned * 1000:.1f} ms, answered after "
+      f"{(time.perf_counter() - t0) * 1000:.0f} ms; longest event-loop gap {worst * 1000:.0f} ms")
+assert pending.done and pending.target is None and worst < 0.1
+assert service.session("EP5/sq01") is h        # not re-keyed: it never took the scope
+h.kill()
+pump(5, until=lambda: not h.is_alive())
+service.shutdown()
+print("ok")
@@ -0,0 +1,241 @@
+# Checks the HTTP middleware pipeline against a local stub server:
+# jittered retries on idempotent calls only, the circuit breaker opening
+# and recovering, per-endpoint timeouts, metrics per normalized endpoint,
+# and the single refresh-and-replay on 401 (also with many threads hitting
+# a revoked token at once: one refresh, not one per request).
+#
+#   python test/check_http_pipeline.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from launcher import config
+from launcher.services.auth_service import AuthService, SessionExpired
+from launcher.services.http_client import HttpClient
+from launcher.services.http_pipeline import (
+    AuthMiddleware, CircuitBreakerMiddleware, CircuitOpen, HttpPipeline, MetricsMiddleware, RetryMiddleware,
+    TimeoutMiddleware, endpoint_name,
+)
+from launcher.util.metrics import MetricsRegistry
+from fake_tokens import TokenIssuer
+
+hits = Counter()
+state = {"fail": 0, "fail_status": 503, "valid_token": "t1", "revoked": set(), "down": False}
+lock = threading.Lock()
+issuer = TokenIssuer(bits=1024)
+
+
+class Stub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=()):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except BrokenPipeError:
+            pass            # the client timed out first
+
+    def _handle(self):
+        path = self.path.split("?")[0]
+        with lock:
+            hits[f"{self.command} {path}"] += 1
+            failing = state["fail"] > 0
+            if failing:
+                state["fail"] -= 1
+        if self.headers.get("Content-Length"):
+            self.rfile.read(int(self.headers["Content-Length"]))
+        if path.endswith("/token"):
+            self._send(200, issuer.token_response("kc-1", 300))
+        elif path.endswith("/logout"):
+            self._send(204, {})
+        elif state["down"]:
+            self._send(503, {"detail": "down"})
+        elif failing:
+            self._send(state["fail_status"], {"detail": "busy"}, [("Retry-After", "0")] if state["fail_status"] == 429 else ())
+        elif path.startswith("/slow"):
+            time.sleep(0.5)
+            self._send(200, {"ok": True})
+        elif path.startswith("/private"):
+            token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+            if token in state["revoked"] or (state["valid_token"] and token != state["valid_token"]):
+                self._send(401, {"detail": "invalid token"})
+            else:
+                self._send(200, {"ok": True})
+        else:
+            self._send(200, {"ok": True})
+
+    do_GET = do_POST = do_PUT = _handle
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base = f"http://127.0.0.1:{server.server_port}"
+
+sleeps = []
+clock = [0.0]
+registry = MetricsRegistry()
+breaker = CircuitBreakerMiddleware(threshold=3, cooldown=30, clock=lambda: clock[0])
+retry = RetryMiddleware(attempts=3, base_delay=0.5, sleep=sleeps.append)
+pipeline = HttpPipeline(
+    [MetricsMiddleware(registry), TimeoutMiddleware((2.0, 5.0), {"GET slow": (2.0, 0.2)}), retry, breaker,
+     AuthMiddleware()],
+    breaker=breaker,
+)
+client = HttpClient(base, pipeline)
+
+# ---------------------------------------------------------------- endpoint names
+
+assert endpoint_name("get", "projects/17/sequences") == "GET projects/{id}/sequences"
+assert endpoint_name("GET", f"{base}/projects/3f2b6c1e-9a7d-4e21-b5a0-0c8f6e2d1a44/shots?x=1") \
+    == "GET projects/{id}/shots"
+
+# ---------------------------------------------------------------- retry
+
+state["fail"] = 2
+resp = client.get("projects/1/things")
+assert resp.status_code == 200 and hits["GET /projects/1/things"] == 3
+assert len(sleeps) == 2 and 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0, sleeps
+print("retried twice, slept", [round(s, 3) for s in sleeps])
+
+# POST is not retried (the server may have acted on it)
+state["fail"] = 1
+assert client.post("projects/", json={"name": "x"}).status_code == 503
+assert hits["POST /projects/"] == 1
+# ...unless the caller says it is safe
+state["fail"] = 1
+assert client.post("projects/", json={"name": "x"}, idempotent=True).status_code == 200
+assert hits["POST /projects/"] == 3
+
+# Retry-After is honoured for 429
+sleeps.clear()
+state["fail"], state["fail_status"] = 1, 429
+assert client.get("limited").status_code == 200 and sleeps == [0.0]
+state["fail_status"] = 503
+
+# Uploads are never replayed
+state["fail"] = 1
+assert client.request("PUT", "upload", files={"file": ("a.txt", b"abc")}).status_code == 503
+assert hits["PUT /upload"] == 1
+
+# ---------------------------------------------------------------- timeouts
+
+breaker.reset(f"127.0.0.1:{server.server_port}")       # forget the 503 above
+try:
+    client.get("slow")
+    raise AssertionError("slow endpoint did not time out")
+except requests.Timeout:
+    pass
+print("slow endpoint timed out after", hits["GET /slow"], "attempts")
+# Three timeouts in a row look like a hung host: the breaker opened
+assert breaker.state(f"127.0.0.1:{server.server_port}") == "open"
+clock[0] += 31
+assert client.get("slow", timeout=(2.0, 2.0)).status_code == 200        # explicit timeout wins
+assert breaker.state(f"127.0.0.1:{server.server_port}") == "closed"
+
+# ---------------------------------------------------------------- circuit breaker
+
+state["down"] = True
+before = hits["GET /health"]
+for _ in range(3):
+    try:
+        client.get("health")
+    except CircuitOpen:
+        break
+print("breaker:", breaker.state(f"127.0.0.1:{server.server_port}"))
+assert breaker.state(f"127.0.0.1:{server.server_port}") == "open"
+calls = hits["GET /health"] - before
+for _ in range(5):
+    try:
+        client.get("health")
+        raise AssertionError("open breaker let a call through")
+    except CircuitOpen as exc:
+        reason = str(exc)
+assert hits["GET /health"] - before == calls, "calls reached the server while open"
+print("fail-fast:", reason)
+
+state["down"] = False
+clock[0] += 31                                          # cool-down over: one trial call closes it
+assert client.get("health").status_code == 200
+assert breaker.state(f"127.0.0.1:{server.server_port}") == "closed"
+
+# ---------------------------------------------------------------- auth: refresh once, replay
+
+
+class FakeAuth:
+    def __init__(self):
+        self.token, self.refreshes, self.logged_out = "t0", 0, False
+
+    def get_access_token(self):
+        return self.token
+
+    def refresh_after_rejection(self, rejected):
+        self.refreshes += 1
+        self.token = f"t{self.refreshes}"
+        return self.token
+
+    def logout(self):
+        self.logged_out = True
+
+
+auth = FakeAuth()
+assert client.get("private", auth=auth).status_code == 200
+assert auth.refreshes == 1 and hits["GET /private"] == 2
+
+state["valid_token"] = "never"
+try:
+    client.get("private", auth=auth)
+    raise AssertionError("second 401 did not end the session")
+except SessionExpired:
+    assert auth.logged_out and auth.refreshes == 2
+
+# Real AuthService: 20 concurrent calls hit a revoked token, Keycloak sees a single refresh
+config.KC_BASE = base
+service = AuthService(http=pipeline)
+service.login("bob", "secret")
+hits_before = hits[f"POST /realms/{config.KC_REALM}/protocol/openid-connect/token"]
+state["valid_token"] = None
+state["revoked"].add(service.get_access_token())         # unexpired here, refused by the server
+
+
+def call(_):
+    return client.get("private", auth=service).status_code
+
+
+with ThreadPoolExecutor(20) as pool:
+    statuses = list(pool.map(call, range(20)))
+refreshes = hits[f"POST /realms/{config.KC_REALM}/protocol/openid-connect/token"] - hits_before
+print(f"20 concurrent 401s -> {refreshes} refresh, statuses {Counter(statuses)}")
+assert refreshes == 1 and statuses == [200] * 20
+
+# ---------------------------------------------------------------- metrics
+
+print(registry.to_prometheus().count("\n"), "lines of Prometheus text")
+series = {m["name"]: {tuple(x["labels"].values()): x for x in m["series"]} for m in registry.to_json()["metrics"]}
+latency = series["http_request_seconds"]
+for (endpoint,), s in sorted(latency.items()):
+    print(f"  {endpoint:<28} calls={s['count']:<3} p50={1000 * s['p50']:6.1f} ms p99={1000 * s['p99']:6.1f} ms")
+assert series["http_retries_total"][("GET projects/{id}/things",)]["value"] == 2
+assert series["http_requests_total"][("GET slow", "ReadTimeout")]["value"] == 1
+assert latency[("GET private",)]["count"] == 22
+assert series["http_requests_total"][("GET private", "200")]["value"] == 21
+assert series["http_requests_in_flight"][()]["value"] == 0
+
+server.shutdown()
+print("ok")
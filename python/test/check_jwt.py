@@ -0,0 +1,203 @@
+# Checks local JWT handling with tokens minted by test/fake_tokens.py:
+# signature checks against a (cached) JWKS, key rotation, tampering, and
+# AuthService building the User and its refresh schedule from the token
+# alone. A tiny local token endpoint stands in for Keycloak and counts
+# requests, to show a login is one round trip (no /auth/me).
+#
+#   python test/check_jwt.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs
+
+from launcher import config
+from launcher.services.auth_service import AuthError, AuthService, SessionExpired
+from launcher.services.jwks import JwksCache, JwksUnavailable, TokenVerifier
+from launcher.util import jwt
+from fake_tokens import TokenIssuer
+
+t0 = time.perf_counter()
+issuer = TokenIssuer()
+print(f"RSA key: {time.perf_counter() - t0:.2f} s")
+
+# ---------------------------------------------------------------- decode / verify
+
+token = issuer.mint("kc-1", preferred_username="bob", email="bob@example.com")
+claims = jwt.unverified_claims(token)
+assert claims["sub"] == "kc-1" and claims["preferred_username"] == "bob"
+assert abs(jwt.lifetime(claims) - 300) < 1e-6
+
+fetches = []
+
+
+def fetch(url):
+    fetches.append(url)
+    if fetch.offline:
+        raise ValueError("offline")
+    return issuer.jwks()
+fetch.offline = False
+
+cache_path = Path(tempfile.mkdtemp()) / "jwks.json"
+verifier = TokenVerifier(JwksCache("http://kc/certs", cache_path, fetch=fetch))
+assert verifier.verify(token)["sub"] == "kc-1"
+n = 2000
+t0 = time.perf_counter()
+for _ in range(n):
+    verifier.verify(token)
+print(f"verify: {1e6 * (time.perf_counter() - t0) / n:.0f} us/token, {len(fetches)} JWKS fetch")
+assert len(fetches) == 1 and cache_path.exists()
+
+head, body, sig = token.split(".")
+forged = json.loads(jwt.b64url_decode(body))
+forged["sub"] = "kc-admin"
+for bad in (f"{head}.{jwt.b64url_encode(json.dumps(forged).encode())}.{sig}", f"{head}.{body}.{sig[:-4]}AAAA",
+            "not-a-token", f"{head}.{body}"):
+    try:
+        verifier.verify(bad)
+        raise AssertionError(f"accepted {bad[:40]}")
+    except jwt.InvalidToken as exc:
+        print("rejected:", exc)
+
+expired = issuer.mint("kc-1", lifetime=60, issued_at=time.time() - 600)
+try:
+    verifier.verify(expired)
+    raise AssertionError("expired token accepted")
+except jwt.InvalidToken:
+    pass
+assert verifier.verify(expired, check_exp=False)["sub"] == "kc-1"
+
+# A new process reuses the cached key set without fetching
+fresh = TokenVerifier(JwksCache("http://kc/certs", cache_path, fetch=fetch))
+fresh.verify(token)
+assert len(fetches) == 1
+
+# Keycloak rotates its key: the unknown kid triggers one refetch, not one per token
+issuer.rotate()
+rotated = issuer.mint("kc-1")
+import launcher.services.jwks as jwks_module
+jwks_module.REFETCH_INTERVAL = 0.0
+assert fresh.verify(rotated)["sub"] == "kc-1" and len(fetches) == 2
+jwks_module.REFETCH_INTERVAL = 60.0
+other = TokenIssuer(bits=1024).mint("kc-1")
+for _ in range(3):
+    try:
+        fresh.verify(other)
+        raise AssertionError("token from an unknown key accepted")
+    except jwt.InvalidToken as exc:
+        assert not isinstance(exc, JwksUnavailable)
+print("fetches after rotation and 3 unknown-key tokens:", len(fetches))
+assert len(fetches) == 2
+
+# Offline with nothing cached: neither accepted nor rejected
+fetch.offline = True
+try:
+    TokenVerifier(JwksCache("http://kc/certs", None, fetch=fetch)).verify(token)
+    raise AssertionError("verified without keys")
+except JwksUnavailable:
+    pass
+fetch.offline = False
+
+# ---------------------------------------------------------------- AuthService
+
+hits = Counter()
+state = {"sub": "kc-1", "lifetime": 300, "refresh_status": 200}
+
+
+class KeycloakStub(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        hits[self.path] += 1
+        if self.path.endswith("/certs"):
+            self._send(200, issuer.jwks())
+        else:
+            self._send(404, {"detail": "not found"})
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+        if self.path.endswith("/logout"):
+            hits[self.path] += 1
+            self._send(204, {})
+            return
+        grant = form["grant_type"][0]
+        hits[f"{self.path} {grant}"] += 1
+        if grant == "refresh_token" and state["refresh_status"] != 200:
+            self._send(state["refresh_status"], {"error": "invalid_grant"})
+            return
+        self._send(200, issuer.token_response(state["sub"], state["lifetime"], preferred_username="bob",
+                                              email="bob@example.com"))
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), KeycloakStub)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+config.KC_BASE = f"http://127.0.0.1:{server.server_port}"
+config.FASTAPI_BASE_URL = f"http://127.0.0.1:{server.server_port}/api/v1"
+auth = AuthService(verifier=TokenVerifier(JwksCache(
+    f"{config.KC_BASE}/realms/{config.KC_REALM}/protocol/openid-connect/certs", None)))
+
+user = auth.login("bob", "secret")
+print("login:", user, dict(hits))
+assert (user.id, user.email, user.display_name) == ("kc-1", "bob@example.com", "bob")
+assert not any("/auth/me" in path for path in hits)
+assert sum(v for k, v in hits.items() if "grant" in k or "password" in k) == 1
+assert 4.0 < auth.access_token_minutes_left() <= 4.5      # 300 s lifetime, refreshed 30 s early
+
+# Refresh schedule comes from the token, not expires_in or the local clock
+state["lifetime"] = 20
+auth._tokens.expires_at = auth._tokens.expires_at.replace(year=2000)
+auth.get_access_token()
+assert 0.25 < auth.access_token_minutes_left() <= 20 / 60
+
+# Resume from a saved refresh token: validate() is one refresh, no /auth/me
+before = sum(hits.values())
+auth._current_user = user
+auth._tokens.expires_at = auth._tokens.expires_at.replace(year=2000)
+assert auth.validate() is user and sum(hits.values()) == before + 1
+
+# The token names someone else: refused
+state["sub"] = "kc-2"
+auth._tokens.expires_at = auth._tokens.expires_at.replace(year=2000)
+try:
+    auth.validate()
+    raise AssertionError("session for another user accepted")
+except SessionExpired as exc:
+    print("other user:", exc)
+assert auth.current_user is None
+
+# A rejected refresh logs out
+state["sub"], state["refresh_status"] = "kc-1", 400
+auth.login("bob", "secret")
+auth._tokens.expires_at = auth._tokens.expires_at.replace(year=2000)
+try:
+    auth.get_access_token()
+    raise AssertionError("refresh failure ignored")
+except SessionExpired:
+    pass
+
+# A token signed by a key Keycloak doesn't publish is refused at login
+state["refresh_status"] = 200
+issuer.key, real_key = TokenIssuer(bits=1024).key, issuer.key
+try:
+    auth.login("bob", "secret")
+    raise AssertionError("forged token accepted")
+except AuthError as exc:
+    print("forged:", exc)
+issuer.key = real_key
+server.shutdown()
+print("ok")
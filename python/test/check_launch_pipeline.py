@@ -0,0 +1,183 @@
+# Checks the launch pipeline (services/launch_service.py) from a browsed
+# project to a running editor, with test/fake_editor.py as the editor and a
+# small template on disk:
+#
+# - preparation runs validate / env / provision / prefetch, each timed on
+#   the plan and in the launch_stage_seconds histogram;
+# - a fresh plan is reused (same future, launch_plan cache hit); past
+#   PLAN_TTL it is re-checked, and the project is found up to date;
+# - cancel() drops a preparation without reporting it, and the next one
+#   resumes the interrupted provisioning;
+# - Open starts the editor (launched, click to process start recorded);
+#   another sequence of the open project is handed to it over IPC instead
+#   (handed_off, no second process), well before a fresh editor is ready;
+# - stop() shuts the preparation worker down.
+#
+#   python test/check_launch_pipeline.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from PyQt6.QtWidgets import QApplication
+
+from launcher.domain.project import Project
+from launcher.domain.sequence import Sequence
+from launcher.services import launch_service
+from launcher.services.admission import AdmissionController, AdmissionPolicy
+from launcher.services.launch_context import LaunchContextResolver
+from launcher.services.launch_service import LAUNCH_STAGE_SECONDS, LaunchPipeline
+from launcher.services.provisioning_service import ProvisioningService
+from launcher.services.theater_service import TheaterService
+from launcher.util.metrics import CACHE_LOOKUPS
+
+app = QApplication(sys.argv)
+tmp = Path(tempfile.mkdtemp())
+fake_editor = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_editor.py")
+EDITOR_ARGS = ["--rate", "20", "--seconds", "60"]
+
+
+def pump(seconds: float, until=lambda: False):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end and not until():
+        app.processEvents()
+        time.sleep(0.002)
+    return until()
+
+
+def stage_count(stage: str) -> int:
+    return LAUNCH_STAGE_SECONDS.labels(stage).snapshot()[1]
+
+
+def plan_hits() -> float:
+    return CACHE_LOOKUPS.labels("launch_plan", "hit").value
+
+
+# The editor gets the .uproject first, as UnrealEditor does
+if os.name == "nt":
+    editor = tmp / "UnrealEditor.cmd"
+    editor.write_text(f'@"{sys.executable}" "{fake_editor}" %*\n')
+else:
+    editor = tmp / "UnrealEditor"
+    editor.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{fake_editor}" "$@"\n')
+    editor.chmod(editor.stat().st_mode | stat.S_IXUSR)
+
+template = tmp / "Template"
+(template / "Config").mkdir(parents=True)
+(template / "Config" / "DefaultEngine.ini").write_text("[/Script/Engine.Engine]\n")
+(template / "Template.uproject").write_text('{"FileVersion": 3}')
+for i in range(2000):
+    d = template / "Content" / f"Dir{i // 200:02d}"
+    d.mkdir(parents=True, exist_ok=True)
+    (d / f"Asset_{i:04d}.uasset").write_bytes(os.urandom(2048))
+
+provisioning = ProvisioningService(template / "Template.uproject", tmp / "projects", link_mode="copy",
+                                   cache_dir=tmp / "cache")
+theater = TheaterService(auth=None, log_dir=tmp / "logs", ipc_dir=tmp / "editors",
+                         admission=AdmissionController(AdmissionPolicy(max_editors=4), metrics=lambda: None))
+pipeline = LaunchPipeline(provisioning, theater, resolver=LaunchContextResolver(editor_exe=str(editor),
+                                                                                projects_root=str(tmp)))
+prepared, failed, handed, launched = [], [], [], []
+pipeline.prepared.connect(prepared.append)
+pipeline.failed.connect(lambda name, msg: failed.append((name, msg)))
+pipeline.handed_off.connect(lambda name, key: handed.append(key))
+pipeline.launched.connect(launched.append)
+pipeline.start_failed.connect(lambda name, msg: failed.append((name, msg)))
+
+ep1 = Project("p1", "EW_EP1", "tg63", 3, 40)
+ep2 = Project("p2", "EW_EP2", "tg64", 3, 40)
+sq01 = Sequence("s1", "p1", "Opening", "sq01", "new")
+sq02 = Sequence("s2", "p1", "Chase", "sq02", "new")
+
+# ---------------------------------------------------------------- preparation
+
+fut = pipeline.prepare(ep1)
+assert pump(30, until=lambda: prepared), failed
+plan = prepared[0]
+assert [name for name, _ in plan.timings] == ["validate", "env", "provision", "prefetch"]
+assert plan.fresh and Path(plan.uproject).is_file() and provisioning.is_provisioned("EW_EP1")
+assert all(stage_count(name) >= 1 for name, _ in plan.timings)
+print(f"first prepare: {plan.report()}")
+
+hits = plan_hits()
+assert pipeline.prepare(ep1) is fut and pipeline.ready_plan(ep1) is plan and plan_hits() == hits + 1
+print("fresh plan reused: same preparation, launch_plan cache hit")
+
+launch_service.PLAN_TTL = 0.2
+pump(0.3)
+assert pipeline.ready_plan(ep1) is None
+prepared.clear()
+assert pipeline.prepare(ep1) is not fut
+assert pump(30, until=lambda: prepared), failed
+again = prepared[0]
+first_provision, second_provision = dict(plan.timings)["provision"], dict(again.timings)["provision"]
+print(f"after PLAN_TTL: {again.report()}")
+assert second_provision < first_provision
+launch_service.PLAN_TTL = 300.0
+plan = again
+
+# ---------------------------------------------------------------- cancel
+
+started, release = threading.Event(), threading.Event()
+provision = provisioning.provision
+
+
+def gated(name, progress=None, cancel=None):
+    def hold(*args):
+        started.set()
+        release.wait(10)        # keep the copy going until cancel() has been called
+    return provision(name, progress=hold, cancel=cancel)
+
+
+provisioning.provision = gated
+prepared.clear()
+cancelled = pipeline.prepare(ep2)
+assert started.wait(10)
+pipeline.cancel()
+release.set()
+assert pump(10, until=lambda: cancelled.done())
+pump(0.2)
+assert not prepared and not failed and pipeline.pending() == 0
+assert not provisioning.is_provisioned("EW_EP2")
+provisioning.provision = provision
+pipeline.prepare(ep2)
+assert pump(30, until=lambda: prepared) and provisioning.is_provisioned("EW_EP2")
+print("cancelled preparation dropped quietly, then resumed")
+
+# ---------------------------------------------------------------- launch / handoff
+
+clicked = time.perf_counter()
+session = pipeline.launch(plan, sq01, args=EDITOR_ARGS, clicked_at=clicked)
+assert launched == [session] and session.key == "EW_EP1/sq01"
+before = stage_count("click_to_start")
+assert pump(10, until=lambda: stage_count("click_to_start") > before)
+assert pump(10, until=lambda: session.pid and theater.registry.get(session.pid))
+fresh_ready = time.perf_counter() - clicked
+assert all(stage_count(name) >= 1 for name in ("scope", "handoff", "start"))
+
+clicked = time.perf_counter()
+assert pipeline.launch(plan, sq02, args=EDITOR_ARGS, clicked_at=clicked) is None
+assert pump(10, until=lambda: handed)
+handoff = time.perf_counter() - clicked
+assert handed == ["EW_EP1/sq02"] and len(launched) == 1 and not failed
+assert theater.session("EW_EP1/sq02") is session and len(theater.running()) == 1
+print(f"fresh editor ready {fresh_ready * 1000:.0f} ms after the click; handoff {handoff * 1000:.1f} ms")
+assert handoff < fresh_ready
+
+# ---------------------------------------------------------------- shutdown
+
+session.terminate()
+pump(5, until=lambda: not session.is_alive())
+pipeline.stop()
+theater.shutdown()
+try:
+    pipeline.prepare(ep1)
+    raise AssertionError("prepare() after stop()")
+except RuntimeError:
+    pass
+print("ok")
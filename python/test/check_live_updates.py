@@ -0,0 +1,59 @@
+# Exercises the SSE client (launcher.services.live_updates.EventStream)
+# against the stand-in push server in fake_backend.py: delivery, reconnect
+# with Last-Event-ID replay, and resync when the replay window was lost.
+#
+#   python test/check_live_updates.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import queue
+
+from fake_backend import FakeBackend
+from launcher.services.live_updates import EventStream
+
+backend = FakeBackend(projects=3).start()
+backend.heartbeat = 0.5
+events, resyncs, states = queue.Queue(), queue.Queue(), queue.Queue()
+
+stream = EventStream(
+    f"{backend.base_url}/events",
+    headers=lambda: {"Authorization": "Bearer test"},
+    on_event=events.put,
+    on_resync=lambda: resyncs.put(True),
+    on_state=states.put,
+    min_backoff=0.05,
+    max_backoff=0.2,
+    read_timeout=2.0,
+)
+try:
+    stream.start()
+    assert states.get(timeout=5) is True
+    assert resyncs.get(timeout=5)  # first connect has no position to replay from
+
+    pid = next(iter(backend.projects))
+    backend.update_project(pid, name="Renamed")
+    ev = events.get(timeout=5)
+    assert (ev.entity, ev.op, ev.data["name"]) == ("project", "updated", "Renamed"), ev
+    print("delivered:", ev.entity, ev.op, ev.id)
+
+    # Drop the connection, change things while disconnected, expect replay
+    backend.drop_streams()
+    assert states.get(timeout=5) is False
+    backend.update_project(pid, name="Renamed again")
+    assert states.get(timeout=5) is True
+    ev = events.get(timeout=5)
+    assert ev.data["name"] == "Renamed again", ev
+    assert resyncs.empty()
+    print("replayed after reconnect:", ev.id)
+
+    # Lose the server's replay window: client must be told to resync
+    backend.drop_streams()
+    backend.update_project(pid, name="Missed")
+    backend.forget_events()
+    assert resyncs.get(timeout=5)
+    print("resync requested after missed events")
+finally:
+    stream.stop()
+    backend.stop()
+print("ok")
@@ -0,0 +1,113 @@
+# Checks the SQLite mirror (services/local_mirror.py):
+#
+# - every user id gets its own database file, and one user's rows never
+#   show up for another;
+# - a file left by another schema version is dropped and rebuilt empty;
+# - a row is only overwritten by a copy with a newer updated_at (or when
+#   either side has none); project counts are always taken;
+# - replace_* drops rows missing from a full listing, within its scope
+#   only, and a delta removes the ids it names.
+#
+#   python test/check_local_mirror.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from launcher.domain.project import Project
+from launcher.domain.sequence import Sequence
+from launcher.domain.shot import Shot
+from launcher.services.local_mirror import SCHEMA_VERSION, LocalMirror
+
+tmp = Path(tempfile.mkdtemp())
+T1, T2, T3 = "2026-01-01T10:00:00Z", "2026-01-02T10:00:00Z", "2026-01-03T10:00:00Z"
+
+# ---------------------------------------------------------------- per user
+
+alice = LocalMirror.for_user("alice@studio", tmp)
+bob = LocalMirror.for_user("bob@studio", tmp)
+assert alice.path != bob.path and alice.path.parent == bob.path.parent == tmp / "mirror"
+assert "alice" not in alice.path.name
+assert LocalMirror.for_user("alice@studio", tmp).path == alice.path
+alice.replace_projects([Project("p1", "EW_EP1", "tg63", 3, 40, T1)])
+bob.replace_projects([Project("p2", "EW_EP2", "tg64", 2, 10, T1)])
+assert [p.id for p in alice.projects()] == ["p1"] and [p.id for p in bob.projects()] == ["p2"]
+assert not bob.search("EW_EP1")
+print(f"per user: {alice.path.name} / {bob.path.name}")
+bob.close()
+
+# ---------------------------------------------------------------- schema version
+
+alice.close()
+db = sqlite3.connect(str(alice.path))
+db.execute(f"PRAGMA user_version = {SCHEMA_VERSION - 1}")
+db.execute("CREATE TABLE leftovers (x)")
+db.commit()
+db.close()
+mirror = LocalMirror(alice.path)
+assert mirror.projects() == [] and mirror.cursor("projects") is None
+with sqlite3.connect(str(alice.path)) as db:
+    assert db.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+mirror.replace_projects([Project("p1", "EW_EP1", "tg63", 3, 40, T1)])
+mirror.close()
+mirror = LocalMirror(alice.path)
+assert [p.id for p in mirror.projects()] == ["p1"]      # same version: kept
+print(f"schema {SCHEMA_VERSION - 1} -> {SCHEMA_VERSION}: dropped and rebuilt")
+
+# ---------------------------------------------------------------- updated_at guard
+
+mirror.upsert_sequences([Sequence("s1", "p1", "Opening", "sq01", "new", None, T2)])
+mirror.upsert_sequences([Sequence("s1", "p1", "Opening", "sq01", "stale", None, T1)])
+assert mirror.sequences("p1")[0].status == "new"
+mirror.upsert_sequences([Sequence("s1", "p1", "Opening", "sq01", "in_progress", None, T3)])
+assert mirror.sequences("p1")[0].status == "in_progress"
+mirror.upsert_sequences([Sequence("s1", "p1", "Opening", "sq01", "review", None, None)])
+assert mirror.sequences("p1")[0].status == "review"
+
+mirror.upsert_projects([Project("p1", "EW_EP1 (renamed)", "tg63", 3, 40, T2)])
+mirror.upsert_projects([Project("p1", "EW_EP1 (old)", "tg63", 3, 40, T1)])
+assert mirror.projects()[0].name == "EW_EP1 (renamed)"
+# Counts are always taken, but an older copy carrying new counts leaves the rest alone
+mirror.upsert_projects([Project("p1", "EW_EP1 (old)", "tg00", 4, 41, T1)])
+p1 = mirror.projects()[0]
+assert (p1.name, p1.code, p1.updated_at) == ("EW_EP1 (renamed)", "tg63", T2), p1
+assert (p1.sequence_count, p1.shot_count) == (4, 41)
+
+mirror.upsert_shots([Shot("h1", "p1", "s1", None, "sh010", "new", {"frames": 24}, T2)])
+mirror.upsert_shots([Shot("h1", "p1", "s1", None, "sh010", "stale", {"frames": 1}, T1)])
+shot = mirror.shots("s1")[0]
+assert shot.status == "new" and shot.meta == {"frames": 24}
+print("older copies ignored, newer or untimestamped ones applied")
+
+# ---------------------------------------------------------------- full listings
+
+mirror.replace_projects([Project(f"p{i}", f"EW_EP{i}", f"tg6{i}", 0, 0, T1) for i in range(1, 4)])
+mirror.replace_projects([Project("p1", "EW_EP1", "tg61", 0, 0, T1), Project("p3", "EW_EP3", "tg63", 0, 0, T1)])
+assert [p.id for p in mirror.projects()] == ["p1", "p3"]
+
+mirror.replace_sequences("p1", [Sequence("s1", "p1", None, "sq01", "new"), Sequence("s2", "p1", None, "sq02", "new")])
+mirror.replace_sequences("p3", [Sequence("s3", "p3", None, "sq01", "new")])
+mirror.replace_sequences("p1", [Sequence("s2", "p1", None, "sq02", "new")])
+assert [s.id for s in mirror.sequences("p1")] == ["s2"]
+assert [s.id for s in mirror.sequences("p3")] == ["s3"]            # other project untouched
+
+mirror.replace_shots("s2", [Shot(f"h{i}", "p1", "s2", None, f"sh{i:03d}", "new") for i in range(5)])
+mirror.replace_shots("s3", [Shot("x1", "p3", "s3", None, "sh010", "new")])
+mirror.replace_shots("s2", [Shot("h4", "p1", "s2", None, "sh004", "new")])
+assert [s.id for s in mirror.shots("s2")] == ["h4"] and [s.id for s in mirror.shots("s3")] == ["x1"]
+mirror.replace_shots("s2", [])
+assert mirror.shots("s2") == [] and len(mirror.all_shots()) == 1
+
+# Thousands of ids stay past SQLite's bound-parameter limit
+many = [Shot(f"m{i}", "p3", "s3", None, f"sh{i:05d}", "new") for i in range(40_000)]
+mirror.replace_shots("s3", many)
+mirror.replace_shots("s3", many[::2])
+assert len(mirror.shots("s3")) == 20_000
+
+mirror.sync_sequences("p3", [], deleted=["s3"], cursor="c1")
+assert mirror.sequences("p3") == [] and mirror.cursor("sequences/p3") == "c1"
+print("full listings drop missing rows in their scope; deltas drop deleted ids")
+mirror.close()
+print("ok")
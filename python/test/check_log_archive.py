@@ -0,0 +1,168 @@
+# Checks and times the editor log archive (services/log_archive.py):
+# write throughput and compression, opening a large log, random access,
+# regex / level search, following a live log, retention by total size,
+# and the viewer model rendering only what is asked for.
+#
+#   python test/check_log_archive.py --lines 2000000
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from launcher.services.log_archive import ERROR, WARNING, LogArchive, line_level
+from launcher.util.proc_stats import sample_process
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--lines", type=int, default=1_000_000)
+opts = parser.parse_args()
+
+root = Path(tempfile.mkdtemp())
+archive = LogArchive(root, max_bytes=1 << 40)
+rss0 = sample_process(os.getpid()).rss
+
+
+def editor_lines(start: int, count: int) -> str:
+    out = []
+    for n in range(start, start + count):
+        stamp = f"[2026.10.19-12.00.{n // 1000 % 60:02d}:{n % 1000:03d}][{n % 1000:3d}]"
+        if n % 5000 == 0:
+            out.append(f"{stamp}LogShaderCompilers: Error: Shader {n} failed to compile")
+        elif n % 700 == 0:
+            out.append(f"{stamp}LogTexture: Warning: Texture /Game/Env/T_{n:07d} has no mips")
+        else:
+            out.append(f"{stamp}LogStreaming: Display: Loading package /Game/Env/Asset_{n:07d}")
+    return "\n".join(out)
+
+
+# --- write, in the batch sizes EditorSession hands over
+writer = archive.create("EW_EP1/sq01")
+batch = 600
+t0 = time.perf_counter()
+write_time = 0.0
+for start in range(0, opts.lines, batch):
+    text = editor_lines(start, min(batch, opts.lines - start))
+    w0 = time.perf_counter()
+    writer.write(text)
+    write_time += time.perf_counter() - w0
+writer.close(0)
+raw = writer.raw_bytes
+log = archive.sessions()[0]
+print(f"write: {opts.lines:,} lines, {raw / 2**20:.0f} MiB -> {log.size / 2**20:.1f} MiB on disk "
+      f"({raw / log.size:.1f}x), archive cost {write_time:.2f} s "
+      f"({opts.lines / write_time / 1e6:.1f} M lines/s)")
+
+# --- open + random access
+t0 = time.perf_counter()
+reader = archive.open(log.session_id)
+print(f"open: {(time.perf_counter() - t0) * 1000:.1f} ms for {reader.block_count:,} blocks, {reader.line_count:,} lines")
+assert reader.line_count == opts.lines
+
+picks = [random.randrange(opts.lines) for _ in range(2000)]
+t0 = time.perf_counter()
+for n in picks:
+    line = reader.line(n)
+    assert f"_{n:07d}" in line or f"Shader {n} " in line, (n, line)
+print(f"random line: {(time.perf_counter() - t0) / len(picks) * 1e6:.0f} us avg (cold blocks)")
+t0 = time.perf_counter()
+page = reader.lines(opts.lines // 2, 60)
+print(f"60-line page: {(time.perf_counter() - t0) * 1e6:.0f} us")
+assert len(page) == 60
+
+# --- search
+t0 = time.perf_counter()
+errors = list(reader.search(min_level=ERROR))
+t_err = time.perf_counter() - t0
+assert errors == list(range(0, opts.lines, 5000)), errors[:5]
+t0 = time.perf_counter()
+warnings = list(reader.search(min_level=WARNING))
+t_warn = time.perf_counter() - t0
+assert all(line_level(reader.line(n)) <= WARNING for n in warnings[:200])
+t0 = time.perf_counter()
+hits = list(reader.search(r"T_00\d{2}700 "))
+t_re = time.perf_counter() - t0
+t0 = time.perf_counter()
+none = list(reader.search(r"NoSuchThing\d+"))
+t_none = time.perf_counter() - t0
+print(f"search: errors {len(errors)} in {t_err * 1000:.0f} ms, warnings+ {len(warnings)} in {t_warn * 1000:.0f} ms, "
+      f"regex {len(hits)} hits in {t_re * 1000:.0f} ms, no-match regex in {t_none * 1000:.0f} ms")
+assert not none and hits
+
+# Anchors work on every line, compiled (as the viewer does) or not; a match never spans a line break
+assert list(reader.search(r"^\[\S+\]\[\s*0\]LogShaderCompilers")) == errors
+assert list(reader.search(re.compile(r"^\[\S+\]\[\s*0\]logshader", re.IGNORECASE))) == errors
+assert list(reader.search(re.compile(r"compile$"))) == errors
+assert not list(reader.search(r"failed to compile\s+\[")) and not list(reader.search(r"mips\n"))
+
+rss1 = sample_process(os.getpid()).rss
+print(f"RSS growth after write/open/search: {(rss1 - rss0) / 2**20:.0f} MiB")
+reader.close()
+
+# --- live follow
+live = archive.create("EW_EP1/sq02")
+follower = archive.open(live.session_id)
+live.write(editor_lines(0, 10))
+live.flush()
+assert follower.refresh() == 10 and follower.line(9).endswith("Asset_0000009")
+live.write(editor_lines(10, 5))
+live.flush()
+assert follower.refresh() == 15
+assert archive.sessions()[0].live and archive.sessions()[0].lines == 15
+live.close(0)
+follower.close()
+print("live follow ok")
+
+# --- viewer model: only visible rows are read
+from PyQt6.QtWidgets import QApplication
+from launcher.ui.log_viewer_page import LogViewerPage
+
+app = QApplication(sys.argv)
+page = LogViewerPage(archive)
+page.resize(1200, 700)
+page.show()
+calls = {"n": 0}
+t0 = time.perf_counter()
+page.show_session(log.session_id)
+app.processEvents()
+opened = time.perf_counter() - t0
+reader_line = page.model._reader.line
+
+
+def counting(n):
+    calls["n"] += 1
+    return reader_line(n)
+
+
+page.model._reader.line = counting
+page.view.viewport().repaint()
+app.processEvents()
+print(f"viewer: opened {page.model.rowCount():,} rows in {opened * 1000:.0f} ms, "
+      f"{calls['n']} line reads for one repaint")
+page.search_input.setText("Shader .* failed")
+deadline = time.monotonic() + 30
+while "match" not in page.info_label.text() and time.monotonic() < deadline:
+    app.processEvents()
+    time.sleep(0.01)
+app.processEvents()
+assert page.model.rowCount() == len(errors), page.model.rowCount()
+print("viewer search:", page.info_label.text())
+page.shutdown()
+
+# --- retention
+small = LogArchive(root / "small", max_bytes=200_000)
+ids = []
+for i in range(6):
+    w = small.create(f"EP/sq{i:02d}")
+    w.write(editor_lines(i * 100_000, 20_000))
+    w.close(0)
+    ids.append(w.session_id)
+    time.sleep(0.01)
+kept = [log.session_id for log in small.sessions()]
+print(f"retention: kept {len(kept)} of 6, {small.total_bytes():,} bytes")
+assert kept and ids[-1] in kept and ids[0] not in kept and small.total_bytes() <= 200_000 + 100_000
+print("ok")
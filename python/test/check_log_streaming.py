@@ -0,0 +1,85 @@
+# Checks that TheaterService keeps the GUI event loop responsive while the
+# child process floods its output. Runs test/fake_editor.py as the "editor"
+# and measures how late a 16 ms (60 fps) timer fires while logs stream in.
+# Fails unless the loop holds 60 fps: at least 90% of the frames arrive, at
+# most 15% of them later than the 16.7 ms budget plus TOLERANCE_MS, and no
+# gap is longer than three frames.
+#
+#   python test/check_log_streaming.py [--rate 50000] [--seconds 5]
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from PyQt6.QtCore import QElapsedTimer, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from launcher.services.admission import AdmissionController
+from launcher.services.theater_service import TheaterService
+
+FRAME_MS = 1000 / 60
+TOLERANCE_MS = 4.0          # timer jitter on a loaded machine, not the log pipeline
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rate", type=int, default=50000)
+parser.add_argument("--seconds", type=float, default=5.0)
+opts = parser.parse_args()
+
+app = QApplication(sys.argv)
+log_dir = Path(tempfile.mkdtemp())
+service = TheaterService(auth=None, log_dir=log_dir, admission=AdmissionController(metrics=lambda: None))
+
+stats = {"batches": 0, "lines": 0, "frames": 0, "late": 0, "worst": 0.0}
+frame = QElapsedTimer()
+
+
+def on_batch(text: str):
+    stats["batches"] += 1
+    stats["lines"] += text.count("\n") + 1
+
+
+def on_frame():
+    if frame.isValid():
+        gap = frame.restart()
+        stats["frames"] += 1
+        stats["worst"] = max(stats["worst"], gap)
+        if gap > FRAME_MS + TOLERANCE_MS:
+            stats["late"] += 1
+    else:
+        frame.start()
+
+
+service.finished.connect(lambda code: app.quit())
+ticker = QTimer()
+ticker.setInterval(16)
+ticker.timeout.connect(on_frame)
+ticker.start()
+
+fake_editor = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_editor.py")
+t0 = time.perf_counter()
+session = service.launch(sys.executable, fake_editor, ["--rate", str(opts.rate), "--seconds", str(opts.seconds)])
+returned = time.perf_counter() - t0
+print(f"launch() returned in {returned * 1000:.1f} ms")
+session.output.connect(on_batch)
+session.error.connect(on_batch)
+app.exec()
+
+elapsed = time.perf_counter() - t0
+print(f"{stats['lines']} lines in {stats['batches']} batches over {elapsed:.1f} s "
+      f"({stats['lines'] / elapsed:.0f} lines/s)")
+print(f"ring buffer: {len(session.log_buffer)} kept of {session.log_buffer.total}")
+print(f"archive: {service.archive.total_bytes() / 2**20:.1f} MiB")
+expected = elapsed * 1000 / ticker.interval()
+late_ratio = stats["late"] / max(stats["frames"], 1)
+print(f"frames: {stats['frames']} of {expected:.0f}, late (>{FRAME_MS + TOLERANCE_MS:.1f} ms): "
+      f"{stats['late']} ({late_ratio:.1%}), worst gap: {stats['worst']} ms")
+assert returned < FRAME_MS / 1000, "launch() blocked the GUI thread"
+assert stats["lines"] > 0, "no output reached the GUI"
+assert stats["frames"] >= 0.9 * expected, "event loop fell below 60 fps"
+assert late_ratio <= 0.15, f"{late_ratio:.1%} of frames late"
+assert stats["worst"] < 3 * FRAME_MS, f"a {stats['worst']} ms stall"
+print("ok")
@@ -0,0 +1,143 @@
+# Checks failing fast and recovering when a backend goes away: the fake
+# FastAPI backend is stopped mid-session, and then restarted on the same
+# port.
+#
+# - the first failing call opens the circuit after a few sends;
+# - later calls fail in microseconds instead of waiting out timeouts;
+# - BackendHealth reports offline, probes in the background, and reports
+#   online again once the backend is back, without any user action;
+# - a hung backend (accepts, never answers) is treated the same way.
+#
+#   python test/check_offline_mode.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import socket
+import threading
+import time
+
+import requests
+from PyQt6.QtCore import QCoreApplication
+
+from fake_backend import FakeBackend
+from launcher.services.backend_health import Backend, BackendHealth
+from launcher.services.http_client import HttpClient
+from launcher.services.http_pipeline import (
+    CircuitBreakerMiddleware, CircuitOpen, HttpPipeline, MetricsMiddleware, RetryMiddleware, TimeoutMiddleware,
+)
+from launcher.services.project_service import ProjectService
+from launcher.util.metrics import MetricsRegistry
+
+app = QCoreApplication([])
+
+
+def pump(until, timeout=10.0):
+    end = time.monotonic() + timeout
+    while not until() and time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.01)
+    return until()
+
+
+class StaticAuth:
+    def get_access_token(self):
+        return "test"
+
+    def logout(self):
+        pass
+
+
+def make_pipeline(read_timeout=5.0):
+    breaker = CircuitBreakerMiddleware(threshold=3, cooldown=30)
+    sends = []
+
+    def counting(request, call_next):
+        sends.append(request.endpoint)
+        return call_next(request)
+
+    pipeline = HttpPipeline(
+        [MetricsMiddleware(MetricsRegistry()), TimeoutMiddleware((1.0, read_timeout)),
+         RetryMiddleware(3, base_delay=0.05), breaker, counting],
+        breaker=breaker,
+    )
+    return pipeline, breaker, sends
+
+
+# ---------------------------------------------------------------- backend stops
+
+backend = FakeBackend(projects=200).start()
+port = backend._server.server_address[1]
+pipeline, breaker, sends = make_pipeline()
+service = ProjectService(StaticAuth(), HttpClient(backend.base_url, pipeline))
+health = BackendHealth(breaker, [Backend("api", f"{backend.base_url}/")], probe_interval=0.2)
+events = []
+health.offline_changed.connect(events.append)
+
+assert len(service.list_my_projects()) == 200
+backend.stop()
+pipeline.transport._local.session.close()   # a stopped VM takes its keep-alive connections with it
+
+before = len(sends)
+t0 = time.perf_counter()
+try:
+    service.list_my_projects()
+    raise AssertionError("no error with the backend down")
+except requests.ConnectionError as exc:
+    print(f"first failure after {len(sends) - before} sends, {time.perf_counter() - t0:.2f} s: {type(exc).__name__}")
+assert len(sends) - before == 3
+assert breaker.state(f"127.0.0.1:{port}") == "open"
+
+before = len(sends)
+t0 = time.perf_counter()
+for _ in range(100):
+    try:
+        service.list_my_projects()
+    except CircuitOpen:
+        pass
+per_call = (time.perf_counter() - t0) / 100
+print(f"then: {1e6 * per_call:.0f} us per call, {len(sends) - before} sends")
+assert len(sends) == before and per_call < 0.01
+
+assert pump(lambda: events == [True])
+assert health.is_offline and health.down() == ["api"]
+print("offline:", health.down())
+
+# Back on the same port: the background probe notices, no user action
+time.sleep(0.5)
+backend = FakeBackend(projects=200, port=port).start()
+t0 = time.perf_counter()
+assert pump(lambda: events == [True, False]), events
+print(f"online again {time.perf_counter() - t0:.2f} s after restart")
+assert breaker.state(f"127.0.0.1:{port}") == "closed"
+assert len(service.list_my_projects()) == 200
+backend.stop()
+health.stop()
+
+# ---------------------------------------------------------------- hung backend
+
+hung = socket.socket()
+hung.bind(("127.0.0.1", 0))
+hung.listen(64)
+accepted = []
+threading.Thread(target=lambda: [accepted.append(hung.accept()) for _ in range(64)], daemon=True).start()
+url = f"http://127.0.0.1:{hung.getsockname()[1]}/api/v1"
+
+pipeline, breaker, sends = make_pipeline(read_timeout=0.3)
+client = HttpClient(url, pipeline)
+t0 = time.perf_counter()
+try:
+    client.get("auth/me/projects", auth=StaticAuth())
+except requests.Timeout:
+    pass
+print(f"hung: gave up after {len(sends)} sends, {time.perf_counter() - t0:.2f} s")
+t0 = time.perf_counter()
+for _ in range(20):
+    try:
+        client.get("projects/1/sequences/count", auth=StaticAuth())
+    except CircuitOpen:
+        pass
+print(f"hung: 20 more calls in {1000 * (time.perf_counter() - t0):.1f} ms, {len(sends) - 3} sends")
+assert len(sends) == 3
+hung.close()
+print("ok")
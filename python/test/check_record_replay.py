@@ -0,0 +1,140 @@
+# Checks the stand-in Keycloak in fake_backend.py and recording / replay of
+# HTTP sessions (services/http_recording.py):
+#
+# - login, token refresh on a 401 and logout through AuthService against
+#   the stand-in, which wants a live token on every API call;
+# - a recorded session replays with the backend gone: same answers, same
+#   order, tokens still verified, nothing sent anywhere;
+# - a request the recording never made fails with ReplayMiss and leaves the
+#   circuit breaker closed; event streams are refused too;
+# - replay at speed 1 waits as long as the server took, at 0 not at all;
+# - injected 503s are retried away for idempotent calls.
+#
+#   python test/check_record_replay.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import json
+import tempfile
+from pathlib import Path
+
+import requests
+
+from fake_backend import FakeBackend
+from launcher import config
+from launcher.services.auth_service import AuthService
+from launcher.services.http_client import HttpClient
+from launcher.services.http_pipeline import (
+    AuthMiddleware, CircuitBreakerMiddleware, HttpPipeline, RetryMiddleware, TimeoutMiddleware,
+)
+from launcher.services.http_recording import RecordingTransport, ReplayMiss, ReplayTransport, request_key
+from launcher.services.jwks import JwksCache, TokenVerifier, jwks_url
+from launcher.services.project_service import ProjectService
+from launcher.util.errors import AuthError
+
+
+def make_pipeline(transport=None):
+    breaker = CircuitBreakerMiddleware(threshold=3, cooldown=30.0)
+    return HttpPipeline([TimeoutMiddleware((1.0, 5.0)), RetryMiddleware(4, base_delay=0.01), breaker,
+                         AuthMiddleware()], transport, breaker=breaker)
+
+
+def make_services(http, base_url, issuer):
+    auth = AuthService(verifier=TokenVerifier(JwksCache(jwks_url(), None, http=http), issuer=issuer), http=http)
+    return auth, ProjectService(auth, HttpClient(base_url, http))
+
+
+def session(auth, projects, backend=None):
+    """The calls recorded and then replayed; what they saw, in order."""
+    seen = [auth.login("bob", "1234").email]
+    listing = projects.list_my_projects()
+    seen.append(sorted(p.name for p in listing))
+    if backend is not None:
+        backend.revoke_access_tokens()      # the next call gets a 401 and the token is refreshed
+    seen.append([s.code for s in projects.list_sequences(listing[0].id)])
+    seen.append([s.code for s in projects.list_sequences(listing[1].id)])
+    auth.logout()
+    return seen
+
+
+backend = FakeBackend(projects=4, sequences_per_project=3).start()
+backend.require_auth = True
+backend.issuer          # generate the signing key now, not inside a recorded answer
+config.KC_BASE = config.KC_ISSUER = backend.kc_base
+issuer = f"{config.KC_ISSUER}/realms/{config.KC_REALM}"
+path = Path(tempfile.mkdtemp()) / "session.jsonl"
+
+# ---------------------------------------------------------------- stand-in Keycloak
+
+auth, projects = make_services(make_pipeline(), backend.base_url, issuer)
+try:
+    auth.login("bob", "wrong")
+    raise AssertionError("a wrong password logged in")
+except AuthError as exc:
+    print(f"wrong password: {exc}")
+assert requests.get(f"{backend.base_url}/auth/me/projects").status_code == 401
+
+# ---------------------------------------------------------------- record
+
+recorder = RecordingTransport(path)
+auth, projects = make_services(make_pipeline(recorder), backend.base_url, issuer)
+recorded = session(auth, projects, backend)
+print(f"recorded {recorder.recorded} exchanges; token grants {backend.token_requests}")
+assert backend.token_requests == ["password", "password", "refresh_token"]
+assert len(recorded[1]) == 4 and len(recorded[2]) == 3
+backend.stop()
+
+# ---------------------------------------------------------------- replay
+
+replay = ReplayTransport(path)
+assert len(replay) == recorder.recorded
+http = make_pipeline(replay)
+auth, projects = make_services(http, "http://replay.invalid/api/v1", issuer)
+replayed = session(auth, projects)
+print(f"replayed with the backend stopped: {replayed == recorded}")
+assert replayed == recorded and not replay.misses
+
+assert request_key("get", "http://a/api/v1/projects?b=2&a=1") == "GET /api/v1/projects?b=2&a=1"
+for _ in range(5):
+    try:
+        http.request("GET", "http://replay.invalid/api/v1/projects/00000000-0000-0000-0000-000000000000/sequences")
+        raise AssertionError("replayed a request that was never recorded")
+    except ReplayMiss:
+        pass
+assert http.breaker.state("replay.invalid") == "closed" and sum(replay.misses.values()) == 5
+try:
+    http.request("GET", "http://replay.invalid/api/v1/events", stream=True)
+    raise AssertionError("replayed an event stream")
+except ReplayMiss:
+    pass
+print(f"unrecorded requests: ReplayMiss, breaker {http.breaker.state('replay.invalid')}")
+
+# ---------------------------------------------------------------- pacing
+
+waits = []
+paced = ReplayTransport(path, speed=1.0, sleep=waits.append)
+auth, projects = make_services(make_pipeline(paced), "http://replay.invalid/api/v1", issuer)
+session(auth, projects)
+total = sum(line["elapsed"] for line in map(json.loads, path.read_text().splitlines()))
+print(f"speed 1 waited {1000 * sum(waits):.1f} ms of {1000 * total:.1f} ms recorded")
+assert len(waits) == recorder.recorded and abs(sum(waits) - total) < 1e-6
+waits.clear()
+paced.speed = 0.0
+paced.rewind()
+session(auth, projects)
+assert not waits
+
+# ---------------------------------------------------------------- injected errors
+
+backend = FakeBackend(projects=4, sequences_per_project=3).start()
+backend.error_rate = 0.2
+config.KC_BASE = config.KC_ISSUER = backend.kc_base
+http = make_pipeline()
+projects = ProjectService(None, HttpClient(backend.base_url, http))
+for _ in range(20):
+    assert len(projects.list_my_projects()) == 4
+print(f"20 listings at a 20% error rate: all answered in {backend.requests} requests")
+assert backend.requests > 20 * 9
+backend.stop()
+print("ok")
@@ -0,0 +1,187 @@
+# Checks the durable save queue (services/save_queue.py) through
+# ScriptBreakdownService.save_project against the stand-in backend:
+#
+# - save returns at once, even on a slow link;
+# - a failing second step (access grant) is retried on its own: one project;
+# - a lost response is resent with the same Idempotency-Key: one project;
+#   to a server that ignores the key, the resend's 409 finds the project
+#   this job created and the grant still follows;
+# - a job interrupted by quitting finishes after the queue reopens;
+# - a refused save (the code is someone else's project, even one with the
+#   same fields, as this job never sent a create that could have made it)
+#   fails without retrying or granting access, and saving the same code
+#   again while a save is unfinished returns the same job.
+#
+#   python test/check_save_queue.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from PyQt6.QtCore import QCoreApplication
+
+from fake_backend import FakeBackend
+from payloads import save_project_body
+from launcher.domain.script_breakdown import ScriptBreakdown
+from launcher.services.api_client import ApiClient
+from launcher.services.http_client import HttpClient
+from launcher.services.http_pipeline import (
+    AuthMiddleware, CircuitBreakerMiddleware, HttpPipeline, RetryMiddleware, TimeoutMiddleware,
+)
+from launcher.services.save_queue import SaveQueue
+from launcher.services.script_breakdown_service import ScriptBreakdownService
+
+app = QCoreApplication([])
+USER = "kc-user-1"
+
+
+def pump(until, timeout=10.0):
+    end = time.monotonic() + timeout
+    while not until() and time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.005)
+    return until()
+
+
+class StaticAuth:
+    _current_user = SimpleNamespace(id=USER)
+
+    def get_access_token(self):
+        return "test"
+
+    def logout(self):
+        pass
+
+
+def make_service(backend, path):
+    """What AppContext wires up, minus the UI: a queue opened for the user and the service registering steps."""
+    queue = SaveQueue(retry_base=0.05, retry_max=0.5)
+    breaker = CircuitBreakerMiddleware(threshold=3, cooldown=0.3)
+    pipeline = HttpPipeline([TimeoutMiddleware((1.0, 5.0)), RetryMiddleware(3, base_delay=0.01), breaker,
+                             AuthMiddleware()], breaker=breaker)
+    ctx = SimpleNamespace(
+        http_client=HttpClient(backend.base_url, pipeline),
+        auth_service=StaticAuth(), save_queue=queue, session_expired=SimpleNamespace(emit=print),
+    )
+    ctx.api_client = ApiClient(ctx)
+    service = ScriptBreakdownService(ctx)
+    queue.open(path)
+    events = []
+    queue.job_changed.connect(lambda job: events.append((job.state, job.step)))
+    return service, queue, events
+
+
+body = save_project_body(50)
+breakdown = ScriptBreakdown(total_pages=25, total_scenes=50, total_characters=40,
+                            scenes=body["config"]["scenes"], character_appearances=body["config"]["character_appearances"])
+
+
+def save(service, code):
+    return service.save_project(f"Project {code}", code, "Feature", breakdown, body["config"]["ai_analysis"])
+
+
+def projects_with(backend, code):
+    return [p for p in backend.projects.values() if p["code"] == code]
+
+
+tmp = Path(tempfile.mkdtemp())
+backend = FakeBackend().start()
+service, queue, events = make_service(backend, tmp / "jobs.sqlite3")
+
+# ---------------------------------------------------------------- returns at once
+
+backend.latency = 0.5
+t0 = time.perf_counter()
+job = save(service, "FAST")
+elapsed = time.perf_counter() - t0
+print(f"save_project returned in {1000 * elapsed:.1f} ms (server takes {backend.latency:.1f} s per call)")
+assert elapsed < 0.1 and job.state == "pending"
+assert pump(lambda: queue.get(job.id).state == "done")
+backend.latency = 0.0
+project = projects_with(backend, "FAST")[0]
+assert backend.access[project["id"]] == {USER: "admin"}
+assert queue.get(job.id).result["project"]["id"] == project["id"]
+
+# ---------------------------------------------------------------- second step fails
+
+events.clear()
+backend.fail("POST", "/projects/access", 503, times=3)
+job = save(service, "RETRY")
+assert pump(lambda: queue.get(job.id).state == "done")
+created = projects_with(backend, "RETRY")
+print(f"access grant failed 3x: {len(created)} project, steps seen {sorted(set(events))}")
+assert len(created) == 1 and backend.access[created[0]["id"]] == {USER: "admin"}
+
+# ---------------------------------------------------------------- lost responses
+
+backend.fail("POST", "/projects/", None, times=1)
+backend.fail("POST", "/projects/access", None, times=1)
+job = save(service, "LOST")
+assert pump(lambda: queue.get(job.id).state == "done")
+created = projects_with(backend, "LOST")
+print(f"both responses lost once: {len(created)} project")
+assert len(created) == 1 and backend.access[created[0]["id"]] == {USER: "admin"}
+
+backend.honour_idempotency = False
+backend.fail("POST", "/projects/", None, times=1)
+job = save(service, "NOKEY")
+assert pump(lambda: queue.get(job.id).state in ("done", "failed"))
+created = projects_with(backend, "NOKEY")
+print(f"lost response, server ignoring Idempotency-Key: {queue.get(job.id).state}, {len(created)} project")
+assert queue.get(job.id).state == "done" and len(created) == 1
+assert backend.access[created[0]["id"]] == {USER: "admin"}
+assert queue.get(job.id).result["project"]["id"] == created[0]["id"]
+backend.honour_idempotency = True
+
+# ---------------------------------------------------------------- quit mid-job, reopen
+
+backend.fail("POST", "/projects/access", 503, times=1000)
+job = save(service, "RESUME")
+assert pump(lambda: queue.get(job.id).step == 1 and queue.get(job.id).attempts >= 2)
+step = queue.get(job.id).step
+queue.stop()                                # the launcher quits with the grant still failing
+backend.faults.clear()
+print(f"quit with the job at step {step + 1}/2; reopening")
+
+service, queue, events = make_service(backend, tmp / "jobs.sqlite3")
+assert pump(lambda: queue.get(job.id).state == "done")
+created = projects_with(backend, "RESUME")
+assert len(created) == 1 and backend.access[created[0]["id"]] == {USER: "admin"}
+print("resumed after reopen: 1 project, access granted")
+
+# ---------------------------------------------------------------- refused, and deduplicated
+
+before = backend.requests
+job = service.save_project("Another film", "FAST", "Feature", breakdown, body["config"]["ai_analysis"])
+assert pump(lambda: queue.get(job.id).state == "failed")   # the code is taken by another project: 409
+print(f"refused: {queue.get(job.id).error} after {backend.requests - before} request(s)")
+assert backend.requests - before == 1 and len(projects_with(backend, "FAST")) == 1     # not sent before: no lookup
+assert queue.get(job.id).error == "HTTP 409: Project code 'FAST' already exists"
+
+# Even an identical project is not taken over unless this job may have created it
+backend.honour_idempotency = False
+fast = projects_with(backend, "FAST")[0]
+backend.access[fast["id"]] = {"someone-else": "admin"}
+job = save(service, "FAST")
+assert pump(lambda: queue.get(job.id).state == "failed")
+assert backend.access[fast["id"]] == {"someone-else": "admin"}
+backend.honour_idempotency = True
+print("identical project under someone else's code: refused, no access granted")
+
+backend.fail("POST", "/projects/", 503, times=1000)
+first = save(service, "TWICE")
+second = save(service, "TWICE")
+assert first.id == second.id and len(queue.jobs()) == 2        # TWICE, plus the refused FAST (saved twice)
+backend.faults.clear()
+queue.retry(first.id)
+assert pump(lambda: queue.get(first.id).state == "done")
+assert len(projects_with(backend, "TWICE")) == 1
+print("saving the same code twice: one job, one project")
+
+queue.stop()
+backend.stop()
+print("ok")
@@ -0,0 +1,83 @@
+# Checks what SearchIndex (services/search_index.py) finds, next to
+# bench_search_index.py which only times it:
+#
+# - a typo still hits through the trigrams, and exact substrings rank first;
+# - an id prefix finds the entity without its trigrams being indexed;
+# - add / remove / re-add change the results straight away;
+# - queries under three characters fall back to a substring scan.
+#
+#   python test/check_search_index.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from launcher.domain.project import Project
+from launcher.domain.sequence import Sequence
+from launcher.domain.shot import Shot
+from launcher.services.search_index import SearchIndex
+
+P1 = "6f1c2a90-0000-4000-8000-000000000001"
+P2 = "6f1c2a91-0000-4000-8000-000000000002"
+S1 = "b7e05d3c-0000-4000-8000-000000000011"
+S2 = "c2a9f410-0000-4000-8000-000000000012"
+
+index = SearchIndex()
+index.add_many([
+    Project(P1, "Eternal Wars EP1", "tg63", 2, 2),
+    Project(P2, "Moon Harbour", "mh01", 0, 0),
+    Sequence(S1, P1, "Battle on the bridge", "sq01", "wip"),
+    Sequence(S2, P1, "Chase", "sq02", "review"),
+    Shot("d4e5f601-0000-4000-8000-000000000021", P1, S1, "Wide", "sh0010", "new"),
+    Shot("d4e5f602-0000-4000-8000-000000000022", P1, S1, "Close up", "sh0020", "approved"),
+])
+assert len(index) == 6
+
+
+def ids(query):
+    return [e.id for e in index.search(query)]
+
+
+# ---------------------------------------------------------------- fuzzy
+
+assert ids("batle on teh bridge") == [S1]
+assert ids("eternl wars") == [P1]
+assert ids("moon harbor") == [P2]
+hits = index.search("sh00")
+assert {e.id for e in hits} >= {"d4e5f601-0000-4000-8000-000000000021", "d4e5f602-0000-4000-8000-000000000022"}
+assert all("sh00" in e.text for e in hits[:2])
+assert ids("zzzzzz") == []
+print(f"typos: {index.search('batle on teh bridge')[0].text!r}")
+
+# ---------------------------------------------------------------- id prefix
+
+assert ids(S1[:8]) == [S1]
+assert set(ids(P1[:7])) == {P1, P2}          # both start with 6f1c2a9
+assert ids(P1[:8]) == [P1]
+assert ids(P1.upper()[:8]) == [P1]
+assert ids(P1[:3]) == []          # under MIN_ID_PREFIX, and no text contains it
+entry = index.search(S2[:8])[0]
+assert entry.kind == "sequence" and entry.project_id == P1 and entry.sequence_id is None
+print(f"id prefix {S2[:8]}: {entry.kind} {entry.text!r}")
+
+# ---------------------------------------------------------------- incremental
+
+assert ids("chase") == [S2]
+index.remove(S2)
+assert ids("chase") == [] and ids(S2[:8]) == [] and len(index) == 5
+index.add(Sequence(S2, P1, "Rooftop chase", "sq02", "final"))
+assert ids("chase") == [S2] and ids(S2[:8]) == [S2]
+index.add(Sequence(S2, P1, "Rooftop escape", "sq02", "final"))      # same id: replaced
+assert ids("chase") == [] and ids("escape") == [S2] and len(index) == 6
+index.add(Project("aaaa0000-0000-4000-8000-000000000003", "Chase the Sun", "cs01", 0, 0))
+assert ids("chase") == ["aaaa0000-0000-4000-8000-000000000003"]
+index.remove("no-such-id")
+assert len(index) == 7
+print("add / remove / replace reflected in the next query")
+
+# ---------------------------------------------------------------- short queries
+
+assert ids("mh") == [P2]
+assert set(ids("wi")) == {S1, "d4e5f601-0000-4000-8000-000000000021"}      # "wip", "wide"
+assert set(ids("q")) == set(ids("sq")) == {S1, S2}
+assert ids("") == [] and ids("   ") == []
+print(f"short queries: 'wi' -> {len(ids('wi'))} hits by substring")
+print("ok")
@@ -0,0 +1,144 @@
+# Checks the saved login session (services/session_store.py) and
+# AuthService.resume_cached(): round trip, rotation, tampering, another
+# server, expiry and logout. Runs with the real Fernet cipher when
+# `cryptography` is installed, and always with a stand-in cipher so the
+# store logic is covered everywhere (the stand-in is NOT encryption).
+#
+#   python test/check_session_store.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+from launcher import config
+from launcher.domain.user import User
+from launcher.services import session_store
+from launcher.services.auth_service import AuthService, SessionExpired
+from launcher.services.session_store import SessionStore
+
+
+class XorCipher:
+    name = b"X"
+
+    def encrypt(self, data: bytes) -> bytes:
+        return bytes(b ^ 0x5A for b in data)
+
+    def decrypt(self, data: bytes) -> bytes:
+        return self.encrypt(data)
+
+
+def check(store: SessionStore, label: str):
+    user = User(id="kc-1", email="bob@example.com", display_name="bob")
+    assert store.load() is None
+    assert store.save(user, "refresh-1", time.time() + 3600)
+    assert b"refresh-1" not in store.path.read_bytes()
+    saved = store.load()
+    assert saved.user == user and saved.refresh_token == "refresh-1", saved
+
+    # Rotation overwrites; no expiry is allowed (offline tokens)
+    store.save(user, "refresh-2", None)
+    assert store.load().refresh_token == "refresh-2" and store.load().refresh_expires_at is None
+
+    # Resume without network: the access token is stale so the first request refreshes
+    auth = AuthService(store=store)
+    t0 = time.perf_counter()
+    resumed = auth.resume_cached()
+    print(f"{label}: resume_cached {1000 * (time.perf_counter() - t0):.2f} ms")
+    assert resumed == user and auth.current_user is resumed
+    assert auth.access_token_minutes_left() == 0.0
+
+    # Tampered / truncated files are ignored, not fatal
+    blob = store.path.read_bytes()
+    store.path.write_bytes(blob[:1] + bytes([blob[1] ^ 1]) + blob[2:-5])
+    assert store.load() is None
+    store.path.write_bytes(blob)
+
+    # Saved for another server
+    kc_base, config.KC_BASE = config.KC_BASE, "http://elsewhere:8080"
+    try:
+        assert store.load() is None
+    finally:
+        config.KC_BASE = kc_base
+
+    # Expired refresh token: dropped
+    store.save(user, "refresh-3", time.time() - 1)
+    assert store.load() is None and not store.path.exists()
+
+    # Logout forgets it (no tokens held, so no request is made)
+    store.save(user, "refresh-4", None)
+    auth = AuthService(store=store)
+    auth.resume_cached()
+    auth._tokens = None
+    auth.logout()
+    assert not store.path.exists() and auth.current_user is None
+    print(f"{label}: ok")
+
+
+check(SessionStore(Path(tempfile.mkdtemp()), cipher=XorCipher()), "stand-in cipher")
+
+
+class TokenEndpoint:
+    """Answers every request with `status`, as a proxy or Keycloak would."""
+
+    def __init__(self, status: int):
+        self.status = status
+
+    def request(self, method, url, **kwargs):
+        resp = requests.Response()
+        resp.status_code = self.status
+        resp._content = b'{"error": "invalid_grant"}' if self.status < 500 else b"Bad Gateway"
+        return resp
+
+
+# A refresh the server can't answer (5xx) keeps the saved session; invalid_grant drops it
+store = SessionStore(Path(tempfile.mkdtemp()), cipher=XorCipher())
+store.save(User("kc-1", "bob@example.com"), "refresh-1", None)
+endpoint = TokenEndpoint(502)
+auth = AuthService(store=store, http=endpoint)
+auth.resume_cached()
+for status in (502, 503):
+    endpoint.status = status
+    try:
+        auth.validate()
+        raise AssertionError("validated without a token")
+    except requests.RequestException as exc:
+        print(f"refresh answered {status}: {exc}; session kept")
+    assert auth.current_user is not None and store.load().refresh_token == "refresh-1"
+endpoint.status = 400
+try:
+    auth.validate()
+    raise AssertionError("validated with a rejected refresh token")
+except SessionExpired:
+    pass
+assert auth.current_user is None and store.load() is None
+
+if session_store.Fernet is not None:
+    directory = Path(tempfile.mkdtemp())
+    session_store.keyring = None        # use the key file, leave the real keyring alone
+    store = SessionStore(directory)
+    check(store, "fernet")
+    assert store.key_path.exists()
+    if os.name == "posix":
+        assert store.key_path.stat().st_mode & 0o077 == 0 and store.path.stat().st_mode & 0o077 == 0
+    # A new key (e.g. the key file was deleted) makes the old session unreadable, not an error
+    store.save(User("kc-1", "bob@example.com"), "refresh-5", None)
+    store.key_path.unlink()
+    assert SessionStore(directory).load() is None
+else:
+    print("cryptography not installed: real cipher not checked")
+    assert SessionStore(Path(tempfile.mkdtemp())).available is (sys.platform == "win32")
+
+# Without encryption the store says why, so the login screen can tell the user
+fernet, session_store.Fernet = session_store.Fernet, None
+store = SessionStore(Path(tempfile.mkdtemp()))
+if sys.platform != "win32":
+    assert not store.available and "cryptography" in store.unavailable_reason
+    assert not store.save(User("kc-1", "bob@example.com"), "refresh-1", None)
+    assert AuthService(store=store).session_not_remembered == store.unavailable_reason
+assert AuthService(store=None).session_not_remembered is None     # remembering turned off
+session_store.Fernet = fernet
+print("ok")
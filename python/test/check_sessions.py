@@ -0,0 +1,75 @@
+# Checks TheaterService's multi-session handling with dummy editors
+# (test/fake_editor.py): concurrent sessions keyed by project/sequence,
+# the concurrency cap, per-session logs, exit codes and RSS/CPU samples.
+#
+#   python test/check_sessions.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import tempfile
+import time
+from pathlib import Path
+
+from PyQt6.QtWidgets import QApplication
+
+from launcher.services import theater_service
+from launcher.services.admission import AdmissionController, AdmissionPolicy
+from launcher.services.theater_service import SessionLimitReached, TheaterService
+
+app = QApplication(sys.argv)
+theater_service.SAMPLE_INTERVAL_MS = 200
+log_dir = Path(tempfile.mkdtemp())
+# Only the editor cap applies here (no system metrics); over it launches are refused, not queued
+admission = AdmissionController(AdmissionPolicy(max_editors=2), metrics=lambda: None)
+service = TheaterService(auth=None, log_dir=log_dir, admission=admission, queue_when_busy=False)
+fake_editor = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_editor.py")
+
+
+def pump(seconds: float, until=lambda: False):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end and not until():
+        app.processEvents()
+        time.sleep(0.01)
+
+
+a = service.launch(sys.executable, fake_editor, ["--rate", "2000", "--seconds", "1.5"], key="EW_EP1/sq01")
+b = service.launch(sys.executable, fake_editor, ["--rate", "500", "--seconds", "30"], key="EW_EP1/sq02")
+try:
+    service.launch(sys.executable, fake_editor, [], key="EW_EP2/sq01")
+    raise AssertionError("cap not enforced")
+except SessionLimitReached as exc:
+    print("cap:", exc)
+try:
+    service.launch(sys.executable, fake_editor, [], key="EW_EP1/sq01")
+    raise AssertionError("duplicate key accepted")
+except RuntimeError as exc:
+    print("duplicate:", exc)
+
+pump(1.0)
+print("running:", [(s.key, s.status, s.pid, f"{s.rss / 2**20:.0f} MiB", f"{s.cpu_percent:.0f}%") for s in service.running()])
+assert all(s.rss > 0 for s in service.running())
+
+pump(5.0, until=lambda: a.status == "exited")
+assert a.exit_code == 0 and a.status == "exited", a
+print("a:", a.status, a.exit_code, f"{a.log_buffer.total} lines")
+
+# A slot freed up: a third editor can start now
+exit3 = log_dir / "exit3.py"
+exit3.write_text("import sys; sys.exit(3)\n")
+c = service.launch(sys.executable, str(exit3), [], key="EW_EP2/sq01")
+pump(5.0, until=lambda: c.status == "exited")
+assert c.exit_code == 3, c
+print("c:", c.status, c.exit_code)
+
+b.terminate()
+pump(5.0, until=lambda: not b.is_alive())
+print("b:", b.status, b.exit_code)
+assert b.status == "exited", b
+assert not service.running()
+
+logs = {log.key: log for log in service.archive.sessions()}
+print("logs:", {key: log.lines for key, log in logs.items()})
+assert set(logs) == {"EW_EP1/sq01", "EW_EP1/sq02", "EW_EP2/sq01"}
+assert logs["EW_EP1/sq01"].lines == a.log_buffer.total and logs["EW_EP1/sq01"].exit_code == 0
+print("ok")
@@ -0,0 +1,109 @@
+# Checks the editor watchdog (services/watchdog.py) through TheaterService
+# with dummy editors (test/fake_editor.py):
+#   - a silent, idle editor during startup is reported as hung, killed and
+#     relaunched once;
+#   - a silent but busy one (compiling shaders) is left alone;
+#   - a crash banner is reported while the process is still alive;
+#   - a non-zero exit is reported as a crash;
+#   - after startup, an editor whose IPC stops answering is reported as hung,
+#     and an idle one that still answers is not; nor is one that never
+#     registered over IPC (a stock editor without the plugin).
+#
+#   python test/check_watchdog.py
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from PyQt6.QtWidgets import QApplication
+
+from launcher.services import theater_service, watchdog
+from launcher.services.admission import AdmissionController, AdmissionPolicy
+from launcher.services.theater_service import TheaterService
+from launcher.services.watchdog import CRASH, HANG, KILL, RELAUNCH, REPORT, WatchdogPolicy
+
+app = QApplication(sys.argv)
+theater_service.SAMPLE_INTERVAL_MS = 200
+watchdog.PING_INTERVAL = 0.4
+tmp = Path(tempfile.mkdtemp())
+fake_editor = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_editor.py")
+
+
+def make_service(**policy):
+    service = TheaterService(
+        auth=None, log_dir=tmp / "logs", ipc_dir=tmp / "editors",
+        admission=AdmissionController(AdmissionPolicy(max_editors=8), metrics=lambda: None),
+        watchdog=WatchdogPolicy(startup_silence=1.5, **policy),
+    )
+    reports = []
+    service.session_unhealthy.connect(lambda s, r: reports.append(r))
+    return service, reports
+
+
+def pump(seconds: float, until=lambda: False):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end and not until():
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def editor(*args):
+    return ["--rate", "200", "--seconds", "0.3", *args]
+
+
+# Startup hang: killed, relaunched once, then left dead
+service, reports = make_service(action=RELAUNCH, max_relaunches=1)
+first = service.launch(sys.executable, fake_editor, editor("--then", "hang"), key="EP1/hang")
+pump(15.0, until=lambda: len(reports) >= 2 and not service.is_running("EP1/hang"))
+print("hang:", [r.summary() for r in reports])
+assert [r.kind for r in reports] == [HANG, HANG], reports
+assert first.status == "exited" and service.session("EP1/hang") is not first
+saved = json.loads(Path(reports[0].path).read_text())
+assert saved["last_lines"] and saved["last_lines"][-1].startswith("[") and saved["pid"] == reports[0].pid
+assert not service.is_running()
+
+# Silent but busy, then a normal exit: no report
+service, reports = make_service(action=KILL)
+busy = service.launch(sys.executable, fake_editor, editor("--then", "spin", "--then-seconds", "3"), key="EP1/busy")
+pump(10.0, until=lambda: not busy.is_alive())
+print("busy:", busy.status, busy.exit_code, f"cpu {busy.cpu_seconds:.1f} s", reports)
+assert busy.exit_code == 0 and not reports
+
+# Crash banner while alive (the crash reporter keeps the process around), report only
+service, reports = make_service(action=REPORT)
+crash = service.launch(sys.executable, fake_editor, editor("--then", "crash"), key="EP1/crash")
+pump(5.0, until=lambda: reports)
+print("crash:", [r.summary() for r in reports])
+assert [r.kind for r in reports] == [CRASH] and crash.is_alive()
+crash.terminate()
+pump(5.0, until=lambda: not crash.is_alive())
+assert len(reports) == 1, reports    # stopped by us: not another crash
+
+# Unexpected exit code
+code = service.launch(sys.executable, fake_editor, editor("--exit-code", "3"), key="EP1/code")
+pump(5.0, until=lambda: not code.is_alive())
+pump(0.2)
+print("exit:", [r.summary() for r in reports[1:]])
+assert [r.kind for r in reports[1:]] == [CRASH] and reports[1].exit_code == 3
+
+# After startup: idle but answering is fine, not answering is a hang
+service, reports = make_service(action=KILL, ping_failures=2)
+idle = service.launch(sys.executable, fake_editor,
+                      editor("--milestones", "--then", "idle"), key="EP2/idle")
+stuck = service.launch(sys.executable, fake_editor, editor("--milestones", "--then", "hang"), key="EP2/stuck")
+stock = service.launch(sys.executable, fake_editor,
+                       editor("--milestones", "--no-ipc", "--then", "idle"), key="EP2/stock")
+pump(10.0, until=lambda: reports and not stuck.is_alive())
+pump(2.0)       # several ping intervals more for the editor without IPC
+print("ready hang:", [r.summary() for r in reports], stuck.watch.milestones)
+assert [r.key for r in reports] == ["EP2/stuck"] and reports[0].kind == HANG
+assert stock.is_alive() and stock.watch.ready and not stock.watch._registered
+assert set(reports[0].milestones) == {"engine_init", "map_loaded", "ready"}
+assert stuck.status == "exited" and idle.is_alive() and idle.watch.ready
+service.stop_all()
+pump(5.0, until=lambda: not service.is_running())
+print("ok")
@@ -0,0 +1,679 @@
+# Local stand-in for the FastAPI backend and Keycloak, used by the scripts in
+# this folder.
+#
+# Serves the routes ProjectService, ScriptBreakdownService, BulkOperations
+# and ApiClient talk to from in-memory state, including the ?updated_since
+# change feed and the /events Server-Sent Events stream, plus Keycloak's
+# token / logout / certs endpoints minting real RS256 tokens
+# (fake_tokens.py) for the users in `users`. With require_auth, API routes
+# want one of those tokens, so the refresh-on-401 path can be exercised.
+# It counts the bytes it sends so scripts can compare transfer sizes.
+# Optionally compresses responses (like a GZipMiddleware would), reads
+# gzip/br/zstd request bodies, and throttles to a given link speed. Writes
+# (POST, PATCH, DELETE) honour Idempotency-Key, fail() injects errors or
+# lost responses, and POST /projects/batch and Idempotency-Key handling can
+# be switched off to play an older server. error_rate answers that share of requests with a 503,
+# from a seeded random generator, so runs are repeatable.
+#
+#   python test/fake_backend.py --projects 1000 --port 4007
+#   (then run the launcher with MVL_DOMAIN=127.0.0.1 KC_BASE=http://127.0.0.1:4007
+#    and log in as bob / 1234)
+#
+# or from a script:
+#   backend = FakeBackend(projects=1000)
+#   backend.start()
+#   client = HttpClient(backend.base_url)
+#   ...
+#   backend.stop()
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import gzip
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, parse_qsl, urlsplit
+
+from fake_tokens import TokenIssuer
+
+API_PREFIX = "/api/v1"
+REALM = "MIHIRA-REALM"
+KC_PREFIX = f"/realms/{REALM}/protocol/openid-connect"
+
+_ENCODERS = {"gzip": lambda data: gzip.compress(data, compresslevel=6)}
+_DECODERS = {"gzip": gzip.decompress}
+try:
+    import zstandard
+    _ENCODERS["zstd"] = lambda data: zstandard.ZstdCompressor(level=3).compress(data)
+    _DECODERS["zstd"] = lambda data: zstandard.ZstdDecompressor().decompress(data, max_output_size=1 << 30)
+except ImportError:
+    pass
+try:
+    import brotli
+    _ENCODERS["br"] = lambda data: brotli.compress(data, quality=4)
+    _DECODERS["br"] = brotli.decompress
+except ImportError:
+    pass
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class _CountingWriter:
+    def __init__(self, raw, backend):
+        self._raw = raw
+        self._backend = backend
+
+    def write(self, data):
+        self._backend.bytes_sent += len(data)
+        self._backend.throttle(len(data))
+        return self._raw.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class FakeBackend:
+    def __init__(self, projects: int = 0, sequences_per_project: int = 0,
+                 host: str = "127.0.0.1", port: int = 0):
+        # Response compression (None: never) and which request body encodings are understood
+        self.compress_min_size: int | None = None
+        self.accept_encoded_bodies = True
+        # Link simulation: bytes per second each way (None: unthrottled), and added delay per request
+        self.bandwidth: float | None = None
+        self.latency = 0.0
+        self._lock = threading.RLock()
+        self.version = 0
+        self.projects: dict[str, dict] = {}
+        self.sequences: dict[str, dict] = {}
+        self.shots: dict[str, dict] = {}
+        self.versions: dict[str, int] = {}
+        self.tombstones: list[tuple[int, str, str, str | None]] = []  # (version, kind, id, parent)
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.requests = 0
+        self.posted: list[dict] = []    # decoded POST bodies, in arrival order
+        self.access: dict[str, dict[str, str]] = {}     # project id -> {user kc id: role}
+        self.idempotent: dict[str, tuple[int, object]] = {}   # Idempotency-Key -> first answer
+        self.honour_idempotency = True  # False: Idempotency-Key is ignored, as by the baseline API
+        self.faults: list[list] = []    # [method, path, status or None, times left]
+        self.batch_endpoint = True      # False: POST /projects/batch is a 404, as on servers before it
+        self.locked: set[str] = set()   # project ids that refuse every change with 403
+        self.in_flight = 0              # requests being handled now, and the most seen at once
+        self.max_in_flight = 0
+        self.error_rate = 0.0           # share of requests answered 503, drawn from `random`
+        self.random = random.Random(0)
+
+        # Keycloak: users by username, and the tokens handed out (the signing key is made on first use)
+        self.users: dict[str, dict] = {}
+        self.token_lifetime = 300
+        self.refresh_lifetime = 1800
+        self.require_auth = False       # API routes answer 401 without a live access token minted here
+        self.access_tokens: dict[str, float] = {}      # access token -> expiry (time.time())
+        self.refresh_tokens: dict[str, str] = {}       # refresh token -> username; rotated on every use
+        self.token_requests: list[str] = []            # grant types, in arrival order
+        self._issuer: TokenIssuer | None = None
+        self.add_user("bob", "1234", email="bob@example.com")
+
+        # Server-Sent Events: retained window for Last-Event-ID replay
+        self.events: list[tuple[int, str, str]] = []   # (event id, name, json data)
+        self.event_seq = 0
+        self.max_events = 1000
+        self.heartbeat = 15.0
+        self.stream_generation = 0  # bump to drop every connected stream
+        self._events_cond = threading.Condition(self._lock)
+
+        for i in range(projects):
+            pid = self.add_project(f"Project {i:04d}", f"P{i:04d}")
+            for j in range(sequences_per_project):
+                self.add_sequence(pid, f"sq{j + 1:02d}", f"Sequence {j + 1}")
+
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------ lifecycle
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "FakeBackend":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.drop_streams()
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def kc_base(self) -> str:
+        """What KC_BASE should be for the launcher to log in here."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_counters(self) -> None:
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.requests = 0
+
+    def throttle(self, nbytes: int) -> None:
+        if self.bandwidth:
+            time.sleep(nbytes / self.bandwidth)
+
+    # ------------------------------------------------------------------ state
+
+    def publish(self, name: str, data: dict) -> None:
+        with self._events_cond:
+            self.event_seq += 1
+            self.events.append((self.event_seq, name, json.dumps(data)))
+            del self.events[:-self.max_events]
+            self._events_cond.notify_all()
+
+    def drop_streams(self) -> None:
+        """Disconnect every SSE client (they should reconnect with Last-Event-ID)."""
+        with self._events_cond:
+            self.stream_generation += 1
+            self._events_cond.notify_all()
+
+    def forget_events(self) -> None:
+        """Drop the replay window so reconnecting clients get a resync."""
+        with self._events_cond:
+            self.events.clear()
+
+    def _events_after(self, last_id: int, generation: int, timeout: float):
+        with self._events_cond:
+            deadline = time.monotonic() + timeout
+            while generation == self.stream_generation:
+                pending = [e for e in self.events if e[0] > last_id]
+                remaining = deadline - time.monotonic()
+                if pending or remaining <= 0:
+                    return pending
+                self._events_cond.wait(remaining)
+            return None
+
+    def _bump(self, entity_id: str) -> str:
+        self.version += 1
+        self.versions[entity_id] = self.version
+        return _now()
+
+    def add_project(self, name: str, code: str) -> str:
+        with self._lock:
+            pid = str(uuid.uuid4())
+            self.projects[pid] = {"id": pid, "name": name, "code": code, "updated_at": self._bump(pid)}
+            return pid
+
+    def update_project(self, project_id: str, **changes) -> None:
+        with self._lock:
+            self.projects[project_id].update(changes)
+            self.projects[project_id]["updated_at"] = self._bump(project_id)
+            self.publish("project.updated", dict(self.projects[project_id], **self._counts(project_id)))
+
+    def delete_project(self, project_id: str) -> None:
+        with self._lock:
+            del self.projects[project_id]
+            self.version += 1
+            self.tombstones.append((self.version, "project", project_id, None))
+            self.publish("project.deleted", {"id": project_id})
+
+    def add_sequence(self, project_id: str, code: str, name: str, status: str = "new") -> str:
+        with self._lock:
+            sid = str(uuid.uuid4())
+            self.sequences[sid] = {
+                "id": sid, "project_id": project_id, "code": code, "name": name,
+                "status": status, "meta": {}, "updated_at": self._bump(sid),
+            }
+            # counts are part of the project, so the project changes too
+            self.projects[project_id]["updated_at"] = self._bump(project_id)
+            self.publish("sequence.created", self.sequences[sid])
+            self.publish("project.updated", dict(self.projects[project_id], **self._counts(project_id)))
+            return sid
+
+    def update_sequence(self, sequence_id: str, **changes) -> None:
+        with self._lock:
+            self.sequences[sequence_id].update(changes)
+            self.sequences[sequence_id]["updated_at"] = self._bump(sequence_id)
+            self.publish("sequence.updated", self.sequences[sequence_id])
+
+    def _sequence_count(self, project_id: str) -> int:
+        return sum(1 for s in self.sequences.values() if s["project_id"] == project_id)
+
+    def _shot_count(self, project_id: str) -> int:
+        return sum(1 for s in self.shots.values() if s["project_id"] == project_id)
+
+    def _counts(self, project_id: str) -> dict:
+        return {
+            "sequence_count": self._sequence_count(project_id),
+            "shot_count": self._shot_count(project_id),
+        }
+
+    def _changes(self, kind: str, items: list[dict], since: int, parent: str | None):
+        changed = [i for i in items if self.versions.get(i["id"], 0) > since]
+        deleted = [t[2] for t in self.tombstones if t[0] > since and t[1] == kind and t[3] == parent]
+        return changed, deleted
+
+    # ------------------------------------------------------------------ keycloak
+
+    def add_user(self, username: str, password: str, email: str | None = None) -> str:
+        sub = str(uuid.uuid5(uuid.NAMESPACE_OID, username))
+        self.users[username] = {"password": password, "sub": sub, "email": email or f"{username}@example.com"}
+        return sub
+
+    @property
+    def issuer(self) -> TokenIssuer:
+        with self._lock:
+            if self._issuer is None:
+                self._issuer = TokenIssuer(issuer=f"{self.kc_base}/realms/{REALM}")
+            return self._issuer
+
+    def revoke_access_tokens(self) -> None:
+        """Every access token handed out so far now gets a 401 (refresh tokens stay good)."""
+        with self._lock:
+            self.access_tokens.clear()
+
+    def authorized(self, header: str | None) -> bool:
+        if not self.require_auth:
+            return True
+        token = (header or "").removeprefix("Bearer ").strip()
+        with self._lock:
+            return self.access_tokens.get(token, 0) > time.time()
+
+    def handle_keycloak(self, method: str, route: str, form: dict) -> tuple[int, object, dict]:
+        if method == "GET" and route == "/certs":
+            return 200, self.issuer.jwks(), {}
+        if method != "POST":
+            return 404, {"error": "not_found"}, {}
+        if route == "/logout":
+            with self._lock:
+                self.refresh_tokens.pop(form.get("refresh_token"), None)
+            return 204, None, {}
+        if route != "/token":
+            return 404, {"error": "not_found"}, {}
+
+        grant = form.get("grant_type")
+        self.token_requests.append(grant)
+        with self._lock:
+            if grant == "password":
+                username = form.get("username")
+                user = self.users.get(username)
+                if user is None or user["password"] != form.get("password"):
+                    return 401, {"error": "invalid_grant", "error_description": "Invalid user credentials"}, {}
+            elif grant == "refresh_token":
+                username = self.refresh_tokens.pop(form.get("refresh_token"), None)
+                if username is None:
+                    return 400, {"error": "invalid_grant", "error_description": "Token is not active"}, {}
+                user = self.users[username]
+            else:
+                return 400, {"error": "unsupported_grant_type"}, {}
+        answer = self.issuer.token_response(
+            user["sub"], self.token_lifetime, self.refresh_lifetime,
+            preferred_username=username, email=user["email"],
+        )
+        with self._lock:
+            self.access_tokens[answer["access_token"]] = time.time() + self.token_lifetime
+            self.refresh_tokens[answer["refresh_token"]] = username
+        return 200, answer, {}
+
+    def parse_script(self, upload: bytes) -> dict:
+        """A made-up breakdown of an uploaded script; the same upload always gives the same one."""
+        rng = random.Random(len(upload))
+        characters = [f"CHARACTER {i}" for i in range(rng.randint(5, 40))]
+        scenes = [f"INT. LOCATION {i} - {rng.choice(('DAY', 'NIGHT'))}" for i in range(rng.randint(20, 120))]
+        character_scenes = {c: sorted(rng.sample(scenes, rng.randint(1, min(10, len(scenes))))) for c in characters}
+        return {
+            "total_pages": max(1, len(scenes) // 2),
+            "total_scenes": len(scenes),
+            "total_characters": len(characters),
+            "scenes": scenes,
+            "characters": characters,
+            "character_appearances": {c: len(s) for c, s in character_scenes.items()},
+            "character_scenes": character_scenes,
+        }
+
+    # ------------------------------------------------------------------ routes
+
+    def handle_get(self, path: str, query: dict) -> tuple[int, object, dict]:
+        since = query.get("updated_since", [None])[0]
+        headers = {"X-Sync-Cursor": str(self.version)}
+
+        with self._lock:
+            if path == "/auth/me/projects":
+                if since is None:
+                    return 200, list(self.projects.values()), headers
+                changed, deleted = self._changes("project", list(self.projects.values()), int(since), None)
+                items = [dict(p, **self._counts(p["id"])) for p in changed]
+                return 200, {"items": items, "deleted": deleted, "cursor": str(self.version)}, headers
+
+            if path == "/projects/":
+                code = query.get("code", [None])[0]
+                return 200, [p for p in self.projects.values() if code is None or p["code"] == code], {}
+
+            m = re.fullmatch(r"/projects/([^/]+)/sequences/count", path)
+            if m:
+                return 200, {"sequence_count": self._sequence_count(m.group(1))}, {}
+
+            m = re.fullmatch(r"/projects/([^/]+)/shots/count", path)
+            if m:
+                return 200, {"shot_count": self._shot_count(m.group(1))}, {}
+
+            m = re.fullmatch(r"/projects/([^/]+)/sequences", path)
+            if m:
+                pid = m.group(1)
+                seqs = [s for s in self.sequences.values() if s["project_id"] == pid]
+                if since is None:
+                    return 200, seqs, headers
+                changed, deleted = self._changes("sequence", seqs, int(since), pid)
+                return 200, {"items": changed, "deleted": deleted, "cursor": str(self.version)}, headers
+
+            m = re.fullmatch(r"/projects/([^/]+)/sequences/([^/]+)/shots", path)
+            if m:
+                return 200, [s for s in self.shots.values() if s["sequence_id"] == m.group(2)], headers
+
+        return 404, {"detail": "Not Found"}, {}
+
+    def fail(self, method: str, path: str, status: int | None, times: int = 1) -> None:
+        """
+        Answer the next `times` calls to `method` `path` (below the API prefix)
+        with `status` without doing anything, or with None, do the work and
+        drop the connection before answering (a lost response).
+        """
+        with self._lock:
+            self.faults.append([method, path, status, times])
+
+    def _take_fault(self, method: str, path: str) -> tuple[bool, int | None]:
+        with self._lock:
+            for fault in self.faults:
+                if fault[0] == method and fault[1] == path and fault[3] > 0:
+                    fault[3] -= 1
+                    return True, fault[2]
+            if self.error_rate and self.random.random() < self.error_rate:
+                return True, 503
+        return False, None
+
+    def handle_write(self, method: str, path: str, body: object, key: str | None = None) -> tuple[int, object, dict]:
+        with self._lock:
+            if key is not None and self.honour_idempotency and key in self.idempotent:
+                status, answer = self.idempotent[key]
+                return status, answer, {"Idempotent-Replayed": "true"}
+            if method == "POST":
+                status, answer = self._post(path, body)
+            else:
+                m = re.fullmatch(r"/projects/([^/]+)", path)
+                if m is None:
+                    status, answer = 404, {"detail": "Not Found"}
+                elif method == "PATCH":
+                    status, answer = self._update_one(m.group(1), body or {})
+                else:
+                    status, answer = self._delete_one(m.group(1))
+            if key is not None and status < 500:
+                self.idempotent[key] = (status, answer)
+            return status, answer, {}
+
+    def _post(self, path: str, body: dict) -> tuple[int, object]:
+        if path == "/projects/":
+            if any(p["code"] == body.get("code") for p in self.projects.values()):
+                return 409, {"detail": f"Project code {body.get('code')!r} already exists"}
+            pid = self.add_project(body["name"], body["code"])
+            self.projects[pid].update({k: v for k, v in body.items() if k not in ("name", "code")})
+            return 201, self.projects[pid]
+        if path == "/projects/access":
+            return self._grant(body)
+        if path == "/script/parse":
+            return 200, self.parse_script(body if isinstance(body, bytes) else b"")
+        if path == "/projects/batch" and self.batch_endpoint:
+            op = body.get("op")
+            results = []
+            for pid in body.get("ids", []):
+                if op == "delete":
+                    status, answer = self._delete_one(pid)
+                elif op == "update":
+                    status, answer = self._update_one(pid, body.get("changes", {}))
+                elif op == "grant_access":
+                    status, answer = self._grant({"project_id": pid, "user_kc_id": body.get("user_kc_id"),
+                                                  "role": body.get("role", "viewer")})
+                else:
+                    return 422, {"detail": f"Unknown op {op!r}"}
+                results.append({"id": pid, "status": status, **({"detail": answer["detail"]} if status >= 400 else {})})
+            return 200, {"results": results}
+        return 404, {"detail": "Not Found"}
+
+    def _grant(self, body: dict) -> tuple[int, object]:
+        if body.get("project_id") not in self.projects:
+            return 404, {"detail": "Project not found"}
+        if body["project_id"] in self.locked:
+            return 403, {"detail": "Project is locked"}
+        grants = self.access.setdefault(body["project_id"], {})
+        if body["user_kc_id"] in grants:
+            return 409, {"detail": "Access already granted"}
+        grants[body["user_kc_id"]] = body.get("role", "viewer")
+        return 201, dict(body)
+
+    def _update_one(self, project_id: str, changes: dict) -> tuple[int, object]:
+        if project_id not in self.projects:
+            return 404, {"detail": "Project not found"}
+        if project_id in self.locked:
+            return 403, {"detail": "Project is locked"}
+        self.update_project(project_id, **{k: v for k, v in changes.items() if k in ("name", "status", "archived")})
+        return 200, self.projects[project_id]
+
+    def _delete_one(self, project_id: str) -> tuple[int, object]:
+        if project_id not in self.projects:
+            return 404, {"detail": "Project not found"}
+        if project_id in self.locked:
+            return 403, {"detail": "Project is locked"}
+        self.delete_project(project_id)
+        return 200, {"id": project_id}
+
+    def _make_handler(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; with Nagle on, delayed ACKs add ~40 ms to each answer
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                self.wfile = _CountingWriter(self.wfile, backend)
+
+            def log_message(self, fmt, *args):
+                pass
+
+            def _send(self, status: int, body: object, headers: dict):
+                data = b"" if status == 204 else json.dumps(body).encode("utf-8")
+                encoding = self._response_encoding(len(data))
+                if encoding:
+                    data = _ENCODERS[encoding](data)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if encoding:
+                    self.send_header("Content-Encoding", encoding)
+                    self.send_header("Vary", "Accept-Encoding")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _response_encoding(self, size: int) -> str | None:
+                if backend.compress_min_size is None or size < backend.compress_min_size:
+                    return None
+                offered = {e.split(";")[0].strip() for e in self.headers.get("Accept-Encoding", "").split(",")}
+                return next((e for e in ("zstd", "br", "gzip") if e in offered and e in _ENCODERS), None)
+
+            def _read_body(self) -> tuple[object, str | None]:
+                """
+                (body, None), or (None, error detail) for a body the server can't read. JSON is
+                decoded, a form becomes a dict, anything else (an upload) stays bytes.
+                """
+                data = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if not data:
+                    return None, None
+                backend.bytes_received += len(data)
+                backend.throttle(len(data))
+                encoding = self.headers.get("Content-Encoding")
+                if encoding:
+                    if not backend.accept_encoded_bodies or encoding not in _DECODERS:
+                        return None, f"Unsupported Content-Encoding: {encoding}"
+                    data = _DECODERS[encoding](data)
+                content_type = self.headers.get("Content-Type", "")
+                if content_type.startswith("application/x-www-form-urlencoded"):
+                    return dict(parse_qsl(data.decode("utf-8"))), None
+                if content_type.startswith("multipart/"):
+                    return data, None
+                return json.loads(data), None
+
+            def _stream_events(self):
+                generation = backend.stream_generation
+                last = self.headers.get("Last-Event-ID")
+                resync = False
+                # Fix the stream position before the client sees the response
+                with backend._lock:
+                    cursor = backend.event_seq
+                    if last is not None and last.isdigit():
+                        oldest = backend.events[0][0] if backend.events else backend.event_seq + 1
+                        if int(last) + 1 >= oldest:
+                            cursor = int(last)
+                        else:
+                            resync = True  # replay window no longer covers the client's position
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                self.close_connection = True
+                try:
+                    if resync:
+                        self.wfile.write(f"id: {cursor}\nevent: resync\ndata: {{}}\n\n".encode())
+                    self.wfile.flush()
+                    while True:
+                        pending = backend._events_after(cursor, generation, backend.heartbeat)
+                        if pending is None:
+                            return  # dropped
+                        if not pending:
+                            self.wfile.write(b": ping\n\n")
+                        for event_id, name, data in pending:
+                            self.wfile.write(f"id: {event_id}\nevent: {name}\ndata: {data}\n\n".encode())
+                            cursor = event_id
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def _refuse(self, method: str, path: str, api: bool = True) -> bool:
+                """Answer with an injected fault or a 401 instead of the route; True if it did."""
+                faulty, status = backend._take_fault(method, path)
+                if faulty and status is not None:
+                    self._send(status, {"detail": "injected failure"}, {})
+                    return True
+                if faulty:
+                    self.close_connection = True    # no answer at all
+                    return True
+                if api and not backend.authorized(self.headers.get("Authorization")):
+                    self._send(401, {"detail": "Not authenticated"}, {"WWW-Authenticate": "Bearer"})
+                    return True
+                return False
+
+            def do_GET(self):
+                backend.requests += 1
+                time.sleep(backend.latency)
+                url = urlsplit(self.path)
+                if url.path.startswith(KC_PREFIX):
+                    if not self._refuse("GET", url.path, api=False):
+                        self._send(*backend.handle_keycloak("GET", url.path[len(KC_PREFIX):], {}))
+                    return
+                if not url.path.startswith(API_PREFIX):
+                    return self._send(404, {"detail": "Not Found"}, {})
+                if self._refuse("GET", url.path[len(API_PREFIX):]):
+                    return
+                if url.path == f"{API_PREFIX}/events":
+                    return self._stream_events()
+                status, body, headers = backend.handle_get(url.path[len(API_PREFIX):], parse_qs(url.query))
+                self._send(status, body, headers)
+
+            def _write(self, method: str):
+                with backend._lock:
+                    backend.requests += 1
+                    backend.in_flight += 1
+                    backend.max_in_flight = max(backend.max_in_flight, backend.in_flight)
+                try:
+                    time.sleep(backend.latency)
+                    url = urlsplit(self.path)
+                    body, refused = self._read_body()
+                    if refused:
+                        return self._send(415, {"detail": refused}, {})
+                    if url.path.startswith(KC_PREFIX):
+                        if not self._refuse(method, url.path, api=False):
+                            self._send(*backend.handle_keycloak(method, url.path[len(KC_PREFIX):], body or {}))
+                        return
+                    if method == "POST":
+                        backend.posted.append(body)
+                    if not url.path.startswith(API_PREFIX):
+                        return self._send(404, {"detail": "Not Found"}, {})
+                    path = url.path[len(API_PREFIX):]
+                    faulty, status = backend._take_fault(method, path)
+                    if faulty and status is not None:
+                        return self._send(status, {"detail": "injected failure"}, {})
+                    if not backend.authorized(self.headers.get("Authorization")):
+                        return self._send(401, {"detail": "Not authenticated"}, {"WWW-Authenticate": "Bearer"})
+                    answer = backend.handle_write(method, path, body, self.headers.get("Idempotency-Key"))
+                    if faulty:
+                        self.close_connection = True    # the work is done, the answer never arrives
+                        return
+                    self._send(*answer)
+                finally:
+                    with backend._lock:
+                        backend.in_flight -= 1
+
+            def do_POST(self):
+                self._write("POST")
+
+            def do_PATCH(self):
+                self._write("PATCH")
+
+            def do_DELETE(self):
+                self._write("DELETE")
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--sequences", type=int, default=5)
+    parser.add_argument("--port", type=int, default=4007)
+    parser.add_argument("--gzip", action="store_true", help="compress responses of 500 bytes and more")
+    parser.add_argument("--bandwidth", type=float, help="throttle to this many KiB/s")
+    parser.add_argument("--latency", type=float, default=0.0, help="add this many ms to every request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="answer this share of requests with a 503")
+    parser.add_argument("--require-auth", action="store_true", help="API routes need a token minted here")
+    parser.add_argument("--user", action="append", default=[], metavar="NAME:PASSWORD",
+                        help="add a login (bob:1234 always exists)")
+    opts = parser.parse_args()
+
+    backend = FakeBackend(opts.projects, opts.sequences, port=opts.port)
+    backend.compress_min_size = 500 if opts.gzip else None
+    backend.bandwidth = opts.bandwidth * 1024 if opts.bandwidth else None
+    backend.latency = opts.latency / 1000
+    backend.error_rate = opts.error_rate
+    backend.require_auth = opts.require_auth
+    for login in opts.user:
+        name, _, password = login.partition(":")
+        backend.add_user(name, password)
+    print(f"Fake backend on {backend.base_url}, Keycloak realm {REALM} on {backend.kc_base}")
+    host = backend._server.server_address[0]
+    print(f"Launcher: MVL_DOMAIN={host} KC_BASE={backend.kc_base}" +
+          ("" if opts.port == 4007 else " (the launcher expects the API on port 4007)"))
+    try:
+        backend._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
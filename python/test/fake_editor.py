@@ -0,0 +1,137 @@
+# Stand-in for UnrealEditor that floods stdout/stderr with log lines.
+# Accepts (and ignores) the arguments the launcher passes to the editor.
+#
+# When started with MVL_IPC_DIR / MVL_IPC_TOKEN in its environment it also
+# serves the editor control protocol (see launcher/services/editor_ipc.py),
+# registering after --ipc-delay seconds like a real editor that is loading.
+#
+# --milestones prints the startup markers the watchdog looks for
+# (services/watchdog.py) first; --then decides what happens after the
+# output phase: exit, idle (silent, IPC still answers), hang (silent, IPC
+# stops answering), spin (silent but busy) or crash (crash banner, then hang like the crash reporter).
+#
+#   python test/fake_editor.py Project.uproject -MVLEditor --rate 50000 --seconds 5
+import argparse
+import atexit
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("uproject", nargs="?")
+parser.add_argument("--rate", type=int, default=50000, help="lines per second")
+parser.add_argument("--seconds", type=float, default=5.0)
+parser.add_argument("--stderr-every", type=int, default=50, help="every Nth line goes to stderr")
+parser.add_argument("--ipc-delay", type=float, default=0.0, help="seconds before accepting IPC commands")
+parser.add_argument("--no-ipc", action="store_true", help="never register, like an editor without the plugin")
+parser.add_argument("--milestones", action="store_true", help="log the startup milestones first")
+parser.add_argument("--then", choices=["exit", "idle", "hang", "spin", "crash"], default="exit")
+parser.add_argument("--then-seconds", type=float, default=3600.0, help="how long idle/hang/spin/crash last")
+parser.add_argument("--exit-code", type=int, default=0)
+opts, _ = parser.parse_known_args()
+
+out, err = sys.stdout.buffer, sys.stderr.buffer
+out_lock = threading.Lock()
+frozen = threading.Event()   # set when hung: IPC requests are no longer answered
+scope = os.environ.get("MVL_SCOPE", "")
+# The launcher passes the .uproject first; in tests that is this script itself
+uproject = os.path.abspath(opts.uproject or sys.argv[0])
+# Exit normally on terminate() so the registry entry is removed
+signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+
+def log(line: str):
+    with out_lock:
+        out.write(f"{line}\n".encode())
+        out.flush()
+
+
+def serve_ipc(ipc_dir: str, token: str):
+    global scope
+    time.sleep(opts.ipc_delay)
+    srv = socket.socket()
+    srv.bind(("127.0.0.1", 0))
+    srv.listen()
+    registry = os.path.join(ipc_dir, f"{os.getpid()}.json")
+
+    def register():
+        tmp = registry + ".tmp"
+        with open(tmp, "w") as fh:
+            json.dump({"protocol": 1, "pid": os.getpid(), "port": srv.getsockname()[1], "token": token,
+                       "uproject": uproject, "scope": scope}, fh)
+        os.replace(tmp, registry)
+
+    os.makedirs(ipc_dir, exist_ok=True)
+    register()
+    atexit.register(lambda: os.path.exists(registry) and os.remove(registry))
+    log("LogMVL: Display: IPC listening")
+    while True:
+        conn, _ = srv.accept()
+        with conn, conn.makefile("rwb") as fh:
+            for raw in fh:
+                if frozen.is_set():
+                    time.sleep(opts.then_seconds)
+                req = json.loads(raw)
+                if req.get("token") != token:
+                    reply = {"ok": False, "error": "bad token"}
+                elif req.get("cmd") == "hello":
+                    reply = {"ok": True, "pid": os.getpid(), "uproject": uproject, "scope": scope}
+                elif req.get("cmd") == "switch_scope":
+                    scope = req.get("env", {}).get("MVL_SCOPE", scope)
+                    register()
+                    log(f"LogMVL: Display: Switching scope to {scope}")
+                    reply = {"ok": True, "scope": scope}
+                else:
+                    reply = {"ok": False, "error": f"unknown command {req.get('cmd')!r}"}
+                fh.write(json.dumps({"id": req.get("id"), **reply}).encode() + b"\n")
+                fh.flush()
+
+
+if os.environ.get("MVL_IPC_DIR") and os.environ.get("MVL_IPC_TOKEN") and not opts.no_ipc:
+    threading.Thread(target=serve_ipc, args=(os.environ["MVL_IPC_DIR"], os.environ["MVL_IPC_TOKEN"]),
+                     daemon=True).start()
+if opts.milestones:
+    log("LogInit: Display: Engine is initialized. Leaving FEngineLoop::Init()")
+    log("LogLoad: Took 0.05 seconds to LoadMap(/Game/Maps/Stage)")
+    log("LogLoad: (Engine Initialization) Total time: 0.10 seconds")
+tick = 0.01
+per_tick = max(1, int(opts.rate * tick))
+start = time.monotonic()
+n = 0
+while time.monotonic() - start < opts.seconds:
+    stamp = time.strftime("%Y.%m.%d-%H.%M.%S")
+    batch, errors = [], []
+    for _ in range(per_tick):
+        line = f"[{stamp}:{n % 1000:03d}][{n % 1000:3d}]LogStreaming: Display: Loading package /Game/Env/Asset_{n:07d}\n".encode()
+        (errors if n % opts.stderr_every == 0 else batch).append(line)
+        n += 1
+    with out_lock:
+        out.write(b"".join(batch))
+        out.flush()
+    if errors:
+        err.write(b"".join(errors))
+        err.flush()
+    # keep the requested rate
+    ahead = start + n / opts.rate - time.monotonic()
+    if ahead > 0:
+        time.sleep(ahead)
+if opts.then == "idle":
+    time.sleep(opts.then_seconds)
+elif opts.then == "hang":
+    frozen.set()
+    time.sleep(opts.then_seconds)
+elif opts.then == "spin":
+    end = time.monotonic() + opts.then_seconds
+    while time.monotonic() < end:
+        pass
+elif opts.then == "crash":
+    log("LogWindows: Error: === Critical error: ===")
+    log("LogWindows: Error: Fatal error: [File:D:/Build/Engine/Source/Runtime/Core/Private/Fake.cpp] [Line: 42]")
+    frozen.set()
+    time.sleep(opts.then_seconds)
+log(f"LogExit: Exiting after {n} lines")
+sys.exit(opts.exit_code)
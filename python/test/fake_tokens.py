@@ -0,0 +1,101 @@
+# Mints Keycloak-style RS256 access tokens locally, for scripts that need
+# real signed JWTs without a Keycloak server.
+#
+#   issuer = TokenIssuer()                  # generates an RSA key (about a second)
+#   token = issuer.mint(sub="kc-1", preferred_username="bob", lifetime=300)
+#   issuer.jwks()                           # what /protocol/openid-connect/certs serves
+import hashlib
+import json
+import secrets
+import time
+
+from launcher.util.jwt import b64url_encode
+
+_SHA256_PREFIX = bytes.fromhex("3031300d060960864801650304020105000420")
+_SMALL_PRIMES = [p for p in range(3, 2000, 2) if all(p % q for q in range(3, int(p ** 0.5) + 1, 2))]
+
+
+def _is_probable_prime(n: int, rounds: int = 24) -> bool:
+    if any(n % p == 0 for p in _SMALL_PRIMES):
+        return n in _SMALL_PRIMES
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for _ in range(rounds):
+        x = pow(secrets.randbelow(n - 3) + 2, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _prime(bits: int, e: int) -> int:
+    while True:
+        p = secrets.randbits(bits) | (1 << (bits - 1)) | (1 << (bits - 2)) | 1
+        if (p - 1) % e and _is_probable_prime(p):
+            return p
+
+
+class RsaKey:
+    def __init__(self, bits: int = 2048, kid: str | None = None):
+        self.e = 65537
+        while True:
+            p, q = _prime(bits // 2, self.e), _prime(bits // 2, self.e)
+            self.n = p * q
+            if p != q and self.n.bit_length() == bits:
+                break
+        self.d = pow(self.e, -1, (p - 1) * (q - 1))
+        self.kid = kid or secrets.token_hex(8)
+
+    def sign(self, data: bytes) -> bytes:
+        k = (self.n.bit_length() + 7) // 8
+        t = _SHA256_PREFIX + hashlib.sha256(data).digest()
+        em = b"\x00\x01" + b"\xff" * (k - len(t) - 3) + b"\x00" + t
+        return pow(int.from_bytes(em, "big"), self.d, self.n).to_bytes(k, "big")
+
+    def jwk(self) -> dict:
+        def enc(i: int) -> str:
+            return b64url_encode(i.to_bytes((i.bit_length() + 7) // 8, "big"))
+        return {"kid": self.kid, "kty": "RSA", "alg": "RS256", "use": "sig", "n": enc(self.n), "e": enc(self.e)}
+
+
+class TokenIssuer:
+    def __init__(self, issuer: str = "http://localhost:8080/realms/MIHIRA-REALM", bits: int = 2048):
+        self.issuer = issuer
+        self.key = RsaKey(bits)
+        self.retired: list[RsaKey] = []
+
+    def rotate(self) -> None:
+        self.retired.append(self.key)
+        self.key = RsaKey(self.key.n.bit_length())
+
+    def jwks(self) -> dict:
+        return {"keys": [k.jwk() for k in (self.key, *self.retired)]}
+
+    def mint(self, sub: str, lifetime: float = 300, issued_at: float | None = None, key: RsaKey | None = None,
+             **claims) -> str:
+        key = key or self.key
+        iat = int(issued_at if issued_at is not None else time.time())
+        header = {"alg": "RS256", "typ": "JWT", "kid": key.kid}
+        payload = {"exp": iat + int(lifetime), "iat": iat, "jti": secrets.token_hex(8), "iss": self.issuer,
+                   "sub": sub, "typ": "Bearer", "azp": "mihira-cli", **claims}
+        signing_input = (b64url_encode(json.dumps(header).encode()) + "." +
+                         b64url_encode(json.dumps(payload).encode()))
+        return signing_input + "." + b64url_encode(key.sign(signing_input.encode("ascii")))
+
+    def token_response(self, sub: str, lifetime: float = 300, refresh_lifetime: float = 1800, **claims) -> dict:
+        """Body of a token-endpoint reply, as Keycloak sends it."""
+        return {
+            "access_token": self.mint(sub, lifetime, **claims),
+            "expires_in": int(lifetime),
+            "refresh_expires_in": int(refresh_lifetime),
+            "refresh_token": secrets.token_urlsafe(32),
+            "token_type": "Bearer",
+            "scope": "profile email",
+        }
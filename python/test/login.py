@@ -1,15 +1,48 @@
-import requests
-from ..launcher.config import DOMAIN
+# Logs in through AuthService (token signature checked against the realm's
+# keys), refreshes once and logs out, printing what each step took. By
+# default against the stand-in Keycloak in fake_backend.py (bob / 1234);
+# with --live, against the one in config (KC_BASE / MVL_DOMAIN).
+#
+#   python test/login.py [--live] [username] [password]
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
 
-token_url = "{DOMAIN}:8080/realms/MIHIRA-REALM/protocol/openid-connect/token"
+import argparse
+import time
 
-payload = {
-    "grant_type": "password",
-    "client_id": "mihira-cli",
-    "username": "bob",
-    "password": "1234",
-}
+from launcher import config
+from launcher.services.auth_service import AuthService
+from launcher.services.jwks import JwksCache, TokenVerifier, jwks_url
 
-resp = requests.post(token_url, data=payload)
-print("Status:", resp.status_code)
-print("Text:", resp.text)
+parser = argparse.ArgumentParser()
+parser.add_argument("--live", action="store_true", help="use the Keycloak in config instead of the stand-in")
+parser.add_argument("username", nargs="?", default="bob")
+parser.add_argument("password", nargs="?", default="1234")
+opts = parser.parse_args()
+
+backend = None
+if not opts.live:
+    from fake_backend import FakeBackend
+    backend = FakeBackend().start()
+    config.KC_BASE = config.KC_ISSUER = backend.kc_base
+    backend.issuer      # generate the signing key now, not inside the login timing
+
+auth = AuthService(verifier=TokenVerifier(JwksCache(jwks_url(), None),
+                                          issuer=f"{config.KC_ISSUER}/realms/{config.KC_REALM}"))
+try:
+    t0 = time.perf_counter()
+    user = auth.login(opts.username, opts.password)
+    print(f"login      {1000 * (time.perf_counter() - t0):7.1f} ms  {user.display_name} <{user.email}> ({user.id})")
+    print(f"           token good for {auth.access_token_minutes_left():.1f} min")
+
+    t0 = time.perf_counter()
+    auth.refresh_after_rejection(auth.get_access_token())
+    print(f"refresh    {1000 * (time.perf_counter() - t0):7.1f} ms")
+
+    t0 = time.perf_counter()
+    auth.logout()
+    print(f"logout     {1000 * (time.perf_counter() - t0):7.1f} ms")
+finally:
+    if backend is not None:
+        backend.stop()
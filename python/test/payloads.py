@@ -0,0 +1,66 @@
+# Real-size API payloads for the benchmarks in this folder, shaped like what
+# the backend stores: a save_project body (config with scenes, character
+# appearances and the AI analysis), sequences and shots with large meta.
+# Text is drawn from a random vocabulary so it compresses like prose, not
+# like repeated strings. Seeded: the same payloads on every run.
+import random
+import uuid
+
+_rng = random.Random(7)
+WORDS = ["".join(_rng.choice("etaoinshrdlcumwfgypbvk") for _ in range(_rng.randint(3, 9))) for _ in range(3000)]
+CHARACTERS = [w.upper() for w in _rng.sample(WORDS, 40)]
+
+
+def text(n: int, rng=_rng) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def save_project_body(scenes: int = 300, seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    scene_list = [{
+        "number": i + 1,
+        "heading": f"{rng.choice(('INT.', 'EXT.'))} {text(3, rng).upper()} - {rng.choice(('DAY', 'NIGHT'))}",
+        "characters": rng.sample(CHARACTERS, rng.randint(1, 6)),
+        "summary": text(40, rng),
+        "action_lines": [text(rng.randint(8, 25), rng) for _ in range(rng.randint(3, 10))],
+        "page_start": i // 2 + 1,
+    } for i in range(scenes)]
+    appearances = {c: sorted(s["number"] for s in scene_list if c in s["characters"]) for c in CHARACTERS}
+    return {
+        "name": "Benchmark", "code": "BENCH", "type": "Feature", "description": "", "status": "Active",
+        "archived": False,
+        "config": {
+            "total_pages": scenes // 2, "total_scenes": scenes, "total_characters": len(CHARACTERS),
+            "scenes": scene_list,
+            "character_appearances": appearances,
+            "ai_analysis": {
+                "logline": text(30, rng),
+                "scenes": [{"number": s["number"], "mood": rng.choice(("tense", "calm", "comic", "bleak")),
+                            "notes": text(60, rng), "vfx": rng.random() < 0.3} for s in scene_list],
+            },
+        },
+    }
+
+
+def sequence_meta(rng=_rng) -> dict:
+    return {
+        "shots": rng.randint(5, 60), "notes": text(80, rng), "tags": rng.sample(WORDS, 8),
+        "frame_ranges": [[f, f + rng.randint(24, 480)] for f in range(1001, 1001 + 480 * 12, 480)],
+        "camera": {"lens": rng.choice((24, 35, 50, 85)), "rig": text(2, rng), "fps": 24},
+    }
+
+
+def shot_list(n: int, seed: int = 2) -> list[dict]:
+    rng = random.Random(seed)
+    project_id, sequence_id = str(uuid.UUID(int=rng.getrandbits(128))), str(uuid.UUID(int=rng.getrandbits(128)))
+    return [{
+        "id": str(uuid.UUID(int=rng.getrandbits(128))), "project_id": project_id, "sequence_id": sequence_id,
+        "name": f"Shot {i:04d}", "code": f"sh{i * 10:04d}", "status": rng.choice(("new", "wip", "review", "final")),
+        "updated_at": "2026-03-01T12:00:00+00:00",
+        "meta": {
+            "frame_in": 1001, "frame_out": 1001 + rng.randint(24, 400), "handles": 8,
+            "description": text(25, rng), "assets": [text(1, rng) for _ in range(rng.randint(2, 12))],
+            "versions": [{"v": v, "by": text(1, rng), "note": text(12, rng), "approved": rng.random() < 0.2}
+                         for v in range(rng.randint(1, 5))],
+        },
+    } for i in range(n)]